@@ -12,6 +12,7 @@ from rich.console import Console
 
 from ..context import session_context
 from .config_cmd import config_command
+from .daemon_cmd import daemon_command
 from .parser import CommandParser
 from .plugins_cmd import plugins_command
 from .shell import PlainSpeakShell
@@ -32,6 +33,7 @@ console = Console()
 app.command(name="translate")(translate_command)
 app.command(name="config")(config_command)
 app.command(name="plugins")(plugins_command)
+app.command(name="daemon")(daemon_command)
 
 
 # Add a callback to handle direct commands without 'translate' verb
@@ -47,7 +49,7 @@ def callback(
 
     if text:
         # Explicitly set execute=False unless the user specified -e/--execute flag
-        translate_command(text, execute=execute)
+        translate_command(text, execute=execute, batch=None)
 
 
 @app.command()
@@ -22,7 +22,7 @@ console = Console()
 def config_command(
     download_model: bool = typer.Option(False, "--download-model", "-d", help="Download the default LLM model"),
     show: bool = typer.Option(False, "--show", "-s", help="Show current configuration"),
-    provider: str = typer.Option(None, "--provider", "-p", help="Set LLM provider (local or openai)"),
+    provider: str = typer.Option(None, "--provider", "-p", help="Set LLM provider (local, openai or router)"),
     model_path: str = typer.Option(None, "--model-path", "-m", help="Set path to local model file"),
     api_key: str = typer.Option(None, "--api-key", "-k", help="Set API key for remote provider"),
     gpu_layers: int = typer.Option(None, "--gpu-layers", "-g", help="Set number of GPU layers to use"),
@@ -69,8 +69,8 @@ def config_command(
     config_updated = False
 
     if provider is not None:
-        if provider.lower() not in ["local", "openai", "remote"]:
-            console.print(f"Invalid provider: {provider}. Must be 'local' or 'openai'.", style="red")
+        if provider.lower() not in ["local", "openai", "remote", "router"]:
+            console.print(f"Invalid provider: {provider}. Must be 'local', 'openai' or 'router'.", style="red")
         else:
             current_config.llm.provider = provider.lower()
             config_updated = True
@@ -0,0 +1,111 @@
+"""
+Daemon command for PlainSpeak CLI.
+
+This module manages the local model daemon, which keeps the model loaded between invocations.
+"""
+
+import subprocess
+import sys
+import time
+from typing import Optional
+
+import typer
+from rich.console import Console
+
+from ..config import load_config
+from ..core.llm.daemon import DaemonError, daemon_supported, main, socket_path
+from ..core.llm.daemon_client import DaemonClient, probe_daemon
+
+# Create console for rich output
+console = Console()
+
+# Seconds to wait for a started daemon to load the model
+START_TIMEOUT = 300
+
+
+def daemon_command(
+    action: str = typer.Argument("status", help="start, stop or status"),
+    foreground: bool = typer.Option(False, "--foreground", "-f", help="Run the daemon in this process"),
+    idle_timeout: Optional[int] = typer.Option(
+        None, "--idle-timeout", help="Seconds without requests before the daemon exits, 0 to never exit"
+    ),
+):
+    """Manage the local model daemon that keeps the model loaded between invocations."""
+    if not daemon_supported():
+        console.print("The model daemon requires Unix domain sockets, which this platform lacks.", style="red")
+        raise typer.Exit(1)
+
+    config = load_config()
+    path = socket_path(config.llm)
+    client = probe_daemon(config.llm)
+
+    if action == "status":
+        if client is None:
+            console.print("Model daemon is not running.", style="yellow")
+            return
+        info = client.request("ping")
+        client.close()
+        console.print(f"Model daemon running (pid {info['pid']}) on {path}, {info['requests']} requests served.")
+
+    elif action == "stop":
+        if client is None and path.exists():
+            # A daemon serving another model still answers to its socket
+            client = DaemonClient(path)
+        if client is None:
+            console.print("Model daemon is not running.", style="yellow")
+            return
+        try:
+            client.request("shutdown")
+            console.print("Model daemon stopped.", style="green")
+        except (OSError, DaemonError) as e:
+            console.print(f"Could not stop the model daemon: {e}", style="red")
+            raise typer.Exit(1)
+        finally:
+            client.close()
+
+    elif action == "start":
+        if client is not None:
+            client.close()
+            console.print(f"Model daemon is already running on {path}.", style="yellow")
+            return
+        args = ["--socket", str(path)]
+        if idle_timeout is not None:
+            args += ["--idle-timeout", str(idle_timeout)]
+        if foreground:
+            raise typer.Exit(main(args))
+        _start_background(args, config)
+
+    else:
+        console.print(f"Unknown action '{action}', use start, stop or status.", style="red")
+        raise typer.Exit(1)
+
+
+def _start_background(args, config) -> None:
+    """Start the daemon in a new session and wait until it serves requests."""
+    path = socket_path(config.llm)
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    log_path = path.with_suffix(".log")
+    with open(log_path, "ab") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import sys; from plainspeak.core.llm.daemon import main; sys.exit(main())", *args],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    with console.status("Loading the model..."):
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                console.print(f"Model daemon exited with code {process.returncode}, see {log_path}", style="red")
+                raise typer.Exit(1)
+            client = probe_daemon(config.llm)
+            if client is not None:
+                client.close()
+                console.print(f"Model daemon started (pid {process.pid}) on {path}.", style="green")
+                return
+            time.sleep(0.2)
+
+    console.print(f"Model daemon did not start within {START_TIMEOUT} seconds, see {log_path}", style="red")
+    raise typer.Exit(1)
@@ -9,7 +9,7 @@ from typing import Optional
 from rich.console import Console
 
 from ...context import session_context
-from ..shell_utils import display_execution_result, execute_command
+from ..shell_utils import display_execution_result, execute_command, print_output
 
 # Create console for rich output
 console = Console()
@@ -34,10 +34,10 @@ def handle_execute(shell, command: str, original_text: Optional[str] = None) ->
 
     console.print("\nExecuting command:", style="yellow")
 
-    success, stdout, stderr = execute_command(command)
+    # Output is printed as it arrives
+    success, _, _ = execute_command(command, on_output=print_output)
 
-    # Display output
-    display_execution_result(success, stdout, stderr)
+    display_execution_result(success, None, None)
 
     # If we have the original text, update the history with execution result
     if original_text and isinstance(original_text, str):
@@ -92,18 +92,18 @@ def handle_learning(shell, args):
     """
     try:
         # Get command history from learning store
-        history_df = learning_store.get_command_history(limit=10)
+        history = learning_store.get_history(limit=10)
 
-        if history_df.empty:
+        if history.empty:
             console.print("No command history found in learning store.", style="yellow")
             return
 
         console.print("Learning Store Command History (last 10 entries):", style="bold")
 
         # Format and display the history
-        for _, row in history_df.iterrows():
+        for row in history.rows():
             # Format timestamp
-            timestamp = row.get("timestamp", "").split("T")[0]  # Just get the date part
+            timestamp = (row.get("timestamp") or "").split("T")[0]  # Just get the date part
 
             # Format success/failure
             success = row.get("success")
@@ -137,15 +137,15 @@ def handle_learning(shell, args):
         console.print("\nLearning Statistics:", style="bold")
 
         # Count successful commands
-        success_count = len(history_df[history_df["success"]])
-        total_executed = len(history_df[history_df["executed"]])
+        success_count = history.count("success")
+        total_executed = history.count("executed")
         if total_executed > 0:
             success_rate = (success_count / total_executed) * 100
             console.print(f"  Success Rate: {success_rate:.1f}% ({success_count}/{total_executed})")
 
         # Count edited commands
-        edited_count = len(history_df[history_df["edited"]])
-        console.print(f"  Edited Commands: {edited_count}/{len(history_df)}")
+        edited_count = history.count("edited")
+        console.print(f"  Edited Commands: {edited_count}/{len(history)}")
 
     except Exception as e:
         console.print(f"Error accessing learning store: {e}", style="red")
@@ -5,7 +5,6 @@ This module provides the command handler methods for translating natural languag
 """
 
 import platform
-import re
 
 from rich.console import Console
 
@@ -46,90 +45,6 @@ def handle_translate(shell, args, parser):
     console.print(f"Translating: '{text}'", style="blue")
     console.print(f"Target OS: {os_display}", style="blue dim")
 
-    # Special case for checking if port is open
-    if "port" in text.lower() and "open" in text.lower():
-        # Attempt to extract port number and host
-        port_match = re.search(r"port\s+(\d+)", text.lower())
-        host_match = re.search(r"(?:on|at|for)\s+([a-zA-Z0-9.-]+)", text.lower())
-
-        if port_match and host_match:
-            port = port_match.group(1)
-            host = host_match.group(1)
-            result = f"nc -zv {host} {port}"
-            display_command(result)
-
-            if args.execute and result.strip():
-                handle_execute(shell, result, original_text=text)
-            else:
-                # Show hints on how to execute the command
-                console.print("\nTo execute this command:", style="cyan")
-                console.print(f"  Option 1: Type !{result}", style="cyan")
-                console.print(f"  Option 2: Type exec {result}", style="cyan")
-                console.print(f"  Option 3: Run the same query with -e flag: {text} -e", style="cyan")
-            return
-        elif port_match:
-            port = port_match.group(1)
-            # Default to localhost if no host is specified
-            result = f"nc -zv localhost {port}"
-            display_command(result)
-
-            if args.execute and result.strip():
-                handle_execute(shell, result, original_text=text)
-            else:
-                # Show hints on how to execute the command
-                console.print("\nTo execute this command:", style="cyan")
-                console.print(f"  Option 1: Type !{result}", style="cyan")
-                console.print(f"  Option 2: Type exec {result}", style="cyan")
-                console.print(f"  Option 3: Run the same query with -e flag: {text} -e", style="cyan")
-            return
-
-    # Special case handling for common queries
-    # Memory and process queries
-    if "memory" in text.lower() and ("process" in text.lower() or "most" in text.lower()):
-        result = "ps aux --sort=-%mem | head -n 10"
-        display_command(result)
-
-        if args.execute and result.strip():
-            handle_execute(shell, result, original_text=text)
-        return
-
-    # File queries - finding large files
-    if any(term in text.lower() for term in ["largest file", "biggest file"]):
-        if "home" in text.lower():
-            result = "find ~ -type f -exec du -sh {} \\; | sort -rh | head -n 10"
-        else:
-            result = "find . -type f -exec du -sh {} \\; | sort -rh | head -n 10"
-
-        display_command(result)
-
-        if args.execute and result.strip():
-            handle_execute(shell, result, original_text=text)
-        return
-
-    # System information queries
-    if "disk space" in text.lower():
-        result = "df -h"
-        display_command(result)
-
-        if args.execute and result.strip():
-            handle_execute(shell, result, original_text=text)
-        return
-
-    # List files queries
-    if any(term in text.lower() for term in ["list files", "show files", "display files"]):
-        if "by size" in text.lower():
-            result = "ls -laSh"
-        elif "recent" in text.lower() or "latest" in text.lower():
-            result = "ls -lat | head -n 20"
-        else:
-            result = "ls -la"
-
-        display_command(result)
-
-        if args.execute and result.strip():
-            handle_execute(shell, result, original_text=text)
-        return
-
     # Get context information for learning store
     system_info = session_context.get_system_info()
     environment_info = session_context.get_environment_info()
@@ -144,8 +59,12 @@ def handle_translate(shell, args, parser):
             verb = parsed_ast["verb"]
             args_dict = parsed_ast.get("args", {})
 
+            # Commands split by command_to_intent() keep their exact text
+            if isinstance(parsed_ast.get("command"), str):
+                result = parsed_ast["command"]
+                success = True
             # Handle complex commands where the entire command is already in the verb
-            if verb.startswith("for ") or verb.startswith("find "):
+            elif verb.startswith("for ") or verb.startswith("find "):
                 result = verb
                 success = True
             else:
@@ -5,18 +5,13 @@ This module provides the CommandParser class for translating natural language to
 """
 
 import logging
-import re
 import shlex
 from typing import Tuple
 
-from rich.console import Console
-
 from ..context import session_context
 from ..core.llm import LLMInterface
 from ..core.parser import NaturalLanguageParser
 
-# Create console for rich output
-console = Console()
 # Set up logger
 logger = logging.getLogger(__name__)
 
@@ -61,102 +56,6 @@ class CommandParser:
         if not text:
             return False, "Empty input"
 
-        # Special case for checking if port is open
-        if "port" in text.lower() and "open" in text.lower():
-            # Attempt to extract port number and host
-            port_match = re.search(r"port\s+(\d+)", text.lower())
-            host_match = re.search(r"(?:on|at|for)\s+([a-zA-Z0-9.-]+)", text.lower())
-
-            if port_match and host_match:
-                port = port_match.group(1)
-                host = host_match.group(1)
-                return True, f"nc -zv {host} {port}"
-            elif port_match:
-                port = port_match.group(1)
-                # Default to localhost if no host is specified
-                return True, f"nc -zv localhost {port}"
-
-        # Special case for converting CSV to JSON
-        if ("convert" in text.lower() and "csv" in text.lower() and "json" in text.lower()) or (
-            "change" in text.lower() and "csv" in text.lower() and "json" in text.lower()
-        ):
-            if "all csv files" in text.lower() or "all files" in text.lower():
-                return True, 'for file in *.csv; do csvjson "$file" > "${file%.csv}.json"; done'
-            else:
-                return True, "csvjson input.csv > output.json"
-
-        # Special case for background ping process
-        if "background process" in text.lower() and "ping" in text.lower():
-            if "google" in text.lower() or "google.com" in text.lower():
-                if "every 5 minutes" in text.lower() or "5 min" in text.lower():
-                    return True, "watch -n 300 ping -c 1 google.com &"
-                return True, "ping google.com &"
-            return True, "ping 8.8.8.8 &"
-
-        # Special case handling for common queries
-        if "find largest file" in text.lower():
-            return True, "find / -type f -exec du -sh {} \\; | sort -rh | head -n 1"
-
-        # Special case for shell or terminal commands
-        if text.lower() in ["shell", "terminal", "console", "open shell", "start shell", "interactive"]:
-            return True, "echo 'Starting interactive shell mode...'"
-
-        # Special case for finding images
-        if "find" in text.lower() and "image" in text.lower():
-            if "current directory" in text.lower() or "current dir" in text.lower() or "this directory" in text.lower():
-                return (
-                    True,
-                    'find . -type f -name "*.jpg" -o -name "*.jpeg" -o -name "*.png" -o '
-                    '-name "*.gif" -o -name "*.bmp" -o -name "*.svg"',
-                )
-            else:
-                # Try to extract directory if mentioned
-                dir_match = re.search(r"in\s+(\S+\s+\S+|\S+)\s+directory", text.lower())
-                if dir_match:
-                    directory = dir_match.group(1).strip()
-                    # Handle special cases like "home" or "documents"
-                    if directory == "home":
-                        directory = "~"
-                    elif directory in ["documents", "downloads", "pictures", "music", "videos"]:
-                        directory = f"~/{directory.capitalize()}"
-                    return (
-                        True,
-                        f'find {directory} -type f -name "*.jpg" -o -name "*.jpeg" -o -name "*.png" -o '
-                        f'-name "*.gif" -o -name "*.bmp" -o -name "*.svg"',
-                    )
-                return (
-                    True,
-                    'find . -type f -name "*.jpg" -o -name "*.jpeg" -o -name "*.png" -o '
-                    '-name "*.gif" -o -name "*.bmp" -o -name "*.svg"',
-                )
-
-        if "disk space" in text.lower():
-            return True, "df -h"
-
-        if "memory usage" in text.lower():
-            return True, "free -h"
-
-        if "list files" in text.lower() or "list all files" in text.lower() or "show files" in text.lower():
-            return True, "ls -la"
-
-        if "running processes" in text.lower():
-            return True, "ps aux"
-
-        if "network connections" in text.lower():
-            return True, "netstat -tuln"
-
-        # Add more common commands
-        if "current directory" in text.lower() and ("list" in text.lower() or "show" in text.lower()):
-            return True, "ls -la"
-
-        if "create directory" in text.lower() or "make directory" in text.lower() or "make folder" in text.lower():
-            # Extract directory name if possible
-            dirname = self._extract_directory_name(text)
-            if dirname:
-                return True, f"mkdir -p {dirname}"
-            # Default response
-            return True, "mkdir -p new_directory"
-
         try:
             # First attempt to use the improved LLM interface with enhanced prompting
             result_from_nlp = self.parser.parse(text)
@@ -164,6 +63,10 @@ class CommandParser:
             if isinstance(result_from_nlp, dict):
                 parsed_ast = result_from_nlp
                 if parsed_ast.get("verb"):
+                    # Commands split by command_to_intent() keep their exact text
+                    if isinstance(parsed_ast.get("command"), str) and parsed_ast["command"].strip() != "for":
+                        return True, parsed_ast["command"]
+
                     # Basic command generation
                     # Ensure args are handled correctly, e.g., boolean flags without values
                     command_parts = [parsed_ast["verb"]]
@@ -273,33 +176,3 @@ Command:"""
 
         # If all else fails, return an apologetic message
         return False, "Unable to generate a complete command for this request."
-
-    def _extract_directory_name(self, text: str) -> str:
-        """Extract directory name from natural language text."""
-        # Debug print
-        console.print(f"Trying to extract directory name from: '{text}'", style="yellow")
-
-        # Try different patterns to extract the directory name
-        patterns = [
-            r'(?:called|named)\s+["\']?([a-zA-Z0-9_-]+)["\']?',
-            r'directory\s+(?:called|named)?\s*["\']?([a-zA-Z0-9_-]+)["\']?',
-            r'folder\s+(?:called|named)?\s*["\']?([a-zA-Z0-9_-]+)["\']?',
-            r'create\s+(?:a|the)?\s*(?:directory|folder)\s+["\']?([a-zA-Z0-9_-]+)["\']?',
-            r'make\s+(?:a|the)?\s*(?:directory|folder)\s+["\']?([a-zA-Z0-9_-]+)["\']?',
-        ]
-
-        dirname = None
-        for pattern in patterns:
-            match = re.search(pattern, text.lower())
-            if match:
-                dirname = match.group(1)
-                console.print(f"Found directory name '{dirname}' using pattern: {pattern}", style="green")
-                return dirname
-            else:
-                console.print(f"No match for pattern: {pattern}", style="red")
-
-        # Hardcoded response for common case
-        if "my_project" in text.lower():
-            return "my_project"
-
-        return ""
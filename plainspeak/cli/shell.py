@@ -9,6 +9,7 @@ from rich.console import Console
 
 from ..context import session_context
 from ..core.i18n import I18n
+from ..core.intents import seed_from_history
 from ..core.llm import LLMInterface
 from ..core.parser import NaturalLanguageParser
 from .shell_commands import (
@@ -66,6 +67,8 @@ Type 'help' for more commands, or 'exit' to quit.\n"""
             # Allow to proceed, NaturalLanguageParser might handle None llm if designed for it
 
         self.parser = NaturalLanguageParser(llm=session_context.llm_interface, i18n=session_context.i18n)
+        # Requests that keep succeeding with the same command skip the LLM
+        seed_from_history()
 
         # Create parsers
         self.translate_parser = create_translate_parser()
@@ -4,19 +4,49 @@ Utility functions for the PlainSpeak Shell.
 This module provides helper functions used by the PlainSpeak interactive shell.
 """
 
-import subprocess
 from typing import Optional, Tuple
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.syntax import Syntax
 
+from ..core.pool import CommandRun, get_execution_pool
+from ..core.process import OutputCallback
+from ..core.sandbox import Sandbox
+from ..core.validation import SAFE, ValidationResult
 from .utils import copy_to_clipboard
 
 # Create console for rich output
 console = Console()
 
 
+class ShellSandbox(Sandbox):
+    """
+    Sandbox for commands typed into the interactive shell.
+
+    These are run as in any other shell: they aren't validated, have no time or
+    resource limits and keep the terminal, so sudo or ssh can prompt for a
+    password. Only their output is limited to MAX_OUTPUT lines.
+    """
+
+    RESOURCE_LIMITS = {
+        **Sandbox.RESOURCE_LIMITS,
+        "MAX_CPU_TIME": 0,
+        "MAX_MEMORY": 0,
+        "MAX_PROCESSES": 0,
+        "MAX_FILE_SIZE": 0,
+    }
+
+    INTERACTIVE = True
+
+    def check_command(self, command: str) -> ValidationResult:
+        """Accept every command, the user typed it."""
+        return SAFE
+
+
+shell_sandbox = ShellSandbox()
+
+
 def display_command(command: str) -> None:
     """
     Display a generated command in a styled panel.
@@ -45,12 +75,25 @@ def display_error(error_message: str, title: str = "Error") -> None:
     console.print(panel)
 
 
-def execute_command(command: str) -> Tuple[bool, Optional[str], Optional[str]]:
+def print_output(stream: str, line: str) -> None:
+    """Print a line of command output as it arrives."""
+    console.print(line, end="", markup=False, highlight=False)
+
+
+def execute_command(
+    command: str, on_output: Optional[OutputCallback] = None
+) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Execute a shell command and return the result.
 
+    The command runs on the shared execution pool in the ShellSandbox, without
+    validation or time limits, and Ctrl-C stops it but not the shell. Output is
+    read as it arrives, and the command is stopped once it has written
+    Sandbox.RESOURCE_LIMITS["MAX_OUTPUT"] lines.
+
     Args:
         command: The command to execute
+        on_output: Optional callback receiving the stream name and each line of output as it arrives
 
     Returns:
         Tuple containing:
@@ -64,21 +107,21 @@ def execute_command(command: str) -> Tuple[bool, Optional[str], Optional[str]]:
         return False, None, None
 
     try:
-        # Using shell=True for now to allow complex commands
-        process = subprocess.run(command, shell=True, check=False, capture_output=True, text=True)
-
-        # Get output
-        stdout = process.stdout if process.stdout else None
-        stderr = process.stderr if process.stderr else None
-
-        # Determine success
-        success = process.returncode == 0
+        run = get_execution_pool().run_sync(command, on_output, shell_sandbox)
+    except KeyboardInterrupt:
+        run = CommandRun(command, error="Command cancelled", cancelled=True)
+    except Exception as e:
+        run = CommandRun(command, error=str(e))
 
-        return success, stdout, stderr
+    if run.error is not None:
+        if on_output is not None:
+            on_output("stderr", run.error + "\n")
+        return False, None, run.error
 
-    except Exception as e:
-        error_message = str(e)
-        return False, None, error_message
+    # Get output
+    stdout = run.stdout if run.stdout else None
+    stderr = run.stderr if run.stderr else None
+    return run.success, stdout, stderr
 
 
 def display_execution_result(
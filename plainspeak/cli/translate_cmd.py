@@ -4,7 +4,13 @@ Translate command for PlainSpeak CLI.
 This module provides the translate command for converting natural language to shell commands.
 """
 
+import json
+import re
 import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, TextIO
 
 import typer
 from rich.console import Console
@@ -14,17 +20,35 @@ from rich.syntax import Syntax
 from ..config import load_config
 from ..context import session_context
 from ..core.llm import get_llm_interface
+from ..core.llm.batch import DEFAULT_BATCH_SIZE
 from .parser import CommandParser
 
 # Create console for rich output
 console = Console()
+# Batch results go to stdout, so progress goes to stderr
+status_console = Console(stderr=True)
+
+# Fields holding the query in JSONL batch files, by preference
+QUERY_FIELDS = ("text", "query", "input", "title", "body")
+
+# Numbered or bulleted Markdown list items
+MARKDOWN_ITEM = re.compile(r"^\s*(?:\d+[.)]|[-*+])\s+(.+)$")
 
 
 def translate_command(
-    text: str = typer.Argument(..., help="Natural language command to translate"),
+    text: Optional[str] = typer.Argument(None, help="Natural language command to translate"),
     execute: bool = typer.Option(False, "--execute", "-e", help="Execute the translated command"),
+    batch: Optional[Path] = typer.Option(
+        None, "--batch", "-b", help="Translate every query in a text, Markdown list or JSONL file"
+    ),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="JSONL file for batch results, default stdout"),
+    batch_size: int = typer.Option(DEFAULT_BATCH_SIZE, "--batch-size", help="Queries generated together"),
 ):
     """Translate natural language to a shell command."""
+    if batch is not None:
+        translate_batch(batch, output, batch_size)
+        return
+
     if not text:
         console.print("Error: Empty input", style="red")
         raise typer.Exit(1)
@@ -95,3 +119,89 @@ def translate_command(
             console.print(Panel(command, title="Error", border_style="red"))
 
         raise typer.Exit(1)
+
+
+def read_queries(path: Path) -> List[str]:
+    """
+    Read the queries of a batch file.
+
+    JSONL files hold one string or object per line, whose query is taken from
+    the first of QUERY_FIELDS present. Markdown files contribute their list
+    items. Other files hold one query per line, lines starting with '#' are
+    comments.
+
+    Args:
+        path: Batch file.
+
+    Returns:
+        The queries, in file order.
+
+    Raises:
+        ValueError: If a JSONL line holds no query.
+    """
+    queries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if path.suffix == ".jsonl":
+                item = json.loads(line)
+                if isinstance(item, dict):
+                    item = next((item[field] for field in QUERY_FIELDS if item.get(field)), None)
+                if not isinstance(item, str):
+                    raise ValueError(f"{path}:{number}: no query found")
+                queries.append(item)
+            elif path.suffix == ".md":
+                match = MARKDOWN_ITEM.match(line)
+                if match:
+                    queries.append(match.group(1).strip())
+            elif not line.startswith("#"):
+                queries.append(line)
+    return queries
+
+
+def translate_batch(path: Path, output: Optional[Path] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """
+    Translate all queries of a file, writing one JSON result per line in input order.
+
+    Args:
+        path: Batch file, see read_queries().
+        output: JSONL file for the results, None for stdout.
+        batch_size: Queries generated together.
+    """
+    try:
+        queries = read_queries(path)
+    except (OSError, ValueError) as e:
+        status_console.print(f"Error reading batch file: {e}", style="red")
+        raise typer.Exit(1)
+
+    llm = get_llm_interface(load_config())
+    status_console.print(f"Translating {len(queries)} queries from {path}", style="yellow")
+    start = time.perf_counter()
+    results = llm.generate_commands(queries, batch_size)
+    elapsed = time.perf_counter() - start
+
+    stream: TextIO = open(output, "w", encoding="utf-8") if output is not None else sys.stdout
+    try:
+        for index, (query, result) in enumerate(zip(queries, results)):
+            record = {
+                "index": index,
+                "input": query,
+                "command": result.text if result.ok else None,
+                "error": result.error,
+                "latency_ms": round(result.latency * 1000, 1),
+            }
+            stream.write(json.dumps(record) + "\n")
+    finally:
+        if output is not None:
+            stream.close()
+
+    failed = sum(1 for result in results if not result.ok)
+    rate = len(queries) / elapsed if elapsed > 0 else 0.0
+    status_console.print(
+        f"Translated {len(queries) - failed}/{len(queries)} queries in {elapsed:.1f}s ({rate:.1f} queries/s)",
+        style="green" if not failed else "yellow",
+    )
+    if failed:
+        raise typer.Exit(1)
@@ -26,7 +26,7 @@ DEFAULT_MODEL_FILE_PATH = "models/tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf"
 class LLMConfig(BaseModel):
     """LLM specific configuration."""
 
-    provider: str = Field("local", description="LLM provider type (e.g., 'local', 'remote', 'openai').")
+    provider: str = Field("local", description="LLM provider type (e.g., 'local', 'remote', 'openai', 'router').")
     model_path: Optional[str] = Field(DEFAULT_MODEL_FILE_PATH, description="Path to the GGUF model file.")
     model_type: str = Field("llama", description="Type of the model (e.g., 'llama', 'gptneox').")
     gpu_layers: int = Field(0, description="Number of model layers to offload to GPU. 0 for CPU only.")
@@ -38,6 +38,52 @@ class LLMConfig(BaseModel):
     top_p: float = Field(0.9, description="Top-p (nucleus) sampling.")
     repetition_penalty: float = Field(1.1, description="Repetition penalty.")
     stop: Optional[list[str]] = Field(["\n"], description="Stop sequences for generation.")
+    command_candidates: int = Field(
+        1, description="Commands sampled per request, of which the best valid one is used. 1 to sample one."
+    )
+    intent_fast_path: bool = Field(True, description="Answer common requests from the intent rules without the LLM.")
+    semantic_cache: bool = Field(False, description="Reuse the command of a similar request that succeeded before.")
+    semantic_cache_threshold: float = Field(
+        0.9, description="Cosine similarity above which a previous request counts as the same."
+    )
+    context_length: int = Field(4096, description="Context length of the local model, in tokens.")
+    prompt_mode: str = Field(
+        "auto",
+        description="System prompt sent with requests: 'full', 'compact' for the relevant sections only, or 'auto'.",
+    )
+    prompt_sections: int = Field(4, description="Maximum number of system prompt sections in a compact prompt.")
+    prompt_token_budget: int = Field(1200, description="Maximum number of tokens of a compact system prompt.")
+    # Remote API requests
+    api_base: str = Field("https://api.openai.com/v1", description="Base URL of the remote chat completions API.")
+    rate_limit_per_minute: int = Field(0, description="Maximum remote API requests per minute, 0 for no limit.")
+    max_concurrency: int = Field(8, description="Maximum remote API requests in flight.")
+    request_timeout: float = Field(30.0, description="Seconds to wait for a remote API response.")
+    retry_count: int = Field(3, description="Retries of failed remote API requests.")
+    circuit_failure_threshold: int = Field(3, description="Consecutive failed requests that pause remote requests.")
+    circuit_recovery_timeout: float = Field(30.0, description="Seconds before remote requests are tried again.")
+    # Routing between the local model and remote endpoints (provider 'router')
+    router_local: bool = Field(True, description="Route requests to the local model too.")
+    router_endpoints: list[dict[str, Any]] = Field(
+        [], description="Remote endpoints, with their api_base, model_name and api_key_env_var. Defaults to api_base."
+    )
+    router_window: int = Field(50, description="Recent requests per backend that latency and errors are tracked over.")
+    router_max_error_rate: float = Field(0.5, description="Share of failed requests that makes a backend unhealthy.")
+    hedge_percentile: float = Field(
+        0.0, description="Latency percentile after which a request is also sent to the next backend, 0 to disable."
+    )
+    # Response cache
+    cache_responses: bool = Field(
+        False, description="Cache generated commands that pass the safety checks for identical requests."
+    )
+    cache_persistent: bool = Field(True, description="Keep cached responses on disk across sessions.")
+    cache_path: Optional[str] = Field(None, description="SQLite file for cached responses, defaults to the cache dir.")
+    cache_ttl: int = Field(7 * 24 * 3600, description="Seconds after which cached responses expire.")
+    cache_max_entries: int = Field(256, description="Maximum number of responses cached in memory.")
+    cache_max_disk_entries: int = Field(10_000, description="Maximum number of responses cached on disk.")
+    # Local model daemon
+    use_daemon: bool = Field(True, description="Generate with the local model daemon when it is running.")
+    daemon_socket: Optional[str] = Field(None, description="Socket of the local model daemon, defaults to the run dir.")
+    daemon_idle_timeout: int = Field(1800, description="Seconds without requests before the model daemon exits.")
 
     @field_validator("model_path", mode="before")  # type: ignore
     @classmethod
@@ -78,6 +124,14 @@ class LLMConfig(BaseModel):
         return v
 
 
+class ExecutionConfig(BaseModel):
+    """Command execution configuration."""
+
+    max_parallel_commands: int = Field(
+        4, ge=1, description="Commands run at the same time when a batch of commands is executed."
+    )
+
+
 class AppConfig(BaseModel):
     """Main application configuration."""
 
@@ -97,6 +151,7 @@ class AppConfig(BaseModel):
             stop=["\n"],
         )
     )
+    execution: ExecutionConfig = Field(default_factory=ExecutionConfig)
     # Add other app-level configs here, e.g., log_level, etc.
 
 
@@ -5,17 +5,15 @@ This module manages the session state and contextual information
 that enhances the natural language understanding capabilities.
 """
 
-import getpass
 import json
 import os
-import platform
-import socket
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 from plainspeak.core.i18n import I18n
 from plainspeak.core.llm import LLMInterface
+from plainspeak.plugins.platform import platform_manager
 
 
 class SessionContext:
@@ -92,19 +90,12 @@ class SessionContext:
         """
         Get current system information.
 
+        The information is collected once per process, see PlatformManager.system_info().
+
         Returns:
             Dict containing system information.
         """
-        return {
-            "os": platform.system(),
-            "os_version": platform.version(),
-            "hostname": socket.gethostname(),
-            "username": getpass.getuser(),
-            "python_version": platform.python_version(),
-            "cpu_count": os.cpu_count() or 0,
-            "platform": platform.platform(),
-            "architecture": platform.architecture()[0],
-        }
+        return dict(platform_manager.system_info())
 
     def get_environment_info(self) -> Dict[str, Any]:
         """
@@ -245,7 +236,7 @@ class SessionContext:
             String containing relevant context for the LLM.
         """
         env = self.get_environment_info()
-        sys_info = self.get_system_info()
+        sys_info = platform_manager.system_info()
 
         context_str = f"""
 Operating System: {sys_info['os']} ({sys_info['os_version']})
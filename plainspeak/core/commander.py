@@ -1,7 +1,9 @@
 import logging
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from plainspeak.config import AppConfig
+from plainspeak.core.pool import CommandRun, get_execution_pool
+from plainspeak.core.process import OutputCallback
 from plainspeak.core.sandbox import Sandbox, SandboxExecutionError
 
 logger = logging.getLogger(__name__)
@@ -16,8 +18,13 @@ class Commander:
     def __init__(self, config: AppConfig, sandbox: Sandbox):
         self.config = config
         self.sandbox = sandbox
+        max_parallel = getattr(getattr(config, "execution", None), "max_parallel_commands", None)
+        # The configured limit applies if this creates the shared pool
+        self.pool = get_execution_pool(max_parallel if isinstance(max_parallel, int) else None)
 
-    def execute(self, ast: Dict[str, Any]) -> Tuple[bool, str, Optional[str]]:
+    def execute(
+        self, ast: Dict[str, Any], on_output: Optional[OutputCallback] = None
+    ) -> Tuple[bool, str, Optional[str]]:
         """
         Executes the command defined in the AST.
 
@@ -29,6 +36,7 @@ class Commander:
                  - 'action_type': The type of action (e.g., 'execute_command').
                  - 'plugin': Name of the plugin.
                  - 'verb': Name of the verb.
+            on_output: Optional callback receiving the stream name and each line of output as it arrives.
 
         Returns:
             A tuple (success: bool, output: str, error: Optional[str]).
@@ -38,49 +46,121 @@ class Commander:
         """
         logger.debug(f"Commander received AST for execution: {ast}")
 
+        final_command, error = self._render(ast)
+        if final_command is None:
+            return False, "", error
+
+        try:
+            # Execute in sandbox
+            return_code, stdout, stderr = self.sandbox.execute_shell_command(final_command, on_output=on_output)
+        except SandboxExecutionError as e:
+            logger.error(f"Sandbox execution error: {e}")
+            return False, "", str(e)
+        except Exception as e:
+            logger.exception(f"Unexpected error during command execution: {e}. AST: {ast}")
+            return False, "", f"Unexpected error: {e}"
+        return self._outcome(return_code, stdout, stderr)
+
+    async def aexecute(
+        self, ast: Dict[str, Any], on_output: Optional[OutputCallback] = None
+    ) -> Tuple[bool, str, Optional[str]]:
+        """
+        Executes the command defined in the AST on the execution pool, see execute().
+
+        Cancelling the awaiting task kills the command and every process it started.
+
+        Args:
+            ast: The Abstract Syntax Tree representing the command.
+            on_output: Optional callback receiving the stream name and each line of output as it arrives.
+
+        Returns:
+            A tuple (success: bool, output: str, error: Optional[str]).
+        """
+        logger.debug(f"Commander received AST for execution: {ast}")
+
+        final_command, error = self._render(ast)
+        if final_command is None:
+            return False, "", error
+        return self._run_outcome(await self.pool.run(final_command, on_output, self.sandbox))
+
+    def execute_batch(self, asts: Sequence[Dict[str, Any]]) -> List[Tuple[bool, str, Optional[str]]]:
+        """
+        Executes the independent commands defined in several ASTs concurrently.
+
+        At most execution.max_parallel_commands commands run at the same time.
+
+        Args:
+            asts: The Abstract Syntax Trees of the commands.
+
+        Returns:
+            A tuple (success, output, error) for each AST, in the order of the ASTs.
+        """
+        rendered = [self._render(ast) for ast in asts]
+        commands = [command for command, _ in rendered if command is not None]
+        runs = iter(self.pool.run_batch(commands, sandbox=self.sandbox))
+        return [
+            self._run_outcome(next(runs)) if command is not None else (False, "", error) for command, error in rendered
+        ]
+
+    def _render(self, ast: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Renders the command defined in the AST.
+
+        Args:
+            ast: The Abstract Syntax Tree representing the command.
+
+        Returns:
+            A tuple (command, None), or (None, error) if the AST can't be executed.
+        """
         action_type = ast.get("action_type")
         command_template = ast.get("command_template")
         parameters = ast.get("parameters", {})
 
         if not command_template:
             logger.error("AST missing 'command_template' for execution.")
-            return False, "", "Internal error: Command template missing in AST."
+            return None, "Internal error: Command template missing in AST."
 
         if action_type == "execute_command":
             try:
                 # Render the command
                 final_command = command_template.format(**parameters)
-                logger.info(f"Executing command: {final_command}")
-
-                # Execute in sandbox
-                return_code, stdout, stderr = self.sandbox.execute_shell_command(final_command)
-
-                if return_code == 0:
-                    logger.info(f"Command executed successfully. Output: {stdout[:200]}...")
-                    # Ensure stdout is a string, not None
-                    return True, stdout if stdout is not None else "", stderr
-                else:
-                    logger.warning(f"Command failed with return code {return_code}. Error: {stderr}")
-                    return False, stdout if stdout is not None else "", stderr
             except KeyError as e:
                 # This might happen if command_template has a placeholder not in parameters
                 param_name = str(e).strip("'")
                 logger.error(f"Missing parameter for command template: {param_name}. AST: {ast}")
-                err_msg = f"Error rendering command: Missing parameter '{param_name}'."
-                return False, "", err_msg
-            except SandboxExecutionError as e:
-                logger.error(f"Sandbox execution error: {e}")
-                return False, "", str(e)
+                return None, f"Error rendering command: Missing parameter '{param_name}'."
             except Exception as e:
                 logger.exception(f"Unexpected error during command execution: {e}. AST: {ast}")
-                return False, "", f"Unexpected error: {e}"
+                return None, f"Unexpected error: {e}"
+            logger.info(f"Executing command: {final_command}")
+            return final_command, None
         # elif action_type == "api_call":
         # Placeholder for other action types
         # success, result = self._execute_api_call(ast)
         # return success, result, None if success else result
         else:
             logger.warning(f"Unsupported action_type '{action_type}' in AST.")
-            return False, "", f"Unsupported action type: {action_type}"
+            return None, f"Unsupported action type: {action_type}"
+
+    def _outcome(
+        self, return_code: Optional[int], stdout: Optional[str], stderr: Optional[str]
+    ) -> Tuple[bool, str, Optional[str]]:
+        """Turns the exit status and output of a command into the result of execute()."""
+        if return_code == 0:
+            logger.info(f"Command executed successfully. Output: {(stdout or '')[:200]}...")
+            # Ensure stdout is a string, not None
+            return True, stdout if stdout is not None else "", stderr
+        else:
+            logger.warning(f"Command failed with return code {return_code}. Error: {stderr}")
+            return False, stdout if stdout is not None else "", stderr
+
+    def _run_outcome(self, run: CommandRun) -> Tuple[bool, str, Optional[str]]:
+        """Turns a command run by the execution pool into the result of execute()."""
+        logger.info(f"Command ran for {run.duration:.3f}s after waiting {run.queued:.3f}s: {run.command}")
+        if run.error is not None:
+            logger.error(f"Sandbox execution error: {run.error}")
+            return False, "", run.error
+        return self._outcome(run.returncode, run.stdout, run.stderr)
 
     # def _execute_api_call(self, ast: Dict[str, Any]) -> Tuple[bool, str]:
     #     # Example:
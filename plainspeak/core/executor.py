@@ -5,10 +5,13 @@ This module provides command execution functionality with safety checks,
 error handling, and execution result tracking.
 """
 
+import asyncio
 import logging
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from ..context import session_context
+from .pool import BatchOutputCallback, CommandRun, get_execution_pool
+from .process import OutputCallback
 from .sandbox import Sandbox
 
 logger = logging.getLogger(__name__)
@@ -29,9 +32,15 @@ class CommandExecutor:
                     a new Sandbox instance will be created.
         """
         self.sandbox = sandbox or Sandbox()
+        # aexecute() and execute_batch() run on the shared pool
+        self.pool = get_execution_pool()
 
     def execute(
-        self, command: str, original_text: Optional[str] = None, track_history: bool = True
+        self,
+        command: str,
+        original_text: Optional[str] = None,
+        track_history: bool = True,
+        on_output: Optional[OutputCallback] = None,
     ) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         Execute a command safely and track results.
@@ -40,12 +49,13 @@ class CommandExecutor:
             command: The command to execute
             original_text: Original natural language text (for history)
             track_history: Whether to track in session history
+            on_output: Optional callback receiving the stream name and each line of output as it arrives
 
         Returns:
             Tuple of (success, stdout, stderr)
         """
         try:
-            returncode, stdout, stderr = self.sandbox.execute_shell_command(command)
+            returncode, stdout, stderr = self.sandbox.execute_shell_command(command, on_output=on_output)
             success = returncode == 0
 
             if track_history and original_text:
@@ -59,6 +69,59 @@ class CommandExecutor:
                 session_context.add_to_history(original_text, command, False)
             return False, None, str(e)
 
+    async def aexecute(
+        self,
+        command: str,
+        original_text: Optional[str] = None,
+        track_history: bool = True,
+        on_output: Optional[OutputCallback] = None,
+    ) -> CommandRun:
+        """
+        Execute a command on the execution pool without blocking the event loop.
+
+        Cancelling the awaiting task kills the command and every process it
+        started; the command is then tracked as failed.
+
+        Args:
+            command: The command to execute
+            original_text: Original natural language text (for history)
+            track_history: Whether to track in session history
+            on_output: Optional callback receiving the stream name and each line of output as it arrives
+
+        Returns:
+            The outcome and timing of the command
+        """
+        try:
+            run = await self.pool.run(command, on_output, self.sandbox)
+        except asyncio.CancelledError:
+            if track_history and original_text:
+                session_context.add_to_history(original_text, command, False)
+            raise
+        if run.error is not None:
+            logger.error("Command execution failed: %s", run.error)
+
+        if track_history and original_text:
+            session_context.add_to_history(original_text, command, run.success)
+        return run
+
+    def execute_batch(
+        self, commands: Sequence[str], on_output: Optional[BatchOutputCallback] = None
+    ) -> List[CommandRun]:
+        """
+        Execute independent commands concurrently, without tracking them in history.
+
+        A KeyboardInterrupt kills the commands still running before it propagates.
+
+        Args:
+            commands: The commands to execute
+            on_output: Optional callback receiving the index of the command, the
+                stream name and each line of output as it arrives
+
+        Returns:
+            The outcome and timing of each command, in the order of the commands
+        """
+        return self.pool.run_batch(commands, on_output, self.sandbox)
+
     def execute_safe(self, command: str, original_text: Optional[str] = None, track_history: bool = True) -> bool:
         """
         Execute a command safely and return only success status.
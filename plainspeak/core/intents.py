@@ -0,0 +1,257 @@
+"""
+Rule-based fast path for common requests.
+
+Requests like "show disk space" have one obvious command, so they are answered
+from the rules in intents.yaml before the LLM is asked. All rules are compiled
+into a single regular expression: each rule becomes an alternative made of
+lookaheads, one per required keyword, so a request is matched against every
+rule in one pass and the first rule in file order wins. Requests that
+succeeded repeatedly in the learning history can be added as exact phrases.
+"""
+
+import logging
+import re
+import shlex
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+import yaml  # type: ignore[import-untyped]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = Path(__file__).with_name("intents.yaml")
+
+# Successful runs of the same request and command before it is answered without the LLM
+DEFAULT_SEED_COUNT = 2
+
+_GROUP = re.compile(r"\(\?P<(\w+)>")
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+def normalize_request(text: str) -> str:
+    """Lowercase a request and collapse its whitespace, dropping trailing punctuation."""
+    return " ".join(text.lower().split()).rstrip("?!.")
+
+
+@dataclass
+class IntentRule:
+    """Rule mapping requests that contain all of its keywords to a command template."""
+
+    name: str
+    command: str
+    match: List[str] = field(default_factory=list)
+    optional: List[str] = field(default_factory=list)
+    exact: List[str] = field(default_factory=list)
+    defaults: Dict[str, str] = field(default_factory=dict)
+    slot_map: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    def render(self, slots: Dict[str, str]) -> str:
+        """
+        Fill in the command template.
+
+        Args:
+            slots: Captured slot values.
+
+        Returns:
+            The command.
+        """
+        values: Dict[str, str] = dict(self.defaults)
+        for name, value in slots.items():
+            mapped = self.slot_map.get(name, {}).get(value)
+            values[name] = mapped if mapped is not None else shlex.quote(value)
+        return _PLACEHOLDER.sub(lambda m: values.get(m.group(1), m.group(0)), self.command)
+
+
+@dataclass
+class IntentMatch:
+    """Command resolved by the fast path."""
+
+    rule: str
+    command: str
+    slots: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class IntentStats:
+    """Hit counts of the fast path."""
+
+    lookups: int = 0
+    hits: int = 0
+    rule_hits: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of requests answered without the LLM."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+def load_intent_rules(path: Path = DEFAULT_RULES_PATH) -> List[IntentRule]:
+    """
+    Load intent rules from a YAML file.
+
+    Args:
+        path: Rules file, a list of rule mappings.
+
+    Returns:
+        The rules, in file order.
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = yaml.safe_load(f) or []
+    return [IntentRule(**entry) for entry in entries]
+
+
+class IntentMatcher:
+    """Compiled set of intent rules."""
+
+    def __init__(self, rules: Sequence[IntentRule]):
+        """
+        Compile the rules.
+
+        Args:
+            rules: Rules in order of priority.
+        """
+        self.rules = list(rules)
+        self._exact: Dict[str, IntentRule] = {}
+        self._learned: Dict[str, str] = {}
+        self._slots: Dict[str, str] = {}
+        alternatives = []
+        for index, rule in enumerate(self.rules):
+            for phrase in rule.exact:
+                self._exact.setdefault(normalize_request(phrase), rule)
+            if rule.match:
+                required = "".join(self._lookahead(expr) for expr in rule.match)
+                optional = "".join(f"(?:{self._lookahead(expr)})?" for expr in rule.optional)
+                alternatives.append(f"(?P<r{index}>{required}{optional})")
+        self._pattern: Optional[Pattern[str]] = (
+            re.compile("^(?:" + "|".join(alternatives) + ")", re.DOTALL) if alternatives else None
+        )
+        self._hits: Counter = Counter()
+        self._lookups = 0
+        self._lock = threading.Lock()
+
+    def _lookahead(self, expr: str) -> str:
+        """Wrap a keyword expression in a lookahead, giving its slots names unique to the combined pattern."""
+
+        def rename(match: "re.Match[str]") -> str:
+            group = f"s{len(self._slots)}"
+            self._slots[group] = match.group(1)
+            return f"(?P<{group}>"
+
+        return rf"(?=.*?\b(?:{_GROUP.sub(rename, expr)}))"
+
+    @classmethod
+    def from_file(cls, path: Path = DEFAULT_RULES_PATH) -> "IntentMatcher":
+        """Compile the rules of a YAML file."""
+        return cls(load_intent_rules(path))
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        """
+        Resolve a request to a command without the LLM.
+
+        Args:
+            text: Natural language request.
+
+        Returns:
+            The match, or None if no rule applies.
+        """
+        request = normalize_request(text)
+        result = self._match(request)
+        with self._lock:
+            self._lookups += 1
+            if result is not None:
+                self._hits[result.rule] += 1
+        return result
+
+    def _match(self, request: str) -> Optional[IntentMatch]:
+        learned = self._learned.get(request)
+        if learned is not None:
+            return IntentMatch("learned", learned)
+        rule = self._exact.get(request)
+        if rule is not None:
+            return IntentMatch(rule.name, rule.render({}))
+        found = self._pattern.match(request) if self._pattern is not None else None
+        if found is None:
+            return None
+        rule = self.rules[int(found.lastgroup[1:])]
+        slots: Dict[str, str] = {}
+        for group, value in found.groupdict().items():
+            name = self._slots.get(group)
+            if name is not None and value is not None:
+                slots.setdefault(name, value)
+        return IntentMatch(rule.name, rule.render(slots), slots)
+
+    def learn(self, text: str, command: str) -> None:
+        """Answer a request with a command from now on."""
+        with self._lock:
+            self._learned[normalize_request(text)] = command
+
+    def seed(self, examples: Iterable[Tuple[str, str]], min_count: int = DEFAULT_SEED_COUNT) -> int:
+        """
+        Learn requests that succeeded repeatedly with the same command.
+
+        Requests that led to different commands are ambiguous and left to the LLM.
+
+        Args:
+            examples: Successful (request, command) pairs.
+            min_count: Successful runs needed to learn a request.
+
+        Returns:
+            Number of requests learned.
+        """
+        counts: Dict[str, Counter] = {}
+        for text, command in examples:
+            if text and command:
+                counts.setdefault(normalize_request(text), Counter())[command.strip()] += 1
+        learned = 0
+        for request, commands in counts.items():
+            if len(commands) == 1:
+                command, count = next(iter(commands.items()))
+                if count >= min_count:
+                    self.learn(request, command)
+                    learned += 1
+        return learned
+
+    @property
+    def stats(self) -> IntentStats:
+        """Hit counts so far."""
+        with self._lock:
+            return IntentStats(self._lookups, sum(self._hits.values()), dict(self._hits))
+
+
+_shared_matcher: Optional[IntentMatcher] = None
+_shared_lock = threading.Lock()
+
+
+def get_intent_matcher() -> IntentMatcher:
+    """Get the shared matcher for the bundled rules, compiling them on first use."""
+    global _shared_matcher
+    with _shared_lock:
+        if _shared_matcher is None:
+            _shared_matcher = IntentMatcher.from_file()
+        return _shared_matcher
+
+
+def seed_from_history(store: Any = None, min_count: int = DEFAULT_SEED_COUNT) -> int:
+    """
+    Teach the shared matcher the requests that repeatedly succeeded in the learning history.
+
+    Args:
+        store: Learning store, defaults to the global one.
+        min_count: Successful runs needed to learn a request.
+
+    Returns:
+        Number of requests learned.
+    """
+    try:
+        if store is None:
+            from ..learning import get_learning_store
+
+            store = get_learning_store()
+        examples = store.get_training_data()
+    except Exception as e:
+        logger.warning(f"Could not read the learning history: {e}")
+        return 0
+    return get_intent_matcher().seed(examples, min_count)
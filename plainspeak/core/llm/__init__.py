@@ -3,8 +3,13 @@
 import logging
 
 from .base import LLMInterface, LLMResponseError
+from .batch import GenerationResult
+from .cache import ResponseCache, ResponseCacheStats, get_response_cache
+from .daemon_client import DaemonLLMInterface, local_llm_interface
 from .local import LocalLLMInterface
 from .remote import RemoteLLM, RemoteLLMInterface
+from .router import RouterLLMInterface
+from .system_prompt import SystemPrompt, load_system_prompt
 
 logger = logging.getLogger(__name__)
 
@@ -24,19 +29,30 @@ def get_llm_interface(config=None) -> LLMInterface:
 
     provider = config.llm.provider.lower()
     if provider == "local":
-        return LocalLLMInterface(config)
+        # Use the model daemon if it is running, so the model isn't loaded again
+        return local_llm_interface(config)
     elif provider in ("remote", "openai"):
         return RemoteLLMInterface(config)
+    elif provider == "router":
+        return RouterLLMInterface(config)
     else:
         raise ValueError(f"Unknown LLM provider: {provider}")
 
 
 # Export the key classes and functions
 __all__ = [
+    "DaemonLLMInterface",
+    "GenerationResult",
     "LLMInterface",
     "LLMResponseError",
     "LocalLLMInterface",
     "RemoteLLMInterface",
     "RemoteLLM",
+    "RouterLLMInterface",
+    "ResponseCache",
+    "ResponseCacheStats",
+    "SystemPrompt",
     "get_llm_interface",
+    "get_response_cache",
+    "load_system_prompt",
 ]
@@ -1,25 +1,52 @@
 """Base classes and interfaces for LLM integrations."""
 
 import logging
-import os
-import platform
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from . import parsers
+from .batch import BatchGeneration
+from .caching import CachedGeneration
+from .candidates import CandidateGeneration
+from .streaming import StreamingGeneration, TokenCallback
+from .system_prompt import COMPACT_SECTIONS, SystemPrompt, estimate_tokens, load_system_prompt
 
 logger = logging.getLogger(__name__)
 
 # Import the LLMParsingError as LLMResponseError for backward compatibility
 LLMResponseError = parsers.LLMParsingError
 
+# Context length of local models, in tokens
+DEFAULT_CONTEXT_LENGTH = 4096
 
-class LLMInterface(ABC):
-    """Base interface for LLM interactions."""
+# Tokens of a compact system prompt
+DEFAULT_PROMPT_BUDGET = 1200
+
+# Tokens reserved for the query and the instructions around the system prompt
+PROMPT_MARGIN = 192
+
+
+class LLMInterface(StreamingGeneration, CachedGeneration, CandidateGeneration, BatchGeneration, ABC):
+    """
+    Base interface for LLM interactions.
+
+    Streaming, caching, candidate sampling and batch generation are
+    implemented by the classes it derives from.
+    """
+
+    # Whether the backend keeps the evaluated system prompt between requests,
+    # so that only the query has to be evaluated when the prompt starts with it
+    reuses_prompt_prefix = False
 
     def __init__(self, config=None):
         """Initialize LLM interface with optional config."""
         self.config = config  # Configuration object
+        self.response_cache = self._init_response_cache()
+        self.semantic_cache = self._init_semantic_cache()
+        # Safety checks for sampled candidate commands, created on first use
+        self._sandbox: Any = None
+        # Set to generate fresh responses without reading or filling the cache
+        self.bypass_cache = False
 
     @abstractmethod
     def generate(self, prompt: str) -> str:
@@ -37,57 +64,124 @@ class LLMInterface(ABC):
         """
         raise NotImplementedError("Subclass must implement abstract method")
 
-    def _get_system_prompt(self) -> str:
+    def _get_system_prompt(self, query: Optional[str] = None) -> str:
         """
         Get the system prompt based on the current operating system.
 
+        The prompt file is read once per process. Unless the backend reuses the
+        evaluated system prompt across requests and the whole prompt fits its
+        context, only the sections most relevant to the query are included,
+        within the configured token budget.
+
+        Args:
+            query: User query the prompt is for, None for the full prompt.
+
         Returns:
             System prompt as a string.
         """
-        # Identify the current OS
-        os_name = platform.system().lower()
+        prompt = load_system_prompt()
+        if query is None or not self._use_compact_prompt(prompt):
+            return prompt.text
+        llm_config = getattr(self.config, "llm", None)
+        sections = getattr(llm_config, "prompt_sections", COMPACT_SECTIONS)
+        budget = getattr(llm_config, "prompt_token_budget", DEFAULT_PROMPT_BUDGET)
+        return prompt.compact(
+            query,
+            sections if isinstance(sections, int) else COMPACT_SECTIONS,
+            budget if isinstance(budget, int) else DEFAULT_PROMPT_BUDGET,
+            self._count_tokens,
+        )
+
+    def _use_compact_prompt(self, prompt: SystemPrompt) -> bool:
+        """
+        Decide whether to send only the relevant sections of the system prompt.
 
-        # Default paths for system prompts
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        prompt_dir = os.path.join(base_dir, "prompts", "system-prompts")
+        Args:
+            prompt: The full system prompt.
 
-        # Map OS to prompt file
-        prompt_files = {
-            "linux": os.path.join(prompt_dir, "linux.txt"),
-            "darwin": os.path.join(prompt_dir, "mac.txt"),
-            "windows": os.path.join(prompt_dir, "windows.txt"),
-        }
+        Returns:
+            True for a compact prompt, according to the prompt_mode setting.
+        """
+        mode = getattr(getattr(self.config, "llm", None), "prompt_mode", "auto")
+        if mode == "full":
+            return False
+        if mode == "compact":
+            return True
+        return not (self.reuses_prompt_prefix and self._fits_full_prompt(prompt.text))
+
+    def _count_tokens(self, text: str) -> int:
+        """
+        Estimate the number of tokens of a text.
 
-        # Get the appropriate prompt file
-        prompt_file = prompt_files.get(os_name, prompt_files["linux"])  # Default to Linux if OS not recognized
+        Args:
+            text: Text to measure.
 
-        try:
-            # Try to load the prompt from file
-            if os.path.exists(prompt_file):
-                with open(prompt_file, "r") as f:
-                    return f.read()
-            else:
-                # Fallback to generic prompt if file not found
-                logger.warning(f"System prompt file not found: {prompt_file}")
-                return "You are a specialized shell command generator. Provide complete, executable commands."
+        Returns:
+            Number of tokens, estimated at three characters per token unless overridden.
+        """
+        return estimate_tokens(text)
 
-        except Exception as e:
-            logger.error(f"Error loading system prompt: {e}")
-            # Generic fallback prompt
-            return "You are a specialized shell command generator. Provide complete, executable commands."
+    def _fits_full_prompt(self, system_prompt: str) -> bool:
+        """
+        Check whether a prompt with the full system prompt fits the model's context.
 
-    def generate_command(self, input_text: str) -> str:
+        Args:
+            system_prompt: The full system prompt.
+
+        Returns:
+            True if the system prompt, the query and the response fit the configured context length.
+        """
+        llm_config = getattr(self.config, "llm", None)
+        context_length = getattr(llm_config, "context_length", DEFAULT_CONTEXT_LENGTH)
+        max_new_tokens = getattr(llm_config, "max_new_tokens", 256)
+        if not isinstance(context_length, int) or not isinstance(max_new_tokens, int):
+            return False
+        return self._count_tokens(system_prompt) + PROMPT_MARGIN + max_new_tokens <= context_length
+
+    def generate_command(self, input_text: str, on_token: Optional[TokenCallback] = None) -> str:
         """
         Generate a shell command from natural language input.
 
+        Generation stops as soon as a complete command has been produced.
+
         Args:
             input_text: Natural language input describing desired command.
+            on_token: Optional callback receiving the response as it arrives.
 
         Returns:
             Generated shell command as a string.
         """
+        match = self._fast_path(input_text)
+        if match is not None:
+            return match.command
+
+        system_prompt, prompt = self._build_command_prompt(input_text)
+
+        candidates = getattr(getattr(self.config, "llm", None), "command_candidates", 1)
+        if isinstance(candidates, int) and not isinstance(candidates, bool) and candidates > 1:
+            return self._generate_best_command(input_text, prompt, system_prompt, candidates, on_token)
+
+        try:
+            response = self._generate_cached(
+                "command", input_text, prompt, system_prompt, until_command=True, on_token=on_token
+            )
+            return self._first_line(response)
+        except Exception as e:
+            logger.error(f"Command generation failed: {e}")
+            return f"echo 'Error generating command: {str(e)}'"
+
+    def _build_command_prompt(self, input_text: str) -> Tuple[str, str]:
+        """
+        Build the prompt asking for a shell command.
+
+        Args:
+            input_text: Natural language input describing desired command.
+
+        Returns:
+            Tuple of (system prompt, full prompt).
+        """
         # Use system prompt based on OS
-        system_prompt = self._get_system_prompt()
+        system_prompt = self._get_system_prompt(input_text)
 
         # Create an enhanced prompt that guides the LLM
         enhanced_prompt = f"""{system_prompt}
@@ -102,19 +196,16 @@ IMPORTANT GUIDANCE:
 5. Format your response as a single line executable command.
 
 Now provide the single best command:"""
+        return system_prompt, enhanced_prompt
 
-        try:
-            response = self.generate(enhanced_prompt)
-
-            # Simple cleanup - take first non-empty line if there are multiple
-            lines = [line for line in response.strip().split("\n") if line.strip()]
-            if lines:
-                return lines[0].strip()
-
-            return response.strip()
-        except Exception as e:
-            logger.error(f"Command generation failed: {e}")
-            return f"echo 'Error generating command: {str(e)}'"
+    @staticmethod
+    def _first_line(response: str) -> str:
+        """Take the first non-empty line of a response."""
+        # Simple cleanup - take first non-empty line if there are multiple
+        lines = [line for line in response.strip().split("\n") if line.strip()]
+        if lines:
+            return lines[0].strip()
+        return response.strip()
 
     def parse_intent(self, text: str, context=None) -> Optional[Dict[str, Any]]:
         """
@@ -128,26 +219,17 @@ Now provide the single best command:"""
             Dictionary containing parsed intent or None if parsing fails.
         """
         # Default implementation - subclasses should override
-        try:
-            # Special case for "find largest file" query
-            if "find largest file" in text.lower():
-                logger.info("Using hardcoded response for 'find largest file'")
-                return {
-                    "verb": "find",
-                    "args": {"path": "/", "type": "f", "exec": "du -sh {} \\; | sort -rh | head -n 1"},
-                }
-
-            # Special case for disk space query
-            if "disk space" in text.lower():
-                logger.info("Using hardcoded response for 'disk space'")
-                return {"verb": "df", "args": {"h": True}}
+        match = self._fast_path(text)
+        if match is not None:
+            return parsers.command_to_intent(match.command)
 
+        try:
             # Get the command from the generate method with enhanced prompt
             # Use a more specific prompt for system commands to help the LLM
             logger.info(f"Generating response for: {text}")
 
             # Create an enhanced prompt that guides the LLM
-            system_prompt = self._get_system_prompt()
+            system_prompt = self._get_system_prompt(text)
             enhanced_prompt = f"""{system_prompt}
 
 USER QUERY: {text}
@@ -162,23 +244,15 @@ IMPORTANT GUIDANCE:
 
 Now provide the single best command:"""
 
-            response = self.generate(enhanced_prompt)
+            response = self._generate_cached("intent", text, enhanced_prompt, system_prompt, until_command=True)
             logger.info(f"Generated response: {response}")
 
             # If the response is just a command string, wrap it in a simple structure
             if response and not response.startswith("{"):
-                command = response.strip()
-                # Extract the first word as the verb
-                parts = command.split()
-
-                # Fix for 'for' loops - don't just extract the first word
-                if parts and parts[0] == "for":
-                    # Handle for loop by keeping the full command
-                    return {"verb": command, "args": {}}
-
-                verb = parts[0] if parts else ""
-                logger.info(f"Extracted verb: {verb}")
-                return {"verb": verb, "args": {}}
+                # Split off the verb, keeping compound commands like 'for' loops whole
+                intent = parsers.command_to_intent(response)
+                logger.info(f"Extracted verb: {intent['verb']}")
+                return intent
 
             return parsers.parse_llm_response(response, text)
         except Exception as e:
@@ -215,16 +289,17 @@ Now provide the single best command:"""
             Dictionary containing parsed command or None if parsing fails.
         """
         # Default implementation - subclasses should override
+        match = self._fast_path(text)
+        if match is not None:
+            return parsers.command_to_intent(match.command)
+
         try:
             # Add locale information to the prompt
-            system_prompt = self._get_system_prompt()
+            system_prompt = self._get_system_prompt(text)
             prompt = parsers.create_prompt_with_locale(system_prompt, text, locale)
-            response = self.generate(prompt)
+            response = self._generate_cached("locale", text, prompt, system_prompt, locale)
 
             return parsers.parse_llm_response(response, text)
         except Exception as e:
             logger.error(f"Failed to parse intent with locale: {e}")
-            # If parsing fails, fall back to a simple command structure
-            if "memory" in text.lower() and "process" in text.lower():
-                return {"verb": "ps", "args": {"aux": True, "sort": "-rss", "head": "10"}}
             return None
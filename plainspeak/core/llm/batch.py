@@ -0,0 +1,110 @@
+"""
+Batch generation for LLM interfaces.
+
+A failing prompt doesn't fail its batch: each prompt gets a GenerationResult
+holding either the text or the error, and the time it took.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from ..intents import IntentMatch
+from .cache import cache_key
+
+# Prompts generated together by generate_batch()
+DEFAULT_BATCH_SIZE = 8
+
+
+@dataclass
+class GenerationResult:
+    """Outcome of generating for one prompt of a batch."""
+
+    text: str = ""
+    error: Optional[str] = None
+    # Seconds until the result was available
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether generation succeeded."""
+        return self.error is None
+
+
+class BatchGeneration:
+    """Batch methods of LLMInterface."""
+
+    # Provided by LLMInterface
+    generate: Callable[[str], str]
+    _fast_path: Callable[[str], Optional[IntentMatch]]
+    _build_command_prompt: Callable[[str], Tuple[str, str]]
+    _first_line: Callable[[str], str]
+    _cache_identity: Callable[[], Any]
+    _is_cacheable: Callable[[str, str], bool]
+
+    def generate_batch(self, prompts: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> List[GenerationResult]:
+        """
+        Generate text for many prompts.
+
+        A failing prompt doesn't fail the batch, its result holds the error.
+        The default implementation generates for one prompt at a time;
+        backends override it to batch prompts or send them concurrently.
+
+        Args:
+            prompts: Input prompt strings.
+            batch_size: Maximum number of prompts processed together.
+
+        Returns:
+            One result per prompt, in input order.
+        """
+        return [self._timed_generate(prompt) for prompt in prompts]
+
+    def _timed_generate(self, prompt: str) -> GenerationResult:
+        """Generate for a prompt, capturing the error and the latency."""
+        start = time.perf_counter()
+        try:
+            return GenerationResult(self.generate(prompt), latency=time.perf_counter() - start)
+        except Exception as e:
+            return GenerationResult(error=str(e), latency=time.perf_counter() - start)
+
+    def generate_commands(self, texts: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> List[GenerationResult]:
+        """
+        Generate shell commands for many natural language inputs.
+
+        Requests resolved by the intent rules and cached commands are reused,
+        the others are generated with generate_batch().
+
+        Args:
+            texts: Natural language inputs describing desired commands.
+            batch_size: Maximum number of prompts processed together.
+
+        Returns:
+            One result per input holding the command, in input order.
+        """
+        results: List[Optional[GenerationResult]] = [None] * len(texts)
+        cache = None if getattr(self, "bypass_cache", False) else getattr(self, "response_cache", None)
+        pending: List[Tuple[int, Optional[str], str]] = []
+        for index, text in enumerate(texts):
+            start = time.perf_counter()
+            match = self._fast_path(text)
+            if match is not None:
+                results[index] = GenerationResult(match.command, latency=time.perf_counter() - start)
+                continue
+            system_prompt, prompt = self._build_command_prompt(text)
+            key = None
+            if cache is not None:
+                key = cache_key("command", text, system_prompt, None, self._cache_identity())
+                response = cache.get(key)
+                if response is not None:
+                    results[index] = GenerationResult(self._first_line(response), latency=time.perf_counter() - start)
+                    continue
+            pending.append((index, key, prompt))
+
+        generated = self.generate_batch([prompt for _, _, prompt in pending], batch_size)
+        for (index, key, _), result in zip(pending, generated):
+            if result.ok:
+                if cache is not None and key is not None and result.text and self._is_cacheable("command", result.text):
+                    cache.put(key, result.text)
+                result.text = self._first_line(result.text)
+            results[index] = result
+        return [result or GenerationResult(error="No result") for result in results]
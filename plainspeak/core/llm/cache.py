@@ -0,0 +1,275 @@
+"""
+Response cache for LLM generation.
+
+Generating a command with a local CPU-only model takes seconds, and a remote
+call costs a round trip, so responses are cached in two tiers: an in-memory
+LRU and a persistent SQLite database under the configuration directory. Keys
+are hashes of everything that determines a response: the kind of prompt, the
+normalized user text, the system prompt, the locale, the model and its
+sampling parameters.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ...utils import paths
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".config" / "plainspeak" / "cache" / "llm_responses.sqlite3"
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_ENTRIES = 10_000
+
+# Expired and surplus disk entries are pruned once per this many insertions
+PRUNE_INTERVAL = 100
+
+
+@dataclass
+class ResponseCacheStats:
+    """Hit and miss counts of a response cache."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_entries: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Lookups answered by either tier."""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def normalize_text(text: str) -> str:
+    """Normalize user text for cache keys by collapsing whitespace."""
+    return " ".join(text.split())
+
+
+def cache_key(
+    kind: str,
+    text: str,
+    system_prompt: str,
+    locale: Optional[str] = None,
+    model: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Build the cache key of a generation request.
+
+    Args:
+        kind: Kind of prompt, as different prompts are built for the same text.
+        text: User text, normalized before hashing.
+        system_prompt: System prompt included in the prompt.
+        locale: Locale of the request, if any.
+        model: Model identity and sampling parameters.
+
+    Returns:
+        Hex digest identifying the request.
+    """
+    payload = json.dumps(
+        [kind, normalize_text(text), system_prompt, locale, model or {}], sort_keys=True, default=str
+    ).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache of generated responses with TTL and size-based eviction."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_entries: int = DEFAULT_DISK_ENTRIES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database for the persistent tier, or None to keep responses in memory only.
+            max_entries: Maximum number of responses kept in memory.
+            max_disk_entries: Maximum number of responses kept on disk.
+            ttl: Seconds after which a response expires.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = ResponseCacheStats()
+        self._inserts = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = self._open(path)
+
+    def _open(self, path: Path) -> Optional[sqlite3.Connection]:
+        """Open the persistent tier, falling back to memory only if that fails."""
+        try:
+            paths.make_directory(path.parent)
+            db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            return db
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not open LLM response cache {path}, caching in memory only: {e}")
+            return None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response.
+
+        Args:
+            key: Key built with cache_key().
+
+        Returns:
+            The cached response, or None if there is none or it expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._memory.move_to_end(key)
+                    self._stats.memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+            row = self._disk_get(key, now)
+            if row is not None:
+                self._remember(key, row)
+                self._stats.disk_hits += 1
+                return row[1]
+
+            self._stats.misses += 1
+            return None
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Key built with cache_key().
+            response: Generated response.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, (now, response))
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, response, now, now),
+                )
+                self._inserts += 1
+                if self._inserts % PRUNE_INTERVAL == 0:
+                    self._prune(now)
+            except sqlite3.Error as e:
+                logger.debug(f"Could not store LLM response in cache: {e}")
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        """Insert into the memory tier, evicting the least recently used entries."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        """Look up a response in the persistent tier."""
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute("SELECT created, response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[0] >= self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            return row[0], row[1]
+        except sqlite3.Error as e:
+            logger.debug(f"Could not read LLM response cache: {e}")
+            return None
+
+    def _prune(self, now: float) -> None:
+        """Delete expired responses and the least recently used ones beyond the size limit."""
+        assert self._db is not None
+        self._db.execute("DELETE FROM responses WHERE created <= ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+
+    def clear(self) -> None:
+        """Remove all responses from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+
+    def stats(self) -> ResponseCacheStats:
+        """Get hit and miss counts."""
+        with self._lock:
+            return ResponseCacheStats(
+                memory_hits=self._stats.memory_hits,
+                disk_hits=self._stats.disk_hits,
+                misses=self._stats.misses,
+                memory_entries=len(self._memory),
+            )
+
+    def close(self) -> None:
+        """Close the persistent tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_shared_caches: Dict[Tuple[Any, ...], ResponseCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_response_cache(llm_config=None) -> ResponseCache:
+    """
+    Get the response cache shared by all LLM interfaces with the same cache settings.
+
+    Args:
+        llm_config: LLM configuration with the cache settings, defaults are used if None.
+
+    Returns:
+        The shared ResponseCache.
+    """
+    path = getattr(llm_config, "cache_path", None)
+    persistent = getattr(llm_config, "cache_persistent", True)
+    settings = (
+        Path(path).expanduser() if path else DEFAULT_CACHE_PATH,
+        persistent,
+        getattr(llm_config, "cache_max_entries", DEFAULT_MEMORY_ENTRIES),
+        getattr(llm_config, "cache_max_disk_entries", DEFAULT_DISK_ENTRIES),
+        getattr(llm_config, "cache_ttl", DEFAULT_TTL_SECONDS),
+    )
+    with _shared_lock:
+        cache = _shared_caches.get(settings)
+        if cache is None:
+            cache = ResponseCache(settings[0] if persistent else None, *settings[2:])
+            _shared_caches[settings] = cache
+        return cache
@@ -0,0 +1,193 @@
+"""
+Answering requests without the model.
+
+Common requests are answered by the intent rules, similar past requests by
+the learning store's semantic cache, and identical requests by the response
+cache. Responses are cached only when the command they hold passes the
+sandbox's safety checks.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from ..intents import IntentMatch, get_intent_matcher
+from . import parsers
+from .cache import ResponseCache, cache_key, get_response_cache
+from .streaming import TokenCallback
+
+logger = logging.getLogger(__name__)
+
+
+class CachedGeneration:
+    """Caching and fast path methods of LLMInterface."""
+
+    # Provided by LLMInterface
+    config: Any
+    generate: Callable[[str], str]
+    generate_until_command: Callable[[str, Optional[TokenCallback]], str]
+    _first_line: Callable[[str], str]
+
+    def _init_response_cache(self) -> Optional[ResponseCache]:
+        """
+        Get the shared response cache if caching is enabled in the config.
+
+        Returns:
+            The response cache, or None if caching is disabled.
+        """
+        llm_config = getattr(self.config, "llm", None)
+        enabled = getattr(llm_config, "cache_responses", False)
+        # Only an actual boolean setting enables caching
+        if not isinstance(enabled, bool) or not enabled:
+            return None
+        return get_response_cache(llm_config)
+
+    def _init_semantic_cache(self) -> Any:
+        """
+        Get the learning store to look up similar past requests in, if enabled in the config.
+
+        Returns:
+            The global learning store, or None if the semantic cache is disabled.
+        """
+        enabled = getattr(getattr(self.config, "llm", None), "semantic_cache", False)
+        if not isinstance(enabled, bool) or not enabled:
+            return None
+        from ...learning import learning_store
+
+        return learning_store
+
+    def _cache_identity(self) -> Dict[str, Any]:
+        """
+        Describe the model and sampling parameters that determine a response.
+
+        Returns:
+            Dictionary included in response cache keys.
+        """
+        llm_config = getattr(self.config, "llm", None)
+        identity: Dict[str, Any] = {"interface": type(self).__name__}
+        for name in (
+            "provider",
+            "model_path",
+            "model_name",
+            "model_type",
+            "max_new_tokens",
+            "max_tokens",
+            "temperature",
+            "top_k",
+            "top_p",
+            "repetition_penalty",
+            "stop",
+        ):
+            identity[name] = getattr(llm_config, name, None)
+        return identity
+
+    def _generate_cached(
+        self,
+        kind: str,
+        text: str,
+        prompt: str,
+        system_prompt: str,
+        locale: Optional[str] = None,
+        until_command: bool = False,
+        on_token: Optional[TokenCallback] = None,
+    ) -> str:
+        """
+        Generate a response, reusing a cached one for an identical request.
+
+        Args:
+            kind: Kind of prompt built from the text.
+            text: User text the prompt was built from.
+            prompt: Full prompt to generate from.
+            system_prompt: System prompt included in the prompt.
+            locale: Locale of the request, if any.
+            until_command: Stream the response and stop once it holds a complete command.
+            on_token: Optional callback receiving the streamed response as it arrives.
+
+        Returns:
+            Generated text response.
+        """
+
+        def generate() -> str:
+            return self.generate_until_command(prompt, on_token) if until_command else self.generate(prompt)
+
+        cache = getattr(self, "response_cache", None)
+        if cache is None or getattr(self, "bypass_cache", False):
+            return generate()
+
+        key = cache_key(kind, text, system_prompt, locale, self._cache_identity())
+        response = cache.get(key)
+        if response is not None:
+            logger.debug(f"Using cached response for: {text}")
+            if on_token is not None:
+                on_token(response)
+            return response
+
+        response = generate()
+        if response and self._is_cacheable(kind, response):
+            cache.put(key, response)
+        return response
+
+    def _get_sandbox(self) -> Any:
+        """Get the sandbox checking generated commands, creating it on first use."""
+        if getattr(self, "_sandbox", None) is None:
+            from ..sandbox import Sandbox
+
+            self._sandbox = Sandbox()
+        return self._sandbox
+
+    def _is_cacheable(self, kind: str, response: str) -> bool:
+        """
+        Check whether a response may be cached, so a bad sample isn't replayed for days.
+
+        Args:
+            kind: Kind of prompt the response was generated for.
+            response: Generated response.
+
+        Returns:
+            True if the command the response holds passes the safety checks.
+        """
+        if kind == "locale":
+            try:
+                intent = parsers.parse_llm_response(response)
+            except Exception:
+                return False
+            command = str(intent.get("verb") or "") if isinstance(intent, dict) else ""
+        else:
+            command = self._first_line(response)
+        return self._get_sandbox().check_command(command).safe
+
+    def _fast_path(self, text: str) -> Optional[IntentMatch]:
+        """
+        Resolve a common request from the intent rules or the semantic cache, without the LLM.
+
+        The intent rules and the semantic cache are enabled by the intent_fast_path
+        and semantic_cache settings respectively.
+
+        Args:
+            text: Natural language input.
+
+        Returns:
+            The match, or None if the LLM has to answer.
+        """
+        llm_config = getattr(self.config, "llm", None)
+        if getattr(llm_config, "intent_fast_path", True) is not False:
+            match = get_intent_matcher().match(text)
+            if match is not None:
+                logger.debug(f"Intent rule {match.rule} answered: {text}")
+                return match
+
+        store = getattr(self, "semantic_cache", None)
+        if store is None:
+            return None
+        threshold = getattr(llm_config, "semantic_cache_threshold", None)
+        try:
+            if isinstance(threshold, (int, float, str)) and not isinstance(threshold, bool):
+                found = store.find_cached_command(text, float(threshold))
+            else:
+                found = store.find_cached_command(text)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+        if found is None:
+            return None
+        logger.debug(f"Reusing the command for '{found[0]}' ({found[2]:.2f}): {text}")
+        return IntentMatch("semantic", found[1])
@@ -0,0 +1,216 @@
+"""
+Choosing the best of several sampled commands.
+
+Instead of generating one command and asking again when it is unusable,
+several candidates can be sampled in one request and checked locally: the
+command has to parse, be complete, pass the sandbox's safety checks, and its
+program should resolve to a shell builtin, an executable on the PATH or a
+plugin verb. The best candidate is used, so a bad sample no longer costs a
+second round trip to the model.
+"""
+
+import logging
+import shlex
+import shutil
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .cache import cache_key
+from .parsers import LLMParsingError, is_complete_command
+from .streaming import TokenCallback
+
+logger = logging.getLogger(__name__)
+
+# Words the shell runs without looking up a program
+SHELL_BUILTINS = frozenset(
+    ". : [ { ( alias bg case cd echo eval exec exit export false fg for history if jobs kill printf pwd read set "
+    "source test time true type ulimit umask unset until wait while".split()
+)
+
+# Resolves the program of a command, returning whether it can be run
+VerbResolver = Callable[[str], bool]
+
+
+@dataclass
+class CandidateVerdict:
+    """Outcome of checking one candidate command."""
+
+    command: str
+    # Whether the command parses, is complete and passes the sandbox checks
+    valid: bool
+    # Whether its program is a builtin, an executable or a plugin verb
+    resolved: bool = False
+    # Number of samples that produced the command
+    votes: int = 1
+    # Position of its first sample
+    index: int = 0
+    reason: Optional[str] = None
+
+
+def program_of(words: Sequence[str]) -> Optional[str]:
+    """Get the program a command runs, skipping leading variable assignments."""
+    for word in words:
+        if "=" in word and not word.startswith("="):
+            continue
+        return word
+    return None
+
+
+def resolve_verb(program: str) -> bool:
+    """
+    Check whether a program can be run.
+
+    Args:
+        program: First word of a command.
+
+    Returns:
+        True for shell builtins, executables on the PATH and plugin verbs.
+    """
+    if program in SHELL_BUILTINS or shutil.which(program):
+        return True
+    try:
+        from ...plugins.manager import get_plugin_manager
+
+        # Only exact verbs and aliases count, a fuzzy match doesn't make the program runnable
+        return get_plugin_manager().registry.get_plugin_for_verb(program) is not None
+    except Exception as e:
+        logger.debug(f"Could not resolve {program} with the plugins: {e}")
+        return False
+
+
+def check_candidate(command: str, sandbox: Any = None, resolver: Optional[VerbResolver] = None) -> CandidateVerdict:
+    """
+    Check whether a candidate command can be used.
+
+    Args:
+        command: Candidate command.
+        sandbox: Sandbox whose validate_command() the command must pass, None to skip that check.
+        resolver: Resolves the program of the command, defaults to resolve_verb().
+
+    Returns:
+        The verdict.
+    """
+    try:
+        words = shlex.split(command, comments=True)
+    except ValueError as e:
+        return CandidateVerdict(command, False, reason=f"Unparseable: {e}")
+    if not words:
+        return CandidateVerdict(command, False, reason="Empty command")
+    if not is_complete_command(command):
+        return CandidateVerdict(command, False, reason="Incomplete command")
+    if sandbox is not None:
+        safe, error = sandbox.validate_command(command)
+        if not safe:
+            return CandidateVerdict(command, False, reason=error)
+
+    program = program_of(words)
+    resolved = program is not None and (resolver or resolve_verb)(program)
+    return CandidateVerdict(command, True, resolved=resolved, reason=None if resolved else f"Unknown program {program}")
+
+
+def rank_candidates(
+    commands: Sequence[str], sandbox: Any = None, resolver: Optional[VerbResolver] = None
+) -> List[CandidateVerdict]:
+    """
+    Check candidate commands and rank them.
+
+    Valid commands come first, then those whose program resolves, then the
+    ones sampled most often; ties keep the sampling order.
+
+    Args:
+        commands: Sampled commands, duplicates included.
+        sandbox: Sandbox whose validate_command() the commands must pass, None to skip that check.
+        resolver: Resolves the program of a command, defaults to resolve_verb().
+
+    Returns:
+        One verdict per distinct command, best first.
+    """
+    votes: Dict[str, int] = {}
+    first: Dict[str, int] = {}
+    for index, command in enumerate(commands):
+        command = command.strip()
+        votes[command] = votes.get(command, 0) + 1
+        first.setdefault(command, index)
+    if not votes:
+        return []
+
+    # Each check is a parse, a few pattern matches and a PATH lookup, cheaper than starting threads
+    verdicts = [check_candidate(command, sandbox, resolver) for command in votes]
+    for verdict in verdicts:
+        verdict.votes = votes[verdict.command]
+        verdict.index = first[verdict.command]
+    verdicts.sort(key=lambda v: (not v.valid, not v.resolved, -v.votes, v.index))
+    return verdicts
+
+
+class CandidateGeneration:
+    """Candidate sampling methods of LLMInterface."""
+
+    # Provided by LLMInterface
+    generate_batch: Callable[..., List[Any]]
+    _first_line: Callable[[str], str]
+    _cache_identity: Callable[[], Any]
+    _get_sandbox: Callable[[], Any]
+
+    def generate_candidates(self, prompt: str, n: int) -> List[str]:
+        """
+        Sample several responses to a prompt.
+
+        The default implementation generates them as a batch of identical
+        prompts; backends override it to sample all of them in one request.
+
+        Args:
+            prompt: Input prompt string.
+            n: Number of responses.
+
+        Returns:
+            The responses that could be generated.
+
+        Raises:
+            LLMParsingError: If no response could be generated.
+        """
+        results = self.generate_batch([prompt] * n, n)
+        texts = [result.text for result in results if result.ok]
+        if not texts:
+            raise LLMParsingError(next((result.error for result in results if result.error), "No response"))
+        return texts
+
+    def _generate_best_command(
+        self, input_text: str, prompt: str, system_prompt: str, n: int, on_token: Optional[TokenCallback] = None
+    ) -> str:
+        """
+        Sample several commands in one request and keep the best, instead of retrying after a bad one.
+
+        Args:
+            input_text: Natural language input describing desired command.
+            prompt: Full prompt to generate from.
+            system_prompt: System prompt included in the prompt.
+            n: Number of candidates.
+            on_token: Optional callback receiving the chosen command.
+
+        Returns:
+            The best candidate command.
+        """
+        cache = None if getattr(self, "bypass_cache", False) else getattr(self, "response_cache", None)
+        key = None
+        command = None
+        if cache is not None:
+            key = cache_key("command", input_text, system_prompt, None, self._cache_identity())
+            command = cache.get(key)
+        if command is None:
+            try:
+                responses = self.generate_candidates(prompt, n)
+            except Exception as e:
+                logger.error(f"Command generation failed: {e}")
+                return f"echo 'Error generating command: {str(e)}'"
+            verdicts = rank_candidates([self._first_line(response) for response in responses], self._get_sandbox())
+            best = verdicts[0]
+            if not best.valid:
+                logger.warning(f"No valid command among {len(responses)} candidates: {best.reason}")
+            logger.debug(f"Chose '{best.command}' from {len(verdicts)} distinct candidates")
+            command = best.command
+            if cache is not None and key is not None and best.valid:
+                cache.put(key, command)
+        if on_token is not None:
+            on_token(command)
+        return command
@@ -0,0 +1,280 @@
+"""
+Local model daemon.
+
+Loading a GGUF model takes seconds, which dominates one-shot invocations. The
+daemon loads the model once and serves generation requests over a Unix domain
+socket, so later invocations only connect to it. Messages are JSON objects,
+one per line, tagged with an id so that a connection can have several requests
+in flight. Streamed generations are answered with one message per chunk and a
+final result, and stop when the client closes the connection. The daemon exits
+after a configurable idle time.
+
+Start it with ``plainspeak daemon start``.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+
+from .base import LLMInterface
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = Path.home() / ".config" / "plainspeak" / "run" / "model.sock"
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+PROTOCOL_VERSION = 2
+
+# Seconds to wait for a connection, replies to generate requests may take longer
+CONNECT_TIMEOUT = 1.0
+
+
+class DaemonError(RuntimeError):
+    """Raised when the model daemon reports an error."""
+
+
+def daemon_supported() -> bool:
+    """Check whether the platform supports Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX") and hasattr(socketserver, "ThreadingUnixStreamServer")
+
+
+def daemon_enabled(llm_config) -> bool:
+    """Check whether the configuration allows using the model daemon."""
+    enabled = getattr(llm_config, "use_daemon", False)
+    # Only an actual boolean setting enables the daemon
+    return isinstance(enabled, bool) and enabled and daemon_supported()
+
+
+def socket_path(llm_config=None) -> Path:
+    """Get the daemon socket path from the configuration."""
+    path = getattr(llm_config, "daemon_socket", None)
+    return Path(path).expanduser() if isinstance(path, str) and path else DEFAULT_SOCKET_PATH
+
+
+def model_identity(llm_config=None) -> Dict[str, Any]:
+    """Describe the loaded model, so clients only use a daemon serving the model they are configured for."""
+    return {name: getattr(llm_config, name, None) for name in ("model_path", "model_type", "gpu_layers")}
+
+
+def write_message(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    """Send a message as one line of JSON."""
+    stream.write(json.dumps(message).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Read requests from a connection and answer them as they complete."""
+
+    def handle(self) -> None:
+        daemon: "ModelDaemon" = self.server.model_daemon  # type: ignore[attr-defined]
+        write_lock = threading.Lock()
+
+        def reply(message: Dict[str, Any]) -> bool:
+            try:
+                with write_lock:
+                    write_message(self.wfile, message)
+                return True
+            except (OSError, ValueError):
+                # The client went away before the reply was ready
+                return False
+
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                reply({"id": None, "error": "Malformed request"})
+                continue
+            daemon.submit(request, reply)
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, model_daemon: "ModelDaemon"):
+        self.model_daemon = model_daemon
+        super().__init__(path, _RequestHandler)
+
+    def service_actions(self) -> None:
+        self.model_daemon.check_idle()
+
+
+class ModelDaemon:
+    """Serve generation requests for a loaded model over a Unix domain socket."""
+
+    def __init__(
+        self,
+        interface: LLMInterface,
+        path: Path = DEFAULT_SOCKET_PATH,
+        idle_timeout: Optional[float] = DEFAULT_IDLE_TIMEOUT,
+        identity: Optional[Dict[str, Any]] = None,
+        workers: int = 8,
+    ):
+        """
+        Initialize the daemon.
+
+        Args:
+            interface: Interface of the loaded model.
+            path: Socket path.
+            idle_timeout: Seconds without requests after which the daemon exits, None to run until stopped.
+            identity: Model identity reported to clients.
+            workers: Maximum number of requests handled at once. Generations run one at a time.
+        """
+        self.interface = interface
+        self.path = Path(path)
+        self.idle_timeout = idle_timeout
+        self.identity = identity or {}
+        self.requests = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="plainspeak-daemon")
+        # Model backends are not thread-safe
+        self._model_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._active = 0
+        self._last_activity = time.monotonic()
+        self._stopping = False
+        self._server: Optional[_UnixServer] = None
+
+    def bind(self) -> None:
+        """
+        Create the socket, replacing a stale one.
+
+        Raises:
+            RuntimeError: If another daemon already listens on the socket.
+        """
+        if self.path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.path))
+                raise RuntimeError(f"A model daemon is already running on {self.path}")
+            except OSError:
+                self.path.unlink()
+            finally:
+                probe.close()
+
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Keep the socket private to the current user
+        umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(str(self.path), self)
+        finally:
+            os.umask(umask)
+
+    def serve_forever(self) -> None:
+        """Serve requests until stopped or idle for too long."""
+        if self._server is None:
+            self.bind()
+        assert self._server is not None
+        logger.info(f"Model daemon listening on {self.path}")
+        try:
+            self._server.serve_forever(poll_interval=0.5)
+        finally:
+            self._server.server_close()
+            self._executor.shutdown(wait=False)
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            logger.info("Model daemon stopped")
+
+    def stop(self) -> None:
+        """Stop serving, from any thread."""
+        with self._state_lock:
+            if self._stopping or self._server is None:
+                return
+            self._stopping = True
+        # shutdown() waits for serve_forever() to return, so it can't run on the serving thread
+        threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def check_idle(self) -> None:
+        """Stop if no request arrived within the idle timeout."""
+        if self.idle_timeout is None:
+            return
+        with self._state_lock:
+            idle = (
+                not self._stopping
+                and self._active == 0
+                and time.monotonic() - self._last_activity > self.idle_timeout
+            )
+        if idle:
+            logger.info(f"Model daemon idle for {self.idle_timeout} seconds, stopping")
+            self.stop()
+
+    def submit(self, request: Dict[str, Any], reply) -> None:
+        """Handle a request in the worker pool and reply when done."""
+        with self._state_lock:
+            self._active += 1
+            self._last_activity = time.monotonic()
+            self.requests += 1
+        self._executor.submit(self._handle, request, reply)
+
+    def _handle(self, request: Dict[str, Any], reply) -> None:
+        request_id = request.get("id")
+        try:
+            if request.get("method") == "generate_stream":
+                self._stream(request, reply)
+            else:
+                reply({"id": request_id, "result": self._dispatch(request)})
+        except Exception as e:
+            logger.error(f"Model daemon request failed: {e}")
+            reply({"id": request_id, "error": str(e)})
+        finally:
+            with self._state_lock:
+                self._active -= 1
+                self._last_activity = time.monotonic()
+
+    def _stream(self, request: Dict[str, Any], reply) -> None:
+        """Send the chunks of a generation as they are produced, stopping it if the client goes away."""
+        request_id = request.get("id")
+        with self._model_lock:
+            chunks = self.interface.generate_stream(request["prompt"])
+            try:
+                for chunk in chunks:
+                    if not reply({"id": request_id, "chunk": chunk}):
+                        logger.debug(f"Client of request {request_id} went away, generation stopped")
+                        return
+            finally:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+        reply({"id": request_id, "result": None})
+
+    def _dispatch(self, request: Dict[str, Any]) -> Any:
+        method = request.get("method")
+        if method == "generate":
+            with self._model_lock:
+                return self.interface.generate(request["prompt"])
+        if method == "ping":
+            return {"version": PROTOCOL_VERSION, "pid": os.getpid(), "model": self.identity, "requests": self.requests}
+        if method == "shutdown":
+            self.stop()
+            return True
+        raise ValueError(f"Unknown method: {method}")
+
+
+def main(argv=None) -> int:
+    """Load the configured local model and serve it."""
+    from ...config import load_config
+    from .local import LocalLLMInterface
+
+    parser = argparse.ArgumentParser(description="Serve the configured local model over a Unix domain socket.")
+    parser.add_argument("--socket", help="Socket path")
+    parser.add_argument("--idle-timeout", type=float, help="Seconds without requests before exiting, 0 to never exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    config = load_config()
+    idle_timeout = args.idle_timeout
+    if idle_timeout is None:
+        idle_timeout = getattr(config.llm, "daemon_idle_timeout", DEFAULT_IDLE_TIMEOUT)
+    path = Path(args.socket) if args.socket else socket_path(config.llm)
+
+    daemon = ModelDaemon(LocalLLMInterface(config), path, idle_timeout or None, model_identity(config.llm))
+    daemon.serve_forever()
+    return 0
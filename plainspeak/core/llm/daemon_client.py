@@ -0,0 +1,299 @@
+"""
+Client side of the local model daemon.
+
+get_llm_interface() connects to a running daemon serving the configured model
+and returns a DaemonLLMInterface, which falls back to loading the model
+in-process if the daemon goes away.
+"""
+
+import itertools
+import json
+import logging
+import socket
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional
+
+from .base import LLMInterface, LLMResponseError
+from .daemon import (
+    CONNECT_TIMEOUT,
+    DEFAULT_SOCKET_PATH,
+    PROTOCOL_VERSION,
+    DaemonError,
+    daemon_enabled,
+    model_identity,
+    socket_path,
+    write_message,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DaemonClient:
+    """Connection to a model daemon."""
+
+    def __init__(self, path: Path = DEFAULT_SOCKET_PATH, timeout: Optional[float] = None):
+        """
+        Initialize the client. The connection is opened on the first request.
+
+        Args:
+            path: Socket path.
+            timeout: Seconds to wait for a reply, None to wait as long as generation takes.
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._stream: Optional[BinaryIO] = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> BinaryIO:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(self.path))
+            sock.settimeout(self.timeout)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._stream = sock.makefile("rwb")
+        return self._stream
+
+    def request(self, method: str, **params: Any) -> Any:
+        """
+        Send a request and wait for its reply.
+
+        Args:
+            method: Request method.
+            **params: Request parameters.
+
+        Returns:
+            The result of the request.
+
+        Raises:
+            DaemonError: If the daemon reports an error.
+            OSError: If the daemon can't be reached.
+        """
+        with self._lock:
+            request_id = next(self._ids)
+            try:
+                stream = self._stream or self._connect()
+                write_message(stream, {"id": request_id, "method": method, **params})
+                line = stream.readline()
+            except OSError:
+                self._close()
+                raise
+            if not line:
+                self._close()
+                raise ConnectionError("Model daemon closed the connection")
+
+        reply = json.loads(line)
+        if reply.get("id") != request_id:
+            raise DaemonError(f"Unexpected reply to request {request_id}")
+        if "error" in reply:
+            raise DaemonError(reply["error"])
+        return reply.get("result")
+
+    def request_stream(self, method: str, **params: Any) -> Iterator[Any]:
+        """
+        Send a request and yield the chunks of its reply as they arrive.
+
+        The connection is held until the iterator is exhausted or closed.
+        Closing it early closes the connection, which stops the daemon's work on
+        the request; the next request reconnects.
+
+        Args:
+            method: Request method.
+            **params: Request parameters.
+
+        Yields:
+            Chunks of the result.
+
+        Raises:
+            DaemonError: If the daemon reports an error.
+            OSError: If the daemon can't be reached.
+        """
+        with self._lock:
+            request_id = next(self._ids)
+            finished = False
+            try:
+                stream = self._stream or self._connect()
+                write_message(stream, {"id": request_id, "method": method, **params})
+                while True:
+                    line = stream.readline()
+                    if not line:
+                        raise ConnectionError("Model daemon closed the connection")
+                    reply = json.loads(line)
+                    if reply.get("id") != request_id:
+                        raise DaemonError(f"Unexpected reply to request {request_id}")
+                    if "chunk" not in reply:
+                        finished = True
+                        break
+                    yield reply["chunk"]
+            finally:
+                if not finished:
+                    self._close()
+        if "error" in reply:
+            raise DaemonError(reply["error"])
+
+    def _close(self) -> None:
+        for resource in (self._stream, self._sock):
+            if resource is not None:
+                try:
+                    resource.close()
+                except OSError:
+                    pass
+        self._stream = None
+        self._sock = None
+
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            self._close()
+
+
+def connect_daemon(llm_config=None) -> Optional[DaemonClient]:
+    """
+    Connect to a running daemon serving the configured model, if the configuration allows it.
+
+    Args:
+        llm_config: LLM configuration.
+
+    Returns:
+        Connected client, or None if disabled or no matching daemon is running.
+    """
+    if not daemon_enabled(llm_config):
+        return None
+    return probe_daemon(llm_config)
+
+
+def probe_daemon(llm_config=None) -> Optional[DaemonClient]:
+    """
+    Connect to a running daemon serving the configured model.
+
+    Args:
+        llm_config: LLM configuration.
+
+    Returns:
+        Connected client, or None if no matching daemon is running.
+    """
+    path = socket_path(llm_config)
+    if not path.exists():
+        return None
+
+    client = DaemonClient(path)
+    try:
+        info = client.request("ping")
+    except (OSError, ValueError, DaemonError) as e:
+        logger.debug(f"Model daemon on {path} not reachable: {e}")
+        client.close()
+        return None
+    if info.get("version") != PROTOCOL_VERSION or info.get("model") != model_identity(llm_config):
+        logger.info(f"Model daemon on {path} serves a different model, loading the model in-process")
+        client.close()
+        return None
+    return client
+
+
+class DaemonLLMInterface(LLMInterface):
+    """Interface generating with a model kept loaded by the model daemon."""
+
+    # The daemon's local model keeps the evaluated system prompt between requests
+    reuses_prompt_prefix = True
+
+    def __init__(self, config=None, client: Optional[DaemonClient] = None):
+        """
+        Initialize the interface.
+
+        Args:
+            config: Configuration object.
+            client: Connected daemon client, defaults to the configured socket.
+        """
+        super().__init__(config)
+        self.client = client or DaemonClient(socket_path(getattr(config, "llm", None)))
+        self._fallback: Optional[LLMInterface] = None
+
+    def generate(self, prompt: str) -> str:
+        """
+        Generate text with the daemon, or in-process if the daemon went away.
+
+        Args:
+            prompt: Input prompt string.
+
+        Returns:
+            Generated text response.
+
+        Raises:
+            LLMResponseError: If generation fails.
+        """
+        if self._fallback is None:
+            try:
+                return self.client.request("generate", prompt=prompt)
+            except DaemonError as e:
+                raise LLMResponseError(f"Local LLM generation failed: {e}")
+            except OSError as e:
+                self._load_fallback(e)
+        assert self._fallback is not None
+        return self._fallback.generate(prompt)
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Generate text with the daemon, yielding it in chunks as it is produced.
+
+        Closing the iterator stops the daemon's generation. If the daemon went
+        away before generating, the text is generated in-process.
+
+        Args:
+            prompt: Input prompt string.
+
+        Yields:
+            Chunks of the generated text.
+
+        Raises:
+            LLMResponseError: If generation fails.
+        """
+        if self._fallback is None:
+            chunks = self.client.request_stream("generate_stream", prompt=prompt)
+            started = False
+            try:
+                for chunk in chunks:
+                    started = True
+                    yield chunk
+                return
+            except DaemonError as e:
+                raise LLMResponseError(f"Local LLM generation failed: {e}")
+            except OSError as e:
+                if started:
+                    raise LLMResponseError(f"Model daemon went away during generation: {e}")
+                self._load_fallback(e)
+            finally:
+                chunks.close()
+        assert self._fallback is not None
+        yield from self._fallback.generate_stream(prompt)
+
+    def _load_fallback(self, error: OSError) -> None:
+        """Load the model in-process after the daemon went away."""
+        logger.warning(f"Model daemon unavailable, loading the model in-process: {error}")
+        self.client.close()
+        from .local import LocalLLMInterface
+
+        self._fallback = LocalLLMInterface(self.config)
+
+
+def local_llm_interface(config=None) -> LLMInterface:
+    """
+    Get an interface to the local model, through the model daemon if it is running.
+
+    Args:
+        config: Configuration object.
+
+    Returns:
+        DaemonLLMInterface if a daemon serves the configured model, LocalLLMInterface otherwise.
+    """
+    client = connect_daemon(getattr(config, "llm", None))
+    if client is not None:
+        return DaemonLLMInterface(config, client)
+    from .local import LocalLLMInterface
+
+    return LocalLLMInterface(config)
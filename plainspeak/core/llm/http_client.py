@@ -0,0 +1,327 @@
+"""
+HTTP client for remote LLM APIs.
+
+RemoteLLM sends JSON requests over pooled keep-alive connections, limits the
+request rate with a token bucket, retries failed requests with jittered
+exponential backoff and stops sending requests while its circuit breaker is
+open. Its asyncio methods let many requests be in flight at once, so that
+sessions sharing one API key don't wait behind each other.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .resilience import RETRY_STATUSES, CircuitBreaker, CircuitOpenError, TokenBucket, backoff_delay, retry_after
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteLLM:
+    """
+    Client for JSON LLM APIs with pooled connections, rate limiting, retries and a circuit breaker.
+
+    Requests reuse the keep-alive connections of a requests.Session. Failed
+    requests are retried with jittered exponential backoff, honoring
+    Retry-After, and count as one failure for the circuit breaker once the
+    retries are exhausted. The asyncio methods run requests in a thread pool
+    of max_concurrency workers, so that that many can be in flight without
+    blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        api_endpoint: str,
+        api_key: str,
+        retry_count: int = 3,
+        timeout: float = 30,
+        rate_limit_per_minute: int = 60,
+        max_concurrency: int = 8,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        limiter: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Initialize the RemoteLLM client.
+
+        Args:
+            api_endpoint: The API endpoint URL
+            api_key: API authentication key
+            retry_count: Number of retries for failed requests
+            timeout: Request timeout in seconds
+            rate_limit_per_minute: Maximum requests per minute
+            max_concurrency: Maximum requests in flight, and pooled connections
+            failure_threshold: Consecutive failed requests that open the circuit breaker
+            recovery_timeout: Seconds before an open circuit breaker lets a trial request through
+            backoff_base: Ceiling of the first retry delay in seconds, doubled on each retry
+            backoff_cap: Maximum retry delay in seconds
+            limiter: Rate limiter to share with other clients, replaces rate_limit_per_minute
+            breaker: Circuit breaker to share with other clients, replaces the threshold and timeout
+        """
+        self.api_endpoint = api_endpoint
+        self.api_key = api_key
+        self.retry_count = retry_count
+        self.timeout = timeout
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.max_concurrency = max_concurrency
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.limiter = limiter or TokenBucket(rate_limit_per_minute)
+        self.breaker = breaker or CircuitBreaker(failure_threshold, recovery_timeout)
+
+        # Logger
+        self.logger = logger
+
+        # Session keeping up to max_concurrency connections alive
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"})
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Semaphores bounding requests in flight, per event loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def failure_count(self) -> int:
+        """Number of consecutive failed requests."""
+        return self.breaker.failures
+
+    @failure_count.setter
+    def failure_count(self, value: int) -> None:
+        self.breaker.failures = value
+
+    @property
+    def circuit_open(self) -> bool:
+        """Whether the circuit breaker currently refuses requests."""
+        return self.breaker.state == CircuitBreaker.OPEN
+
+    @circuit_open.setter
+    def circuit_open(self, value: bool) -> None:
+        if value:
+            self.breaker.trip()
+        else:
+            self.breaker.reset()
+
+    def _url(self, endpoint: str) -> str:
+        return f"{self.api_endpoint.rstrip('/')}/{endpoint.lstrip('/')}"
+
+    def _attempt(
+        self, url: str, payload: Dict[str, Any], stream: bool = False
+    ) -> Tuple[Any, Optional[Exception], Optional[float]]:
+        """
+        Send a request once.
+
+        Args:
+            url: Request URL.
+            payload: Request payload.
+            stream: Return the open response instead of its JSON body.
+
+        Returns:
+            Tuple of (response JSON or response, retryable error, delay requested by the server).
+
+        Raises:
+            requests.HTTPError: For errors that retrying won't fix.
+        """
+        try:
+            response = self.session.post(url, json=payload, timeout=self.timeout, stream=stream)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            return None, e, None
+        if response.status_code in RETRY_STATUSES:
+            error = requests.HTTPError(f"HTTP {response.status_code} from {url}", response=response)
+            response.close()
+            return None, error, retry_after(response.headers.get("Retry-After"))
+        # The service answered, even if it rejects the request
+        self.breaker.record_success()
+        if not response.ok:
+            response.close()
+        response.raise_for_status()
+        return (response if stream else response.json()), None, None
+
+    def _backoff(self, attempt: int, error: Exception, delay: Optional[float]) -> float:
+        delay = delay if delay is not None else backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+        self.logger.warning(f"Request failed ({error}), retrying in {delay:.2f}s")
+        return delay
+
+    def _make_api_request(self, endpoint: str, payload: Dict[str, Any], stream: bool = False) -> Any:
+        """
+        Make an API request with circuit breaker and rate limiting.
+
+        Args:
+            endpoint: API endpoint path
+            payload: Request payload
+            stream: Return the open response, to be read and closed by the caller
+
+        Returns:
+            API response as dictionary, or the response if streaming
+
+        Raises:
+            RuntimeError: If circuit breaker is open
+            requests.RequestException: For request failures
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("Circuit breaker open - too many failures")
+
+        url = self._url(endpoint)
+        error: Optional[Exception] = None
+        for attempt in range(self.retry_count + 1):
+            self.limiter.acquire()
+            result, error, delay = self._attempt(url, payload, stream)
+            if error is None:
+                return result
+            if attempt < self.retry_count:
+                time.sleep(self._backoff(attempt, error, delay))
+
+        self.breaker.record_failure()
+        assert error is not None
+        raise error
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="plainspeak-remote")
+            return self._executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def request_async(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make an API request without blocking the event loop.
+
+        Args:
+            endpoint: API endpoint path
+            payload: Request payload
+
+        Returns:
+            API response as dictionary
+
+        Raises:
+            RuntimeError: If circuit breaker is open
+            requests.RequestException: For request failures
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("Circuit breaker open - too many failures")
+
+        loop = asyncio.get_running_loop()
+        url = self._url(endpoint)
+        error: Optional[Exception] = None
+        async with self._semaphore():
+            for attempt in range(self.retry_count + 1):
+                await self.limiter.acquire_async()
+                result, error, delay = await loop.run_in_executor(self._pool(), self._attempt, url, payload)
+                if error is None:
+                    return result
+                if attempt < self.retry_count:
+                    await asyncio.sleep(self._backoff(attempt, error, delay))
+
+        self.breaker.record_failure()
+        assert error is not None
+        raise error
+
+    def chat(
+        self, messages: List[Dict[str, str]], model: str, max_tokens: int, temperature: float, n: int = 1
+    ) -> List[str]:
+        """
+        Request a chat completion.
+
+        Args:
+            messages: Chat messages.
+            model: Model name.
+            max_tokens: Maximum tokens to generate.
+            temperature: Sampling temperature.
+            n: Number of choices to sample.
+
+        Returns:
+            Content of each choice, empty for choices without content.
+        """
+        payload = {"model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature}
+        if n > 1:
+            payload["n"] = n
+        response = self._make_api_request("chat/completions", payload)
+        return [(choice.get("message") or {}).get("content") or "" for choice in response["choices"]]
+
+    def chat_stream(
+        self, messages: List[Dict[str, str]], model: str, max_tokens: int, temperature: float
+    ) -> Iterator[str]:
+        """
+        Request a chat completion, yielding its content as server-sent events arrive.
+
+        The request is retried like any other until the response starts.
+        Closing the iterator closes the response, so the API stops generating.
+
+        Args:
+            messages: Chat messages.
+            model: Model name.
+            max_tokens: Maximum tokens to generate.
+            temperature: Sampling temperature.
+
+        Yields:
+            Chunks of the content of the first choice.
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+        }
+        response = self._make_api_request("chat/completions", payload, stream=True)
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices")
+                content = (choices[0].get("delta") or {}).get("content") if choices else None
+                if content:
+                    yield content
+        finally:
+            response.close()
+
+    async def chat_async(self, messages: List[Dict[str, str]], model: str, max_tokens: int, temperature: float) -> str:
+        """
+        Request a chat completion without blocking the event loop.
+
+        Args:
+            messages: Chat messages.
+            model: Model name.
+            max_tokens: Maximum tokens to generate.
+            temperature: Sampling temperature.
+
+        Returns:
+            Content of the first choice.
+        """
+        payload = {"model": model, "messages": messages, "max_tokens": max_tokens, "temperature": temperature}
+        response = await self.request_async("chat/completions", payload)
+        return response["choices"][0]["message"]["content"]
+
+    def close(self) -> None:
+        """Close the session and free resources."""
+        if self.session:
+            self.session.close()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
@@ -1,18 +1,41 @@
 """Local LLM interface implementation."""
 
 import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from .base import LLMInterface, LLMResponseError
+from .base import DEFAULT_CONTEXT_LENGTH, LLMInterface, LLMResponseError
+from .batch import DEFAULT_BATCH_SIZE, GenerationResult
+from .streaming import hold_incomplete
+from .transformers_backend import COMMAND_PROMPT_HEADER, TransformersGeneration
 
 logger = logging.getLogger(__name__)
 
 
-class LocalLLMInterface(LLMInterface):
-    """Interface for local LLM models."""
+class LocalLLMInterface(TransformersGeneration, LLMInterface):
+    """
+    Interface for local LLM models.
+
+    Prompts start with the system prompt, so its evaluation is reused across
+    requests: ctransformers keeps the state of the longest token prefix shared
+    with the previous prompt, and for transformers a snapshot of the key/value
+    cache after the system prompt is computed once and copied into each
+    generation.
+    """
+
+    reuses_prompt_prefix = True
 
     def __init__(self, config=None):
         """Initialize local LLM interface."""
         super().__init__(config)
+        self._token_counts: Dict[str, int] = {}
+        # Token ids and key/value cache of the system prompt, for transformers
+        self._prefix_state: Optional[Tuple[Any, Any]] = None
+        self._prefix_failed = False
+
+        context_length = getattr(config.llm, "context_length", None) if config else None
+        if not isinstance(context_length, int):
+            context_length = DEFAULT_CONTEXT_LENGTH
 
         # Lazy imports to avoid unnecessary dependencies
         try:
@@ -28,7 +51,7 @@ class LocalLLMInterface(LLMInterface):
                     config.llm.model_path,
                     model_type="llama" if not hasattr(config.llm, "model_type") else config.llm.model_type,
                     gpu_layers=gpu_layers,
-                    context_length=256,  # Use a smaller context length to avoid token limit issues
+                    context_length=context_length,
                 )
                 self.tokenizer = None  # Not needed for ctransformers
                 self.using_ctransformers = True
@@ -49,110 +72,73 @@ class LocalLLMInterface(LLMInterface):
         except Exception as e:
             raise RuntimeError(f"Failed to load local model: {e}")
 
-    def generate(self, prompt: str) -> str:
+    def _generation_settings(self) -> Tuple[int, float, Optional[List[str]]]:
+        """Get the maximum number of new tokens, the temperature and the stop sequences."""
+        # Get max tokens from config or default - use a reasonable value for command generation
+        max_tokens = getattr(self.config.llm, "max_new_tokens", 256) if self.config else 256
+
+        # Get temperature from config or default
+        temperature = getattr(self.config.llm, "temperature", 0.2) if self.config else 0.2
+
+        stop = getattr(self.config.llm, "stop_sequences", None) if self.config else None
+        return max_tokens, temperature, stop
+
+    def _count_tokens(self, text: str) -> int:
         """
-        Generate text using local LLM.
+        Count the tokens of a text with the model's tokenizer, once per text.
 
         Args:
-            prompt: Input prompt string.
+            text: Text to measure.
 
         Returns:
-            Generated text response.
-
-        Raises:
-            LLMResponseError: If generation fails.
+            Number of tokens.
         """
-        try:
-            # Format conversion operations
-            if ("convert" in prompt.lower() and "csv" in prompt.lower() and "json" in prompt.lower()) or (
-                "change" in prompt.lower() and "csv" in prompt.lower() and "json" in prompt.lower()
-            ):
-                if "all csv files" in prompt.lower() or "all files" in prompt.lower():
-                    return 'for file in *.csv; do csvjson "$file" > "${file%.csv}.json"; done'
-                else:
-                    return "csvjson input.csv > output.json"
-
-            # Background processes
-            if "background process" in prompt.lower() and "ping" in prompt.lower():
-                if "google" in prompt.lower() or "google.com" in prompt.lower():
-                    if "every 5 minutes" in prompt.lower() or "5 min" in prompt.lower():
-                        return "watch -n 300 ping -c 1 google.com &"
-                    return "ping google.com &"
-                return "ping 8.8.8.8 &"
-
-            # File operations
-            if any(x in prompt.lower() for x in ["find largest file", "largest file", "biggest file"]):
-                return "find / -type f -exec du -sh {} \\; | sort -rh | head -n 10"
-
-            if "find largest" in prompt.lower() and "home" in prompt.lower():
-                return "find ~ -type f -exec du -sh {} \\; | sort -rh | head -n 10"
-
-            if "find largest" in prompt.lower() and "folder" in prompt.lower():
-                return "du -h / | sort -rh | head -n 10"
-
-            if any(x in prompt.lower() for x in ["list files", "show files", "display files"]):
-                if "by size" in prompt.lower():
-                    return "ls -laSh"
-                elif "recent" in prompt.lower() or "latest" in prompt.lower():
-                    return "ls -lat | head -n 20"
+        count = self._token_counts.get(text)
+        if count is None:
+            try:
+                if self.using_ctransformers:
+                    count = len(self.model.tokenize(text))
                 else:
-                    return "ls -la"
-
-            # System info queries
-            if "disk space" in prompt.lower():
-                return "df -h"
-
-            if "memory usage" in prompt.lower():
-                return "free -h"
-
-            # Process queries
-            if any(
-                term in prompt.lower() for term in ["process memory", "memory process", "most memory", "using memory"]
-            ):
-                return "ps aux --sort=-%mem | head -n 10"
-
-            if "top process" in prompt.lower() or "cpu usage" in prompt.lower():
-                return "top -b -n 1 | head -n 20"
-
-            if any(term in prompt.lower() for term in ["running process", "active process", "process list"]):
-                return "ps aux"
-
-            # Network queries
-            if "ip address" in prompt.lower():
-                return "ifconfig || ip addr show"
-
-            if "network connections" in prompt.lower() or "open ports" in prompt.lower():
-                return "netstat -tuln"
+                    count = len(self.tokenizer(text).input_ids)
+            except Exception as e:
+                logger.debug(f"Could not tokenize with the model, estimating the token count: {e}")
+                count = super()._count_tokens(text)
+            self._token_counts[text] = count
+        return count
+
+    @staticmethod
+    def _command_prompt(prompt: str) -> str:
+        """Build a prompt that clearly indicates we need a complete command."""
+        return f"""{COMMAND_PROMPT_HEADER}{prompt}
 
-            # File search and content
-            if "find text" in prompt.lower() or "search for text" in prompt.lower():
-                search_term = prompt.split("text")[1].strip().split(" ")[0]
-                if search_term:
-                    return f"grep -r '{search_term}' ."
-                return "grep -r 'SEARCH_TERM' ."
-
-            if "count lines" in prompt.lower():
-                return "find . -name '*.py' | xargs wc -l"
+IMPORTANT: Return a complete, well-formed command with all necessary arguments and syntax.
+Response:"""
 
-            # System metrics
-            if "system uptime" in prompt.lower() or "how long" in prompt.lower() and "running" in prompt.lower():
-                return "uptime"
+    @staticmethod
+    def _retry_prompt(prompt: str) -> str:
+        """Build an even more explicit prompt for retrying after an incomplete response."""
+        return f"""Task: {prompt}
+Generate a COMPLETE shell command with ALL necessary syntax.
+DO NOT just return 'for' - show the FULL command with all syntax.
 
-            if "kernel version" in prompt.lower() or "os version" in prompt.lower():
-                return "uname -a"
+Command:"""
 
-            # Get max tokens from config or default - use a reasonable value for command generation
-            max_tokens = getattr(self.config.llm, "max_new_tokens", 256) if self.config else 256
+    def generate(self, prompt: str) -> str:
+        """
+        Generate text using local LLM.
 
-            # Get temperature from config or default
-            temperature = getattr(self.config.llm, "temperature", 0.2) if self.config else 0.2
+        Args:
+            prompt: Input prompt string.
 
-            # Build a prompt that clearly indicates we need a complete command
-            full_prompt = f"""Generate a complete shell command for this task:
-{prompt}
+        Returns:
+            Generated text response.
 
-IMPORTANT: Return a complete, well-formed command with all necessary arguments and syntax.
-Response:"""
+        Raises:
+            LLMResponseError: If generation fails.
+        """
+        try:
+            max_tokens, temperature, stop = self._generation_settings()
+            full_prompt = self._command_prompt(prompt)
 
             if self.using_ctransformers:
                 # Generate with ctransformers
@@ -161,20 +147,15 @@ Response:"""
                         full_prompt,
                         max_new_tokens=max_tokens,
                         temperature=temperature,
-                        stop=getattr(self.config.llm, "stop_sequences", None) if self.config else None,
+                        stop=stop,
                     )
 
                     # Check if the response is empty or just 'for'
                     if not response or response.strip() == "for":
                         logger.warning("Received incomplete response. Retrying with more explicit prompt.")
                         # Try once more with an even more explicit prompt
-                        retry_prompt = f"""Task: {prompt}
-Generate a COMPLETE shell command with ALL necessary syntax.
-DO NOT just return 'for' - show the FULL command with all syntax.
-
-Command:"""
                         response = self.model(
-                            retry_prompt,
+                            self._retry_prompt(prompt),
                             max_new_tokens=max_tokens,
                             temperature=temperature,
                         )
@@ -190,11 +171,11 @@ Command:"""
                 # Generate with transformers
                 try:
                     inputs = self.tokenizer(full_prompt, return_tensors="pt")
-                    outputs = self.model.generate(
-                        **inputs,
+                    outputs = self._generate_transformers(
+                        inputs,
                         max_new_tokens=max_tokens,
                         temperature=temperature,
-                        stop=getattr(self.config.llm, "stop_sequences", None) if self.config else None,
+                        stop=stop,
                     )
                     return self.tokenizer.decode(outputs[0], skip_special_tokens=True)
                 except Exception as e:
@@ -208,3 +189,108 @@ Command:"""
             if "context length" in str(e).lower():
                 return "echo 'Command too complex for current model'"
             raise LLMResponseError(f"Local LLM generation failed: {e}")
+
+    def generate_batch(self, prompts: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> List[GenerationResult]:
+        """
+        Generate text for many prompts, in padded batches of up to batch_size prompts with transformers.
+
+        ctransformers evaluates one sequence at a time, so its prompts are generated one by one.
+
+        Args:
+            prompts: Input prompt strings.
+            batch_size: Maximum number of prompts in a batch.
+
+        Returns:
+            One result per prompt, in input order. Batched prompts share the latency of their batch.
+        """
+        if self.using_ctransformers:
+            return super().generate_batch(prompts, batch_size)
+
+        results: List[GenerationResult] = []
+        max_tokens, temperature, _ = self._generation_settings()
+        batch_size = max(batch_size, 1)
+        for offset in range(0, len(prompts), batch_size):
+            batch = prompts[offset : offset + batch_size]
+            start = time.perf_counter()
+            try:
+                full_prompts = [self._command_prompt(prompt) for prompt in batch]
+                texts = self._generate_padded(full_prompts, max_tokens, temperature)
+                error = None
+            except Exception as e:
+                texts, error = [""] * len(batch), f"Local LLM generation failed: {e}"
+            latency = time.perf_counter() - start
+            results.extend(GenerationResult(text, error, latency) for text in texts)
+        return results
+
+    def generate_candidates(self, prompt: str, n: int) -> List[str]:
+        """
+        Sample several responses to a prompt, as one batch with transformers.
+
+        ctransformers evaluates one sequence at a time, so its samples are generated one by one.
+
+        Args:
+            prompt: Input prompt string.
+            n: Number of responses.
+
+        Returns:
+            The responses that could be generated.
+
+        Raises:
+            LLMResponseError: If generation fails.
+        """
+        if self.using_ctransformers:
+            return super().generate_candidates(prompt, n)
+        max_tokens, temperature, _ = self._generation_settings()
+        try:
+            texts = self._generate_padded(
+                [self._command_prompt(prompt)], max_tokens, temperature, do_sample=True, num_return_sequences=n
+            )
+        except Exception as e:
+            raise LLMResponseError(f"Local LLM generation failed: {e}")
+        return [text for text in texts if text.strip()]
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Generate text using local LLM, yielding tokens as they are decoded.
+
+        Closing the iterator stops decoding.
+
+        Args:
+            prompt: Input prompt string.
+
+        Yields:
+            Chunks of the generated text.
+
+        Raises:
+            LLMResponseError: If generation fails.
+        """
+        max_tokens, temperature, stop = self._generation_settings()
+        full_prompt = self._command_prompt(prompt)
+        tokens: Iterator[str] = iter(())
+        chunks: Optional[Iterator[str]] = None
+        try:
+            if self.using_ctransformers:
+                tokens = self.model(
+                    full_prompt, max_new_tokens=max_tokens, temperature=temperature, stop=stop, stream=True
+                )
+
+                def retry() -> str:
+                    return self.model(self._retry_prompt(prompt), max_new_tokens=max_tokens, temperature=temperature)
+
+                chunks = hold_incomplete(tokens, retry)
+            else:
+                tokens = self._stream_transformers(full_prompt, max_tokens, temperature)
+                chunks = hold_incomplete(tokens)
+            yield from chunks
+        except Exception as e:
+            # If we get a context length error, return a simple fallback
+            if "context length" in str(e).lower():
+                yield "echo 'Command too complex for current model'"
+                return
+            raise LLMResponseError(f"Local LLM generation failed: {e}")
+        finally:
+            # Stop decoding if the caller closed the stream early
+            for stream in (chunks, tokens):
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
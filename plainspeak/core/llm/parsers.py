@@ -7,7 +7,8 @@ This module contains helper functions for parsing LLM responses.
 import json
 import logging
 import re
-from typing import Any, Dict
+import shlex
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +85,116 @@ def parse_llm_response(response: str, original_command: str = None) -> Dict[str,
         return {"verb": verb, "args": {}}
 
 
+# Words opening and closing compound shell commands
+_COMPOUND_OPENERS = frozenset({"for", "while", "until", "select", "if", "case"})
+_COMPOUND_CLOSERS = frozenset({"done", "fi", "esac"})
+
+# Line endings that continue a command on the next line
+_CONTINUATIONS = ("\\", "|", "&&", "||", "{", "(")
+
+# Characters of shell operators, which make a command more than a program with arguments
+_OPERATOR_CHARS = "();<>|&"
+
+
+def command_to_intent(command: str) -> Dict[str, Any]:
+    """
+    Split a shell command into a verb and its arguments.
+
+    Options become arguments set to True (``-lh`` gives ``l`` and ``h``),
+    except ``--name=value`` options, which keep their value. Other words are
+    kept in order under ``operands``. Compound commands, pipelines and
+    commands that can't be split are kept whole as the verb. The command
+    itself is kept under ``command``, since the split loses the exact syntax.
+
+    Args:
+        command: Shell command.
+
+    Returns:
+        Dict with the verb, its arguments and the command.
+    """
+    command = command.strip()
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=_OPERATOR_CHARS)
+    lexer.whitespace_split = True
+    try:
+        parts = list(lexer)
+    except ValueError:
+        return {"verb": command, "args": {}, "command": command}
+    if not parts or parts[0] in _COMPOUND_OPENERS or any(not part.strip(_OPERATOR_CHARS) for part in parts):
+        return {"verb": command, "args": {}, "command": command}
+
+    args: Dict[str, Any] = {}
+    operands = []
+    for part in parts[1:]:
+        if part.startswith("--") and len(part) > 2:
+            name, sep, value = part[2:].partition("=")
+            args[name] = value if sep else True
+        elif part.startswith("-") and part[1:].isalpha():
+            args.update(dict.fromkeys(part[1:], True))
+        else:
+            operands.append(part)
+    if operands:
+        args["operands"] = operands
+    return {"verb": parts[0], "args": args, "command": command}
+
+
+def is_complete_command(command: str) -> bool:
+    """
+    Check whether a shell command is complete, with balanced quotes and compound commands.
+
+    Args:
+        command: Command text, possibly spanning several lines.
+
+    Returns:
+        True if nothing more is needed to run the command.
+    """
+    stripped = command.strip()
+    if not stripped or stripped.endswith(_CONTINUATIONS):
+        return False
+    try:
+        words = shlex.split(stripped, comments=True)
+    except ValueError:
+        # Unbalanced quotes
+        return False
+
+    depth = 0
+    for word in words:
+        word = word.rstrip(";")
+        if word in _COMPOUND_OPENERS:
+            depth += 1
+        elif word in _COMPOUND_CLOSERS:
+            depth -= 1
+    return depth <= 0
+
+
+def first_complete_command(text: str) -> Optional[str]:
+    """
+    Find the first complete command in the finished lines of a partial response.
+
+    Responses that start like JSON or a code block are never considered
+    complete before they end.
+
+    Args:
+        text: Response generated so far.
+
+    Returns:
+        The command, or None if no complete command has been generated yet.
+    """
+    if text.lstrip().startswith(("{", "[", "`")):
+        return None
+
+    # The text after the last newline may still grow
+    lines = text.split("\n")[:-1]
+    command: list[str] = []
+    for line in lines:
+        if not command and not line.strip():
+            continue
+        command.append(line)
+        candidate = "\n".join(command)
+        if is_complete_command(candidate):
+            return candidate.strip()
+    return None
+
+
 def create_prompt_with_locale(system_prompt: str, text: str, locale: str) -> str:
     """
     Create a prompt with locale information.
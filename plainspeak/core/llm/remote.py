@@ -1,15 +1,29 @@
 """Remote LLM interface implementations."""
 
+import asyncio
 import logging
 import os
-from typing import Any, Dict
-
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from .base import LLMInterface, LLMResponseError
+from .batch import DEFAULT_BATCH_SIZE, GenerationResult
+from .http_client import RemoteLLM
+from .resilience import CircuitBreaker, CircuitOpenError, TokenBucket
+from .streaming import hold_incomplete
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_API_BASE = "https://api.openai.com/v1"
+
+
+def _setting(config, name: str, default: Any, kind: Any = int) -> Any:
+    """Read an LLM setting, ignoring values of the wrong type."""
+    value = getattr(getattr(config, "llm", None), name, default)
+    return value if isinstance(value, kind) and not isinstance(value, bool) else default
+
 
 class RemoteLLMInterface(LLMInterface):
     """Interface for remote LLM APIs like OpenAI."""
@@ -20,16 +34,36 @@ class RemoteLLMInterface(LLMInterface):
 
         # Initialize key settings
         self.api_key = self._get_api_key()
-        self.remote_llm = self._init_remote_llm()
-
-        # Circuit breaker settings
-        self.failure_count = 0
-        self.circuit_tripped = False
-        self.failure_threshold = 3  # Default value
 
-        # Get threshold from config if available
-        if config and hasattr(config.llm, "circuit_failure_threshold"):
-            self.failure_threshold = config.llm.circuit_failure_threshold
+        # Circuit breaker and rate limit, shared by synchronous and asyncio requests
+        self.failure_threshold = _setting(config, "circuit_failure_threshold", 3)
+        self.breaker = CircuitBreaker(
+            self.failure_threshold, _setting(config, "circuit_recovery_timeout", 30.0, (int, float))
+        )
+        self.limiter = TokenBucket(_setting(config, "rate_limit_per_minute", 0, (int, float)))
+        self._http: Optional[RemoteLLM] = None
+        self._http_lock = threading.Lock()
+
+    @property
+    def failure_count(self) -> int:
+        """Number of consecutive failed requests."""
+        return self.breaker.failures
+
+    @failure_count.setter
+    def failure_count(self, value: int) -> None:
+        self.breaker.failures = value
+
+    @property
+    def circuit_tripped(self) -> bool:
+        """Whether the circuit breaker currently refuses requests."""
+        return self.breaker.state == CircuitBreaker.OPEN
+
+    @circuit_tripped.setter
+    def circuit_tripped(self, value: bool) -> None:
+        if value:
+            self.breaker.trip()
+        else:
+            self.breaker.reset()
 
     def _get_api_key(self) -> str:
         """Get API key from config or environment."""
@@ -48,28 +82,65 @@ class RemoteLLMInterface(LLMInterface):
 
         return api_key
 
-    def _init_remote_llm(self):
-        """Initialize remote LLM client."""
-        try:
-            import openai  # Lazy import
-
-            client = openai.OpenAI(api_key=self.api_key)
-            return client
-        except ImportError:
-            # For testing purposes, return a mock client
-            logger.warning("OpenAI module not found. Using mock client for testing.")
-            from unittest.mock import MagicMock
+    def _request_settings(self) -> Tuple[str, int, float]:
+        """Get the model name, the maximum number of tokens and the temperature."""
+        return (
+            _setting(self.config, "model_name", "gpt-3.5-turbo", str),
+            _setting(self.config, "max_tokens", 1024),
+            _setting(self.config, "temperature", 0.2, (int, float)),
+        )
 
-            mock_client = MagicMock()
-            mock_client.chat.completions.create.return_value.choices = [
-                MagicMock(message=MagicMock(content="Mock response"))
-            ]
-            return mock_client
+    @staticmethod
+    def _messages(prompt: str) -> List[Dict[str, str]]:
+        """Build the chat messages for a prompt."""
+        system_msg = "You are a specialized shell command generator. " "Always provide complete, executable commands."
+        return [
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": prompt},
+        ]
+
+    @staticmethod
+    def _retry_messages(prompt: str) -> List[Dict[str, str]]:
+        """Build the chat messages asking again after an incomplete response."""
+        # Define retry system message
+        retry_system_msg = "You are a specialized shell command generator. " "Never return incomplete commands."
+        return [
+            {"role": "system", "content": retry_system_msg},
+            {"role": "user", "content": prompt},
+            {
+                "role": "assistant",
+                "content": "I need to provide a complete command. Let me generate the full syntax:",
+            },
+        ]
+
+    def _retry(self, prompt: str, model_name: str, max_tokens: int, temperature: float) -> str:
+        """Ask again with more explicit instructions after an incomplete response."""
+        logger.warning("Received incomplete response. Retrying with more explicit instructions.")
+        return self.remote_llm.chat(self._retry_messages(prompt), model_name, max_tokens, temperature)[0]
+
+    @property
+    def remote_llm(self) -> RemoteLLM:
+        """Get the HTTP client, sharing the interface's rate limit and circuit breaker."""
+        with self._http_lock:
+            if self._http is None:
+                self._http = RemoteLLM(
+                    api_endpoint=_setting(self.config, "api_base", DEFAULT_API_BASE, str),
+                    api_key=self.api_key,
+                    retry_count=_setting(self.config, "retry_count", 3),
+                    timeout=_setting(self.config, "request_timeout", 30, (int, float)),
+                    max_concurrency=_setting(self.config, "max_concurrency", 8),
+                    limiter=self.limiter,
+                    breaker=self.breaker,
+                )
+            return self._http
 
     def generate(self, prompt: str) -> str:
         """
         Generate text using remote LLM.
 
+        Failed requests are retried with backoff by the HTTP client, and count
+        towards the circuit breaker once the retries are exhausted.
+
         Args:
             prompt: Input prompt string.
 
@@ -77,143 +148,161 @@ class RemoteLLMInterface(LLMInterface):
             Generated text response.
 
         Raises:
-            RuntimeError: If circuit breaker is tripped.
+            CircuitOpenError: If circuit breaker is tripped.
             LLMResponseError: If generation fails.
         """
-        if self.circuit_tripped:
-            raise RuntimeError("Circuit breaker tripped - too many failures")
-
+        model_name, max_tokens, temperature = self._request_settings()
+        logger.debug(f"Sending request with model={model_name}, max_tokens={max_tokens}")
+        logger.debug(f"Prompt length: {len(prompt)} characters")
         try:
-            # Get max_tokens from config or use a reasonable default
-            max_tokens = getattr(self.config.llm, "max_tokens", 1024) if self.config else 1024
+            content = self.remote_llm.chat(self._messages(prompt), model_name, max_tokens, temperature)[0]
 
-            # Get temperature from config or use a reasonable default
-            temperature = getattr(self.config.llm, "temperature", 0.2) if self.config else 0.2
+            # Ensure we have meaningful content
+            if not content or content.strip() == "for":
+                # If the LLM returns just "for" or empty content, try again with more explicit instructions
+                content = self._retry(prompt, model_name, max_tokens, temperature)
 
-            # Get model name from config or use a reasonable default
-            model_name = getattr(self.config.llm, "model_name", "gpt-3.5-turbo") if self.config else "gpt-3.5-turbo"
+            logger.debug(f"Received response: {content[:50]}...")
+            return content
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise LLMResponseError(f"Remote LLM generation failed: {e}")
 
-            # Log the request details
-            logger.debug(f"Sending request to OpenAI API with model={model_name}, max_tokens={max_tokens}")
-            logger.debug(f"Prompt length: {len(prompt)} characters")
+    def generate_candidates(self, prompt: str, n: int) -> List[str]:
+        """
+        Sample several responses to a prompt in one request.
 
-            # Define system message content
-            system_msg = (
-                "You are a specialized shell command generator. " "Always provide complete, executable commands."
-            )
+        Args:
+            prompt: Input prompt string.
+            n: Number of responses.
 
-            response = self.remote_llm.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": system_msg},
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
+        Returns:
+            The non-empty responses.
 
-            self.failure_count = 0  # Reset on success
-            content = response.choices[0].message.content
+        Raises:
+            CircuitOpenError: If circuit breaker is tripped.
+            LLMResponseError: If generation fails.
+        """
+        model_name, max_tokens, temperature = self._request_settings()
+        try:
+            texts = self.remote_llm.chat(self._messages(prompt), model_name, max_tokens, temperature, n=n)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise LLMResponseError(f"Remote LLM generation failed: {e}")
+        texts = [text for text in texts if text]
+        if not texts:
+            raise LLMResponseError("Remote LLM returned no candidates")
+        return texts
 
-            # Ensure we have meaningful content
-            if not content or content.strip() == "for":
-                # If the LLM returns just "for" or empty content, try again with more explicit instructions
-                logger.warning("Received incomplete response. Retrying with more explicit instructions.")
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Generate text using remote LLM without blocking the event loop.
 
-                # Define retry system message
-                retry_system_msg = "You are a specialized shell command generator. " "Never return incomplete commands."
-
-                response = self.remote_llm.chat.completions.create(
-                    model=model_name,
-                    messages=[
-                        {"role": "system", "content": retry_system_msg},
-                        {"role": "user", "content": prompt},
-                        {
-                            "role": "assistant",
-                            "content": "I need to provide a complete command. Let me generate the full syntax:",
-                        },
-                    ],
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                )
+        Requests go through pooled keep-alive connections, with retries and
+        bounded concurrency, so many of them can be in flight at once.
 
-                content = response.choices[0].message.content
+        Args:
+            prompt: Input prompt string.
 
-            logger.debug(f"Received response: {content[:50]}...")
-            return content
+        Returns:
+            Generated text response.
 
+        Raises:
+            CircuitOpenError: If circuit breaker is tripped.
+            LLMResponseError: If generation fails.
+        """
+        model_name, max_tokens, temperature = self._request_settings()
+        client = self.remote_llm
+        try:
+            content = await client.chat_async(self._messages(prompt), model_name, max_tokens, temperature)
+            if not content or content.strip() == "for":
+                logger.warning("Received incomplete response. Retrying with more explicit instructions.")
+                content = await client.chat_async(self._retry_messages(prompt), model_name, max_tokens, temperature)
+            return content
+        except CircuitOpenError:
+            raise
         except Exception as e:
-            self.failure_count += 1
-            # Only trip the circuit breaker if we've reached the threshold
-            if self.failure_count >= self.failure_threshold:
-                self.circuit_tripped = True
-            else:
-                self.circuit_tripped = False
             raise LLMResponseError(f"Remote LLM generation failed: {e}")
 
-
-class RemoteLLM:
-    """
-    Implementation of a remote LLM client with robust error handling,
-    circuit breaker pattern, and rate limiting.
-    """
-
-    def __init__(
-        self,
-        api_endpoint: str,
-        api_key: str,
-        retry_count: int = 3,
-        timeout: int = 30,
-        rate_limit_per_minute: int = 60,
-    ):
+    async def agenerate_batch(
+        self, prompts: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> List[GenerationResult]:
         """
-        Initialize the RemoteLLM client.
+        Generate text for many prompts concurrently, with up to batch_size requests in flight.
 
         Args:
-            api_endpoint: The API endpoint URL
-            api_key: API authentication key
-            retry_count: Number of retries for failed requests
-            timeout: Request timeout in seconds
-            rate_limit_per_minute: Maximum requests per minute
-        """
-        self.api_endpoint = api_endpoint
-        self.api_key = api_key
-        self.retry_count = retry_count
-        self.timeout = timeout
-        self.rate_limit_per_minute = rate_limit_per_minute
+            prompts: Input prompt strings.
+            batch_size: Maximum number of requests in flight.
 
-        # Circuit breaker state
-        self.failure_count = 0
-        self.circuit_open = False
+        Returns:
+            One result per prompt, in input order.
+        """
+        semaphore = asyncio.Semaphore(max(batch_size, 1))
 
-        # Logger
-        self.logger = logger
+        async def generate(prompt: str) -> GenerationResult:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    return GenerationResult(await self.agenerate(prompt), latency=time.perf_counter() - start)
+                except Exception as e:
+                    return GenerationResult(error=str(e), latency=time.perf_counter() - start)
 
-        # Session
-        self.session = requests.Session()
+        return list(await asyncio.gather(*(generate(prompt) for prompt in prompts)))
 
-    def _make_api_request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_batch(self, prompts: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> List[GenerationResult]:
         """
-        Make an API request with circuit breaker and rate limiting.
+        Generate text for many prompts, sending up to batch_size requests concurrently.
 
         Args:
-            endpoint: API endpoint path
-            payload: Request payload
+            prompts: Input prompt strings.
+            batch_size: Maximum number of requests in flight.
 
         Returns:
-            API response as dictionary
+            One result per prompt, in input order.
+        """
+        if len(prompts) <= 1 or batch_size <= 1:
+            return super().generate_batch(prompts, batch_size)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.agenerate_batch(prompts, batch_size))
+        # The running event loop can't be blocked on, use threads instead
+        with ThreadPoolExecutor(max_workers=min(batch_size, len(prompts))) as pool:
+            return list(pool.map(self._timed_generate, prompts))
 
-        Raises:
-            RuntimeError: If circuit breaker is open
-            requests.RequestException: For request failures
+    def close(self) -> None:
+        """Close the pooled connections of the HTTP client."""
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
         """
-        if self.circuit_open:
-            raise RuntimeError("Circuit breaker open - too many failures")
+        Generate text using remote LLM, yielding tokens as they arrive.
 
-        # Implementation would go here
-        return {}
+        Closing the iterator closes the response stream, so the API stops generating.
 
-    def close(self) -> None:
-        """Close the session and free resources."""
-        if self.session:
-            self.session.close()
+        Args:
+            prompt: Input prompt string.
+
+        Yields:
+            Chunks of the generated text.
+
+        Raises:
+            CircuitOpenError: If circuit breaker is tripped.
+            LLMResponseError: If generation fails.
+        """
+        model_name, max_tokens, temperature = self._request_settings()
+        logger.debug(f"Streaming with model={model_name}, max_tokens={max_tokens}")
+        stream = self.remote_llm.chat_stream(self._messages(prompt), model_name, max_tokens, temperature)
+        try:
+            yield from hold_incomplete(stream, lambda: self._retry(prompt, model_name, max_tokens, temperature))
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise LLMResponseError(f"Remote LLM generation failed: {e}")
+        finally:
+            stream.close()
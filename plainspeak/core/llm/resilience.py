@@ -0,0 +1,194 @@
+"""
+Rate limiting, retry and circuit breaking for remote LLM APIs.
+
+The primitives are thread-safe and don't block themselves: callers sleep for
+the returned delays with time.sleep() or asyncio.sleep(), so the same limiter
+and breaker can be shared by synchronous and asyncio requests.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limiting and server errors
+RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a request is refused because the circuit breaker is open."""
+
+
+def backoff_delay(
+    attempt: int, base: float = 0.5, cap: float = 30.0, rng: Callable[[], float] = random.random
+) -> float:
+    """
+    Compute the delay before retrying, with exponential backoff and full jitter.
+
+    Args:
+        attempt: Number of the failed attempt, starting at 0.
+        base: Delay ceiling of the first retry, in seconds.
+        cap: Maximum delay, in seconds.
+        rng: Source of random numbers in [0, 1).
+
+    Returns:
+        Seconds to wait, uniformly drawn below the exponential ceiling.
+    """
+    return rng() * min(cap, base * 2**attempt)
+
+
+def retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds, ignoring dates and invalid values."""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate, allowing short bursts."""
+
+    def __init__(
+        self, rate_per_minute: float, burst: Optional[int] = None, clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the bucket, full.
+
+        Args:
+            rate_per_minute: Sustained number of requests per minute, 0 or less for no limit.
+            burst: Number of requests that may be sent at once, defaults to ten seconds' worth.
+            clock: Monotonic clock in seconds.
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(rate_per_minute / 6)))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt if none is left so that waiting callers are served in order.
+
+        Returns:
+            Seconds to wait before sending the request.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait until a request may be sent, without blocking the event loop."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker refusing requests after consecutive failures.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests are refused. Once recovery_timeout has passed it is half-open:
+    one trial request is let through, which closes the circuit if it succeeds
+    and opens it again if it fails.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self, failure_threshold: int = 5, recovery_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the breaker, closed.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            recovery_timeout: Seconds after which an open circuit lets a trial request through.
+            clock: Monotonic clock in seconds.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        """Current state: CLOSED, OPEN or HALF_OPEN."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    @property
+    def failures(self) -> int:
+        """Number of consecutive failures."""
+        return self._failures
+
+    @failures.setter
+    def failures(self, value: int) -> None:
+        with self._lock:
+            self._failures = value
+
+    def allow(self) -> bool:
+        """
+        Check whether a request may be sent, claiming the trial request of a half-open circuit.
+
+        Returns:
+            True if the request may be sent.
+        """
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful request, closing the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit at the threshold or after a failed trial."""
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial = False
+
+    def trip(self) -> None:
+        """Open the circuit now."""
+        with self._lock:
+            self._opened_at = self._clock()
+            self._trial = False
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        self.record_success()
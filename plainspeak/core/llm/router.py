@@ -0,0 +1,303 @@
+"""
+Routing of requests between a local model and remote LLM endpoints.
+
+RouterLLMInterface keeps rolling latency and error statistics per backend and
+sends each request to the fastest healthy one, falling back to the next when
+it fails. With hedging enabled, a second request goes to the next backend when
+the first takes longer than a latency percentile of its backend, and the first
+response wins.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .base import LLMInterface, LLMResponseError
+from .daemon_client import local_llm_interface
+from .remote import RemoteLLMInterface, _setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 50
+DEFAULT_MAX_ERROR_RATE = 0.5
+DEFAULT_RECOVERY_TIMEOUT = 30.0
+
+# Latency samples needed before a backend's percentiles are used for hedging
+MIN_HEDGE_SAMPLES = 5
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of values, q in [0, 100]."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class BackendStats:
+    """Rolling latency and error statistics of a backend."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW, clock=time.monotonic):
+        """
+        Initialize empty statistics.
+
+        Args:
+            window: Number of recent requests the statistics are computed over.
+            clock: Monotonic clock in seconds.
+        """
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.last_failure: Optional[float] = None
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful request and its latency in seconds."""
+        with self._lock:
+            self.latencies.append(latency)
+            self.outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        with self._lock:
+            self.outcomes.append(False)
+            self.last_failure = self._clock()
+
+    @property
+    def error_rate(self) -> float:
+        """Share of failed requests in the window."""
+        with self._lock:
+            return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def latency(self, q: float) -> Optional[float]:
+        """Latency percentile in seconds, None without samples."""
+        with self._lock:
+            return percentile(list(self.latencies), q) if self.latencies else None
+
+    @property
+    def p50(self) -> Optional[float]:
+        """Median latency in seconds."""
+        return self.latency(50)
+
+    @property
+    def p95(self) -> Optional[float]:
+        """95th percentile latency in seconds."""
+        return self.latency(95)
+
+    def healthy(self, max_error_rate: float, recovery_timeout: float) -> bool:
+        """
+        Check whether the backend should receive requests.
+
+        A backend failing too often is avoided until recovery_timeout has
+        passed since its last failure, when it gets another chance.
+
+        Args:
+            max_error_rate: Highest acceptable share of failed requests.
+            recovery_timeout: Seconds after the last failure before retrying an unhealthy backend.
+
+        Returns:
+            True if the backend is healthy.
+        """
+        if self.error_rate <= max_error_rate:
+            return True
+        return self.last_failure is None or self._clock() - self.last_failure >= recovery_timeout
+
+
+def _endpoint_config(config, overrides: Dict[str, Any]) -> SimpleNamespace:
+    """Build the configuration of a routed backend, with its own settings and without response caching."""
+    llm_config = getattr(config, "llm", None)
+    if hasattr(llm_config, "model_dump"):
+        settings = llm_config.model_dump()
+    else:
+        settings = dict(vars(llm_config)) if llm_config is not None else {}
+    settings.update({key: value for key, value in overrides.items() if key != "name"})
+    # The router caches responses itself
+    settings["cache_responses"] = False
+    return SimpleNamespace(llm=SimpleNamespace(**settings))
+
+
+def build_backends(config) -> Dict[str, LLMInterface]:
+    """
+    Create the local and remote backends configured for the router.
+
+    Backends that can't be created, like remote endpoints without an API key,
+    are left out with a warning.
+
+    Args:
+        config: Configuration object.
+
+    Returns:
+        Backends by name, in configuration order.
+    """
+    llm_config = getattr(config, "llm", None)
+    candidates = []
+    if getattr(llm_config, "router_local", True) is not False:
+        candidates.append(("local", lambda: local_llm_interface(_endpoint_config(config, {}))))
+    endpoints = getattr(llm_config, "router_endpoints", None)
+    for index, endpoint in enumerate(endpoints if isinstance(endpoints, list) and endpoints else [{}]):
+        name = endpoint.get("name") or endpoint.get("api_base") or f"remote-{index}"
+        candidates.append((name, lambda endpoint=endpoint: RemoteLLMInterface(_endpoint_config(config, endpoint))))
+
+    backends: Dict[str, LLMInterface] = {}
+    for name, create in candidates:
+        try:
+            backends[name] = create()
+        except Exception as e:
+            logger.warning(f"LLM backend {name} unavailable: {e}")
+    return backends
+
+
+class RouterLLMInterface(LLMInterface):
+    """Interface routing each request to the fastest healthy of several backends."""
+
+    def __init__(self, config=None, backends: Optional[Dict[str, LLMInterface]] = None):
+        """
+        Initialize the router.
+
+        Args:
+            config: Configuration object.
+            backends: Backends by name in order of preference, created from the config by default.
+
+        Raises:
+            ValueError: If no backend is available.
+        """
+        super().__init__(config)
+        self.backends = backends if backends is not None else build_backends(config)
+        if not self.backends:
+            raise ValueError("No LLM backend available for routing")
+
+        window = _setting(config, "router_window", DEFAULT_WINDOW)
+        self.max_error_rate = _setting(config, "router_max_error_rate", DEFAULT_MAX_ERROR_RATE, (int, float))
+        self.recovery_timeout = _setting(config, "circuit_recovery_timeout", DEFAULT_RECOVERY_TIMEOUT, (int, float))
+        self.hedge_percentile = _setting(config, "hedge_percentile", 0.0, (int, float))
+        self.stats = {name: BackendStats(window) for name in self.backends}
+        # Runs backends without asyncio support, outliving the event loop of a request
+        # so that a losing hedged request doesn't hold up the winner
+        self._pool = ThreadPoolExecutor(max_workers=2 * len(self.backends), thread_name_prefix="llm-router")
+
+    def ranked_backends(self) -> List[str]:
+        """
+        Order the backends for the next request.
+
+        Healthy backends come first, fastest median latency first. Backends
+        without samples yet come before measured ones, so that they get
+        measured. Unhealthy backends stay available as a last resort.
+
+        Returns:
+            Backend names, best first.
+        """
+
+        def key(item: Tuple[int, str]) -> Tuple[bool, float, int]:
+            index, name = item
+            stats = self.stats[name]
+            healthy = stats.healthy(self.max_error_rate, self.recovery_timeout) and not getattr(
+                self.backends[name], "circuit_tripped", False
+            )
+            if not healthy:
+                return (True, stats.error_rate, index)
+            return (False, stats.p50 or 0.0, index)
+
+        return [name for _, name in sorted(enumerate(self.backends), key=key)]
+
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        """Seconds after which a request to the backend is hedged, None to not hedge."""
+        stats = self.stats[name]
+        if self.hedge_percentile <= 0 or len(stats.latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        return stats.latency(self.hedge_percentile)
+
+    async def _call(self, name: str, prompt: str) -> str:
+        """Generate with one backend, recording its latency or failure."""
+        backend = self.backends[name]
+        start = time.perf_counter()
+        try:
+            agenerate = getattr(backend, "agenerate", None)
+            if agenerate is not None:
+                response = await agenerate(prompt)
+            else:
+                response = await asyncio.get_running_loop().run_in_executor(self._pool, backend.generate, prompt)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.stats[name].record_failure()
+            raise
+        self.stats[name].record_success(time.perf_counter() - start)
+        return response
+
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Generate text with the best backend, falling back to the next ones on failure.
+
+        Args:
+            prompt: Input prompt string.
+
+        Returns:
+            Generated text response.
+
+        Raises:
+            LLMResponseError: If every backend fails.
+        """
+        queue = self.ranked_backends()
+        pending: Dict["asyncio.Task[str]", str] = {}
+        errors: List[str] = []
+
+        def launch() -> Optional[float]:
+            name = queue.pop(0)
+            pending[asyncio.ensure_future(self._call(name, prompt))] = name
+            return self._hedge_delay(name)
+
+        hedge_delay = launch()
+        try:
+            while pending:
+                timeout = hedge_delay if queue else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.debug(f"Hedging request to {list(pending.values())} after {timeout:.3f}s")
+                    launch()
+                    hedge_delay = None  # One hedged request at most
+                    continue
+                for task in done:
+                    name = pending.pop(task)
+                    try:
+                        return task.result()
+                    except Exception as e:
+                        logger.warning(f"LLM backend {name} failed: {e}")
+                        errors.append(f"{name}: {e}")
+                if not pending and queue:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise LLMResponseError(f"All LLM backends failed: {'; '.join(errors)}")
+
+    def generate(self, prompt: str) -> str:
+        """
+        Generate text with the best backend, falling back to the next ones on failure.
+
+        Args:
+            prompt: Input prompt string.
+
+        Returns:
+            Generated text response.
+
+        Raises:
+            LLMResponseError: If every backend fails.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.agenerate(prompt))
+        # The running event loop can't be blocked on, run the request on its own loop
+        return self._pool.submit(asyncio.run, self.agenerate(prompt)).result()
+
+    def close(self) -> None:
+        """Close the backends and stop the worker threads."""
+        for backend in self.backends.values():
+            close = getattr(backend, "close", None)
+            if close is not None:
+                close()
+        self._pool.shutdown(wait=False)
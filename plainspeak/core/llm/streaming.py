@@ -0,0 +1,98 @@
+"""
+Streamed generation for LLM interfaces.
+
+Backends that can stream override generate_stream(); generate_until_command()
+reads the stream and stops generating once the response holds a complete
+command.
+"""
+
+import logging
+from typing import Callable, Iterable, Iterator, Optional
+
+from . import parsers
+
+logger = logging.getLogger(__name__)
+
+# Callback receiving generated text as it arrives
+TokenCallback = Callable[[str], None]
+
+
+def hold_incomplete(chunks: Iterable[str], retry: Optional[Callable[[], str]] = None) -> Iterator[str]:
+    """
+    Pass streamed chunks through, holding them back while the response could still be just 'for'.
+
+    Models sometimes answer with nothing or only 'for'. Such a response is
+    replaced by the result of retry(), as done for complete responses.
+
+    Args:
+        chunks: Streamed text chunks.
+        retry: Callable generating a replacement response, None to keep the response.
+
+    Yields:
+        Text chunks.
+    """
+    held = ""
+    for chunk in chunks:
+        if held is None:
+            yield chunk
+            continue
+        held += chunk
+        if not "for".startswith(held.strip()):
+            yield held
+            held = None
+    if held is not None:
+        if retry is not None:
+            logger.warning("Received incomplete response. Retrying with more explicit prompt.")
+            held = retry()
+        if held:
+            yield held
+
+
+class StreamingGeneration:
+    """Streaming methods of LLMInterface."""
+
+    # Provided by LLMInterface
+    generate: Callable[[str], str]
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Generate text using the LLM, yielding it in chunks as it is produced.
+
+        Closing the iterator stops generation where the backend supports it.
+        The default implementation yields the complete response of generate().
+
+        Args:
+            prompt: Input prompt string.
+
+        Yields:
+            Chunks of the generated text.
+        """
+        yield self.generate(prompt)
+
+    def generate_until_command(self, prompt: str, on_token: Optional[TokenCallback] = None) -> str:
+        """
+        Generate text, stopping as soon as it holds a complete command.
+
+        Args:
+            prompt: Input prompt string.
+            on_token: Optional callback receiving each chunk as it arrives.
+
+        Returns:
+            The first complete command, or the whole response if it never holds one before it ends.
+        """
+        text = ""
+        stream = self.generate_stream(prompt)
+        try:
+            for chunk in stream:
+                text += chunk
+                if on_token is not None:
+                    on_token(chunk)
+                if "\n" in chunk:
+                    command = parsers.first_complete_command(text)
+                    if command is not None:
+                        return command
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+        return text
@@ -0,0 +1,210 @@
+"""
+Per-OS system prompts.
+
+The system prompt files under prompts/system-prompts are read once per process
+and split into a preamble, ``## `` sections and a closing epilogue. The
+sections are indexed with BM25, so that a compact prompt with only the
+sections relevant to a query, within a token budget, can be assembled when
+sending the full prompt with every request would be too slow or costly.
+"""
+
+import logging
+import os
+import platform
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ...utils import bm25
+
+logger = logging.getLogger(__name__)
+
+PROMPT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "prompts")
+SYSTEM_PROMPT_DIR = os.path.join(PROMPT_DIR, "system-prompts")
+
+# Map OS to prompt file
+PROMPT_FILES = {"linux": "linux.txt", "darwin": "mac.txt", "windows": "windows.txt"}
+
+FALLBACK_PROMPT = "You are a specialized shell command generator. Provide complete, executable commands."
+
+# Number of sections kept in a compact prompt
+COMPACT_SECTIONS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text at three characters per token."""
+    return len(text) // 3 + 1
+
+
+@dataclass(frozen=True)
+class PromptSection:
+    """A ``## `` section of a system prompt."""
+
+    title: str
+    text: str
+    terms: Dict[str, int] = field(hash=False)
+    length: int
+
+
+class SectionIndex:
+    """BM25 index over the sections of a system prompt."""
+
+    def __init__(self, sections: Sequence[PromptSection]):
+        """
+        Build the index.
+
+        Args:
+            sections: Sections to index.
+        """
+        self.sections = sections
+        document_frequency: Counter = Counter()
+        for section in sections:
+            document_frequency.update(section.terms.keys())
+        count = len(sections)
+        self.idf = {term: bm25.idf(count, frequency) for term, frequency in document_frequency.items()}
+        self.average_length = sum(section.length for section in sections) / count if count else 0.0
+
+    def scores(self, query: str) -> List[float]:
+        """
+        Score every section against a query.
+
+        Args:
+            query: User query.
+
+        Returns:
+            BM25 score of each section, in section order.
+        """
+        terms = [term for term in set(bm25.terms(query)) if term in self.idf]
+        scores = []
+        for section in self.sections:
+            score = 0.0
+            for term in terms:
+                frequency = section.terms.get(term, 0)
+                if frequency:
+                    score += self.idf[term] * bm25.term_weight(frequency, section.length, self.average_length)
+            scores.append(score)
+        return scores
+
+
+@dataclass(frozen=True)
+class SystemPrompt:
+    """A system prompt split into indexed sections."""
+
+    text: str
+    preamble: str
+    sections: Tuple[PromptSection, ...]
+    epilogue: str
+    index: SectionIndex = field(compare=False, repr=False)
+
+    @classmethod
+    def parse(cls, text: str) -> "SystemPrompt":
+        """
+        Split a system prompt into its preamble, sections and epilogue, and index the sections.
+
+        Args:
+            text: Full system prompt.
+
+        Returns:
+            The parsed prompt.
+        """
+        parts = re.split(r"(?m)^(?=## )", text)
+        preamble = parts[0].strip() if not parts[0].startswith("## ") else ""
+        chunks = [part.strip() for part in parts if part.startswith("## ")]
+
+        epilogue = ""
+        if chunks:
+            # Closing guidance follows the last section's list items
+            paragraphs = chunks[-1].split("\n\n")
+            index = len(paragraphs)
+            while index > 1 and not paragraphs[index - 1].lstrip().startswith(("-", "→", "#")):
+                index -= 1
+            chunks[-1] = "\n\n".join(paragraphs[:index])
+            epilogue = "\n\n".join(paragraphs[index:])
+
+        sections = []
+        for chunk in chunks:
+            terms = bm25.terms(chunk)
+            sections.append(PromptSection(chunk.splitlines()[0][3:].strip(), chunk, Counter(terms), len(terms)))
+        return cls(text, preamble, tuple(sections), epilogue, SectionIndex(sections))
+
+    def compact(
+        self,
+        query: str,
+        max_sections: int = COMPACT_SECTIONS,
+        budget: Optional[int] = None,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+    ) -> str:
+        """
+        Assemble a prompt with only the sections most relevant to the query.
+
+        The preamble and epilogue are always kept. Sections are taken by
+        decreasing BM25 score, skipping those that would exceed the budget.
+
+        Args:
+            query: User query.
+            max_sections: Maximum number of sections to keep.
+            budget: Maximum number of tokens of the prompt, None for no limit.
+            count_tokens: Function counting the tokens of a text.
+
+        Returns:
+            The compact prompt, with the sections in their original order.
+        """
+        remaining = None
+        if budget is not None:
+            remaining = budget - sum(count_tokens(part) for part in (self.preamble, self.epilogue) if part)
+
+        scores = self.index.scores(query)
+        chosen: List[int] = []
+        for index in sorted(range(len(self.sections)), key=lambda i: -scores[i]):
+            if len(chosen) >= max_sections or scores[index] <= 0:
+                break
+            if remaining is not None:
+                tokens = count_tokens(self.sections[index].text)
+                if tokens > remaining:
+                    continue
+                remaining -= tokens
+            chosen.append(index)
+
+        parts = [self.preamble, *(self.sections[index].text for index in sorted(chosen)), self.epilogue]
+        return "\n\n".join(part for part in parts if part)
+
+
+_prompts: Dict[str, SystemPrompt] = {}
+_lock = threading.Lock()
+
+
+def system_prompt_path(os_name: Optional[str] = None) -> str:
+    """Get the system prompt file for an OS, defaulting to the current one and to Linux if unknown."""
+    os_name = (os_name or platform.system()).lower()
+    return os.path.join(SYSTEM_PROMPT_DIR, PROMPT_FILES.get(os_name, PROMPT_FILES["linux"]))
+
+
+def load_system_prompt(os_name: Optional[str] = None) -> SystemPrompt:
+    """
+    Load the system prompt for an OS, reading and parsing the file only once.
+
+    Args:
+        os_name: Name as returned by platform.system(), defaults to the current OS.
+
+    Returns:
+        The parsed system prompt, or a generic prompt if the file can't be read.
+    """
+    path = system_prompt_path(os_name)
+    prompt = _prompts.get(path)
+    if prompt is not None:
+        return prompt
+
+    try:
+        with open(path, "r") as f:
+            text = f.read()
+    except FileNotFoundError:
+        logger.warning(f"System prompt file not found: {path}")
+        text = FALLBACK_PROMPT
+    except Exception as e:
+        logger.error(f"Error loading system prompt: {e}")
+        text = FALLBACK_PROMPT
+
+    with _lock:
+        return _prompts.setdefault(path, SystemPrompt.parse(text))
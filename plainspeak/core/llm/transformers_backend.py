@@ -0,0 +1,133 @@
+"""
+Generation with Hugging Face transformers for the local LLM interface.
+
+Prompts are generated in left-padded batches, streamed from a background
+thread, and continue from a snapshot of the key/value cache after the system
+prompt, which is computed once.
+"""
+
+import copy
+import logging
+import threading
+from typing import Any, Iterator, List, Optional, Tuple
+
+from .system_prompt import load_system_prompt
+
+logger = logging.getLogger(__name__)
+
+# Start of every prompt of the local interface, followed by the system prompt
+COMMAND_PROMPT_HEADER = "Generate a complete shell command for this task:\n"
+
+
+class TransformersGeneration:
+    """Transformers methods of LocalLLMInterface."""
+
+    # Set by LocalLLMInterface
+    model: Any
+    tokenizer: Any
+    # Token ids and key/value cache of the system prompt
+    _prefix_state: Optional[Tuple[Any, Any]]
+    _prefix_failed: bool
+
+    def _generate_padded(
+        self, full_prompts: List[str], max_tokens: int, temperature: float, **kwargs: Any
+    ) -> List[str]:
+        """
+        Generate for several prompts in one left-padded transformers batch, returning the new text of each.
+
+        Extra keyword arguments are passed to the model's generate(), so with
+        num_return_sequences the samples of each prompt follow each other.
+        """
+        tokenizer = self.tokenizer
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        # Decoder-only models continue from the last position, so pad on the left
+        padding_side = tokenizer.padding_side
+        tokenizer.padding_side = "left"
+        try:
+            inputs = tokenizer(full_prompts, return_tensors="pt", padding=True)
+        finally:
+            tokenizer.padding_side = padding_side
+
+        outputs = self.model.generate(
+            **inputs,
+            max_new_tokens=max_tokens,
+            temperature=temperature,
+            pad_token_id=tokenizer.pad_token_id,
+            **kwargs,
+        )
+        return tokenizer.batch_decode(outputs[:, inputs["input_ids"].shape[1] :], skip_special_tokens=True)
+
+    def _stream_transformers(self, full_prompt: str, max_tokens: int, temperature: float) -> Iterator[str]:
+        """Stream a transformers generation, which runs in a background thread until done or closed."""
+        from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+        cancelled = threading.Event()
+
+        class Cancelled(StoppingCriteria):
+            def __call__(self, input_ids, scores, **kwargs) -> bool:
+                return cancelled.is_set()
+
+        inputs = self.tokenizer(full_prompt, return_tensors="pt")
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        errors: List[Exception] = []
+
+        def run() -> None:
+            try:
+                self._generate_transformers(
+                    inputs,
+                    max_new_tokens=max_tokens,
+                    temperature=temperature,
+                    streamer=streamer,
+                    stopping_criteria=StoppingCriteriaList([Cancelled()]),
+                )
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        threading.Thread(target=run, daemon=True).start()
+        try:
+            yield from streamer
+        finally:
+            cancelled.set()
+        if errors:
+            raise errors[0]
+
+    def _prefix_cache(self, input_ids: Any) -> Any:
+        """
+        Get a copy of the key/value cache of the system prompt if the input starts with it.
+
+        Args:
+            input_ids: Token ids of the prompt.
+
+        Returns:
+            The cache to continue from, or None.
+        """
+        import torch
+
+        if self._prefix_state is None:
+            prefix = COMMAND_PROMPT_HEADER + load_system_prompt().text
+            # The last token may merge with the text that follows it in a prompt
+            prefix_ids = self.tokenizer(prefix, return_tensors="pt").input_ids[:, :-1]
+            with torch.no_grad():
+                past = self.model(prefix_ids, use_cache=True).past_key_values
+            self._prefix_state = (prefix_ids, past)
+
+        prefix_ids, past = self._prefix_state
+        length = prefix_ids.shape[1]
+        if input_ids.shape[1] <= length or not torch.equal(input_ids[:, :length], prefix_ids):
+            return None
+        # Generation extends the cache in place
+        return copy.deepcopy(past)
+
+    def _generate_transformers(self, inputs: Any, **kwargs: Any) -> Any:
+        """Generate with transformers, continuing from the system prompt's key/value cache when possible."""
+        if not self._prefix_failed:
+            try:
+                past = self._prefix_cache(inputs["input_ids"])
+                if past is not None:
+                    return self.model.generate(**inputs, past_key_values=past, **kwargs)
+            except Exception as e:
+                logger.warning(f"Could not reuse the system prompt cache, evaluating whole prompts: {e}")
+                self._prefix_failed = True
+        return self.model.generate(**inputs, **kwargs)
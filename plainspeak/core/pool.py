@@ -0,0 +1,252 @@
+"""
+Concurrent execution of shell commands.
+
+An ExecutionPool runs sandboxed commands on a bounded set of worker threads
+and hands them to asyncio as awaitables, so independent commands of a batch
+run side by side while the event loop stays responsive. Cancelling the task
+of a command kills the command and every process it started, and nothing
+else: the commands run in their own process groups, so Ctrl-C reaches
+PlainSpeak only, which then cancels the commands it is waiting for.
+
+The interactive shell, Commander and CommandExecutor share the pool returned
+by get_execution_pool(), so max_parallel bounds all their commands together.
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, List, Optional, Sequence, TypeVar
+
+from .process import OutputCallback
+from .sandbox import Sandbox, SandboxExecutionError
+from .spawn import ResourceUsage
+
+logger = logging.getLogger(__name__)
+
+# Commands run at the same time when no limit is configured
+DEFAULT_MAX_PARALLEL = 4
+
+# Callback receiving the index of the command in the batch, the stream name and each line
+BatchOutputCallback = Callable[[int, str, str], None]
+
+T = TypeVar("T")
+
+
+@dataclass
+class CommandRun:
+    """Outcome and timing of a command run by an ExecutionPool."""
+
+    command: str
+    # None if the command didn't run to completion
+    returncode: Optional[int] = None
+    stdout: Optional[str] = None
+    stderr: Optional[str] = None
+    # Why the command couldn't run, e.g. a failed validation or a timeout
+    error: Optional[str] = None
+    cancelled: bool = False
+    # Seconds spent waiting for a free worker, then running
+    queued: float = 0.0
+    duration: float = 0.0
+    usage: Optional[ResourceUsage] = None
+
+    @property
+    def success(self) -> bool:
+        """Whether the command ran and exited with status 0."""
+        return self.returncode == 0 and self.error is None and not self.cancelled
+
+
+class ExecutionPool:
+    """Bounded pool running sandboxed shell commands concurrently under asyncio."""
+
+    def __init__(self, sandbox: Optional[Sandbox] = None, max_parallel: Optional[int] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            sandbox: Sandbox validating and running the commands.
+            max_parallel: Commands run at the same time, DEFAULT_MAX_PARALLEL by default.
+        """
+        self.sandbox = sandbox or Sandbox()
+        self.max_parallel = max_parallel if max_parallel and max_parallel > 0 else DEFAULT_MAX_PARALLEL
+        # Worker threads are started on demand, later commands wait for a free one
+        self._workers = ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="plainspeak-exec")
+
+    async def run(
+        self, command: str, on_output: Optional[OutputCallback] = None, sandbox: Optional[Sandbox] = None
+    ) -> CommandRun:
+        """
+        Run a command once a worker is free.
+
+        Cancelling the awaiting task kills the command, and the cancellation
+        propagates once the command has been reaped.
+
+        Args:
+            command: The shell command to execute.
+            on_output: Optional callback receiving the stream name and each line
+                of output as it arrives, called on the event loop.
+            sandbox: Sandbox validating and running the command, the pool's by default.
+
+        Returns:
+            The outcome of the command.
+        """
+        sandbox = sandbox or self.sandbox
+        submitted = time.monotonic()
+        run = CommandRun(command)
+        try:
+            process = sandbox.stream_shell_command(command, sandbox.OUTPUT_HISTORY if on_output is not None else None)
+        except SandboxExecutionError as e:
+            run.error = str(e)
+            return run
+
+        loop = asyncio.get_running_loop()
+        deliver: Optional[OutputCallback] = None
+        if on_output is not None:
+            deliver = lambda name, line: loop.call_soon_threadsafe(on_output, name, line)  # noqa: E731
+
+        def work() -> CommandRun:
+            if process.cancelled:
+                run.cancelled = True
+                return run
+            run.queued = time.monotonic() - submitted
+            try:
+                result = sandbox.run_process(process, deliver)
+            except SandboxExecutionError as e:
+                run.error = str(e)
+            else:
+                run.returncode, run.stdout, run.stderr = result.returncode, result.stdout, result.stderr
+                run.usage = result.usage
+            run.cancelled = process.cancelled
+            run.duration = time.monotonic() - submitted - run.queued
+            return run
+
+        job = self._workers.submit(work)
+        future = asyncio.wrap_future(job)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            process.cancel()
+            # A command that hasn't started is dropped, a running one is killed and reaped
+            if not job.cancel():
+                await asyncio.wait([future])
+            raise
+
+    async def map(
+        self,
+        commands: Sequence[str],
+        on_output: Optional[BatchOutputCallback] = None,
+        sandbox: Optional[Sandbox] = None,
+    ) -> List[CommandRun]:
+        """
+        Run independent commands concurrently, at most max_parallel at a time.
+
+        Args:
+            commands: The shell commands to execute.
+            on_output: Optional callback receiving the index of the command,
+                the stream name and each line of output as it arrives.
+            sandbox: Sandbox validating and running the commands, the pool's by default.
+
+        Returns:
+            The outcome of each command, in the order of the commands.
+        """
+
+        def output_of(index: int) -> Optional[OutputCallback]:
+            if on_output is None:
+                return None
+            return lambda name, line: on_output(index, name, line)
+
+        start = time.monotonic()
+        runs = await asyncio.gather(*(self.run(command, output_of(i), sandbox) for i, command in enumerate(commands)))
+        logger.info(
+            "Ran %d commands in %.3fs (%d failed, up to %d at a time)",
+            len(runs),
+            time.monotonic() - start,
+            sum(1 for run in runs if not run.success),
+            self.max_parallel,
+        )
+        return list(runs)
+
+    def run_sync(
+        self, command: str, on_output: Optional[OutputCallback] = None, sandbox: Optional[Sandbox] = None
+    ) -> CommandRun:
+        """
+        Run a command from synchronous code, see run().
+
+        A KeyboardInterrupt kills the command before it propagates.
+
+        Args:
+            command: The shell command to execute.
+            on_output: Optional callback receiving the stream name and each line of output as it arrives.
+            sandbox: Sandbox validating and running the command, the pool's by default.
+
+        Returns:
+            The outcome of the command.
+        """
+        return _run_blocking(self.run(command, on_output, sandbox))
+
+    def run_batch(
+        self,
+        commands: Sequence[str],
+        on_output: Optional[BatchOutputCallback] = None,
+        sandbox: Optional[Sandbox] = None,
+    ) -> List[CommandRun]:
+        """
+        Run independent commands concurrently from synchronous code, see map().
+
+        A KeyboardInterrupt kills the commands still running before it propagates.
+
+        Args:
+            commands: The shell commands to execute.
+            on_output: Optional callback receiving the index of the command,
+                the stream name and each line of output as it arrives.
+            sandbox: Sandbox validating and running the commands, the pool's by default.
+
+        Returns:
+            The outcome of each command, in the order of the commands.
+        """
+        return _run_blocking(self.map(commands, on_output, sandbox))
+
+    def close(self) -> None:
+        """Stop the worker threads once the submitted commands have finished."""
+        self._workers.shutdown(wait=True)
+
+
+def _run_blocking(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from synchronous code."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    # The running event loop can't be blocked on, run the coroutine on its own loop
+    with ThreadPoolExecutor(max_workers=1) as runner:
+        return runner.submit(asyncio.run, coroutine).result()
+
+
+_shared_pool: Optional[ExecutionPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_execution_pool(max_parallel: Optional[int] = None) -> ExecutionPool:
+    """
+    Get the shared execution pool, closed when the interpreter exits.
+
+    Args:
+        max_parallel: Commands run at the same time, used when the pool is first
+            created. Defaults to execution.max_parallel_commands of the configuration.
+
+    Returns:
+        The pool, with a default Sandbox.
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            if max_parallel is None:
+                from ..config import app_config
+
+                max_parallel = app_config.execution.max_parallel_commands
+            _shared_pool = ExecutionPool(max_parallel=max_parallel)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
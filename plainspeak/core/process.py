@@ -0,0 +1,311 @@
+"""
+Streaming execution of shell commands.
+
+Output is read from the stdout and stderr pipes as it arrives, with a
+selector on POSIX and reader threads on Windows, and handed to the caller
+line by line. Only the last lines of each stream are kept for the result, and
+a command producing more than the allowed number of lines is killed, so
+commands like ``find / -type f`` neither buffer their whole output in memory
+nor run unbounded.
+
+Starting, limiting and reaping the command's process are left to the spawn
+module.
+"""
+
+import codecs
+import os
+import queue
+import selectors
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import IO, Callable, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .spawn import LIMIT_SIGNALS, ResourceLimits, ResourceUsage, kill_group, reap, spawn
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+# Bytes read from a pipe at once
+READ_SIZE = 65536
+
+# Longer lines are split, so a command that never writes a newline can't exhaust memory
+MAX_LINE_LENGTH = 65536
+
+# Callback receiving the stream name and each line, with its line ending
+OutputCallback = Callable[[str, str], None]
+
+# Seconds between checks whether a command whose output has ended has exited
+REAP_INTERVAL = 0.005
+
+
+@dataclass
+class ProcessResult:
+    """Outcome of a streamed command."""
+
+    returncode: int
+    # Last lines of each stream
+    stdout: str
+    stderr: str
+    # Lines read from both streams
+    lines: int = 0
+    # Whether the command was killed for producing too much output
+    truncated: bool = False
+    duration: float = 0.0
+    # None where resource usage isn't available
+    usage: Optional[ResourceUsage] = None
+
+    @property
+    def limit_exceeded(self) -> Optional[str]:
+        """Describe the resource limit that stopped the command, if any."""
+        # The shell reports a program killed by a signal with 128 + the signal number
+        signum = -self.returncode if self.returncode < 0 else self.returncode - 128
+        return LIMIT_SIGNALS.get(signum)
+
+
+class LineSplitter:
+    """Incremental decoder splitting a byte stream into text lines."""
+
+    def __init__(self, max_length: int = MAX_LINE_LENGTH):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial = ""
+        self.max_length = max_length
+
+    def feed(self, data: bytes) -> List[str]:
+        """Decode a chunk, returning the lines it completes."""
+        text = self._partial + self._decoder.decode(data).replace("\r\n", "\n")
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        complete = [line + "\n" for line in lines]
+        while len(self._partial) >= self.max_length:
+            complete.append(self._partial[: self.max_length])
+            self._partial = self._partial[self.max_length :]
+        return complete
+
+    def flush(self) -> List[str]:
+        """Return the unterminated last line, if any, once the stream has ended."""
+        text = self._partial + self._decoder.decode(b"", final=True)
+        self._partial = ""
+        return [text] if text else []
+
+
+class StreamingProcess:
+    """
+    Shell command whose output lines are read as they arrive.
+
+    Iterating over it starts the command and yields (stream, line) tuples;
+    afterwards result() holds the exit status and the last lines of output.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        cwd: Optional[str] = None,
+        env: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+        max_lines: Optional[int] = None,
+        history_lines: int = 1000,
+        limits: Optional[ResourceLimits] = None,
+        interactive: bool = False,
+    ):
+        """
+        Prepare a command.
+
+        Args:
+            command: Shell command to run.
+            cwd: Working directory.
+            env: Environment variables.
+            timeout: Seconds after which the command is killed, None for no limit.
+            max_lines: Lines after which the command is killed, None or 0 for no limit.
+            history_lines: Last lines of each stream kept for the result.
+            limits: Resource limits of the command, applied on Linux only.
+            interactive: Keep the standard input and the terminal, see spawn(). Only
+                the command itself is killed then, not the processes it started.
+        """
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.timeout = timeout
+        self.max_lines = max_lines
+        self.process: Optional[subprocess.Popen] = None
+        self.lines = 0
+        self.truncated = False
+        # Set by cancel(), possibly from another thread
+        self.cancelled = False
+        self.limits = limits
+        self.interactive = interactive
+        self.usage: Optional[ResourceUsage] = None
+        self._history: Dict[str, Deque[str]] = {name: deque(maxlen=history_lines) for name in (STDOUT, STDERR)}
+        self._started = 0.0
+        self._finished: Optional[float] = None
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        if self.process is not None:
+            raise RuntimeError("Command already started")
+        self._started = time.monotonic()
+        self.process = spawn(self.command, self.cwd, self.env, self.limits, self.interactive)
+        if self.cancelled:
+            self.kill()
+        deadline = self._started + self.timeout if self.timeout else None
+        chunks = self._read_selector(deadline) if os.name != "nt" else self._read_threads(deadline)
+        try:
+            splitters = {STDOUT: LineSplitter(), STDERR: LineSplitter()}
+            for name, data in chunks:
+                lines = splitters[name].feed(data) if data else splitters[name].flush()
+                for line in lines:
+                    if self.max_lines and self.lines >= self.max_lines:
+                        self.truncated = True
+                        self.kill()
+                        return
+                    self.lines += 1
+                    self._history[name].append(line)
+                    yield name, line
+            self._wait(deadline)
+        finally:
+            chunks.close()
+            self._close()
+
+    def _read_selector(self, deadline: Optional[float]) -> Iterator[Tuple[str, bytes]]:
+        """Read chunks from both pipes as they become readable, an empty chunk marking the end of a stream."""
+        assert self.process is not None
+        with selectors.DefaultSelector() as selector:
+            for name, pipe in ((STDOUT, self.process.stdout), (STDERR, self.process.stderr)):
+                os.set_blocking(pipe.fileno(), False)
+                selector.register(pipe, selectors.EVENT_READ, name)
+            while selector.get_map():
+                for key, _ in selector.select(self._remaining(deadline)):
+                    try:
+                        data = os.read(key.fd, READ_SIZE)
+                    except BlockingIOError:
+                        continue
+                    if not data:
+                        selector.unregister(key.fileobj)
+                    yield key.data, data
+
+    def _read_threads(self, deadline: Optional[float]) -> Iterator[Tuple[str, bytes]]:
+        """Read chunks from both pipes with one thread each, for platforms whose selectors don't support pipes."""
+        assert self.process is not None
+        chunks: "queue.Queue[Tuple[str, bytes]]" = queue.Queue()
+
+        def pump(name: str, pipe: IO[bytes]) -> None:
+            try:
+                for data in iter(lambda: pipe.read1(READ_SIZE), b""):  # type: ignore[attr-defined]
+                    chunks.put((name, data))
+            except (OSError, ValueError):
+                pass
+            chunks.put((name, b""))
+
+        for name, pipe in ((STDOUT, self.process.stdout), (STDERR, self.process.stderr)):
+            threading.Thread(target=pump, args=(name, pipe), daemon=True).start()
+        open_streams = 2
+        while open_streams:
+            try:
+                name, data = chunks.get(timeout=self._remaining(deadline))
+            except queue.Empty:
+                continue
+            if not data:
+                open_streams -= 1
+            yield name, data
+
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        """Seconds left before the deadline, killing the command once it has passed."""
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self.kill()
+            raise subprocess.TimeoutExpired(self.command, self.timeout or 0)
+        return remaining
+
+    def _wait(self, deadline: Optional[float]) -> None:
+        """Wait for the command to exit after its output has ended."""
+        while not self._reap(block=False):
+            time.sleep(min(REAP_INTERVAL, self._remaining(deadline) or REAP_INTERVAL))
+
+    def _reap(self, block: bool) -> bool:
+        """Collect the exit status of the command, and its resource usage on POSIX, see reap()."""
+        assert self.process is not None
+        exited, usage = reap(self.process, block)
+        if usage is not None:
+            self.usage = usage
+        return exited
+
+    def _signal_kill(self) -> None:
+        """Send SIGKILL to the command, and on POSIX to every process it started unless it is interactive."""
+        assert self.process is not None
+        # The processes started by an interactive command share our process group
+        kill_group(self.process, group=not self.interactive)
+
+    def kill(self) -> None:
+        """Kill the command, and on POSIX every process it started, then wait for it to exit."""
+        if self.process is None or self.process.returncode is not None:
+            return
+        self._signal_kill()
+        self._reap(block=True)
+
+    def cancel(self) -> None:
+        """
+        Kill the command from any thread.
+
+        The thread iterating over the command sees its output end and reaps it.
+        A command that hasn't started yet is killed as soon as it starts.
+        """
+        self.cancelled = True
+        if self.process is not None and self.process.returncode is None:
+            self._signal_kill()
+
+    def _close(self) -> None:
+        """Close the pipes, killing the command if it is still running."""
+        if self.process is None:
+            return
+        self.kill()
+        for pipe in (self.process.stdout, self.process.stderr):
+            if pipe is not None:
+                pipe.close()
+        if self._finished is None:
+            self._finished = time.monotonic()
+
+    def result(self) -> ProcessResult:
+        """
+        Get the outcome of the command, running it to completion if it hasn't been read yet.
+
+        Returns:
+            The exit status and the kept output.
+        """
+        if self.process is None:
+            for _ in self:
+                pass
+        assert self.process is not None
+        return ProcessResult(
+            returncode=self.process.returncode,
+            stdout="".join(self._history[STDOUT]),
+            stderr="".join(self._history[STDERR]),
+            lines=self.lines,
+            truncated=self.truncated,
+            duration=(self._finished or time.monotonic()) - self._started,
+            usage=self.usage,
+        )
+
+
+def run_streaming(command: str, on_output: Optional[OutputCallback] = None, **options) -> ProcessResult:
+    """
+    Run a shell command, passing its output to a callback as it arrives.
+
+    Args:
+        command: Shell command to run.
+        on_output: Callback receiving the stream name and each line.
+        **options: Options of StreamingProcess.
+
+    Returns:
+        The outcome of the command.
+
+    Raises:
+        subprocess.TimeoutExpired: If the command was killed after the timeout.
+    """
+    process = StreamingProcess(command, **options)
+    for name, line in process:
+        if on_output is not None:
+            on_output(name, line)
+    return process.result()
@@ -6,14 +6,16 @@ This module provides enhanced safety mechanisms for command execution.
 
 import logging
 import os
-import re
 import shlex
 import subprocess
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Mapping, Optional, Tuple
 
 from ..plugins.platform import platform_manager
+from .process import OutputCallback, ProcessResult, StreamingProcess
+from .spawn import ResourceLimits
+from .validation import SAFE, ValidationResult, compile_patterns
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +26,8 @@ class CommandContext:
 
     command: str
     cwd: str
-    env: Dict[str, str]
+    # Snapshot shared between contexts, see PlatformManager.environment()
+    env: Mapping[str, str]
     user: str
     timestamp: datetime
     platform: str
@@ -64,50 +67,83 @@ class Sandbox:
         r"\b(chmod|chown)\s+[0-7]*777\b",  # Overly permissive permissions
     ]
 
+    # DANGEROUS_PATTERNS compiled into one regex, again for subclasses that override them
+    _dangerous_regex = compile_patterns(DANGEROUS_PATTERNS)
+
     # Resource limits (0 = unlimited)
     RESOURCE_LIMITS = {
         "MAX_CPU_TIME": 60,  # seconds
-        "MAX_MEMORY": 512,  # MB
+        "MAX_MEMORY": 0,  # MB of heap per process, opt-in as some programs need more than they seem to
         "MAX_OUTPUT": 10_000,  # lines
         "MAX_PROCESSES": 10,  # subprocesses
+        "MAX_FILE_SIZE": 1024,  # MB per written file
     }
 
+    # Output lines of each stream kept for the result when they are streamed to a callback
+    OUTPUT_HISTORY = 1000
+
+    # Whether commands keep the standard input and the terminal, see spawn()
+    INTERACTIVE = False
+
+    def __init_subclass__(cls, **kwargs):
+        """Compile the DANGEROUS_PATTERNS of a subclass."""
+        super().__init_subclass__(**kwargs)
+        if "DANGEROUS_PATTERNS" in cls.__dict__:
+            cls._dangerous_regex = compile_patterns(cls.DANGEROUS_PATTERNS)
+
     def __init__(self):
         """Initialize the safety sandbox."""
         self.platform_mgr = platform_manager
 
-    def validate_command(self, command: str) -> Tuple[bool, Optional[str]]:
+    def check_command(self, command: str) -> ValidationResult:
         """
-        Validate if a command is safe to execute.
+        Check if a command is safe to execute.
+
+        Subclasses add their own rules by extending this method.
 
         Args:
-            command: The command to validate.
+            command: The command to check.
 
         Returns:
-            Tuple of (is_safe, error_message).
+            The verdict, with the first rule the command breaks.
         """
-        # Check blacklisted commands
-        cmd_parts = shlex.split(command)
+        try:
+            cmd_parts = shlex.split(command)
+        except ValueError as e:
+            return ValidationResult(False, "syntax", str(e))
         if not cmd_parts:
-            return False, "Empty command"
+            return ValidationResult(False, "empty")
 
         # Check against blacklist
         if command in self.BLACKLISTED_COMMANDS:
-            return False, f"Command '{command}' is blacklisted"
+            return ValidationResult(False, "blacklisted", command)
 
         # Check dangerous patterns
-        for pattern in self.DANGEROUS_PATTERNS:
-            if re.search(pattern, command):
-                return False, f"Command matches dangerous pattern: {pattern}"
+        if self._dangerous_regex is not None:
+            match = self._dangerous_regex.search(command)
+            if match:
+                return ValidationResult(False, "pattern", self.DANGEROUS_PATTERNS[int(match.lastgroup[1:])])
 
         # Platform-specific path checks
         for part in cmd_parts:
-            # Convert potential paths to normalized form
             if os.path.sep in part or "/" in part:
                 if not self.platform_mgr.is_safe_path(part):
-                    return False, f"Unsafe path: {part}"
+                    return ValidationResult(False, "path", part)
+
+        return SAFE
+
+    def validate_command(self, command: str) -> Tuple[bool, Optional[str]]:
+        """
+        Validate if a command is safe to execute.
+
+        Args:
+            command: The command to validate.
 
-        return True, None
+        Returns:
+            Tuple of (is_safe, error_message).
+        """
+        result = self.check_command(command)
+        return result.safe, result.message
 
     def create_context(self, command: str) -> CommandContext:
         """
@@ -122,57 +158,124 @@ class Sandbox:
         return CommandContext(
             command=self.platform_mgr.convert_command(command),
             cwd=os.getcwd(),
-            env=os.environ.copy(),
-            user=os.getlogin(),
+            env=self.platform_mgr.environment(),
+            user=self.platform_mgr.user,
             timestamp=datetime.now(),
             platform=self.platform_mgr.system,
         )
 
-    def execute_shell_command(self, command: str) -> Tuple[int, Optional[str], Optional[str]]:
+    def resource_limits(self) -> ResourceLimits:
+        """Get the limits of RESOURCE_LIMITS enforced by the operating system."""
+        return ResourceLimits(
+            cpu_time=self.RESOURCE_LIMITS["MAX_CPU_TIME"],
+            memory=self.RESOURCE_LIMITS["MAX_MEMORY"],
+            processes=self.RESOURCE_LIMITS["MAX_PROCESSES"],
+            file_size=self.RESOURCE_LIMITS.get("MAX_FILE_SIZE", 0),
+        )
+
+    def stream_shell_command(self, command: str, history_lines: Optional[int] = None) -> StreamingProcess:
         """
-        Execute a shell command safely and return its results.
+        Validate a shell command and prepare it for streamed execution.
+
+        Iterating over the returned process runs the command and yields
+        (stream, line) tuples as output arrives. The command and every process
+        it starts are killed after MAX_OUTPUT lines or MAX_CPU_TIME seconds,
+        and on Linux the other RESOURCE_LIMITS are set as rlimits.
 
         Args:
             command: The shell command to execute.
+            history_lines: Last lines of each stream kept for the result, defaults to MAX_OUTPUT.
 
         Returns:
-            Tuple of (return_code, stdout, stderr).
-            stdout and stderr are None if capture_output=False.
+            The process, not yet started.
+
+        Raises:
+            SandboxExecutionError: If the command fails validation.
+        """
+        is_safe, error = self.validate_command(command)
+        if not is_safe:
+            raise SandboxExecutionError(f"Unsafe command: {error}")
+
+        context = self.create_context(command)
+        logger.info(
+            "Executing command: %s (user=%s, cwd=%s, platform=%s)",
+            command,
+            context.user,
+            context.cwd,
+            context.platform,
+        )
+        max_lines = self.RESOURCE_LIMITS["MAX_OUTPUT"]
+        return StreamingProcess(
+            command,
+            cwd=context.cwd,
+            env=context.env,
+            timeout=self.RESOURCE_LIMITS["MAX_CPU_TIME"] or None,
+            max_lines=max_lines,
+            history_lines=history_lines if history_lines is not None else max_lines or self.OUTPUT_HISTORY,
+            limits=self.resource_limits(),
+            interactive=self.INTERACTIVE,
+        )
+
+    def run_shell_command(self, command: str, on_output: Optional[OutputCallback] = None) -> ProcessResult:
+        """
+        Execute a shell command safely and return its outcome and resource usage.
+
+        Args:
+            command: The shell command to execute.
+            on_output: Optional callback receiving the stream name and each
+                line of output as it arrives. Only the last OUTPUT_HISTORY
+                lines of each stream are then kept.
+
+        Returns:
+            The result, with the CPU time and peak memory of the command where available.
 
         Raises:
             SandboxExecutionError: If the command fails validation or execution fails.
         """
         try:
-            # Validate command
-            is_safe, error = self.validate_command(command)
-            if not is_safe:
-                raise SandboxExecutionError(f"Unsafe command: {error}")
-
-            # Create execution context
-            context = self.create_context(command)
-
-            # Log execution
-            logger.info(
-                "Executing command: %s (user=%s, cwd=%s, platform=%s)",
-                command,
-                context.user,
-                context.cwd,
-                context.platform,
-            )
-
-            # Execute command
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=self.RESOURCE_LIMITS["MAX_CPU_TIME"],
-                cwd=context.cwd,
-                env=context.env,
-            )
+            process = self.stream_shell_command(command, self.OUTPUT_HISTORY if on_output is not None else None)
+        except SandboxExecutionError:
+            raise
+        except Exception as e:
+            raise self._execution_error(command, e) from e
+        return self.run_process(process, on_output)
+
+    def run_process(self, process: StreamingProcess, on_output: Optional[OutputCallback] = None) -> ProcessResult:
+        """
+        Run a command prepared by stream_shell_command() to completion.
+
+        Args:
+            process: The prepared command.
+            on_output: Optional callback receiving the stream name and each line of output as it arrives.
+
+        Returns:
+            The result, with notices of the limits that stopped the command appended to stderr.
+
+        Raises:
+            SandboxExecutionError: If the command times out or execution fails.
+        """
+        command = process.command
+        try:
+            for name, line in process:
+                if on_output is not None:
+                    on_output(name, line)
+            result = process.result()
+
+            notices = []
+            if result.truncated:
+                notices.append(f"Output truncated after {result.lines} lines, command stopped")
+            if result.limit_exceeded:
+                notices.append(result.limit_exceeded)
+            for notice in notices:
+                logger.warning("%s: %s", notice, command)
+                result.stderr += notice + "\n"
+                if on_output is not None:
+                    on_output("stderr", notice + "\n")
 
             # Log success/failure
-            if result.returncode == 0:
+            if process.cancelled:
+                logger.info("Command cancelled: %s", command)
+            elif result.returncode == 0:
                 logger.info(
                     "Command completed successfully: %s (returncode=%d)",
                     command,
@@ -185,8 +288,17 @@ class Sandbox:
                     command,
                     result.stderr,
                 )
+            if result.usage is not None:
+                logger.info(
+                    "Command resource usage: %s (user=%.3fs, sys=%.3fs, max_rss=%.1fMB, wall=%.3fs)",
+                    command,
+                    result.usage.user_time,
+                    result.usage.system_time,
+                    result.usage.max_rss / (1024 * 1024),
+                    result.duration,
+                )
 
-            return result.returncode, result.stdout, result.stderr
+            return result
 
         except subprocess.TimeoutExpired as e:
             error_msg = f"Command timed out after {self.RESOURCE_LIMITS['MAX_CPU_TIME']} seconds"
@@ -194,9 +306,34 @@ class Sandbox:
             raise SandboxExecutionError(error_msg) from e
 
         except Exception as e:
-            error_msg = f"Error executing command: {str(e)}"
-            logger.error("%s: %s", error_msg, command)
-            raise SandboxExecutionError(error_msg) from e
+            raise self._execution_error(command, e) from e
+
+    def _execution_error(self, command: str, error: Exception) -> SandboxExecutionError:
+        """Log an unexpected error while executing a command, wrapping it for the caller."""
+        error_msg = f"Error executing command: {str(error)}"
+        logger.error("%s: %s", error_msg, command)
+        return SandboxExecutionError(error_msg)
+
+    def execute_shell_command(
+        self, command: str, on_output: Optional[OutputCallback] = None
+    ) -> Tuple[int, Optional[str], Optional[str]]:
+        """
+        Execute a shell command safely and return its results.
+
+        Args:
+            command: The shell command to execute.
+            on_output: Optional callback receiving the stream name and each
+                line of output as it arrives. Only the last OUTPUT_HISTORY
+                lines of each stream are then returned.
+
+        Returns:
+            Tuple of (return_code, stdout, stderr).
+
+        Raises:
+            SandboxExecutionError: If the command fails validation or execution fails.
+        """
+        result = self.run_shell_command(command, on_output)
+        return result.returncode, result.stdout, result.stderr
 
 
 # Global sandbox instance
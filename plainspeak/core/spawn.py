@@ -0,0 +1,198 @@
+"""
+Starting, limiting and reaping the processes of shell commands.
+
+On POSIX each command runs in its own process group, so the command and
+everything it started are killed together. On Linux, resource limits are set
+on the shell with prlimit() right after it is spawned, while it waits on its
+standard input, so they apply before the command runs. Its CPU time and peak
+memory are collected when it is reaped.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Mapping, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+@dataclass
+class ResourceLimits:
+    """Limits of a command and the processes it starts, 0 for no limit."""
+
+    # Seconds of CPU time of each process
+    cpu_time: float = 0
+    # Megabytes of heap and other private writable memory of each process. Unlike
+    # address space, this leaves the memory reserved but unused by runtimes like Go and Node.js alone.
+    memory: int = 0
+    # Processes the command may start
+    processes: int = 0
+    # Megabytes of each written file
+    file_size: int = 0
+
+    def rlimits(self) -> List[Tuple[int, int]]:
+        """
+        Get the (resource, limit) pairs to set on the command's process.
+
+        RLIMIT_NPROC counts all processes of the user, so it is set to the
+        number of tasks on the host plus the allowed processes. That still
+        stops a fork bomb while leaving the user's other processes alone.
+
+        Returns:
+            The limits, empty where prlimit() isn't available.
+        """
+        if resource is None or not hasattr(resource, "prlimit"):
+            return []
+        limits = []
+        if self.cpu_time:
+            limits.append((resource.RLIMIT_CPU, max(int(self.cpu_time), 1)))
+        if self.memory:
+            limits.append((resource.RLIMIT_DATA, self.memory * 1024 * 1024))
+        if self.file_size:
+            limits.append((resource.RLIMIT_FSIZE, self.file_size * 1024 * 1024))
+        if self.processes:
+            tasks = _host_tasks()
+            if tasks is not None:
+                limits.append((resource.RLIMIT_NPROC, tasks + self.processes))
+        return limits
+
+
+def _host_tasks() -> Optional[int]:
+    """Count the tasks running on a Linux host, from /proc/loadavg."""
+    try:
+        with open("/proc/loadavg") as f:
+            return int(f.read().split()[3].split("/")[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _set_rlimits(pid: int, limits: List[Tuple[int, int]]) -> None:
+    """Lower the resource limits of a running process."""
+    for kind, value in limits:
+        _, hard = resource.prlimit(pid, kind)
+        if hard != resource.RLIM_INFINITY:
+            value = min(value, hard)
+        elif kind == resource.RLIMIT_CPU:
+            # The soft limit sends SIGXCPU, which the hard limit would preempt with SIGKILL
+            hard = value + 1
+        else:
+            hard = value
+        resource.prlimit(pid, kind, (value, hard))
+
+
+@dataclass
+class ResourceUsage:
+    """Resources used by a command and the processes it waited for."""
+
+    user_time: float
+    system_time: float
+    # Peak resident memory of the largest process, in bytes
+    max_rss: int
+
+
+# Signals sent by the kernel when a resource limit is hit
+LIMIT_SIGNALS = {
+    getattr(signal, name): message
+    for name, message in (("SIGXCPU", "CPU time limit exceeded"), ("SIGXFSZ", "File size limit exceeded"))
+    if hasattr(signal, name)
+}
+
+
+def spawn(
+    command: str,
+    cwd: Optional[str],
+    env: Optional[Mapping[str, str]],
+    limits: Optional[ResourceLimits],
+    interactive: bool = False,
+) -> subprocess.Popen:
+    """
+    Start a shell command with both output streams piped, in a new session on POSIX unless it is interactive.
+
+    Args:
+        command: Shell command to run.
+        cwd: Working directory.
+        env: Environment variables.
+        limits: Resource limits of the command, applied on Linux to commands that aren't interactive.
+        interactive: Keep the standard input and the terminal of this process, for password prompts.
+
+    Returns:
+        The started process, with its standard input at its end unless it is interactive.
+    """
+    rlimits = limits.rlimits() if limits is not None and os.name != "nt" and not interactive else []
+    if rlimits:
+        # The shell waits for a line on its standard input until its limits are set
+        command = f"read _; {command}"
+    process = subprocess.Popen(
+        command,
+        shell=True,
+        stdin=subprocess.PIPE if rlimits else None if interactive else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd,
+        env=env,
+        start_new_session=os.name != "nt" and not interactive,
+    )
+    if rlimits:
+        assert process.stdin is not None
+        try:
+            _set_rlimits(process.pid, rlimits)
+            process.stdin.write(b"\n")
+        except OSError:
+            # The command must not run without its limits
+            kill_group(process)
+            process.wait()
+            raise
+        finally:
+            # The command sees the end of its input, as with /dev/null
+            process.stdin.close()
+    return process
+
+
+def reap(process: subprocess.Popen, block: bool) -> Tuple[bool, Optional[ResourceUsage]]:
+    """
+    Collect the exit status of a process, and its resource usage on POSIX.
+
+    Args:
+        process: The process.
+        block: Wait for the process to exit.
+
+    Returns:
+        Whether the process has exited, and its resource usage if it was just reaped on POSIX.
+    """
+    if process.returncode is not None:
+        return True, None
+    if os.name == "nt":
+        if block:
+            process.wait()
+        return process.poll() is not None, None
+    try:
+        pid, status, rusage = os.wait4(process.pid, 0 if block else os.WNOHANG)
+    except ChildProcessError:
+        # Reaped by someone else, the status is lost
+        process.returncode = -1
+        return True, None
+    if pid == 0:
+        return False, None
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return True, ResourceUsage(rusage.ru_utime, rusage.ru_stime, rusage.ru_maxrss * scale)
+
+
+def kill_group(process: subprocess.Popen, group: bool = True) -> None:
+    """Send SIGKILL to a process, and on POSIX to every process of its group unless group is False."""
+    if os.name == "nt":
+        process.kill()
+        return
+    try:
+        if group:
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            os.kill(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
@@ -0,0 +1,59 @@
+"""
+Outcomes and patterns of command validation.
+
+A Sandbox reports why it rejected a command with a ValidationResult, and
+matches commands against all its dangerous patterns at once with a regex
+built by compile_patterns().
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional, Pattern, Sequence
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    """Outcome of validating a command, with the rule that rejected it."""
+
+    safe: bool
+    # Rule that rejected the command: "empty", "syntax", "blacklisted", "pattern" or "path"
+    reason: Optional[str] = None
+    # The offending command, pattern, path or parse error
+    detail: Optional[str] = None
+
+    @property
+    def message(self) -> Optional[str]:
+        """Get a human-readable description of why the command was rejected."""
+        if self.safe:
+            return None
+        if self.reason == "empty":
+            return "Empty command"
+        if self.reason == "syntax":
+            return f"Unparseable command: {self.detail}"
+        if self.reason == "blacklisted":
+            return f"Command '{self.detail}' is blacklisted"
+        if self.reason == "pattern":
+            return f"Command matches dangerous pattern: {self.detail}"
+        if self.reason == "path":
+            return f"Unsafe path: {self.detail}"
+        return f"Command rejected: {self.detail}"
+
+
+SAFE = ValidationResult(True)
+
+
+def compile_patterns(patterns: Sequence[str]) -> Optional[Pattern[str]]:
+    """
+    Combine regular expressions into a single one.
+
+    Args:
+        patterns: The regular expressions.
+
+    Returns:
+        A regex matching wherever one of the patterns does, with the index i of
+        the matching pattern in the name "p<i>" of match.lastgroup, or None if
+        there are no patterns.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?P<p{i}>{pattern})" for i, pattern in enumerate(patterns)))
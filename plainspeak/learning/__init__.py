@@ -0,0 +1,21 @@
+"""
+Learning System for PlainSpeak.
+
+This package implements the feedback loop for improving command generation over time.
+"""
+
+from .history import CommandHistory
+from .journal import RecordJournal
+from .models import Command, Feedback, Pattern
+from .store import LearningStore, get_learning_store, learning_store
+
+__all__ = [
+    "Command",
+    "CommandHistory",
+    "Feedback",
+    "LearningStore",
+    "Pattern",
+    "RecordJournal",
+    "get_learning_store",
+    "learning_store",
+]
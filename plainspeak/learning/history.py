@@ -0,0 +1,67 @@
+"""
+Columnar views of the learning store's command history.
+
+Most callers only need a few columns of the most recent commands, so history
+is served as plain Python lists. A pandas DataFrame is only built on request,
+keeping pandas out of the CLI startup path.
+"""
+
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from .models import Command
+
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore[import-untyped]
+
+COLUMNS = [f.name for f in fields(Command)]
+
+
+class CommandHistory:
+    """Column-oriented, read-only view of command records."""
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        """
+        Build the view from command records.
+
+        Args:
+            records: Command records in display order.
+        """
+        names = list(COLUMNS)
+        for record in records:
+            for name in record:
+                if name not in names:
+                    names.append(name)
+        self.columns: Dict[str, List[Any]] = {name: [r.get(name) for r in records] for name in names}
+        self._length = len(records)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def empty(self) -> bool:
+        """Whether the view contains no commands."""
+        return self._length == 0
+
+    def __getitem__(self, column: str) -> List[Any]:
+        return self.columns[column]
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the commands as dictionaries."""
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+
+    def count(self, column: str, value: Optional[Any] = True) -> int:
+        """Count commands whose column equals a value (truthy by default)."""
+        if value is True:
+            return sum(1 for v in self.columns[column] if v)
+        return sum(1 for v in self.columns[column] if v == value)
+
+    def to_frame(self) -> "pd.DataFrame":
+        """Convert the view into a pandas DataFrame."""
+        import pandas as pd  # type: ignore[import-untyped]
+
+        if self.empty:
+            return pd.DataFrame()
+        return pd.DataFrame(self.columns)
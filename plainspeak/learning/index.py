@@ -0,0 +1,312 @@
+"""
+Inverted index for similarity retrieval over the learning store.
+
+Successful commands are indexed by the tokens of their natural language text
+and ranked with BM25. Per-posting term weights are precomputed at insert time
+and queries are scored with vectorized NumPy accumulation over the posting
+lists of the query terms. The index is kept in sync incrementally by
+replaying journal records appended since it was last updated, and a snapshot
+is persisted so that new processes don't have to rebuild it from scratch.
+"""
+
+import logging
+import pickle
+from abc import ABC, abstractmethod
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils import bm25
+from ..utils.paths import atomic_write
+from .journal import RecordJournal
+
+logger = logging.getLogger(__name__)
+
+
+class JournalIndex(ABC):
+    """
+    Base of indexes mirroring the commands journal.
+
+    Subclasses index records in upsert() and describe their contents for
+    snapshots with _state() and _restore().
+    """
+
+    # Bump when the snapshot layout changes
+    SNAPSHOT_VERSION = 1
+
+    # Persist a new snapshot after replaying at least this many records
+    SAVE_THRESHOLD = 512
+
+    def __init__(self, snapshot_path: Optional[Path] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            snapshot_path: Where to persist the index, or None to keep it in memory only.
+        """
+        self.snapshot_path = snapshot_path
+        self._reset()
+
+        # Journal position the index reflects
+        self._generation: Optional[int] = None
+        self._fingerprint: Optional[int] = None
+        self._watermark = 0
+        self._unsaved = 0
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Drop all indexed documents."""
+
+    @abstractmethod
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Add, replace or remove a command depending on its success flag."""
+
+    @abstractmethod
+    def _state(self) -> Dict[str, Any]:
+        """Get the indexed contents to persist."""
+
+    @abstractmethod
+    def _restore(self, state: Dict[str, Any]) -> None:
+        """Restore indexed contents persisted by _state()."""
+
+    @staticmethod
+    def _command_for(record: Dict[str, Any]) -> str:
+        """Get the command text that should be suggested for a record."""
+        return record.get("edited_command") if record.get("edited") else record["generated_command"]
+
+    def sync(self, journal: RecordJournal) -> None:
+        """
+        Catch up with records appended to the journal since the last sync.
+
+        The index is rebuilt from scratch if the journal has been rewritten.
+
+        Args:
+            journal: Commands journal backing the index.
+        """
+        generation = journal.generation
+        stale = (
+            generation != self._generation
+            or self._watermark > journal.end
+            or journal.fingerprint(self._watermark) != self._fingerprint
+        )
+        if stale:
+            self._reset()
+            self._watermark = 0
+            self._generation = generation
+
+        replayed = 0
+        for _, record in journal.tail(self._watermark):
+            self.upsert(record)
+            replayed += 1
+        self._watermark = journal.end
+        self._fingerprint = journal.fingerprint(self._watermark)
+
+        self._unsaved += replayed
+        if self._unsaved and (stale or self._unsaved >= self.SAVE_THRESHOLD):
+            self.save()
+
+    def save(self) -> None:
+        """Persist a snapshot of the index."""
+        if self.snapshot_path is None:
+            return
+        state = {
+            "version": self.SNAPSHOT_VERSION,
+            **self._state(),
+            "generation": self._generation,
+            "fingerprint": self._fingerprint,
+            "watermark": self._watermark,
+        }
+        try:
+            atomic_write(self.snapshot_path, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+            self._unsaved = 0
+        except OSError as e:
+            logger.warning(f"Could not save {type(self).__name__} to {self.snapshot_path}: {e}")
+
+    @classmethod
+    def load(cls, snapshot_path: Path) -> "JournalIndex":
+        """
+        Load a persisted index, or return an empty one if unavailable.
+
+        Args:
+            snapshot_path: Snapshot file written by save().
+
+        Returns:
+            The loaded index.
+        """
+        index = cls(snapshot_path)
+        if not snapshot_path.exists():
+            return index
+        try:
+            state = pickle.loads(snapshot_path.read_bytes())
+            if state.get("version") != cls.SNAPSHOT_VERSION:
+                return index
+            index._restore(state)
+            index._generation = state["generation"]
+            index._fingerprint = state["fingerprint"]
+            index._watermark = state["watermark"]
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable {cls.__name__} snapshot {snapshot_path}: {e}")
+            return cls(snapshot_path)
+        return index
+
+
+class SimilarityIndex(JournalIndex):
+    """BM25-ranked inverted index of successful commands."""
+
+    # Version 2 indexes the stopword-free terms of bm25.terms()
+    SNAPSHOT_VERSION = 2
+
+    # Re-weight all postings once the average document length drifts this much
+    REWEIGHT_DRIFT = 0.25
+
+    def _reset(self) -> None:
+        """Drop all indexed documents."""
+        # token -> {document slot -> BM25 term weight without idf}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        # command id -> (natural text, command, token count, token counts, slot)
+        self._docs: Dict[str, Tuple[str, str, int, Dict[str, int], int]] = {}
+        # slot -> command id (None for removed commands)
+        self._slots: List[Optional[str]] = []
+        self._total_length = 0
+        # Average document length the stored weights were computed with
+        self._weight_basis = 0.0
+        # token -> (slots, weights) arrays, built on demand and dropped on change
+        self._arrays: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _state(self) -> Dict[str, Any]:
+        return {
+            "postings": self._postings,
+            "docs": self._docs,
+            "slots": self._slots,
+            "total_length": self._total_length,
+            "weight_basis": self._weight_basis,
+        }
+
+    def _restore(self, state: Dict[str, Any]) -> None:
+        self._postings = state["postings"]
+        self._docs = state["docs"]
+        self._slots = state["slots"]
+        self._total_length = state["total_length"]
+        self._weight_basis = state["weight_basis"]
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """
+        Add, replace or remove a command depending on its success flag.
+
+        Args:
+            record: Command record from the journal.
+        """
+        doc_id = record.get("id")
+        if doc_id is None:
+            return
+        slot = self.remove(doc_id)
+        if not record.get("success"):
+            return
+
+        tokens = bm25.terms(record.get("natural_text", ""))
+        if not tokens:
+            return
+        if slot is None:
+            slot = len(self._slots)
+            self._slots.append(doc_id)
+        else:
+            self._slots[slot] = doc_id
+
+        counts = dict(Counter(tokens))
+        self._docs[doc_id] = (record["natural_text"], self._command_for(record), len(tokens), counts, slot)
+        self._total_length += len(tokens)
+
+        average = self._total_length / len(self._docs)
+        if not self._weight_basis or abs(average - self._weight_basis) > self.REWEIGHT_DRIFT * self._weight_basis:
+            self._reweight(average)
+        else:
+            self._add_postings(slot, counts, len(tokens))
+
+    def _weight(self, tf: int, length: int) -> float:
+        """BM25 term weight for a posting, excluding idf."""
+        return bm25.term_weight(tf, length, self._weight_basis)
+
+    def _add_postings(self, slot: int, counts: Dict[str, int], length: int) -> None:
+        """Insert a document's weighted postings."""
+        for token, tf in counts.items():
+            self._postings.setdefault(token, {})[slot] = self._weight(tf, length)
+            self._arrays.pop(token, None)
+
+    def _reweight(self, average: float) -> None:
+        """Recompute every posting weight for a new average document length."""
+        self._weight_basis = average
+        self._postings.clear()
+        self._arrays.clear()
+        for _, _, length, counts, slot in self._docs.values():
+            self._add_postings(slot, counts, length)
+
+    def remove(self, doc_id: str) -> Optional[int]:
+        """
+        Remove a command from the index if present.
+
+        Returns:
+            The slot the command occupied, or None if it was not indexed.
+        """
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return None
+        _, _, length, counts, slot = doc
+        self._total_length -= length
+        self._slots[slot] = None
+        for token in counts:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.pop(slot, None)
+                self._arrays.pop(token, None)
+                if not posting:
+                    del self._postings[token]
+        return slot
+
+    def _term_arrays(self, token: str, np: Any) -> Any:
+        """Get the posting list of a token as (slots, weights) arrays."""
+        arrays = self._arrays.get(token)
+        if arrays is None:
+            posting = self._postings[token]
+            arrays = (
+                np.fromiter(posting.keys(), dtype=np.int64, count=len(posting)),
+                np.fromiter(posting.values(), dtype=np.float64, count=len(posting)),
+            )
+            self._arrays[token] = arrays
+        return arrays
+
+    def search(self, text: str, limit: int = 5) -> List[Tuple[str, str, float]]:
+        """
+        Rank indexed commands against a query.
+
+        Args:
+            text: Natural language query.
+            limit: Maximum number of results.
+
+        Returns:
+            List of (natural_text, command, score) tuples, best first.
+        """
+        tokens = [token for token in set(bm25.terms(text)) if token in self._postings]
+        if not tokens or limit <= 0:
+            return []
+
+        import numpy as np
+
+        n_docs = len(self._docs)
+        scores = np.zeros(len(self._slots), dtype=np.float64)
+        for token in tokens:
+            slots, weights = self._term_arrays(token, np)
+            scores[slots] += bm25.idf(n_docs, len(self._postings[token])) * weights
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(scores[candidates], -limit)[-limit:]]
+        top = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        results = []
+        for slot in top.tolist():
+            doc = self._docs[self._slots[slot]]
+            results.append((doc[0], doc[1], float(scores[slot])))
+        return results
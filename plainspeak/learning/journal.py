@@ -0,0 +1,335 @@
+"""
+Append-only record journal for the learning store.
+
+Records are stored one JSON object per line. New records and updates are
+appended; an in-memory index maps each record id to the byte offset of its
+latest version, so updates never rewrite the file. Stale versions are dropped
+by periodic compaction, which rewrites the file atomically.
+
+Several processes may share a journal: appends, compaction and crash recovery
+hold an exclusive lock on a ``.lock`` file next to the journal, so compaction
+never drops a record another process is appending.
+"""
+
+import json
+import logging
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..utils.paths import atomic_write, file_lock
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    """Encode a record as a single JSON line."""
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class RecordJournal:
+    """
+    Append-only JSON-lines store with an id to offset index.
+
+    When ``key`` is None the journal is a plain append-only log without
+    update support (used for feedback entries).
+    """
+
+    # Compact once stale versions outnumber live records and exceed this floor
+    COMPACT_MIN_STALE = 256
+
+    def __init__(
+        self,
+        path: Path,
+        key: Optional[str] = "id",
+        legacy_path: Optional[Path] = None,
+        compact_min_stale: Optional[int] = None,
+    ):
+        """
+        Initialize the journal, migrating a legacy JSON array file if present.
+
+        Args:
+            path: Path of the JSON-lines journal file.
+            key: Record field used as the unique id, or None for a plain log.
+            legacy_path: Optional whole-file JSON array to migrate from.
+            compact_min_stale: Override for COMPACT_MIN_STALE.
+        """
+        self.path = path
+        self.key = key
+        self.compact_min_stale = self.COMPACT_MIN_STALE if compact_min_stale is None else compact_min_stale
+
+        self._offsets: Dict[str, int] = {}
+        self._count = 0  # Number of record lines in the file (live + stale)
+        self._end = 0  # Offset up to which the file has been indexed
+        self._inode: Optional[int] = None
+        # Compaction replaces the journal file, so the lock is held on a file that stays
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+
+        with file_lock(self.lock_path):
+            if not self.path.exists():
+                if legacy_path is not None and legacy_path.exists():
+                    self._migrate(legacy_path)
+                else:
+                    self.path.touch()
+
+            self._recover_tail()
+        self._refresh()
+
+    def _migrate(self, legacy_path: Path) -> None:
+        """Convert a legacy JSON array file into a journal."""
+        try:
+            records = json.loads(legacy_path.read_text() or "[]")
+        except json.JSONDecodeError:
+            logger.error(f"Error reading {legacy_path}, starting with an empty journal")
+            records = []
+
+        atomic_write(self.path, b"".join(_encode(r) for r in records if isinstance(r, dict)))
+        legacy_path.replace(legacy_path.with_name(legacy_path.name + ".migrated"))
+        logger.info(f"Migrated {len(records)} records from {legacy_path} to {self.path}")
+
+    def _recover_tail(self) -> None:
+        """Drop a partially written trailing line left behind by a crash."""
+        with open(self.path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+
+            # Walk back to the last complete line
+            pos = size
+            while pos > 0:
+                step = min(4096, pos)
+                f.seek(pos - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    pos = pos - step + newline + 1
+                    break
+                pos -= step
+            logger.warning(f"Discarding {size - pos} bytes of incomplete data at the end of {self.path}")
+            f.truncate(pos)
+
+    def _refresh(self) -> None:
+        """Bring the index up to date with the file on disk."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.path.touch()
+            stat = os.stat(self.path)
+
+        if stat.st_ino != self._inode or stat.st_size < self._end:
+            # The file was replaced (e.g. compacted by another process)
+            self._offsets.clear()
+            self._count = 0
+            self._end = 0
+            self._inode = stat.st_ino
+
+        if stat.st_size > self._end:
+            self._scan(self._end)
+
+    def _scan(self, start: int) -> None:
+        """Index complete lines from the given offset to the end of the file."""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Incomplete line still being written
+                if line.strip():
+                    self._index_line(line, offset)
+                offset += len(line)
+        self._end = offset
+
+    def _index_line(self, line: bytes, offset: int) -> None:
+        """Add a single journal line to the index."""
+        self._count += 1
+        if self.key is None:
+            return
+        try:
+            record_id = json.loads(line)[self.key]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            logger.error(f"Skipping corrupt record at offset {offset} in {self.path}")
+            return
+        # Assigning to an existing key keeps the original insertion order
+        self._offsets[record_id] = offset
+
+    @property
+    def generation(self) -> Optional[int]:
+        """Identifier of the current journal file; changes when it is rewritten."""
+        self._refresh()
+        return self._inode
+
+    @property
+    def end(self) -> int:
+        """Offset just past the last indexed line."""
+        self._refresh()
+        return self._end
+
+    def fingerprint(self, offset: int) -> int:
+        """
+        Checksum of the bytes just before an offset.
+
+        Used together with ``generation`` to detect that a position recorded
+        earlier still refers to the same journal contents.
+        """
+        start = max(0, offset - 256)
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return zlib.crc32(f.read(offset - start))
+
+    def tail(self, start: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Iterate over record versions appended at or after an offset.
+
+        Unlike records(), superseded versions are included, in file order.
+
+        Args:
+            start: Offset previously obtained from ``end``.
+
+        Yields:
+            Tuples of (offset, record).
+        """
+        self._refresh()
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if offset >= self._end:
+                    break
+                if line.strip():
+                    try:
+                        yield offset, json.loads(line)
+                    except json.JSONDecodeError:
+                        pass
+                offset += len(line)
+
+    @property
+    def stale_count(self) -> int:
+        """Number of superseded or corrupt lines in the journal."""
+        return self._count - len(self._offsets) if self.key is not None else 0
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._offsets) if self.key is not None else self._count
+
+    def __contains__(self, record_id: object) -> bool:
+        self._refresh()
+        return record_id in self._offsets
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Append a record, replacing any earlier version with the same id.
+
+        Args:
+            record: JSON-serializable record.
+        """
+        with file_lock(self.lock_path):
+            self._write(record)
+        self._maybe_compact()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Append a record and index it, with the lock held."""
+        with open(self.path, "ab") as f:
+            f.write(_encode(record))
+            f.flush()
+        self._refresh()
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the latest version of a record.
+
+        Args:
+            record_id: Id of the record.
+
+        Returns:
+            The record, or None if it does not exist.
+        """
+        self._refresh()
+        return self._read(record_id)
+
+    def _read(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Read the latest indexed version of a record."""
+        offset = self._offsets.get(record_id)
+        if offset is None:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def update(self, record_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Update fields of a record by appending its new version.
+
+        The record is read and written under one lock, so concurrent updates
+        of other fields are not lost.
+
+        Args:
+            record_id: Id of the record.
+            fields: Fields to set.
+
+        Returns:
+            The updated record, or None if it does not exist.
+        """
+        with file_lock(self.lock_path):
+            self._refresh()
+            record = self._read(record_id)
+            if record is None:
+                return None
+            record.update(fields)
+            self._write(record)
+        self._maybe_compact()
+        return record
+
+    def _iter_live(self) -> Iterator[Tuple[int, bytes]]:
+        """Yield (offset, line) for every live line in file order."""
+        live = set(self._offsets.values()) if self.key is not None else None
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                if offset >= self._end:
+                    break
+                if (live is None and line.strip()) or (live is not None and offset in live):
+                    yield offset, line
+                offset += len(line)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """
+        Read all live records.
+
+        Returns:
+            Records ordered by first insertion.
+        """
+        self._refresh()
+        by_offset: Dict[int, Dict[str, Any]] = {}
+        for offset, line in self._iter_live():
+            try:
+                by_offset[offset] = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+        if self.key is None:
+            return list(by_offset.values())
+        return [by_offset[offset] for offset in self._offsets.values() if offset in by_offset]
+
+    def _maybe_compact(self) -> None:
+        """Compact the journal once stale versions dominate."""
+        stale = self.stale_count
+        if stale >= self.compact_min_stale and stale > len(self._offsets):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the journal with only the latest version of each record."""
+        with file_lock(self.lock_path):
+            # Records appended by other processes before the lock was taken are kept
+            self._refresh()
+            lines = {offset: line for offset, line in self._iter_live()}
+            if self.key is not None:
+                data = b"".join(lines[offset] for offset in self._offsets.values() if offset in lines)
+            else:
+                data = b"".join(lines.values())
+            atomic_write(self.path, data)
+            self._inode = None  # Force a full re-index of the new file
+            self._refresh()
@@ -0,0 +1,54 @@
+"""
+Data models for the learning store.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class Command:
+    """Command generation entry."""
+
+    id: str  # UUID
+    natural_text: str
+    generated_command: str
+    edited: bool = False
+    edited_command: Optional[str] = None
+    executed: bool = False
+    success: Optional[bool] = None
+    error_message: Optional[str] = None
+    execution_time: float = 0.0
+    timestamp: str = ""  # ISO format
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.timestamp:
+            self.timestamp = datetime.now().isoformat()
+
+
+@dataclass
+class Feedback:
+    """Feedback for a command."""
+
+    command_id: str
+    feedback_type: str  # 'approve', 'edit', 'reject'
+    feedback_text: Optional[str] = None
+    timestamp: str = ""
+
+    def __post_init__(self):
+        if not self.timestamp:
+            self.timestamp = datetime.now().isoformat()
+
+
+@dataclass
+class Pattern:
+    """Usage pattern detected from commands."""
+
+    pattern: str
+    command_template: str
+    success_rate: float
+    usage_count: int
+    last_used: str  # ISO format
+    metadata: Optional[Dict[str, Any]] = None
@@ -0,0 +1,166 @@
+"""
+Nearest-neighbour cache of successful translations.
+
+Requests are embedded as hashed n-gram vectors: word unigrams and bigrams,
+leaving out politeness words, and character trigrams are hashed into a fixed
+number of signed buckets and the result is L2-normalized, so the dot product of two embeddings is their cosine
+similarity. The embeddings of successful commands are kept as rows of a NumPy
+matrix, which lets a new request be compared against all of them with one
+matrix-vector product. Paraphrases of a request that already worked ("please
+compress my old logs" after "compress old logs") can then be answered without
+asking the LLM.
+"""
+
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils import bm25
+from .index import JournalIndex
+
+# Number of hash buckets of an embedding
+DIMENSIONS = 1024
+
+# Politeness and function words that don't change what a request asks for
+STOP_WORDS = frozenset(
+    ["a", "an", "the", "me", "my", "please", "can", "could", "would", "you", "i", "want", "to", "some", "just"]
+)
+
+# Cosine similarity above which a cached command is reused
+DEFAULT_THRESHOLD = 0.9
+
+
+def _features(text: str) -> List[str]:
+    """Get the word unigrams and bigrams and character trigrams of a text."""
+    words = [word for word in bm25.words(text) if word not in STOP_WORDS]
+    features = list(words)
+    features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    for word in words:
+        padded = f"#{word}#"
+        features.extend(f"#{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    return features
+
+
+def embed(text: str, dimensions: int = DIMENSIONS) -> Any:
+    """
+    Embed a text as a normalized hashed n-gram vector.
+
+    Args:
+        text: Natural language text.
+        dimensions: Number of hash buckets.
+
+    Returns:
+        A float32 NumPy vector, all zeros if the text has no words.
+    """
+    import numpy as np
+
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for feature in _features(text):
+        digest = zlib.crc32(feature.encode("utf-8"))
+        # The top bit picks the sign so that collisions tend to cancel out
+        vector[digest % dimensions] += 1.0 if digest & 0x80000000 else -1.0
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector
+
+
+class SemanticCache(JournalIndex):
+    """Embeddings of successful commands, searched by cosine similarity."""
+
+    # Rows allocated for an empty matrix, doubled whenever it is full
+    INITIAL_CAPACITY = 64
+
+    def _reset(self) -> None:
+        """Drop all cached commands."""
+        # Embeddings by slot, allocated lazily since NumPy is optional
+        self._matrix: Any = None
+        # command id -> (natural text, command, slot)
+        self._docs: Dict[str, Tuple[str, str, int]] = {}
+        # slot -> command id (None for removed commands)
+        self._slots: List[Optional[str]] = []
+        # Slots freed by removed commands, reused before growing the matrix
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _state(self) -> Dict[str, Any]:
+        return {"matrix": self._matrix, "docs": self._docs, "slots": self._slots, "free": self._free}
+
+    def _restore(self, state: Dict[str, Any]) -> None:
+        self._matrix = state["matrix"]
+        self._docs = state["docs"]
+        self._slots = state["slots"]
+        self._free = state["free"]
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """
+        Add, replace or remove a command depending on its success flag.
+
+        Args:
+            record: Command record from the journal.
+        """
+        doc_id = record.get("id")
+        if doc_id is None:
+            return
+        self.remove(doc_id)
+        if not record.get("success"):
+            return
+
+        vector = embed(record.get("natural_text", ""))
+        if not vector.any():
+            return
+
+        import numpy as np
+
+        if self._free:
+            slot = self._free.pop()
+            self._slots[slot] = doc_id
+        else:
+            slot = len(self._slots)
+            self._slots.append(doc_id)
+            if self._matrix is None:
+                self._matrix = np.zeros((self.INITIAL_CAPACITY, len(vector)), dtype=np.float32)
+            elif slot == len(self._matrix):
+                grown = np.zeros((2 * len(self._matrix), self._matrix.shape[1]), dtype=np.float32)
+                grown[:slot] = self._matrix
+                self._matrix = grown
+        self._matrix[slot] = vector
+        self._docs[doc_id] = (record["natural_text"], self._command_for(record), slot)
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a command from the cache if present."""
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        slot = doc[2]
+        self._slots[slot] = None
+        self._matrix[slot] = 0.0
+        self._free.append(slot)
+
+    def lookup(self, text: str, threshold: float = DEFAULT_THRESHOLD) -> Optional[Tuple[str, str, float]]:
+        """
+        Find the cached command whose request is most similar to a text.
+
+        Args:
+            text: Natural language request.
+            threshold: Minimum cosine similarity to accept.
+
+        Returns:
+            The (natural_text, command, similarity) of the nearest request, or
+            None if no cached request is similar enough.
+        """
+        if not self._docs:
+            return None
+        vector = embed(text, self._matrix.shape[1])
+        if not vector.any():
+            return None
+
+        # Unused and removed rows are all zeros and score 0
+        scores = self._matrix[: len(self._slots)] @ vector
+        slot = int(scores.argmax())
+        score = float(scores[slot])
+        if score < threshold:
+            return None
+        natural_text, command, _ = self._docs[self._slots[slot]]
+        return natural_text, command, score
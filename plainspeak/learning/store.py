@@ -0,0 +1,235 @@
+"""
+Learning System for PlainSpeak.
+
+This module implements the feedback loop for improving command generation over time.
+Uses append-only JSON-lines storage for flexibility and constant-cost writes.
+"""
+
+import heapq
+import json
+import logging
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .history import CommandHistory
+from .index import SimilarityIndex
+from .journal import RecordJournal
+from .models import Command, Feedback
+from .semantic import DEFAULT_THRESHOLD, SemanticCache
+
+if TYPE_CHECKING:
+    import pandas as pd  # type: ignore[import-untyped]
+
+logger = logging.getLogger(__name__)
+
+
+class LearningStore:
+    """
+    Store for collecting and analyzing command generation feedback.
+    Uses append-only JSON-lines journals for flexible storage without schema constraints.
+    """
+
+    def __init__(self, data_dir: Optional[Path] = None):
+        """
+        Initialize the learning store.
+
+        Legacy ``*.json`` array files from earlier versions are migrated to
+        journals on first use.
+
+        Args:
+            data_dir: Directory for journal storage. If None, uses ~/.plainspeak/learning/
+        """
+        if data_dir is None:
+            data_dir = Path.home() / ".plainspeak" / "learning"
+
+        self.data_dir = data_dir
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        # Initialize storage files
+        self.commands_file = self.data_dir / "commands.jsonl"
+        self.feedback_file = self.data_dir / "feedback.jsonl"
+        self.patterns_file = self.data_dir / "patterns.jsonl"
+
+        self._init_storage()
+
+    def _init_storage(self) -> None:
+        """Open the journals, creating or migrating them as needed."""
+        self._commands = RecordJournal(self.commands_file, legacy_path=self.data_dir / "commands.json")
+        self._feedback = RecordJournal(self.feedback_file, key=None, legacy_path=self.data_dir / "feedback.json")
+        self._patterns = RecordJournal(self.patterns_file, key="pattern", legacy_path=self.data_dir / "patterns.json")
+        # Loaded on first lookup, so that creating a store doesn't unpickle them,
+        # and caught up with the journal before each lookup rather than on writes
+        self._index: Optional[SimilarityIndex] = None
+        self._semantic_cache: Optional[SemanticCache] = None
+
+    def _load_commands(self) -> List[Dict[str, Any]]:
+        """Load the latest version of every stored command."""
+        return self._commands.records()
+
+    def add_command(
+        self,
+        natural_text: str,
+        generated_command: str,
+        executed: bool = False,
+        success: Optional[bool] = None,
+        system_info: Optional[Dict[str, Any]] = None,
+        environment_info: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Add a command and return its ID."""
+        import uuid
+
+        command = Command(
+            id=str(uuid.uuid4()),
+            natural_text=natural_text,
+            generated_command=generated_command,
+            executed=executed,
+            success=success,
+            metadata={"system_info": system_info or {}, "environment_info": environment_info or {}},
+        )
+
+        self._commands.append(asdict(command))
+
+        return command.id
+
+    def add_feedback(self, command_id: str, feedback_type: str, message: Optional[str] = None) -> None:
+        """Add feedback for a command."""
+        feedback = Feedback(command_id=command_id, feedback_type=feedback_type, feedback_text=message)
+        self._feedback.append(asdict(feedback))
+
+    def update_command_execution(
+        self, command_id: str, executed: bool, success: bool, error_message: Optional[str] = None
+    ) -> None:
+        """Update command execution results."""
+        fields: Dict[str, Any] = {"executed": executed, "success": success}
+        if error_message:
+            fields["error_message"] = error_message
+        self._commands.update(command_id, fields)
+
+    def update_command_edit(self, command_id: str, edited_command: str) -> None:
+        """Update command with user edits."""
+        self._commands.update(command_id, {"edited": True, "edited_command": edited_command})
+
+    def compact(self) -> None:
+        """Drop superseded command versions from the journals."""
+        self._commands.compact()
+        self._patterns.compact()
+
+    def get_history(self, limit: Optional[int] = None) -> CommandHistory:
+        """
+        Get the most recent commands as a lightweight columnar view.
+
+        Args:
+            limit: Maximum number of commands, newest first.
+
+        Returns:
+            CommandHistory view of the commands.
+        """
+        commands = self._load_commands()
+        if limit:
+            commands = heapq.nlargest(limit, commands, key=lambda cmd: cmd.get("timestamp", ""))
+        else:
+            commands.sort(key=lambda cmd: cmd.get("timestamp", ""), reverse=True)
+        return CommandHistory(commands)
+
+    def get_command_history(self, limit: Optional[int] = None) -> "pd.DataFrame":
+        """Get command history as a DataFrame (imports pandas on first use)."""
+        return self.get_history(limit).to_frame()
+
+    def get_training_data(self, min_success_rate: float = 0.8, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Get successful commands for training."""
+        commands = self._load_commands()
+        results: List[Tuple[str, str]] = []
+
+        for cmd in commands:
+            if cmd.get("success") and cmd.get("executed"):
+                command = cmd.get("edited_command") if cmd.get("edited") else cmd["generated_command"]
+                results.append((cmd["natural_text"], command))
+
+        if limit:
+            results = results[:limit]
+
+        return results
+
+    def get_similar_examples(self, text: str, limit: int = 5) -> List[Tuple[str, str, float]]:
+        """
+        Find similar examples from history.
+
+        Successful commands are ranked by BM25 relevance of their natural
+        language text to the query, using the persistent similarity index.
+
+        Returns:
+            List of (natural_text, command, score) tuples, best first.
+        """
+        if self._index is None:
+            self._index = SimilarityIndex.load(self.data_dir / "similarity_index.pickle")
+        self._index.sync(self._commands)
+        return self._index.search(text, limit)
+
+    def find_cached_command(self, text: str, threshold: float = DEFAULT_THRESHOLD) -> Optional[Tuple[str, str, float]]:
+        """
+        Find a successful command whose request means the same as a text.
+
+        Requests are compared by cosine similarity of their hashed n-gram
+        embeddings, using the persistent semantic cache.
+
+        Args:
+            text: Natural language request.
+            threshold: Minimum similarity to accept.
+
+        Returns:
+            The (natural_text, command, similarity) of the nearest request, or None.
+        """
+        if self._semantic_cache is None:
+            self._semantic_cache = SemanticCache.load(self.data_dir / "semantic_cache.pickle")
+        self._semantic_cache.sync(self._commands)
+        return self._semantic_cache.lookup(text, threshold)
+
+    def export_training_data(self, output_path: Path) -> int:
+        """Export training data to JSONL."""
+        successful_commands = [
+            cmd for cmd in self._load_commands() if cmd.get("success") and cmd.get("executed")
+        ]
+
+        if not successful_commands:
+            return 0
+
+        with open(output_path, "w") as f:
+            for cmd in successful_commands:
+                command = cmd.get("edited_command") if cmd.get("edited") else cmd["generated_command"]
+                f.write(
+                    json.dumps(
+                        {
+                            "input": cmd["natural_text"],
+                            "output": command,
+                        }
+                    )
+                    + "\n"
+                )
+
+        return len(successful_commands)
+
+
+_default_store: Optional[LearningStore] = None
+
+
+def get_learning_store() -> LearningStore:
+    """Get the global learning store, creating it on first use."""
+    global _default_store
+    if _default_store is None:
+        _default_store = LearningStore()
+    return _default_store
+
+
+class _LazyLearningStore:
+    """Stand-in for the global store that defers its creation until first use."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_learning_store(), name)
+
+    def __repr__(self) -> str:
+        return repr(_default_store) if _default_store is not None else "<LearningStore (not yet created)>"
+
+
+# Global learning store instance
+learning_store: LearningStore = _LazyLearningStore()  # type: ignore[assignment]
@@ -2,6 +2,7 @@
 PlainSpeak Plugins Package.
 
 This package contains the plugin system and built-in plugins for PlainSpeak.
+Plugin modules are imported on demand rather than when the package is imported.
 """
 
 import importlib
@@ -76,7 +77,9 @@ class PluginManager:
         return self.plugins.get(name)
 
     def get_all_plugins(self) -> Dict[str, Any]:
-        """Get all loaded plugins."""
+        """Get all plugins, loading them on first use."""
+        if not self.plugins:
+            load_all_plugins()
         return self.plugins
 
     def is_plugin_loaded(self, name: str) -> bool:
@@ -88,8 +91,5 @@ class PluginManager:
         return load_all_plugins()
 
 
-# Load all plugins when the package is imported
-load_all_plugins()
-
 # Create a singleton instance of the plugin manager
 plugin_manager = PluginManager()
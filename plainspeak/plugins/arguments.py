@@ -0,0 +1,194 @@
+"""
+Argument validation for plugin verbs.
+
+Argument schemas from verb details or plugin manifests are compiled once into
+ArgumentValidator objects, which apply defaults, coerce values to the declared
+types and normalize paths in a single pass over the arguments.
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from ..utils import paths
+
+if TYPE_CHECKING:
+    from .schemas import CommandConfig
+
+# Manifest arguments that hold file system paths
+PATH_ARGUMENTS = frozenset({"path", "file", "directory"})
+
+_TRUE = frozenset({"true", "yes", "y", "on", "1"})
+_FALSE = frozenset({"false", "no", "n", "off", "0", ""})
+
+
+class ArgumentValidationError(ValueError):
+    """Raised when arguments for a verb are missing or invalid."""
+
+    def __init__(self, verb: str, missing: List[str], invalid: Dict[str, str]):
+        self.verb = verb
+        self.missing = missing
+        self.invalid = invalid
+        problems = [f"missing {', '.join(missing)}"] if missing else []
+        problems += [f"invalid {name} ({reason})" for name, reason in invalid.items()]
+        super().__init__(f"Invalid arguments for verb '{verb}': {'; '.join(problems)}")
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"expected a boolean, got {value!r}")
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise ValueError(f"expected an integer, got {value!r}")
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"expected an integer, got {value!r}")
+        return int(value)
+    return int(str(value).strip()) if not isinstance(value, int) else value
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise ValueError(f"expected a number, got {value!r}")
+    return float(value)
+
+
+def _to_path(value: Any) -> str:
+    text = str(value)
+    return paths.normalize_path(text) if text else text
+
+
+def _to_list(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "string": str,
+    "str": str,
+    "integer": _to_int,
+    "int": _to_int,
+    "number": _to_float,
+    "float": _to_float,
+    "boolean": _to_bool,
+    "bool": _to_bool,
+    "path": _to_path,
+    "array": _to_list,
+    "list": _to_list,
+}
+
+# Type names inferred from default values
+_DEFAULT_TYPES = {bool: "boolean", int: "integer", float: "number", str: "string", list: "array"}
+
+
+class ArgumentValidator:
+    """Compiled validator for the arguments of one verb."""
+
+    __slots__ = ("verb", "_defaults", "_converters", "_required")
+
+    def __init__(self, verb: str, schema: Mapping[str, Mapping[str, Any]]):
+        """
+        Compile a validator from an argument schema.
+
+        Args:
+            verb: Canonical verb the arguments belong to.
+            schema: Mapping of argument name to a spec with optional ``type``,
+                ``required`` and ``default`` keys. Without a type, the type of
+                the default is used.
+        """
+        self.verb = verb
+        self._defaults: List[Tuple[str, Any]] = []
+        self._converters: Dict[str, Callable[[Any], Any]] = {}
+        self._required: List[str] = []
+
+        for name, spec in schema.items():
+            type_name = spec.get("type")
+            if type_name is None and spec.get("default") is not None:
+                type_name = _DEFAULT_TYPES.get(type(spec["default"]))
+            converter = _CONVERTERS.get(str(type_name).lower()) if type_name else None
+            if converter is not None:
+                self._converters[name] = converter
+            if spec.get("required"):
+                self._required.append(name)
+            elif "default" in spec:
+                self._defaults.append((name, spec["default"]))
+
+    def __call__(self, args: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+        """
+        Validate arguments.
+
+        Arguments not in the schema are passed through unchanged.
+
+        Args:
+            args: Arguments to validate.
+
+        Returns:
+            New dictionary with defaults applied and values coerced.
+
+        Raises:
+            ArgumentValidationError: If required arguments are missing or values can't be coerced.
+        """
+        result = {name: list(default) if isinstance(default, list) else default for name, default in self._defaults}
+        invalid: Dict[str, str] = {}
+        converters = self._converters
+        for name, value in (args or {}).items():
+            converter = converters.get(name)
+            if converter is not None and value is not None:
+                try:
+                    value = converter(value)
+                except (TypeError, ValueError) as e:
+                    invalid[name] = str(e)
+            result[name] = value
+
+        missing = [name for name in self._required if result.get(name) in (None, "")]
+        if missing or invalid:
+            raise ArgumentValidationError(self.verb, missing, invalid)
+        return result
+
+
+def manifest_argument_schema(command: "CommandConfig") -> Dict[str, Dict[str, Any]]:
+    """
+    Build an argument schema from a manifest command configuration.
+
+    Args:
+        command: Command configuration from a plugin manifest.
+
+    Returns:
+        Argument schema usable by ArgumentValidator.
+    """
+    schema: Dict[str, Dict[str, Any]] = {}
+    for name in command.required_args:
+        schema[name] = {"required": True}
+    for name, default in command.optional_args.items():
+        schema[name] = {"default": default}
+    for name, spec in schema.items():
+        if name in PATH_ARGUMENTS:
+            spec["type"] = "path"
+    return schema
+
+
+def compile_validator(verb: str, details: Mapping[str, Any]) -> ArgumentValidator:
+    """
+    Compile the validator for a verb from its details.
+
+    The schema is read from the ``args`` or ``parameters`` entry. Either may
+    map names to specs or, for untyped optional arguments, list the names.
+
+    Args:
+        verb: Canonical verb.
+        details: Verb details as returned by a plugin's get_verb_details().
+
+    Returns:
+        The compiled validator.
+    """
+    schema = details.get("args") or details.get("parameters") or {}
+    if not isinstance(schema, Mapping):
+        schema = {name: {} for name in schema}
+    return ArgumentValidator(verb, {name: spec if isinstance(spec, Mapping) else {} for name, spec in schema.items()})
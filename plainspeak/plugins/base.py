@@ -1,16 +1,16 @@
 """
 Base Plugin for PlainSpeak.
 
-This module defines the base plugin class and plugin registry.
+This module defines the base plugin classes. The plugin registry lives in
+registry.py and is re-exported here for backwards compatibility.
 """
 
 import logging
 from abc import ABC, abstractmethod
-from functools import lru_cache
-from typing import Any, Dict, List, Optional
-
-import yaml  # type: ignore[import-untyped]
+from typing import Any, Dict, List
 
+from .arguments import manifest_argument_schema
+from .manifest_cache import read_manifest
 from .schemas import PluginManifest
 
 logger = logging.getLogger(__name__)
@@ -149,9 +149,7 @@ class YAMLPlugin(BasePlugin):
     def _load_manifest(self) -> PluginManifest:
         """Load and validate manifest."""
         try:
-            with open(self.manifest_path, "r") as f:
-                manifest_data = yaml.safe_load(f)
-            return PluginManifest(**manifest_data)
+            return read_manifest(str(self.manifest_path))
         except Exception as e:
             error_msg = f"Failed to load manifest from {self.manifest_path}: {e}"
             logger.error(error_msg)
@@ -177,99 +175,26 @@ class YAMLPlugin(BasePlugin):
                 command = command.replace(placeholder, str(value))
         return command
 
+    def get_verb_details(self, verb: str) -> Dict[str, Any]:
+        """Get verb details, with the template and argument schema from the manifest."""
+        details = super().get_verb_details(verb)
+        command = self.manifest.commands.get(details["verb"]) if details else None
+        if command is not None:
+            details["description"] = command.description
+            details["template"] = command.template
+            details["args"] = manifest_argument_schema(command)
+        return details
 
-class PluginRegistry:
-    """Registry managing plugins."""
-
-    def __init__(self):
-        """Initialize registry."""
-        self.plugins: Dict[str, BasePlugin] = {}
-        self.verb_to_plugin_map: Dict[str, str] = {}
-        self.verb_to_plugin_cache: Dict[str, str] = {}
-
-    def register(self, plugin: BasePlugin) -> None:
-        """Register a plugin."""
-        if plugin.name in self.plugins:
-            logger.warning(f"Replacing plugin '{plugin.name}'")
-        self.plugins[plugin.name] = plugin
-        self._rebuild_verb_maps()
-        logger.debug(
-            f"Registered plugin '{plugin.name}' with {len(plugin.get_verbs())} verbs "
-            f"and {len(plugin.get_aliases())} aliases"
-        )
-
-    def _rebuild_verb_maps(self) -> None:
-        """Rebuild verb mappings."""
-        self.verb_to_plugin_map.clear()
-        self.verb_to_plugin_cache.clear()
-        self.get_plugin_for_verb.cache_clear()
-
-        # Process plugins in priority order
-        plugins = self.get_plugins_sorted_by_priority()
-        for plugin in plugins:
-            for verb in plugin.get_verbs():
-                if verb.lower() not in self.verb_to_plugin_map:
-                    self.verb_to_plugin_map[verb.lower()] = plugin.name
-            for alias in plugin.get_aliases():
-                if alias.lower() not in self.verb_to_plugin_map:
-                    self.verb_to_plugin_map[alias.lower()] = plugin.name
-
-    def get_plugin(self, name: str) -> Optional[BasePlugin]:
-        """Get plugin by name."""
-        return self.plugins.get(name)
-
-    @lru_cache(maxsize=256)
-    def get_plugin_for_verb(self, verb: str) -> Optional[BasePlugin]:
-        """Get plugin for verb."""
-        if not verb:
-            logger.debug("Empty verb provided")
-            return None
-
-        verb_lower = verb.lower()
-        plugin_name = self.verb_to_plugin_map.get(verb_lower)
-        if plugin_name:
-            # Handle case where plugin was removed but still in verb map
-            if plugin_name in self.plugins:
-                return self.plugins[plugin_name]
-            else:
-                logger.warning(f"Plugin '{plugin_name}' for verb '{verb}' not found in registry")
-                # Clear caches to rebuild verb maps
-                self.clear_caches()
-                return None
-
-        return None
-
-    def get_all_verbs(self) -> Dict[str, str]:
-        """Get all verb mappings."""
-        return self.verb_to_plugin_map.copy()
-
-    def get_plugins_sorted_by_priority(self) -> List[BasePlugin]:
-        """Get plugins sorted by priority."""
-        plugins = list(self.plugins.values())
-        plugins.sort(key=lambda p: p.priority, reverse=True)
-        return plugins
-
-    def clear(self) -> None:
-        """Clear registry."""
-        self.plugins.clear()
-        self.verb_to_plugin_map.clear()
-        self.verb_to_plugin_cache.clear()
-        self.get_plugin_for_verb.cache_clear()
-
-    def clear_caches(self) -> None:
-        """Clear caches but keep plugins."""
-        self.verb_to_plugin_map.clear()
-        self.verb_to_plugin_cache.clear()
-        self.get_plugin_for_verb.cache_clear()
 
-        # Also clear caches in plugins
-        for plugin in self.plugins.values():
-            if hasattr(plugin, "clear_caches"):
-                plugin.clear_caches()
+# Backwards compatibility
+Plugin = BasePlugin
 
 
-# Global registry
-registry = PluginRegistry()
+def __getattr__(name: str) -> Any:
+    """Resolve the registry names that used to be defined in this module."""
+    # Imported on first access, as the registry module itself depends on this one
+    if name in ("PluginRegistry", "registry"):
+        from . import registry as registry_module
 
-# Backwards compatibility
-Plugin = BasePlugin
+        return getattr(registry_module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,214 @@
+"""
+Deferred plugin loading for PlainSpeak.
+
+Plugins found in plugin directories or through entry points are registered as
+LazyPlugin placeholders built from their manifest, so startup only has to read
+the manifests. The plugin module is imported and the plugin class instantiated
+the first time one of its verbs is resolved.
+"""
+
+import importlib
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, List, Optional
+
+from .base import BasePlugin, PluginLoadError
+from .schemas import PluginManifest
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PluginLoadStats:
+    """Timing of how a plugin was discovered and loaded."""
+
+    name: str
+    source: str
+    lazy: bool
+    # Time spent at startup: reading the manifest, or the full load for eager plugins
+    discovery_seconds: float = 0.0
+    # Time spent importing and instantiating a deferred plugin, None until it is loaded
+    load_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the plugin module has been imported and instantiated."""
+        return self.load_seconds is not None
+
+    @property
+    def total_seconds(self) -> float:
+        """Time spent on the plugin so far, at startup and on first use."""
+        return self.discovery_seconds + (self.load_seconds or 0.0)
+
+
+def import_entrypoint(entrypoint: str) -> Any:
+    """
+    Import the object an entrypoint such as ``package.module.Class`` refers to.
+
+    Args:
+        entrypoint: Dotted import path.
+
+    Returns:
+        The imported object.
+    """
+    module_name, class_name = entrypoint.rsplit(".", 1)
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+def find_entry_point_manifest(entry_point: Any) -> Optional[Path]:
+    """
+    Locate the manifest shipped next to an entry point's module.
+
+    The distribution's file list is searched, so the module is not imported.
+    A manifest is either ``manifest.yaml`` or ``<entry point name>.yaml`` in
+    the module's package directory.
+
+    Args:
+        entry_point: An importlib.metadata entry point.
+
+    Returns:
+        Path to the manifest, or None if the distribution doesn't ship one.
+    """
+    dist = getattr(entry_point, "dist", None)
+    files = getattr(dist, "files", None) if dist is not None else None
+    if not files:
+        return None
+
+    # The module is either a package or a module inside one
+    parts = entry_point.value.split(":", 1)[0].strip().split(".")
+    directories = {PurePosixPath(*parts)}
+    if len(parts) > 1:
+        directories.add(PurePosixPath(*parts[:-1]))
+    names = {"manifest.yaml", f"{entry_point.name}.yaml"}
+
+    for file in files:
+        path = PurePosixPath(str(file))
+        if path.name in names and path.parent in directories:
+            return Path(dist.locate_file(file))
+    return None
+
+
+class LazyPlugin(BasePlugin):
+    """
+    Placeholder for a plugin whose module has not been imported yet.
+
+    The placeholder answers verb and alias queries from the manifest and
+    forwards everything else to the real plugin, loading it on first use.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        priority: int,
+        verbs: List[str],
+        aliases: Dict[str, str],
+        factory: Callable[[], BasePlugin],
+        source: str,
+    ):
+        """
+        Initialize the placeholder.
+
+        Args:
+            name: Plugin name.
+            description: Plugin description.
+            priority: Plugin priority.
+            verbs: Verbs the plugin provides.
+            aliases: Alias to canonical verb mapping.
+            factory: Callable that imports and instantiates the plugin.
+            source: Where the plugin was found, for diagnostics.
+        """
+        self._plugin: Optional[BasePlugin] = None
+        self._factory = factory
+        super().__init__(name=name, description=description, priority=priority)
+        self.verbs = list(verbs)
+        self.verb_aliases = dict(aliases)
+        self.source = source
+        self.stats = PluginLoadStats(name=name, source=source, lazy=True)
+
+    @classmethod
+    def from_manifest(
+        cls, manifest: PluginManifest, source: str, factory: Optional[Callable[[], BasePlugin]] = None
+    ) -> "LazyPlugin":
+        """
+        Create a placeholder from a plugin manifest.
+
+        Args:
+            manifest: The plugin's manifest.
+            source: Where the manifest was found.
+            factory: Callable creating the plugin, defaults to instantiating the manifest's entrypoint.
+
+        Returns:
+            The placeholder.
+        """
+        aliases = {alias: verb for verb, verb_aliases in manifest.verb_aliases.items() for alias in verb_aliases}
+        if factory is None:
+            entrypoint = manifest.entrypoint
+
+            def factory() -> BasePlugin:
+                return import_entrypoint(entrypoint)()
+
+        return cls(manifest.name, manifest.description, manifest.priority, manifest.verbs, aliases, factory, source)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the real plugin has been loaded."""
+        return self._plugin is not None
+
+    def load(self) -> BasePlugin:
+        """
+        Import and instantiate the real plugin, once.
+
+        Returns:
+            The plugin instance.
+
+        Raises:
+            PluginLoadError: If the plugin cannot be loaded.
+        """
+        if self._plugin is not None:
+            return self._plugin
+        if self.stats.error is not None:
+            raise PluginLoadError(self.stats.error)
+
+        start = time.perf_counter()
+        try:
+            plugin = self._factory()
+        except Exception as e:
+            self.stats.error = f"Failed to load plugin '{self.name}' from {self.source}: {e}"
+            logger.error(self.stats.error, exc_info=True)
+            raise PluginLoadError(self.stats.error) from e
+
+        self.stats.load_seconds = time.perf_counter() - start
+        logger.debug(f"Loaded plugin '{self.name}' on first use in {self.stats.load_seconds * 1000:.1f} ms")
+        self._plugin = plugin
+        return plugin
+
+    def describes(self, plugin: BasePlugin) -> bool:
+        """Check whether the loaded plugin has the verbs, aliases and priority of the manifest."""
+        return (
+            list(plugin.get_verbs()) == self.verbs
+            and dict(plugin.get_aliases()) == self.verb_aliases
+            and plugin.priority == self.priority
+        )
+
+    def get_verbs(self) -> List[str]:
+        """Get supported verbs, as declared in the manifest."""
+        return self.verbs
+
+    def generate_command(self, verb: str, args: Dict[str, Any]) -> str:
+        """Generate a command with the real plugin."""
+        return self.load().generate_command(verb, args)
+
+    def get_verb_details(self, verb: str) -> Dict[str, Any]:
+        """Get verb details from the real plugin."""
+        return self.load().get_verb_details(verb)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes the placeholder doesn't define itself
+        if name.startswith("__") or name in ("_plugin", "_factory", "stats"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
@@ -0,0 +1,185 @@
+"""
+Discovery and loading of plugins for the plugin manager.
+
+Built-in plugins are imported right away. Plugins of entry points that ship
+a manifest, and plugins found in plugin directories, are registered from
+their manifest and imported once one of their verbs is used.
+"""
+
+import importlib
+import logging
+import time
+from typing import Any, Dict, List
+
+from plainspeak.plugins.base import BasePlugin
+from plainspeak.plugins.lazy import LazyPlugin, PluginLoadStats, find_entry_point_manifest
+from plainspeak.plugins.manifest_cache import get_manifest_cache, read_manifest
+from plainspeak.plugins.registry import PluginRegistry
+from plainspeak.utils import paths
+
+logger = logging.getLogger(__name__)
+
+# Built-in plugins as (module, class) pairs
+BUILTIN_PLUGINS = [
+    ("plainspeak.plugins.file", "FilePlugin"),
+    ("plainspeak.plugins.text", "TextPlugin"),
+    ("plainspeak.plugins.system", "SystemPlugin"),
+    ("plainspeak.plugins.network", "NetworkPlugin"),
+]
+
+
+class PluginLoading:
+    """Plugin loading methods of PluginManager."""
+
+    # Set by PluginManager
+    config: Any
+    registry: PluginRegistry
+    load_stats: Dict[str, PluginLoadStats]
+
+    def _load_plugins(self) -> None:
+        """
+        Load all plugins.
+
+        Built-in plugins are loaded right away. Plugins with a manifest are
+        registered from it and only imported once one of their verbs is used.
+        """
+        start = time.perf_counter()
+
+        # First load builtin plugins
+        self._load_builtin_plugins()
+
+        # Then load any additional plugins from entry points
+        self._load_plugins_from_entry_points()
+
+        # Finally load plugins from configured directories
+        self._load_plugins_from_directories()
+
+        if not self.registry.plugins:
+            logger.warning("No plugins were loaded!")
+        get_manifest_cache().save()
+        deferred = sum(1 for plugin in self.registry.plugins.values() if isinstance(plugin, LazyPlugin))
+        logger.debug(
+            f"Registered {len(self.registry.plugins)} plugins ({deferred} deferred) "
+            f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+    def _record_load(self, plugin: BasePlugin, source: str, start: float) -> None:
+        """Record how long discovering or loading a plugin took."""
+        elapsed = time.perf_counter() - start
+        if isinstance(plugin, LazyPlugin):
+            plugin.stats.discovery_seconds = elapsed
+            self.load_stats[plugin.name] = plugin.stats
+        else:
+            self.load_stats[plugin.name] = PluginLoadStats(
+                name=plugin.name, source=source, lazy=False, discovery_seconds=elapsed, load_seconds=0.0
+            )
+
+    def get_load_report(self) -> List[PluginLoadStats]:
+        """
+        Get per-plugin load timings.
+
+        Returns:
+            Load statistics of every plugin, slowest first.
+        """
+        return sorted(self.load_stats.values(), key=lambda stats: stats.total_seconds, reverse=True)
+
+    def _load_builtin_plugins(self) -> None:
+        """Load built-in plugins."""
+        try:
+            loaded = []
+            for module_name, class_name in BUILTIN_PLUGINS:
+                start = time.perf_counter()
+                plugin = getattr(importlib.import_module(module_name), class_name)()
+                self._record_load(plugin, "builtin", start)
+                loaded.append(plugin)
+            self.registry.register_many(loaded)
+        except Exception as e:
+            logger.error(f"Error loading builtin plugins: {e}")
+
+    def _load_plugins_from_entry_points(self) -> None:
+        """Load plugins from setuptools entry points, deferring those that ship a manifest."""
+        try:
+            import importlib.metadata as metadata
+
+            loaded = []
+            for entry_point in metadata.entry_points(group="plainspeak.plugins"):
+                try:
+                    if (
+                        self.config
+                        and hasattr(self.config, "plugins_enabled")
+                        and self.config.plugins_enabled
+                        and entry_point.name not in self.config.plugins_enabled
+                    ):
+                        logger.debug(f"Skipping disabled plugin: {entry_point.name}")
+                        continue
+
+                    start = time.perf_counter()
+                    manifest_path = find_entry_point_manifest(entry_point)
+                    if manifest_path is not None:
+                        plugin = LazyPlugin.from_manifest(
+                            read_manifest(str(manifest_path)),
+                            source=f"entry point {entry_point.name}",
+                            factory=lambda entry_point=entry_point: entry_point.load()(),
+                        )
+                    else:
+                        plugin = entry_point.load()()
+
+                    if self.config and hasattr(self.config, "plugins_disabled"):
+                        if plugin.name in self.config.plugins_disabled:
+                            logger.info(f"Plugin '{plugin.name}' is disabled in configuration")
+                            continue
+
+                    self._record_load(plugin, f"entry point {entry_point.name}", start)
+                    loaded.append(plugin)
+                    logger.debug(f"Loaded plugin '{plugin.name}' from entry point")
+
+                except Exception as e:
+                    logger.error(f"Error loading plugin from entry point '{entry_point.name}': {e}", exc_info=True)
+
+            if loaded:
+                self.registry.register_many(loaded)
+        except Exception as e:
+            logger.error(f"Error loading plugins from entry points: {e}", exc_info=True)
+
+    def _load_plugins_from_directories(self) -> None:
+        """Load plugins from directories."""
+        if not self.config or not hasattr(self.config, "plugins_dir"):
+            return
+        self._load_plugins_from_directory(self.config.plugins_dir)
+
+    def _load_plugins_from_directory(self, directory: str) -> None:
+        """
+        Register the plugins of a specific directory from their manifests.
+
+        Plugin modules are imported when one of their verbs is first used.
+
+        Args:
+            directory: Path to directory containing plugins.
+        """
+        if not paths.exists(directory):
+            logger.warning(f"Plugins directory does not exist: {directory}")
+            return
+
+        # List plugin directories, from the manifest cache when unchanged
+        try:
+            plugin_dirs = get_manifest_cache().plugin_dirs(directory)
+
+            # Register a placeholder for each plugin
+            loaded = []
+            for plugin_dir in plugin_dirs:
+                try:
+                    manifest_path = paths.join_paths(plugin_dir, "manifest.yaml")
+                    start = time.perf_counter()
+                    plugin = LazyPlugin.from_manifest(read_manifest(manifest_path), source=manifest_path)
+                    self._record_load(plugin, manifest_path, start)
+                    loaded.append(plugin)
+                    logger.debug(f"Found plugin '{plugin.name}' in {manifest_path}")
+
+                except Exception as e:
+                    logger.error(f"Error loading plugin from {manifest_path}: {e}", exc_info=True)
+
+            if loaded:
+                self.registry.register_many(loaded)
+
+        except Exception as e:
+            logger.error(f"Error scanning plugins directory: {e}", exc_info=True)
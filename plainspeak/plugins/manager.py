@@ -1,21 +1,22 @@
 """Plugin manager for PlainSpeak."""
 
 import difflib
-import functools
-import importlib
 import logging
-from typing import Any, Dict, Optional
-
-import yaml
-
-from plainspeak.plugins.base import BasePlugin, PluginRegistry
-from plainspeak.plugins.schemas import PluginManifest
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from plainspeak.plugins.arguments import ArgumentValidator, compile_validator
+from plainspeak.plugins.base import BasePlugin
+from plainspeak.plugins.lazy import PluginLoadStats
+from plainspeak.plugins.loading import PluginLoading
+from plainspeak.plugins.registry import PluginRegistry
+from plainspeak.plugins.verb_cache import CacheInfo, VerbCache
 from plainspeak.utils import paths
 
 logger = logging.getLogger(__name__)
 
 
-class PluginManager:
+class PluginManager(PluginLoading):
     """Manages plugins for PlainSpeak."""
 
     # Default threshold for fuzzy matching
@@ -25,132 +26,48 @@ class PluginManager:
         """Initialize plugin manager."""
         self.config = config
         self.registry = PluginRegistry()
+        self._verb_cache = VerbCache()
+        # (plugin name, canonical verb) -> (verb details, argument validator)
+        self._details_cache = VerbCache()
+        self.load_stats: Dict[str, PluginLoadStats] = {}
         self._load_plugins()
 
-    def _load_plugins(self) -> None:
-        """Load all plugins."""
-        # First load builtin plugins
-        self._load_builtin_plugins()
-
-        # Then load any additional plugins from entry points
-        self._load_plugins_from_entry_points()
-
-        # Finally load plugins from configured directories
-        self._load_plugins_from_directories()
-
-        if not self.registry.plugins:
-            logger.warning("No plugins were loaded!")
-
-    def _load_builtin_plugins(self) -> None:
-        """Load built-in plugins."""
-        try:
-            from plainspeak.plugins import file, network, system, text
-
-            self.registry.register(file.FilePlugin())
-            self.registry.register(text.TextPlugin())
-            self.registry.register(system.SystemPlugin())
-            self.registry.register(network.NetworkPlugin())
-        except Exception as e:
-            logger.error(f"Error loading builtin plugins: {e}")
-
-    def _load_plugins_from_entry_points(self) -> None:
-        """Load plugins from setuptools entry points."""
-        try:
-            import importlib.metadata as metadata
-
-            for entry_point in metadata.entry_points(group="plainspeak.plugins"):
-                try:
-                    if (
-                        self.config
-                        and hasattr(self.config, "plugins_enabled")
-                        and self.config.plugins_enabled
-                        and entry_point.name not in self.config.plugins_enabled
-                    ):
-                        logger.debug(f"Skipping disabled plugin: {entry_point.name}")
-                        continue
-
-                    plugin_class = entry_point.load()
-                    plugin = plugin_class()
-
-                    if self.config and hasattr(self.config, "plugins_disabled"):
-                        if plugin.name in self.config.plugins_disabled:
-                            logger.info(f"Plugin '{plugin.name}' is disabled in configuration")
-                            continue
-
-                    self.registry.register(plugin)
-                    logger.debug(f"Loaded plugin '{plugin.name}' from entry point")
-
-                except Exception as e:
-                    logger.error(f"Error loading plugin from entry point '{entry_point.name}': {e}", exc_info=True)
-        except Exception as e:
-            logger.error(f"Error loading plugins from entry points: {e}", exc_info=True)
-
-    def _load_plugins_from_directories(self) -> None:
-        """Load plugins from directories."""
-        if not self.config or not hasattr(self.config, "plugins_dir"):
-            return
-
-        plugins_dir = self.config.plugins_dir
-        if not paths.exists(plugins_dir):
-            logger.warning(f"Plugins directory does not exist: {plugins_dir}")
-            return
-
-        # List plugin directories
-        try:
-            entries = paths.list_directory(plugins_dir)
-            plugin_dirs = []
-
-            # First collect all plugin directories
-            for entry in entries:
-                if paths.is_directory(entry):
-                    manifest_path = paths.join_paths(entry, "manifest.yaml")
-                    if paths.exists(manifest_path):
-                        plugin_dirs.append(entry)
-
-            # Load plugins from each directory
-            for plugin_dir in plugin_dirs:
-                try:
-                    manifest_path = paths.join_paths(plugin_dir, "manifest.yaml")
-                    with open(manifest_path) as f:
-                        manifest_data = yaml.safe_load(f)
-
-                    # Validate manifest data
-                    manifest = PluginManifest(**manifest_data)
-
-                    # Import the plugin module and class
-                    module_name, class_name = manifest.entrypoint.rsplit(".", 1)
-                    module = importlib.import_module(module_name)
-                    plugin_class = getattr(module, class_name)
-
-                    # Instantiate and register plugin
-                    plugin = plugin_class()
-                    self.registry.register(plugin)
-                    logger.debug(f"Loaded plugin '{plugin.name}' from {manifest_path}")
-
-                except Exception as e:
-                    logger.error(f"Error loading plugin from {manifest_path}: {e}", exc_info=True)
-
-        except Exception as e:
-            logger.error(f"Error scanning plugins directory: {e}", exc_info=True)
-
-    @functools.lru_cache(maxsize=256)
     def get_plugin_for_verb(self, verb: str) -> Optional[BasePlugin]:
         """
         Get the plugin that can handle the given verb.
 
+        Resolutions, including fuzzy matches and misses, are cached until the
+        registry changes or the fuzzy matching threshold is adjusted.
+
         Args:
             verb: The verb to handle.
 
         Returns:
             Plugin instance or None if no plugin found.
         """
-        # First try exact match
-        plugin = self.registry.get_plugin_for_verb(verb)
-        if plugin:
+        if not verb:
+            return None
+
+        key = verb.lower()
+        generation = (self.registry.generation, self.FUZZY_MATCH_THRESHOLD)
+        found, plugin = self._verb_cache.lookup(key, generation)
+        if found:
             return plugin
 
-        # If no exact match, try fuzzy matching
-        return self._find_plugin_with_fuzzy_matching(verb)
+        # First try exact match, then fuzzy matching
+        plugin = self.registry.get_plugin_for_verb(verb) or self._find_plugin_with_fuzzy_matching(verb)
+        self._verb_cache.store(key, plugin, generation)
+        return plugin
+
+    def invalidate(self) -> None:
+        """Invalidate cached verb resolutions and verb details."""
+        self._verb_cache.clear()
+        self._details_cache.clear()
+        self.registry.invalidate()
+
+    def cache_info(self) -> CacheInfo:
+        """Get statistics of the verb resolution cache."""
+        return self._verb_cache.info()
 
     def find_plugin_for_verb(self, verb: str) -> Optional[BasePlugin]:
         """
@@ -185,24 +102,22 @@ class PluginManager:
             threshold = self.FUZZY_MATCH_THRESHOLD
 
         verb_lower = verb.lower()
-        all_verbs = self.get_all_verbs()
+        index = self.registry.verb_index
 
         # Try prefix matching first
-        prefix_matches = [v for v in all_verbs if v.lower().startswith(verb_lower)]
-        if prefix_matches:
-            return self.registry.get_plugin_for_verb(prefix_matches[0])
-
-        # Then try fuzzy matching
-        matches = []
-        for v in all_verbs:
-            score = difflib.SequenceMatcher(None, verb_lower, v.lower()).ratio()
-            if score >= threshold:
-                matches.append((v, score))
-
-        if matches:
-            # Sort by score descending
-            matches.sort(key=lambda x: x[1], reverse=True)
-            return self.registry.get_plugin_for_verb(matches[0][0])
+        prefix_match = index.prefix_match(verb_lower)
+        if prefix_match:
+            return self.registry.get_plugin_for_verb(prefix_match)
+
+        # Then score only the verbs that can reach the threshold
+        best_verb, best_score = None, 0.0
+        for v in index.fuzzy_candidates(verb_lower, threshold):
+            score = difflib.SequenceMatcher(None, verb_lower, v).ratio()
+            if score >= threshold and score > best_score:
+                best_verb, best_score = v, score
+
+        if best_verb:
+            return self.registry.get_plugin_for_verb(best_verb)
 
         return None
 
@@ -216,7 +131,7 @@ class PluginManager:
         Returns:
             Plugin instance or None if not found.
         """
-        return self.registry.plugins.get(name)
+        return self.registry.get_plugin(name)
 
     def get_all_plugins(self) -> Dict[str, BasePlugin]:
         """
@@ -244,16 +159,46 @@ class PluginManager:
             verb: The verb to get details for.
 
         Returns:
-            Dictionary with verb details.
+            Dictionary with verb details. It is shared between callers and must not be modified.
         """
         plugin = self.get_plugin_for_verb(verb)
         if not plugin:
             return {}
-        return plugin.get_verb_details(verb)
+        return self._compiled_verb(plugin, verb)[0]
+
+    def _compiled_verb(self, plugin: BasePlugin, verb: str) -> Tuple[Dict[str, Any], Optional[ArgumentValidator]]:
+        """
+        Get the details and compiled argument validator of a verb.
+
+        Both are cached per plugin and canonical verb until the registry changes.
+
+        Args:
+            plugin: Plugin handling the verb.
+            verb: The verb or one of its aliases.
+
+        Returns:
+            Tuple of the verb details and the validator, or None if the plugin has no details for the verb.
+        """
+        try:
+            canonical = plugin.get_canonical_verb(verb)
+        except ValueError:
+            canonical = verb.lower()
+
+        key = (plugin.name, canonical)
+        generation = self.registry.generation
+        found, compiled = self._details_cache.lookup(key, generation)
+        if not found:
+            details = plugin.get_verb_details(verb)
+            compiled = (details, compile_validator(canonical, details) if details else None)
+            self._details_cache.store(key, compiled, generation)
+        return compiled
 
     def reload_plugins(self) -> None:
         """Reload all plugins."""
         self.registry.clear()
+        self._verb_cache.clear()
+        self._details_cache.clear()
+        self.load_stats.clear()
         self._load_plugins()
 
         # Also reload plugins from custom directory if set
@@ -281,55 +226,6 @@ class PluginManager:
         # Load plugins from this directory
         self._load_plugins_from_directory(directory)
 
-    def _load_plugins_from_directory(self, directory: str) -> None:
-        """
-        Load plugins from a specific directory.
-
-        Args:
-            directory: Path to directory containing plugins.
-        """
-        if not paths.exists(directory):
-            logger.warning(f"Plugins directory does not exist: {directory}")
-            return
-
-        # List plugin directories
-        try:
-            entries = paths.list_directory(directory)
-            plugin_dirs = []
-
-            # First collect all plugin directories
-            for entry in entries:
-                if paths.is_directory(entry):
-                    manifest_path = paths.join_paths(entry, "manifest.yaml")
-                    if paths.exists(manifest_path):
-                        plugin_dirs.append(entry)
-
-            # Load plugins from each directory
-            for plugin_dir in plugin_dirs:
-                try:
-                    manifest_path = paths.join_paths(plugin_dir, "manifest.yaml")
-                    with open(manifest_path) as f:
-                        manifest_data = yaml.safe_load(f)
-
-                    # Validate manifest data
-                    manifest = PluginManifest(**manifest_data)
-
-                    # Import the plugin module and class
-                    module_name, class_name = manifest.entrypoint.rsplit(".", 1)
-                    module = importlib.import_module(module_name)
-                    plugin_class = getattr(module, class_name)
-
-                    # Instantiate and register plugin
-                    plugin = plugin_class()
-                    self.registry.register(plugin)
-                    logger.debug(f"Loaded plugin '{plugin.name}' from {manifest_path}")
-
-                except Exception as e:
-                    logger.error(f"Error loading plugin from {manifest_path}: {e}", exc_info=True)
-
-        except Exception as e:
-            logger.error(f"Error scanning plugins directory: {e}", exc_info=True)
-
     def extract_verb_and_args(self, text: str) -> tuple:
         """
         Extract verb and arguments from natural language text.
@@ -384,6 +280,9 @@ class PluginManager:
         """
         Resolve parameters for a verb.
 
+        Arguments are checked with the verb's compiled validator, which applies
+        defaults, coerces values to their declared types and normalizes paths.
+
         Args:
             verb: The verb to handle.
             args: Arguments for the verb.
@@ -392,16 +291,28 @@ class PluginManager:
 
         Returns:
             Dictionary of resolved parameters.
+
+        Raises:
+            ArgumentValidationError: If required arguments are missing or invalid.
         """
         plugin = self.get_plugin_for_verb(verb)
         if not plugin:
             return {}
 
-        # Get verb details to understand expected parameters
-        verb_details = plugin.get_verb_details(verb)
-        if not verb_details or "args" not in verb_details:
+        _, validator = self._compiled_verb(plugin, verb)
+        if validator is None:
             return args
+        return validator(args)
+
+
+_shared_manager: Optional[PluginManager] = None
+_shared_lock = threading.Lock()
+
 
-        # Simple implementation that just returns the args as is
-        # In a real implementation, this would validate and transform the args
-        return args
+def get_plugin_manager() -> PluginManager:
+    """Get the shared plugin manager, loading the plugins on first use."""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = PluginManager()
+        return _shared_manager
@@ -0,0 +1,228 @@
+"""
+Persistent cache of parsed plugin manifests.
+
+Loading a manifest means parsing YAML and validating the result with the
+PluginManifest schema. Validated manifests are kept in a pickled snapshot under
+the configuration directory, or at the path set in the PLAINSPEAK_MANIFEST_CACHE
+environment variable, keyed by the manifest's path and checked against
+its modification time, size and content hash, so unchanged manifests are
+neither parsed nor validated again. Plugin directory listings are cached the
+same way, keyed by the modification times of the directory and its
+subdirectories.
+"""
+
+import atexit
+import hashlib
+import logging
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml  # type: ignore[import-untyped]
+
+from ..utils import paths
+from .schemas import CommandConfig, PluginManifest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".config" / "plainspeak" / "cache" / "plugin_manifests.pickle"
+
+# Environment variable overriding the snapshot path, empty to keep the cache in memory only
+CACHE_PATH_ENV = "PLAINSPEAK_MANIFEST_CACHE"
+
+MANIFEST_NAME = "manifest.yaml"
+
+# Files modified this recently may change again within the timestamp
+# resolution, so their modification time alone is not trusted
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def _schema_key() -> Tuple[Any, ...]:
+    """Identify the manifest schema, so snapshots from other versions are ignored."""
+    import pydantic
+
+    return (pydantic.VERSION, tuple(PluginManifest.model_fields), tuple(CommandConfig.model_fields))
+
+
+def _trusted_mtime(stat: os.stat_result) -> Optional[int]:
+    """Get a modification time that is safe to compare later, or None if it is too recent."""
+    if time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS:
+        return None
+    return stat.st_mtime_ns
+
+
+def _mtime(path: str) -> Optional[int]:
+    """Get the modification time of a path, or None if it no longer exists."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ManifestCache:
+    """Cache of validated plugin manifests and plugin directory listings."""
+
+    # Bump when the snapshot layout changes
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize the cache, loading the snapshot if there is one.
+
+        Args:
+            path: Snapshot file, or None to keep the cache in memory only.
+        """
+        self.path = path
+        # manifest path -> (mtime, size, content hash, manifest)
+        self._manifests: Dict[str, Tuple[Optional[int], int, bytes, PluginManifest]] = {}
+        # directory -> (mtime, {subdirectory: mtime}, plugin directories)
+        self._listings: Dict[str, Tuple[Optional[int], Dict[str, Optional[int]], List[str]]] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            self._load_snapshot()
+
+    def _load_snapshot(self) -> None:
+        """Load the persisted snapshot, ignoring it if unreadable or outdated."""
+        try:
+            with open(self.path, "rb") as f:
+                state = pickle.load(f)
+            if state.get("version") != self.SNAPSHOT_VERSION or state.get("schema") != _schema_key():
+                return
+            self._manifests = state["manifests"]
+            self._listings = state["listings"]
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable manifest cache {self.path}: {e}")
+            self._manifests = {}
+            self._listings = {}
+
+    def save(self) -> None:
+        """Persist the cache if it changed."""
+        if self.path is None or not self._dirty:
+            return
+        state = {
+            "version": self.SNAPSHOT_VERSION,
+            "schema": _schema_key(),
+            "manifests": self._manifests,
+            "listings": self._listings,
+        }
+        try:
+            paths.make_directory(self.path.parent)
+            paths.atomic_write(self.path, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+            self._dirty = False
+        except OSError as e:
+            logger.debug(f"Could not save manifest cache to {self.path}: {e}")
+
+    def load(self, manifest_path: str) -> PluginManifest:
+        """
+        Load a validated manifest, parsing it only if it changed.
+
+        Args:
+            manifest_path: Path to the manifest YAML file.
+
+        Returns:
+            The validated manifest. It is shared between callers and must not be modified.
+        """
+        key = os.path.abspath(manifest_path)
+        stat = os.stat(key)
+        entry = self._manifests.get(key)
+        if entry is not None and entry[0] is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self.hits += 1
+            return entry[3]
+
+        with open(key, "rb") as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if entry is not None and entry[2] == digest:
+            # Touched but not modified
+            self.hits += 1
+            manifest = entry[3]
+        else:
+            self.misses += 1
+            manifest = PluginManifest(**yaml.safe_load(data))
+
+        self._manifests[key] = (_trusted_mtime(stat), stat.st_size, digest, manifest)
+        self._dirty = True
+        return manifest
+
+    def plugin_dirs(self, directory: str) -> List[str]:
+        """
+        List the subdirectories of a directory that contain a plugin manifest.
+
+        Args:
+            directory: Plugins directory.
+
+        Returns:
+            Paths of the plugin directories.
+        """
+        key = os.path.abspath(directory)
+        stat = os.stat(key)
+        entry = self._listings.get(key)
+        if (
+            entry is not None
+            and entry[0] is not None
+            and entry[0] == stat.st_mtime_ns
+            and all(mtime is not None and mtime == _mtime(sub) for sub, mtime in entry[1].items())
+        ):
+            return list(entry[2])
+
+        subdirectories: Dict[str, Optional[int]] = {}
+        plugin_dirs = []
+        for entry_path in paths.list_directory(key):
+            if paths.is_directory(entry_path):
+                subdirectories[entry_path] = _trusted_mtime(os.stat(entry_path))
+                if paths.exists(paths.join_paths(entry_path, MANIFEST_NAME)):
+                    plugin_dirs.append(entry_path)
+
+        self._listings[key] = (_trusted_mtime(stat), subdirectories, plugin_dirs)
+        self._dirty = True
+        return list(plugin_dirs)
+
+
+_default_cache: Optional[ManifestCache] = None
+
+
+def default_cache_path() -> Optional[Path]:
+    """
+    Get the snapshot path of the process-wide cache.
+
+    Returns:
+        The path from PLAINSPEAK_MANIFEST_CACHE if set, DEFAULT_CACHE_PATH otherwise,
+        or None if the variable is empty.
+    """
+    override = os.getenv(CACHE_PATH_ENV)
+    if override is None:
+        return DEFAULT_CACHE_PATH
+    return Path(override).expanduser() if override else None
+
+
+def get_manifest_cache() -> ManifestCache:
+    """
+    Get the process-wide manifest cache, which is saved at exit.
+
+    Returns:
+        The shared ManifestCache.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ManifestCache(default_cache_path())
+        atexit.register(_default_cache.save)
+    return _default_cache
+
+
+def read_manifest(manifest_path: str) -> PluginManifest:
+    """
+    Read and validate a plugin manifest through the shared cache.
+
+    Args:
+        manifest_path: Path to the manifest YAML file.
+
+    Returns:
+        The validated manifest.
+    """
+    return get_manifest_cache().load(manifest_path)
@@ -4,10 +4,14 @@ Platform-specific utilities for PlainSpeak.
 This module provides platform-specific path handling and system operations.
 """
 
+import getpass
 import os
 import platform
+import socket
+import time
 from pathlib import Path
-from typing import Optional, Union
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
 
 
 class PlatformManager:
@@ -18,8 +22,29 @@ class PlatformManager:
     - Path normalization
     - System paths lookup
     - Platform-specific command mapping
+    - Snapshots of system facts and environment variables
     """
 
+    # Verdicts of is_safe_path kept per normalized path
+    SAFE_PATH_CACHE_SIZE = 4096
+
+    # Seconds for which collected system facts are reused
+    SYSTEM_INFO_TTL = 300.0
+
+    # Windows equivalents of Unix commands
+    COMMAND_CONVERSIONS = {
+        "ls": "dir",
+        "rm": "del",
+        "cp": "copy",
+        "mv": "move",
+        "cat": "type",
+        "touch": "echo. >",
+        "grep": "findstr",
+        "chmod": "icacls",
+        "pwd": "cd",
+        "ln": "mklink",
+    }
+
     def __init__(self):
         """Initialize the platform manager."""
         self.system = platform.system().lower()
@@ -28,6 +53,11 @@ class PlatformManager:
         self.is_linux = self.system == "linux"
         self.path_sep = os.path.sep
         self._setup_system_paths()
+        self._user: Optional[str] = None
+        self._system_info: Optional[Dict[str, Any]] = None
+        self._system_info_time = 0.0
+        self._environ: Optional[Mapping[str, str]] = None
+        self._environ_data: Optional[Dict[Any, Any]] = None
 
     def _setup_system_paths(self) -> None:
         """Setup platform-specific system paths."""
@@ -64,6 +94,39 @@ class PlatformManager:
                 "downloads": self.home / "Downloads",
             }
 
+        self._safe_prefixes = self._get_safe_prefixes()
+        self._safe_path_cache: Dict[str, bool] = {}
+
+    def _get_safe_prefixes(self) -> Tuple[str, ...]:
+        """Get the normalized prefixes of the paths under safe locations."""
+        roots = [self.home, self.get_known_path("temp"), self.get_known_path("downloads")]
+        if self.is_windows:
+            roots.extend([self.get_known_path("program_files"), self.get_known_path("system")])
+        elif self.is_macos:
+            roots.extend([self.get_known_path("applications"), self.get_known_path("library")])
+        else:
+            roots.extend([self.get_known_path("bin"), self.get_known_path("local")])
+
+        prefixes = []
+        for root in roots:
+            # Unset locations, e.g. a missing %TEMP%, are relative and never contain a normalized path
+            if root is not None and root.is_absolute():
+                prefix = os.path.join(str(root), "")
+                prefixes.append(prefix.lower() if self.is_windows else prefix)
+        return tuple(prefixes)
+
+    def _normalize(self, path: Union[str, Path]) -> str:
+        """Normalize a path to an absolute string, see normalize_path()."""
+        path = os.fspath(path)
+
+        # Expand user directory
+        if path.startswith("~"):
+            path = os.path.expanduser(path)
+
+        # Make absolute and normalize separators and case (on Windows)
+        path = os.path.normpath(os.path.join(os.getcwd(), path))
+        return path.lower() if self.is_windows else path
+
     def normalize_path(self, path: Union[str, Path]) -> Path:
         """
         Normalize a path for the current platform.
@@ -74,23 +137,7 @@ class PlatformManager:
         Returns:
             Normalized Path object.
         """
-        # Convert to Path object
-        path = Path(path)
-
-        # Expand user directory
-        if str(path).startswith("~"):
-            path = Path(os.path.expanduser(str(path)))
-
-        # Make absolute
-        if not path.is_absolute():
-            path = Path.cwd() / path
-
-        # Normalize separators and case (on Windows)
-        path = Path(os.path.normpath(str(path)))
-        if self.is_windows:
-            path = Path(str(path).lower())
-
-        return path
+        return Path(self._normalize(path))
 
     def get_known_path(self, name: str) -> Optional[Path]:
         """
@@ -114,28 +161,15 @@ class PlatformManager:
         Returns:
             True if safe, False otherwise.
         """
-        path = self.normalize_path(path)
-
-        # Check if path exists under home directory
-        try:
-            if self.home in path.parents:
-                return True
-        except Exception:
-            return False
-
-        # Check other safe locations
-        safe_roots = [self.get_known_path("temp"), self.get_known_path("downloads")]
-
-        if self.is_windows:
-            safe_roots.extend([self.get_known_path("program_files"), self.get_known_path("system")])
-        elif self.is_macos:
-            safe_roots.extend([self.get_known_path("applications"), self.get_known_path("library")])
-        else:
-            safe_roots.extend([self.get_known_path("bin"), self.get_known_path("local")])
-
-        safe_roots = [r for r in safe_roots if r is not None]
-
-        return any(r in path.parents for r in safe_roots)
+        path = self._normalize(path)
+        safe = self._safe_path_cache.get(path)
+        if safe is None:
+            # Only paths strictly below home or another safe location are safe
+            safe = any(path.startswith(prefix) and path != prefix for prefix in self._safe_prefixes)
+            if len(self._safe_path_cache) >= self.SAFE_PATH_CACHE_SIZE:
+                self._safe_path_cache.clear()
+            self._safe_path_cache[path] = safe
+        return safe
 
     def convert_path_for_command(self, path: Union[str, Path]) -> str:
         """
@@ -173,27 +207,75 @@ class PlatformManager:
         """
         if self.is_windows:
             # Convert Unix-style commands to Windows equivalents
-            conversions = {
-                "ls": "dir",
-                "rm": "del",
-                "cp": "copy",
-                "mv": "move",
-                "cat": "type",
-                "touch": "echo. >",
-                "grep": "findstr",
-                "chmod": "icacls",
-                "pwd": "cd",
-                "ln": "mklink",
-            }
-
-            # Split command into parts
             parts = command.split()
-            if parts and parts[0] in conversions:
-                parts[0] = conversions[parts[0]]
+            if parts and parts[0] in self.COMMAND_CONVERSIONS:
+                parts[0] = self.COMMAND_CONVERSIONS[parts[0]]
                 command = " ".join(parts)
 
         return command
 
+    @property
+    def user(self) -> str:
+        """
+        Name of the user running PlainSpeak, looked up once.
+
+        Unlike os.getlogin(), this doesn't need a controlling terminal.
+        """
+        if self._user is None:
+            try:
+                self._user = getpass.getuser()
+            except Exception:
+                # No login name in the environment and no password database entry
+                self._user = str(os.getuid()) if hasattr(os, "getuid") else "unknown"
+        return self._user
+
+    def system_info(self, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get facts about the system that don't change while PlainSpeak runs.
+
+        They are collected on first use, and again once they are older than
+        SYSTEM_INFO_TTL seconds, as some of them are slow to look up:
+        platform.architecture() may even start a subprocess.
+
+        Args:
+            refresh: Collect the facts again now.
+
+        Returns:
+            Dict containing system information, shared between callers and not to be modified.
+        """
+        now = time.monotonic()
+        if refresh or self._system_info is None or now - self._system_info_time > self.SYSTEM_INFO_TTL:
+            self._system_info = {
+                "os": platform.system(),
+                "os_version": platform.version(),
+                "hostname": socket.gethostname(),
+                "username": self.user,
+                "python_version": platform.python_version(),
+                "cpu_count": os.cpu_count() or 0,
+                "platform": platform.platform(),
+                "architecture": platform.architecture()[0],
+            }
+            self._system_info_time = now
+        return self._system_info
+
+    def environment(self) -> Mapping[str, str]:
+        """
+        Get a read-only snapshot of the environment variables.
+
+        A new snapshot is taken only once os.environ has changed, which is
+        detected by comparing its raw contents with those of the snapshot,
+        without decoding or copying them.
+
+        Returns:
+            The environment variables.
+        """
+        # The undecoded variables behind os.environ, missing on other Python implementations
+        data = getattr(os.environ, "_data", None)
+        if self._environ is None or data is None or data != self._environ_data:
+            self._environ_data = dict(data) if data is not None else None
+            self._environ = MappingProxyType(os.environ.copy())
+        return self._environ
+
 
 # Global platform manager
 platform_manager = PlatformManager()
@@ -0,0 +1,244 @@
+"""
+Plugin registry for PlainSpeak.
+
+This module defines the registry that maps verbs and aliases to plugins.
+"""
+
+import itertools
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .base import BasePlugin, PluginLoadError
+from .lazy import LazyPlugin
+from .verb_cache import CacheInfo, VerbCache
+from .verb_index import VerbIndex
+
+logger = logging.getLogger(__name__)
+
+# Registry generations are unique across registries, so a cache stamped with
+# one registry's generation is never mistaken as valid for another
+_generations = itertools.count(1)
+
+
+class PluginRegistry:
+    """Registry managing plugins."""
+
+    def __init__(self):
+        """Initialize registry."""
+        self.plugins: Dict[str, BasePlugin] = {}
+        self.verb_to_plugin_map: Dict[str, str] = {}
+        self.verb_to_plugin_cache: Dict[str, str] = {}
+        self.verb_index = VerbIndex()
+        self.generation = next(_generations)
+        self._verb_cache = VerbCache()
+
+        # verb -> (-priority, registration order, position in plugin) of the winning claim
+        self._verb_ranks: Dict[str, Tuple[Any, int, int]] = {}
+        self._plugin_order: Dict[str, int] = {}
+        self._next_order = 0
+        # False once the verb maps no longer reflect the registered plugins
+        self._verb_maps_valid = True
+        # (generation, verbs in priority order) computed by get_all_verbs
+        self._ordered_verbs: Optional[Tuple[int, Dict[str, str]]] = None
+
+    def invalidate(self) -> None:
+        """Start a new generation, invalidating cached verb resolutions."""
+        self.generation = next(_generations)
+
+    def cache_info(self) -> CacheInfo:
+        """Get statistics of the verb resolution cache."""
+        return self._verb_cache.info()
+
+    def register(self, plugin: BasePlugin) -> None:
+        """Register a plugin."""
+        replacing = plugin.name in self.plugins
+        if replacing:
+            logger.warning(f"Replacing plugin '{plugin.name}'")
+        self.plugins[plugin.name] = plugin
+        if replacing or not self._verb_maps_valid:
+            self._rebuild_verb_maps()
+        else:
+            self._insert_verbs(plugin)
+        logger.debug(
+            f"Registered plugin '{plugin.name}' with {len(plugin.get_verbs())} verbs "
+            f"and {len(plugin.get_aliases())} aliases"
+        )
+
+    def register_many(self, plugins: Iterable[BasePlugin]) -> None:
+        """
+        Register several plugins, building the verb maps only once.
+
+        Args:
+            plugins: Plugins to register, in registration order.
+        """
+        count = 0
+        for plugin in plugins:
+            if plugin.name in self.plugins:
+                logger.warning(f"Replacing plugin '{plugin.name}'")
+            self.plugins[plugin.name] = plugin
+            count += 1
+        self._rebuild_verb_maps()
+        logger.debug(f"Registered {count} plugins")
+
+    def _insert_verbs(self, plugin: BasePlugin) -> None:
+        """
+        Add the verbs and aliases of a newly registered plugin to the verb maps.
+
+        A verb is claimed by the plugin with the highest priority, and among
+        plugins of equal priority by the one registered first. The new plugin
+        comes last in registration order, so it only takes over verbs held by
+        plugins of lower priority.
+        """
+        order = self._next_order
+        self._next_order += 1
+        self._plugin_order[plugin.name] = order
+
+        for position, verb in enumerate([*plugin.get_verbs(), *plugin.get_aliases()]):
+            verb_lower = verb.lower()
+            rank = (-plugin.priority, order, position)
+            current = self._verb_ranks.get(verb_lower)
+            if current is None or rank < current:
+                self._verb_ranks[verb_lower] = rank
+                self.verb_to_plugin_map[verb_lower] = plugin.name
+                self.verb_index.add(verb_lower, rank)
+
+        self.invalidate()
+
+    def _rebuild_verb_maps(self) -> None:
+        """Rebuild verb mappings from scratch."""
+        self.verb_to_plugin_map.clear()
+        self.verb_to_plugin_cache.clear()
+        self._verb_ranks.clear()
+        self._plugin_order = {name: order for order, name in enumerate(self.plugins)}
+        self._next_order = len(self._plugin_order)
+        self.verb_index = VerbIndex()
+        self.invalidate()
+
+        # Process plugins in priority order
+        for plugin in self.get_plugins_sorted_by_priority():
+            order = self._plugin_order[plugin.name]
+            for position, verb in enumerate([*plugin.get_verbs(), *plugin.get_aliases()]):
+                verb_lower = verb.lower()
+                if verb_lower not in self.verb_to_plugin_map:
+                    rank = (-plugin.priority, order, position)
+                    self._verb_ranks[verb_lower] = rank
+                    self.verb_to_plugin_map[verb_lower] = plugin.name
+                    self.verb_index.add(verb_lower, rank)
+        self._verb_maps_valid = True
+
+    def get_plugin(self, name: str) -> Optional[BasePlugin]:
+        """Get plugin by name, loading it if it was deferred."""
+        plugin = self.plugins.get(name)
+        if isinstance(plugin, LazyPlugin):
+            return self._load_lazy_plugin(plugin)
+        return plugin
+
+    def _load_lazy_plugin(self, stub: LazyPlugin) -> Optional[BasePlugin]:
+        """
+        Replace a deferred plugin with the plugin instance it stands for.
+
+        Plugins that fail to load are dropped from the registry, so their
+        verbs fall through to other plugins.
+
+        Returns:
+            The loaded plugin, or None if it could not be loaded.
+        """
+        try:
+            plugin = stub.load()
+        except PluginLoadError:
+            if self.plugins.get(stub.name) is stub:
+                del self.plugins[stub.name]
+                self._rebuild_verb_maps()
+            return None
+
+        if self.plugins.get(stub.name) is stub:
+            # Assigning to the existing key keeps the plugin's registration order
+            self.plugins[stub.name] = plugin
+            if not stub.describes(plugin):
+                logger.warning(f"Plugin '{stub.name}' differs from its manifest, rebuilding verb map")
+                self._rebuild_verb_maps()
+        return plugin
+
+    def get_plugin_for_verb(self, verb: str) -> Optional[BasePlugin]:
+        """Get plugin for verb."""
+        if not verb:
+            logger.debug("Empty verb provided")
+            return None
+
+        verb_lower = verb.lower()
+        generation = self.generation
+        found, plugin = self._verb_cache.lookup(verb_lower, generation)
+        if not found:
+            plugin = self._resolve_verb(verb_lower)
+            self._verb_cache.store(verb_lower, plugin, generation)
+        return plugin
+
+    def _resolve_verb(self, verb_lower: str) -> Optional[BasePlugin]:
+        """Resolve a lowercase verb through the verb map."""
+        plugin_name = self.verb_to_plugin_map.get(verb_lower)
+        if plugin_name:
+            # Handle case where plugin was removed but still in verb map
+            if plugin_name in self.plugins:
+                plugin = self.plugins[plugin_name]
+                if isinstance(plugin, LazyPlugin):
+                    generation = self.generation
+                    plugin = self._load_lazy_plugin(plugin)
+                    if self.generation != generation:
+                        # The verb map changed, the verb may now belong to another plugin
+                        return self._resolve_verb(verb_lower)
+                return plugin
+            else:
+                logger.warning(f"Plugin '{plugin_name}' for verb '{verb_lower}' not found in registry")
+                # Clear caches to rebuild verb maps
+                self.clear_caches()
+                return None
+
+        return None
+
+    def get_all_verbs(self) -> Dict[str, str]:
+        """Get all verb mappings, in priority order."""
+        # Every change to the verb maps starts a new generation, so the order is sorted once per generation
+        cached = self._ordered_verbs
+        if cached is None or cached[0] != self.generation:
+            ranks = self._verb_ranks
+            ordered = sorted(self.verb_to_plugin_map, key=lambda verb: ranks.get(verb, ()))
+            cached = (self.generation, {verb: self.verb_to_plugin_map[verb] for verb in ordered})
+            self._ordered_verbs = cached
+        return dict(cached[1])
+
+    def get_plugins_sorted_by_priority(self) -> List[BasePlugin]:
+        """Get plugins sorted by priority."""
+        plugins = list(self.plugins.values())
+        plugins.sort(key=lambda p: p.priority, reverse=True)
+        return plugins
+
+    def clear(self) -> None:
+        """Clear registry."""
+        self.plugins.clear()
+        self.verb_to_plugin_map.clear()
+        self.verb_to_plugin_cache.clear()
+        self._verb_ranks.clear()
+        self._plugin_order.clear()
+        self._next_order = 0
+        self._verb_maps_valid = True
+        self.verb_index = VerbIndex()
+        self.invalidate()
+
+    def clear_caches(self) -> None:
+        """Clear caches but keep plugins."""
+        self.verb_to_plugin_map.clear()
+        self.verb_to_plugin_cache.clear()
+        self._verb_ranks.clear()
+        self.verb_index = VerbIndex()
+        self.invalidate()
+        # The verb maps are rebuilt on the next registration
+        self._verb_maps_valid = False
+
+        # Also clear caches in plugins
+        for plugin in self.plugins.values():
+            if hasattr(plugin, "clear_caches"):
+                plugin.clear_caches()
+
+
+# Global registry
+registry = PluginRegistry()
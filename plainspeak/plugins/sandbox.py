@@ -5,9 +5,9 @@ This module extends the core sandbox functionality with plugin-specific features
 """
 
 import logging
-from typing import Optional, Tuple
 
 from ..core.sandbox import Sandbox
+from ..core.validation import SAFE, ValidationResult
 
 logger = logging.getLogger(__name__)
 
@@ -26,23 +26,23 @@ class SafetySandbox(Sandbox):
         """Initialize the sandbox plugin."""
         super().__init__()
 
-    def validate_command(self, command: str) -> Tuple[bool, Optional[str]]:
+    def check_command(self, command: str) -> ValidationResult:
         """
         Extends core validation with plugin-specific rules.
 
         Args:
-            command: The command to validate.
+            command: The command to check.
 
         Returns:
-            Tuple of (is_safe, error_message).
+            The verdict, with the first rule the command breaks.
         """
         # First run core validation
-        is_safe, error = super().validate_command(command)
-        if not is_safe:
-            return False, error
+        result = super().check_command(command)
+        if not result.safe:
+            return result
 
         # Add any plugin-specific validation here
-        return True, None
+        return SAFE
 
 
 # Global sandbox instance
@@ -0,0 +1,83 @@
+"""
+Verb resolution cache for plugin lookups.
+
+Each registry and manager owns its own cache, so cached plugins are released
+together with their owner. Entries are stamped with the generation of the
+registry they were resolved against; a lookup with a different generation
+drops every entry, which invalidates the cache whenever plugins change.
+"""
+
+from collections import OrderedDict, namedtuple
+from typing import Any, Hashable, Tuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize", "generation"])
+
+
+class VerbCache:
+    """Bounded LRU cache of verb resolutions with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of cached resolutions.
+        """
+        self.maxsize = maxsize
+        self.generation: Any = None
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: Hashable, generation: Any) -> Tuple[bool, Any]:
+        """
+        Look up a cached resolution.
+
+        Args:
+            key: Cache key, usually the lowercase verb.
+            generation: Current generation of the backing registry.
+
+        Returns:
+            Tuple of (found, value).
+        """
+        if generation != self.generation:
+            self._entries.clear()
+            self.generation = generation
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def store(self, key: Hashable, value: Any, generation: Any) -> None:
+        """
+        Cache a resolution made against the given generation.
+
+        Results computed against an outdated generation are discarded.
+
+        Args:
+            key: Cache key, usually the lowercase verb.
+            value: Resolved value (None results are cached too).
+            generation: Generation the value was resolved against.
+        """
+        if generation != self.generation or self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries, keeping the counters."""
+        self._entries.clear()
+        self.generation = None
+
+    def info(self) -> CacheInfo:
+        """Get cache statistics."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries), self.generation)
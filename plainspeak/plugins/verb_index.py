@@ -0,0 +1,137 @@
+"""
+Verb index for plugin verb resolution.
+
+Provides prefix lookups through a trie and candidate selection for fuzzy
+matching through a character n-gram index, so that resolving a verb does not
+require scanning every registered verb.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _TrieNode:
+    """Trie node tracking the best-ranked verb in its subtree."""
+
+    __slots__ = ("children", "best_rank", "best_verb")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.best_rank: Any = None
+        self.best_verb: Optional[str] = None
+
+
+class VerbIndex:
+    """
+    Index over registered verbs and aliases.
+
+    Every verb carries a rank (any comparable value, lower is preferred) that
+    mirrors the registry's priority order, so lookups return the same verb a
+    scan of the verb map in order would.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._root = _TrieNode()
+        self._ranks: Dict[str, Any] = {}
+        # verb length -> character -> {verb -> occurrences of the character}
+        self._grams: Dict[int, Dict[str, Dict[str, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    def __contains__(self, verb: object) -> bool:
+        return verb in self._ranks
+
+    def add(self, verb: str, rank: Any) -> None:
+        """
+        Add a verb to the index.
+
+        Args:
+            verb: Lowercase verb or alias.
+            rank: Position of the verb in priority order (lower wins).
+        """
+        if verb in self._ranks:
+            # Only improved ranks are accepted, which keeps the trie minimums valid
+            if not rank < self._ranks[verb]:
+                return
+        else:
+            by_char = self._grams.setdefault(len(verb), {})
+            for char in verb:
+                posting = by_char.setdefault(char, {})
+                posting[verb] = posting.get(verb, 0) + 1
+        self._ranks[verb] = rank
+
+        node = self._root
+        self._offer(node, verb, rank)
+        for char in verb:
+            node = node.children.setdefault(char, _TrieNode())
+            self._offer(node, verb, rank)
+
+    @staticmethod
+    def _offer(node: _TrieNode, verb: str, rank: Any) -> None:
+        """Record a verb at a node if it outranks the current best."""
+        if node.best_verb is None or rank < node.best_rank:
+            node.best_rank = rank
+            node.best_verb = verb
+
+    def prefix_match(self, prefix: str) -> Optional[str]:
+        """
+        Find the best-ranked verb starting with a prefix.
+
+        Args:
+            prefix: Lowercase prefix.
+
+        Returns:
+            The matching verb, or None.
+        """
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node.best_verb
+
+    def fuzzy_candidates(self, query: str, threshold: float) -> List[str]:
+        """
+        Select verbs that may reach a similarity ratio of at least ``threshold``.
+
+        The ratio used by difflib.SequenceMatcher is 2*M/T, where M is the
+        number of matching characters and T the combined length. M can never
+        exceed the shorter length nor the number of shared characters, which
+        gives an upper bound used to discard verbs without scoring them. No
+        verb that could pass the threshold is discarded.
+
+        Args:
+            query: Lowercase verb to match.
+            threshold: Minimum similarity ratio (0.0 to 1.0).
+
+        Returns:
+            Candidate verbs in rank order.
+        """
+        if not query or threshold <= 0:
+            return sorted(self._ranks, key=self._ranks.__getitem__)
+
+        n = len(query)
+        # 2*min(n, m) / (n + m) >= threshold bounds the candidate length m
+        min_length = n * threshold / (2 - threshold)
+        max_length = n * (2 - threshold) / threshold
+        query_counts: Dict[str, int] = {}
+        for char in query:
+            query_counts[char] = query_counts.get(char, 0) + 1
+
+        # Count shared characters, only for verbs of a feasible length
+        shared: Dict[str, int] = {}
+        for length, by_char in self._grams.items():
+            if not min_length - 1e-9 <= length <= max_length + 1e-9:
+                continue
+            for char, count in query_counts.items():
+                for verb, occurrences in by_char.get(char, {}).items():
+                    shared[verb] = shared.get(verb, 0) + min(count, occurrences)
+
+        candidates: List[Tuple[Any, str]] = [
+            (self._ranks[verb], verb)
+            for verb, matches in shared.items()
+            if 2 * matches / (n + len(verb)) >= threshold - 1e-9
+        ]
+        candidates.sort(key=lambda item: item[0])
+        return [verb for _, verb in candidates]
@@ -4,6 +4,6 @@ Utility modules for PlainSpeak.
 This package provides common utilities used throughout the PlainSpeak codebase.
 """
 
-from . import path_compat, paths
+from . import bm25, path_compat, paths
 
-__all__ = ["paths", "path_compat"]
+__all__ = ["bm25", "paths", "path_compat"]
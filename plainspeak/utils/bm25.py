@@ -0,0 +1,77 @@
+"""
+Tokenization and BM25 weighting shared by PlainSpeak's text indexes.
+
+Both the system prompt section index and the learning store's similarity
+index rank documents with BM25 over the same terms, so a query is matched
+the same way whichever index answers it.
+"""
+
+import math
+import re
+from typing import List
+
+# BM25 parameters: term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+WORD_RE = re.compile(r"\w+")
+
+STOPWORDS = frozenset(
+    "a all an and any are as at be by can do for from how i in into is it me my of on or so that the this "
+    "to up what which with you your".split()
+)
+
+
+def words(text: str) -> List[str]:
+    """Split text into lowercase words."""
+    return WORD_RE.findall(text.lower())
+
+
+def terms(text: str) -> List[str]:
+    """
+    Split text into index terms: lowercase words without stopwords and plural endings.
+
+    Args:
+        text: Text to split.
+
+    Returns:
+        Terms in order of appearance.
+    """
+    result = []
+    for word in words(text):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        result.append(word)
+    return result
+
+
+def idf(documents: int, frequency: int) -> float:
+    """
+    Inverse document frequency of a term.
+
+    Args:
+        documents: Number of indexed documents.
+        frequency: Number of documents containing the term.
+
+    Returns:
+        The BM25 idf, always positive.
+    """
+    return math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+
+
+def term_weight(frequency: int, length: int, average_length: float) -> float:
+    """
+    BM25 weight of a term in a document, excluding idf.
+
+    Args:
+        frequency: Occurrences of the term in the document.
+        length: Number of terms of the document.
+        average_length: Average number of terms of the indexed documents.
+
+    Returns:
+        The saturated, length-normalized term frequency.
+    """
+    norm = K1 * (1 - B + B * length / (average_length or 1))
+    return frequency * (K1 + 1) / (frequency + norm)
@@ -7,7 +7,15 @@ pathlib-related issues across different Python versions and platforms.
 
 import glob
 import os
-from typing import List, Optional, Union
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
 
 PathLike = Union[str, bytes, os.PathLike]
 
@@ -162,6 +170,58 @@ def make_directory(path: PathLike, exist_ok: bool = True) -> str:
     return path_str
 
 
+def atomic_write(path: PathLike, data: bytes) -> None:
+    """
+    Write data to a file atomically.
+
+    The data is written to a temporary file in the same directory, flushed to
+    disk and then moved over the target, so readers never see a partial file.
+
+    Args:
+        path: Destination file.
+        data: Bytes to write.
+    """
+    path_str = normalize_path(path)
+    directory, name = os.path.split(path_str)
+    fd, tmp_name = tempfile.mkstemp(dir=directory or None, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path_str)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+@contextmanager
+def file_lock(path: PathLike) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a file, waiting for other holders to release it.
+
+    The lock is taken per open file, so it also serializes threads of one process.
+
+    Args:
+        path: Lock file, created if missing.
+    """
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
 def find_upwards(filename: str, start_dir: Optional[PathLike] = None) -> Optional[str]:
     """
     Search for a file in the given directory and its parents.
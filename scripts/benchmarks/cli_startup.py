@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI import time.
+
+Measures how long it takes a fresh interpreter to import the modules used by
+a one-shot `plainspeak "..."` invocation, and reports which heavy optional
+libraries ended up being imported along the way.
+
+Usage:
+    python scripts/benchmarks/cli_startup.py [--runs 10] [--module plainspeak.cli]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+HEAVY_MODULES = ["pandas", "numpy", "transformers", "ctransformers", "openai"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Number of fresh interpreters to time")
+    parser.add_argument(
+        "--module",
+        action="append",
+        help="Module to import (repeatable, default: the translate handlers and the CLI package)",
+    )
+    args = parser.parse_args()
+    modules = args.module or ["plainspeak.learning", "plainspeak.cli.handlers.translate_handlers", "plainspeak.cli"]
+
+    with tempfile.TemporaryDirectory() as home:
+        # Use a scratch home so the run doesn't touch the user's learning store or config
+        env = dict(os.environ, HOME=home, PYTHONPATH=str(ROOT))
+        for module in modules:
+            code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+            samples = []
+            loaded = []
+            for _ in range(args.runs):
+                result = subprocess.run(
+                    [sys.executable, "-c", code], capture_output=True, text=True, env=env, cwd=ROOT, check=True
+                )
+                data = json.loads(result.stdout.strip().splitlines()[-1])
+                samples.append(data["seconds"])
+                loaded = data["loaded"]
+            print(
+                f"{module:<45} median {statistics.median(samples) * 1000:8.1f} ms   "
+                f"min {min(samples) * 1000:8.1f} ms   heavy imports: {', '.join(loaded) or 'none'}"
+            )
+        store_dir = Path(home) / ".plainspeak" / "learning"
+        print(f"\nLearning store created at import: {'yes' if store_dir.exists() else 'no'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
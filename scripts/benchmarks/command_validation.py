@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark Sandbox.validate_command.
+
+Validates synthetic candidate commands, safe and unsafe, with two strategies:
+
+- baseline: a re.search per dangerous pattern and a pathlib check of every
+  path-like word (the old behaviour)
+- compiled: Sandbox.check_command with the combined pattern regex and the
+  cached path verdicts of the platform manager
+
+Both strategies are checked to agree on which commands are safe.
+
+Usage:
+    python scripts/benchmarks/command_validation.py [--commands 5000] [--paths 200]
+"""
+
+import argparse
+import os
+import random
+import re
+import shlex
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from plainspeak.core.sandbox import Sandbox  # noqa: E402
+
+PROGRAMS = ["ls -la", "cat", "grep -rn TODO", "du -sh", "cp", "tar czf", "find", "wc -l", "chmod 644", "head -n 20"]
+UNSAFE = [
+    "rm -rf /",
+    "dd if=/dev/zero of=disk.img",
+    "curl http://example.com/x.sh",
+    "chmod 777 notes",
+    "cat /etc/shadow",
+]
+
+
+class BaselineSandbox(Sandbox):
+    """Sandbox validating with per-call regex searches and uncached pathlib checks."""
+
+    def validate_command(self, command: str):
+        cmd_parts = shlex.split(command)
+        if not cmd_parts:
+            return False, "Empty command"
+        if command in self.BLACKLISTED_COMMANDS:
+            return False, f"Command '{command}' is blacklisted"
+        for pattern in self.DANGEROUS_PATTERNS:
+            if re.search(pattern, command):
+                return False, f"Command matches dangerous pattern: {pattern}"
+        for part in cmd_parts:
+            if os.path.sep in part or "/" in part:
+                if not self._is_safe_path(part):
+                    return False, f"Unsafe path: {part}"
+        return True, None
+
+    def _is_safe_path(self, part: str) -> bool:
+        path = Path(os.path.normpath(Path.cwd() / Path(os.path.expanduser(part))))
+        roots = [self.platform_mgr.home] + [
+            self.platform_mgr.get_known_path(name) for name in ("temp", "downloads", "bin", "local")
+        ]
+        return any(root in path.parents for root in roots if root is not None)
+
+
+def make_commands(count: int, paths: int, seed: int) -> List[str]:
+    """Generate commands over a limited set of paths, as repeated candidates would use."""
+    rng = random.Random(seed)
+    pool = [f"~/projects/app{i}/src/file{i}.py" for i in range(paths // 2)]
+    pool += [f"/tmp/build{i}/out.log" for i in range(paths // 2)]
+    commands = []
+    for _ in range(count):
+        if rng.random() < 0.1:
+            commands.append(rng.choice(UNSAFE))
+        else:
+            commands.append(" ".join([rng.choice(PROGRAMS)] + rng.sample(pool, rng.randint(1, 3))))
+    return commands
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=5000, help="Number of commands to validate")
+    parser.add_argument("--paths", type=int, default=200, help="Number of distinct paths in the commands")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    commands = make_commands(args.commands, args.paths, args.seed)
+    verdicts = {}
+    for name, sandbox in (("baseline", BaselineSandbox()), ("compiled", Sandbox())):
+        start = time.perf_counter()
+        verdicts[name] = [sandbox.validate_command(command)[0] for command in commands]
+        elapsed = time.perf_counter() - start
+        print(f"{name:>9}: {elapsed * 1000:8.1f} ms, {len(commands) / elapsed:10.0f} commands/s")
+
+    if verdicts["baseline"] != verdicts["compiled"]:
+        print("Strategies disagree on which commands are safe")
+        return 1
+    print(f"{sum(verdicts['compiled'])} of {len(commands)} commands safe in both strategies")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark similarity retrieval in the learning store.
+
+Compares the indexed BM25 lookup used by LearningStore.get_similar_examples
+with the previous linear scan that scored every stored command per query.
+
+Usage:
+    python scripts/benchmarks/learning_retrieval.py [--commands 100000] [--queries 200]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from plainspeak.learning import LearningStore  # noqa: E402
+
+VERBS = ["list", "show", "find", "delete", "copy", "move", "compress", "count", "search", "open", "check", "kill"]
+NOUNS = ["files", "folders", "logs", "images", "processes", "ports", "users", "archives", "videos", "documents"]
+MODIFIERS = ["hidden", "large", "old", "recent", "empty", "duplicate", "modified", "python", "temporary", "shared"]
+PLACES = ["here", "in home", "in downloads", "on desktop", "in tmp", "recursively", "today", "this week"]
+
+
+def make_text(rng: random.Random) -> str:
+    """Generate a synthetic natural language request."""
+    words = [rng.choice(VERBS), rng.choice(MODIFIERS), rng.choice(NOUNS)]
+    if rng.random() < 0.5:
+        words.append(rng.choice(PLACES))
+    # Specific names (files, hosts, branches...) make up the long tail of the vocabulary
+    words.extend(f"name{rng.randint(0, 5000)}" for _ in range(rng.randint(0, 2)))
+    return " ".join(words)
+
+
+def linear_scan(commands: List[Dict[str, Any]], text: str, limit: int = 5) -> List[Tuple[str, str, float]]:
+    """The previous get_similar_examples algorithm."""
+    text_words = set(text.lower().split())
+    results: List[Tuple[str, str, float]] = []
+    for cmd in commands:
+        if cmd.get("success"):
+            pattern_words = set(cmd["natural_text"].lower().split())
+            common_words = text_words & pattern_words
+            if common_words:
+                score = len(common_words) / max(len(text_words), len(pattern_words))
+                command = cmd.get("edited_command") if cmd.get("edited") else cmd["generated_command"]
+                results.append((cmd["natural_text"], command, score))
+    results.sort(key=lambda x: x[2], reverse=True)
+    return results[:limit]
+
+
+def report(name: str, samples: List[float]) -> None:
+    """Print latency statistics in milliseconds."""
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:<28} mean {statistics.mean(samples) * 1000:9.3f} ms   p95 {p95 * 1000:9.3f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=100_000, help="Number of stored commands")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries to time")
+    parser.add_argument("--linear-queries", type=int, default=20, help="Queries for the (slow) linear scan")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        with open(data_dir / "commands.jsonl", "w") as f:
+            for i in range(args.commands):
+                record = {
+                    "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "natural_text": make_text(rng),
+                    "generated_command": f"cmd{i}",
+                    "executed": True,
+                    "success": rng.random() < 0.8,
+                }
+                f.write(json.dumps(record) + "\n")
+
+        store = LearningStore(data_dir)
+        start = time.perf_counter()
+        store.get_similar_examples("warm up")
+        print(f"Commands: {args.commands}, indexed: {len(store._index)}")
+        print(f"Initial index build: {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        LearningStore(data_dir).get_similar_examples("warm up")
+        print(f"Load from snapshot:  {time.perf_counter() - start:.2f} s\n")
+
+        queries = [make_text(rng) for _ in range(args.queries)]
+
+        # The first pass also materializes the posting arrays of each query term
+        for label in ("indexed (BM25), cold", "indexed (BM25), warm"):
+            indexed = []
+            for query in queries:
+                start = time.perf_counter()
+                store.get_similar_examples(query)
+                indexed.append(time.perf_counter() - start)
+            report(label, indexed)
+
+        # The old implementation re-read the whole file on every call
+        linear = []
+        for query in queries[: args.linear_queries]:
+            start = time.perf_counter()
+            commands = [json.loads(line) for line in (data_dir / "commands.jsonl").read_text().splitlines()]
+            linear_scan(commands, query)
+            linear.append(time.perf_counter() - start)
+        report("linear scan (reload + score)", linear)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark plugin registration at startup.
+
+Registers synthetic plugins with overlapping verbs and random priorities and
+compares three strategies:
+
+- rebuild: rebuilding the whole verb map on every registration (the old behaviour)
+- register: incremental insertion through PluginRegistry.register
+- register_many: a single bulk registration
+
+All strategies are checked to produce the same verb map.
+
+Usage:
+    python scripts/benchmarks/plugin_registration.py [--plugins 500] [--verbs 20] [--aliases 5]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from plainspeak.plugins.base import BasePlugin, PluginRegistry  # noqa: E402
+
+
+class SyntheticPlugin(BasePlugin):
+    """Plugin with a fixed set of verbs and aliases."""
+
+    def __init__(self, name: str, priority: int, verbs: List[str], aliases: Dict[str, str]):
+        super().__init__(name, f"Synthetic plugin {name}", priority)
+        self.priority = priority
+        self._verbs = verbs
+        self.verb_aliases = aliases
+
+    def get_verbs(self) -> List[str]:
+        return self._verbs
+
+    def generate_command(self, verb, args) -> str:
+        return verb
+
+
+class RebuildingRegistry(PluginRegistry):
+    """Registry that rebuilds the verb map on every registration."""
+
+    def register(self, plugin: BasePlugin) -> None:
+        self.plugins[plugin.name] = plugin
+        self._rebuild_verb_maps()
+
+
+def make_plugins(count: int, verbs: int, aliases: int, seed: int) -> List[SyntheticPlugin]:
+    """Generate plugins whose verbs overlap so that priorities matter."""
+    rng = random.Random(seed)
+    vocabulary = [f"verb{i}" for i in range(count * verbs // 4)]
+    plugins = []
+    for i in range(count):
+        plugin_verbs = rng.sample(vocabulary, verbs)
+        plugin_aliases = {f"alias{rng.randrange(count * aliases)}": rng.choice(plugin_verbs) for _ in range(aliases)}
+        plugins.append(SyntheticPlugin(f"plugin{i}", rng.randrange(100), plugin_verbs, plugin_aliases))
+    return plugins
+
+
+def time_strategy(strategy: str, plugins: List[SyntheticPlugin]) -> Tuple[float, Dict[str, str]]:
+    """Register all plugins with a strategy, returning the elapsed seconds and the verb map."""
+    registry = RebuildingRegistry() if strategy == "rebuild" else PluginRegistry()
+    start = time.perf_counter()
+    if strategy == "register_many":
+        registry.register_many(plugins)
+    else:
+        for plugin in plugins:
+            registry.register(plugin)
+    elapsed = time.perf_counter() - start
+    return elapsed, registry.get_all_verbs()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plugins", type=int, default=500, help="Number of synthetic plugins")
+    parser.add_argument("--verbs", type=int, default=20, help="Verbs per plugin")
+    parser.add_argument("--aliases", type=int, default=5, help="Aliases per plugin")
+    parser.add_argument("--runs", type=int, default=3, help="Number of timed runs per strategy")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    plugins = make_plugins(args.plugins, args.verbs, args.aliases, args.seed)
+    print(f"{args.plugins} plugins, {args.verbs} verbs and {args.aliases} aliases each\n")
+
+    verb_maps = {}
+    for strategy in ("rebuild", "register", "register_many"):
+        samples = []
+        for _ in range(args.runs):
+            elapsed, verb_maps[strategy] = time_strategy(strategy, plugins)
+            samples.append(elapsed)
+        print(f"{strategy:<15} median {statistics.median(samples) * 1000:9.1f} ms   min {min(samples) * 1000:9.1f} ms")
+
+    expected = list(verb_maps["rebuild"].items())
+    same = all(list(verbs.items()) == expected for verbs in verb_maps.values())
+    print(f"\nVerb maps identical: {'yes' if same else 'NO'} ({len(expected)} verbs)")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
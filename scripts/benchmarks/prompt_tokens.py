@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the size of the prompts sent to the LLM.
+
+Builds the command, intent and locale prompts for a set of typical queries on
+each OS, once with the full system prompt and once with the budgeted compact
+prompt, and reports tokens per request and the time to assemble a prompt.
+Tokens are estimated at three characters per token, as in the LLM interfaces.
+
+Usage:
+    python scripts/benchmarks/prompt_tokens.py [--budget 1200] [--sections 4]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from plainspeak.config import LLMConfig  # noqa: E402
+from plainspeak.core.llm.base import LLMInterface  # noqa: E402
+from plainspeak.core.llm.system_prompt import estimate_tokens, load_system_prompt  # noqa: E402
+
+QUERIES = [
+    "show open ports and network connections",
+    "find files larger than 100MB in my home directory",
+    "compress the logs folder into a zip archive",
+    "restart the nginx service",
+    "which process uses the most memory",
+    "count the lines in all python files",
+    "show free space on each disk",
+    "add a new user called deploy",
+    "search for TODO in all source files",
+    "download a file from a url",
+    "kill the process listening on port 8080",
+    "list installed packages",
+]
+
+
+class RecordingLLM(LLMInterface):
+    """LLM recording the prompts it is given instead of generating."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.prompts: List[str] = []
+
+    def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return "true"
+
+
+def make_llm(mode: str, budget: int, sections: int) -> RecordingLLM:
+    """Create an LLM with the given system prompt settings and no response cache."""
+    llm_config = LLMConfig(
+        cache_responses=False, prompt_mode=mode, prompt_token_budget=budget, prompt_sections=sections
+    )
+    return RecordingLLM(type("Config", (), {"llm": llm_config})())
+
+
+def build_prompts(mode: str, os_name: str, budget: int, sections: int) -> List[str]:
+    """Build the prompts of all request kinds for all queries."""
+    llm = make_llm(mode, budget, sections)
+    prompt = load_system_prompt(os_name)
+    with patch("plainspeak.core.llm.base.load_system_prompt", return_value=prompt):
+        for query in QUERIES:
+            llm.generate_command(query)
+            llm.parse_intent(query)
+            llm.parse_natural_language_with_locale(query, "en_US")
+    return llm.prompts
+
+
+def time_assembly(mode: str, os_name: str, budget: int, sections: int, rounds: int) -> float:
+    """Time building a system prompt for a query, in microseconds."""
+    llm = make_llm(mode, budget, sections)
+    prompt = load_system_prompt(os_name)
+    with patch("plainspeak.core.llm.base.load_system_prompt", return_value=prompt):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for query in QUERIES:
+                llm._get_system_prompt(query)
+        elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(QUERIES)) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=int, default=1200, help="Token budget of compact system prompts")
+    parser.add_argument("--sections", type=int, default=4, help="Maximum sections in compact system prompts")
+    parser.add_argument("--rounds", type=int, default=200, help="Rounds over the queries for timing")
+    args = parser.parse_args()
+
+    print(f"{len(QUERIES)} queries x 3 request kinds, budget {args.budget} tokens, up to {args.sections} sections")
+    print(f"{'os':<8} {'mode':<8} {'mean tokens':>12} {'median':>8} {'max':>8} {'assembly':>10}")
+    for os_name in ("linux", "darwin", "windows"):
+        means = {}
+        for mode in ("full", "compact"):
+            tokens = [estimate_tokens(prompt) for prompt in build_prompts(mode, os_name, args.budget, args.sections)]
+            means[mode] = statistics.mean(tokens)
+            micros = time_assembly(mode, os_name, args.budget, args.sections, args.rounds)
+            print(
+                f"{os_name:<8} {mode:<8} {means[mode]:>12.0f} {statistics.median(tokens):>8.0f} "
+                f"{max(tokens):>8} {micros:>8.1f}us"
+            )
+        print(f"{os_name:<8} saving {1 - means['compact'] / means['full']:.0%} tokens per request")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
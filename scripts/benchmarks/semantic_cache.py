@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark the semantic cache of the learning store.
+
+Stores synthetic successful requests, then looks up paraphrases of them
+(which should reuse the stored command) and near misses that differ in one
+meaningful word (which should go to the LLM). Reports, per similarity
+threshold, the share of paraphrases answered, the share of near misses wrongly
+answered, and the lookup latency.
+
+Usage:
+    python scripts/benchmarks/semantic_cache.py [--commands 20000] [--queries 500]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from plainspeak.learning import LearningStore  # noqa: E402
+
+VERBS = ["list", "show", "find", "delete", "copy", "move", "compress", "count", "search", "open", "check", "kill"]
+NOUNS = ["files", "folders", "logs", "images", "processes", "ports", "users", "archives", "videos", "documents"]
+MODIFIERS = ["hidden", "large", "old", "recent", "empty", "duplicate", "modified", "python", "temporary", "shared"]
+PLACES = ["in home", "in downloads", "on desktop", "in tmp", "recursively", "today", "this week"]
+FILLERS = ["please", "can you", "i want to", "could you", "quickly"]
+OBJECTS = ["me", "all", "the", "all the", "my"]
+
+Request = Tuple[str, str, str, str]
+
+
+def make_request(rng: random.Random) -> Request:
+    """Pick the meaningful words of a synthetic request."""
+    return rng.choice(VERBS), rng.choice(MODIFIERS), rng.choice(NOUNS), rng.choice(PLACES)
+
+
+def phrase(request: Request, rng: random.Random, paraphrase: bool = False) -> str:
+    """Word a request, optionally with filler words around the meaningful ones."""
+    verb, modifier, noun, place = request
+    if not paraphrase:
+        return f"{verb} {modifier} {noun} {place}"
+    return f"{rng.choice(FILLERS)} {verb} {rng.choice(OBJECTS)} {modifier} {noun} {place}"
+
+
+def command_for(request: Request) -> str:
+    return "cmd-" + "-".join(request).replace(" ", "_")
+
+
+def near_miss(request: Request, rng: random.Random) -> Request:
+    """Change one meaningful word of a request."""
+    position = rng.randrange(4)
+    choices = [VERBS, MODIFIERS, NOUNS, PLACES][position]
+    words = list(request)
+    words[position] = rng.choice([word for word in choices if word != request[position]])
+    return words[0], words[1], words[2], words[3]
+
+
+def report(name: str, samples: List[float]) -> None:
+    """Print latency statistics in milliseconds."""
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:<28} mean {statistics.mean(samples) * 1000:9.3f} ms   p95 {p95 * 1000:9.3f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=20_000, help="Requests to generate, duplicates are dropped")
+    parser.add_argument("--queries", type=int, default=500, help="Paraphrases and near misses to look up, each")
+    parser.add_argument(
+        "--thresholds", type=float, nargs="+", default=[0.8, 0.85, 0.9, 0.95], help="Thresholds to compare"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    stored = {make_request(rng) for _ in range(args.commands)}
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        with open(data_dir / "commands.jsonl", "w") as f:
+            for request in stored:
+                record = {
+                    "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "natural_text": phrase(request, rng),
+                    "generated_command": command_for(request),
+                    "executed": True,
+                    "success": True,
+                }
+                f.write(json.dumps(record) + "\n")
+
+        store = LearningStore(data_dir)
+        start = time.perf_counter()
+        store.find_cached_command("warm up")
+        print(f"Stored requests: {len(stored)}")
+        print(f"Initial cache build: {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        LearningStore(data_dir).find_cached_command("warm up")
+        print(f"Load from snapshot:  {time.perf_counter() - start:.2f} s\n")
+
+        known = sorted(stored)
+        paraphrases = []
+        for request in rng.sample(known, min(args.queries, len(known))):
+            paraphrases.append((phrase(request, rng, paraphrase=True), command_for(request)))
+        misses = []
+        while len(misses) < args.queries:
+            request = near_miss(rng.choice(known), rng)
+            if request not in stored:
+                misses.append(phrase(request, rng, paraphrase=True))
+
+        # Look up once at threshold 0 and apply each threshold to the best similarity
+        latencies = []
+        paraphrase_results = []
+        for text, command in paraphrases:
+            start = time.perf_counter()
+            found = store.find_cached_command(text, 0.0)
+            latencies.append(time.perf_counter() - start)
+            paraphrase_results.append((found[1] == command, found[2]) if found else (False, 0.0))
+        miss_scores = []
+        for text in misses:
+            start = time.perf_counter()
+            found = store.find_cached_command(text, 0.0)
+            latencies.append(time.perf_counter() - start)
+            miss_scores.append(found[2] if found else 0.0)
+
+        report("lookup", latencies)
+        print()
+        print(f"{'threshold':>9}  {'paraphrases answered':>20}  {'answered wrongly':>16}  {'near misses answered':>20}")
+        for threshold in args.thresholds:
+            answered = [correct for correct, score in paraphrase_results if score >= threshold]
+            wrong = answered.count(False)
+            false_hits = sum(score >= threshold for score in miss_scores)
+            print(
+                f"{threshold:>9.2f}  {len(answered) / len(paraphrases):>20.1%}  "
+                f"{wrong / len(paraphrases):>16.1%}  {false_hits / len(misses):>20.1%}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,9 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+# Keep the plugin manifest cache in memory instead of the user's config directory
+os.environ["PLAINSPEAK_MANIFEST_CACHE"] = ""
+
 
 # Monkey patch Path._flavour to fix the AttributeError
 # This is needed because pytest's cacheprovider tries to access Path._flavour
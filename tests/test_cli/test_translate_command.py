@@ -1,12 +1,19 @@
 """Tests for the translate command."""
 
+import json
+import shutil
 import subprocess
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import Mock, patch
 
+import typer
 from typer.testing import CliRunner
 
 from plainspeak.cli import app
+from plainspeak.cli.translate_cmd import read_queries, translate_batch
+from plainspeak.core.llm import GenerationResult
 
 
 class TestTranslateCommand(unittest.TestCase):
@@ -116,3 +123,58 @@ class TestTranslateCommand(unittest.TestCase):
         self.assertEqual(result.exit_code, 1)
         self.assertIn("Error: Empty input", result.stdout)
         mock_command_parser_class.return_value.parse.assert_not_called()
+
+
+class TestTranslateBatch(unittest.TestCase):
+    """Test suite for batch translation."""
+
+    def setUp(self):
+        """Set up a directory for batch files."""
+        self.directory = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Remove the batch files."""
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = self.directory / name
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_read_queries_formats(self):
+        """Test reading queries from JSONL, Markdown and text files."""
+        jsonl = self.write(
+            "queries.jsonl", '{"text": "list files"}\n\n"show disk space"\n{"title": "t", "body": "b"}\n'
+        )
+        markdown = self.write("queries.md", "# Queries\n\n## Files\n\n1. Find empty directories\n- List files\n")
+        text = self.write("queries.txt", "# comment\nshow uptime\n\nlist users\n")
+
+        self.assertEqual(read_queries(jsonl), ["list files", "show disk space", "t"])
+        self.assertEqual(read_queries(markdown), ["Find empty directories", "List files"])
+        self.assertEqual(read_queries(text), ["show uptime", "list users"])
+
+    @patch("plainspeak.cli.translate_cmd.load_config")
+    @patch("plainspeak.cli.translate_cmd.get_llm_interface")
+    def test_translate_batch_writes_results_in_order(self, mock_get_llm, mock_load_config):
+        """Test that batch results are written as JSONL in input order."""
+        mock_llm = mock_get_llm.return_value
+        mock_llm.generate_commands.return_value = [
+            GenerationResult("ls", latency=0.25),
+            GenerationResult(error="timeout", latency=1.0),
+        ]
+        queries = self.write("queries.txt", "list files\nshow disk space\n")
+        output = self.directory / "results.jsonl"
+
+        with self.assertRaises(typer.Exit) as raised:
+            translate_batch(queries, output, batch_size=4)
+
+        self.assertEqual(raised.exception.exit_code, 1)
+        mock_llm.generate_commands.assert_called_once_with(["list files", "show disk space"], 4)
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        self.assertEqual(
+            records,
+            [
+                {"index": 0, "input": "list files", "command": "ls", "error": None, "latency_ms": 250.0},
+                {"index": 1, "input": "show disk space", "command": None, "error": "timeout", "latency_ms": 1000.0},
+            ],
+        )
@@ -9,6 +9,7 @@ from pathlib import Path
 import pytest
 
 from plainspeak.context import SessionContext
+from plainspeak.plugins.platform import platform_manager
 
 
 @pytest.fixture
@@ -43,6 +44,28 @@ def test_session_context_system_info():
     assert "python_version" in system_info
 
 
+def test_session_context_system_info_is_collected_once(monkeypatch):
+    """Test that system information is collected once, then refreshed lazily."""
+    calls = []
+    monkeypatch.setattr("platform.architecture", lambda *args, **kwargs: calls.append(args) or ("64bit", ""))
+    platform_manager.system_info(refresh=True)
+    context = SessionContext()
+
+    for _ in range(3):
+        assert context.get_system_info()["architecture"] == "64bit"
+        context.get_context_for_llm()
+        context.get_full_context()
+    assert len(calls) == 1
+
+    # Callers get their own copy
+    context.get_system_info()["os"] = "changed"
+    assert platform_manager.system_info()["os"] != "changed"
+
+    monkeypatch.setattr(platform_manager, "SYSTEM_INFO_TTL", -1.0)
+    context.get_system_info()
+    assert len(calls) == 2
+
+
 def test_session_context_environment_info():
     """Test getting environment information."""
     context = SessionContext()
@@ -1,12 +1,18 @@
 """Test configuration for the core module tests."""
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Dict
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from plainspeak.config import PlainSpeakConfig
 from plainspeak.plugins.base import BasePlugin
+from plainspeak.plugins.manager import PluginManager
 
 
 class MockPlugin(BasePlugin):
@@ -32,7 +38,116 @@ def mock_plugin():
     return MockPlugin(name="test_plugin", priority=10, verbs=["test"])
 
 
+@pytest.fixture
+def mock_config(tmp_path):
+    """Create a mock config."""
+    config = MagicMock(spec=PlainSpeakConfig)
+    config.plugins_dir = str(tmp_path)  # Use temp directory
+    config.plugins_enabled = ["core_file", "core_system"]
+    config.plugins_disabled = []
+    config.plugin_verb_match_threshold = 0.8
+    return config
+
+
+@pytest.fixture
+def plugin_manager(mock_config):
+    """Create a plugin manager instance."""
+    with patch("plainspeak.plugins.manager.PluginManager._load_plugins"):
+        manager = PluginManager(config=mock_config)
+        # Clear initial plugins for testing
+        manager.registry.clear()
+        return manager
+
+
 @pytest.fixture
 def mock_path():
     """Mock Path object."""
     return MagicMock(spec=Path)
+
+
+class StubAPI(ThreadingHTTPServer):
+    """Chat completions API answering with the upper-cased user message."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        # Statuses answered before succeeding, in order
+        self.failures = []
+        self.delay = 0.0
+        self.requests = 0
+        self.payloads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server: StubAPI = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+            server.payloads.append(payload)
+            server.connections.add(self.client_address)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            status = server.failures.pop(0) if server.failures else 200
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+
+        content_type = "application/json"
+        if status == 200 and payload.get("stream"):
+            # Server-sent events with the content in chunks of two characters, then a second line
+            content = payload["messages"][-1]["content"].upper()
+            chunks = [content[i : i + 2] for i in range(0, len(content), 2)] + ["\n", "MORE"]
+            events = [{"choices": [{"delta": {"content": chunk}}]} for chunk in chunks] + [{"choices": []}]
+            data = "".join(f"data: {json.dumps(event)}\n\n" for event in events).encode() + b"data: [DONE]\n\n"
+            content_type = "text/event-stream"
+        elif status == 200:
+            content = payload["messages"][-1]["content"].upper()
+            choice = {"message": {"role": "assistant", "content": content}}
+            data = json.dumps({"choices": [choice] * payload.get("n", 1)}).encode()
+        else:
+            data = json.dumps({"error": {"message": f"status {status}"}}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stub_api():
+    """Start local stub chat completions APIs, stopped after the test."""
+    servers = []
+
+    def start() -> StubAPI:
+        server = StubAPI()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def api(stub_api):
+    """Local stub chat completions API."""
+    return stub_api()
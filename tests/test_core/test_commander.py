@@ -47,7 +47,7 @@ class TestCommander:
         assert success is True
         assert output == "Hello World output"
         assert error is None
-        mock_sandbox.execute_shell_command.assert_called_once_with(expected_command)
+        mock_sandbox.execute_shell_command.assert_called_once_with(expected_command, on_output=None)
 
     def test_execute_shell_command_failure(self, commander_instance: Commander, mock_sandbox: MagicMock):
         ast = {
@@ -63,7 +63,7 @@ class TestCommander:
         assert success is False
         assert output == "Some output"
         assert error == "Error occurred"
-        mock_sandbox.execute_shell_command.assert_called_once_with(expected_command)
+        mock_sandbox.execute_shell_command.assert_called_once_with(expected_command, on_output=None)
 
     def test_execute_missing_command_template(self, commander_instance: Commander):
         ast = {
@@ -0,0 +1,154 @@
+"""Tests for the rule-based intent fast path."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from plainspeak.config import LLMConfig
+from plainspeak.core.intents import IntentMatcher, IntentRule, get_intent_matcher, normalize_request
+from plainspeak.core.llm.base import LLMInterface
+from plainspeak.learning import LearningStore
+
+
+class CountingLLM(LLMInterface):
+    """LLM counting the requests that reach it."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        return "echo generated"
+
+
+@pytest.fixture
+def matcher():
+    return IntentMatcher(
+        [
+            IntentRule("shell", "bash", exact=["shell", "open shell"]),
+            IntentRule(
+                "port",
+                "nc -zv {host} {port}",
+                match=[r"port (?P<port>\d+)", "open"],
+                optional=[r"on (?P<host>[a-z0-9.-]+)"],
+                defaults={"host": "localhost"},
+            ),
+            IntentRule(
+                "cd",
+                "cd {place}",
+                match=[r"go to (?P<place>\S+)"],
+                slot_map={"place": {"home": "~"}},
+            ),
+            IntentRule("files_by_size", "ls -laSh", match=["list files", "by size"]),
+            IntentRule("files", "ls -la", match=["list files"]),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "text, rule, command",
+    [
+        ("Open  Shell?", "shell", "bash"),
+        ("is port 22 open on example.com", "port", "nc -zv example.com 22"),
+        ("check that port 8080 is open", "port", "nc -zv localhost 8080"),
+        ("go to home", "cd", "cd ~"),
+        ("go to my;rm", "cd", "cd 'my;rm'"),
+        ("by size, list files", "files_by_size", "ls -laSh"),
+        ("please list files", "files", "ls -la"),
+    ],
+)
+def test_rules_resolve_commands_in_priority_order(matcher, text, rule, command):
+    match = matcher.match(text)
+    assert (match.rule, match.command) == (rule, command)
+
+
+def test_unmatched_requests_are_left_to_the_llm(matcher):
+    assert matcher.match("shell script to rename photos") is None
+    assert matcher.match("relist files") is None
+    assert matcher.match("port 22") is None
+
+
+def test_hit_rates_are_recorded(matcher):
+    for text in ("list files", "list files", "port 22 open", "what time is it"):
+        matcher.match(text)
+    stats = matcher.stats
+    assert (stats.lookups, stats.hits, stats.hit_rate) == (4, 3, 0.75)
+    assert stats.rule_hits == {"files": 2, "port": 1}
+
+
+def test_seeds_repeated_unambiguous_successes(matcher):
+    history = [
+        ("deploy the site", "make deploy"),
+        ("Deploy the  site", "make deploy"),
+        ("build docs", "make docs"),
+        ("run tests", "pytest"),
+        ("run tests", "tox"),
+        ("list files", "exa -l"),
+        ("list files", "exa -l"),
+    ]
+    assert matcher.seed(history) == 2
+    assert matcher.match("deploy the site").command == "make deploy"
+    assert matcher.match("build docs") is None
+    assert matcher.match("run tests") is None
+    # Learned commands take precedence over the bundled rules
+    assert matcher.match("list files").command == "exa -l"
+
+
+def test_bundled_rules():
+    matcher = IntentMatcher.from_file()
+    assert matcher.match("show disk space").command == "df -h"
+    assert matcher.match("convert all csv files to json").rule == "csv_to_json_all"
+    assert matcher.match("create a directory called my_project").command == "mkdir -p my_project"
+    assert matcher.match("find images in the documents directory").command.startswith("find ~/Documents ")
+    assert normalize_request(" Show  Disk Space? ") == "show disk space"
+
+
+@pytest.mark.parametrize(
+    "text, command",
+    [
+        ("list files in /etc", "ls -la /etc"),
+        ("count lines in all js files", "find . -name '*.js' | xargs wc -l"),
+        ('create a folder called "my docs"', "mkdir -p 'my docs'"),
+        ("make a folder for each csv file", None),
+        ("kill the process using the most memory", None),
+        ("list files in detail", None),
+        ("count lines in all files", None),
+    ],
+)
+def test_bundled_rules_account_for_the_whole_request(text, command):
+    match = IntentMatcher.from_file().match(text)
+    assert (match.command if match else None) == command
+
+
+def test_interface_answers_from_rules_before_the_llm():
+    llm = CountingLLM(SimpleNamespace(llm=LLMConfig(cache_responses=False)))
+    hits = get_intent_matcher().stats.hits
+
+    assert llm.generate_command("show disk space") == "df -h"
+    assert llm.parse_intent("show disk space") == {"verb": "df", "args": {"h": True}, "command": "df -h"}
+    results = llm.generate_commands(["show memory usage", "summarize my week"])
+    assert [result.text for result in results] == ["free -h", "echo generated"]
+    assert llm.calls == 1
+    assert get_intent_matcher().stats.hits == hits + 3
+
+    llm.config.llm.intent_fast_path = False
+    assert llm.generate_command("show disk space") == "echo generated"
+
+
+def test_interface_reuses_commands_of_similar_requests(tmp_path):
+    assert CountingLLM(SimpleNamespace(llm=LLMConfig())).semantic_cache is None
+
+    llm = CountingLLM(SimpleNamespace(llm=LLMConfig(cache_responses=False, semantic_cache=True)))
+    llm.semantic_cache = LearningStore(tmp_path)
+    llm.semantic_cache.add_command("compress old logs", "gzip *.log", executed=True, success=True)
+
+    assert llm.generate_command("please compress the old logs") == "gzip *.log"
+    assert llm.generate_command("compress new logs") == "echo generated"
+    assert llm.calls == 1
+
+    # The semantic cache does not depend on the intent rules, and takes thresholds of any numeric type
+    llm.config.llm.intent_fast_path = False
+    assert llm.generate_command("compress old logs now") == "gzip *.log"
+    llm.config.llm.semantic_cache_threshold = 1
+    assert llm.generate_command("compress old logs now") == "echo generated"
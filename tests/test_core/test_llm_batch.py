@@ -0,0 +1,62 @@
+"""Tests for batched generation."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from plainspeak.config import LLMConfig
+from plainspeak.core.llm import LocalLLMInterface
+from plainspeak.core.llm.base import LLMInterface
+
+
+class EchoLLM(LLMInterface):
+    """LLM answering with the user query of each prompt, failing on 'fail'."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        query = prompt.split("USER QUERY: ")[1].split("\n")[0]
+        if query == "fail":
+            raise RuntimeError("model crashed")
+        return f"\necho {query}\nextra line"
+
+
+def test_generate_commands_keeps_order_and_isolates_failures():
+    results = EchoLLM().generate_commands(["one", "fail", "two"], batch_size=2)
+
+    assert [result.text for result in results] == ["echo one", "", "echo two"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert "model crashed" in results[1].error
+    assert all(result.latency >= 0 for result in results)
+
+
+def test_generate_commands_reuses_cached_commands(tmp_path):
+    llm_config = LLMConfig(cache_responses=True, cache_path=str(tmp_path / "responses.sqlite3"), prompt_mode="full")
+    llm = EchoLLM(config=SimpleNamespace(llm=llm_config))
+
+    assert llm.generate_command("one") == "echo one"
+    results = llm.generate_commands(["one", "two"])
+    assert [result.text for result in results] == ["echo one", "echo two"]
+    assert llm.calls == 2
+
+
+def test_local_transformers_batch_pads_prompts_together():
+    llm = LocalLLMInterface.__new__(LocalLLMInterface)
+    LLMInterface.__init__(llm, SimpleNamespace(llm=SimpleNamespace(max_new_tokens=8, temperature=0.1)))
+    llm.using_ctransformers = False
+    llm.tokenizer = MagicMock(pad_token=None, eos_token="</s>", padding_side="right")
+    llm.tokenizer.side_effect = lambda prompts, **kwargs: {"input_ids": np.zeros((len(prompts), 4), dtype=int)}
+    llm.tokenizer.batch_decode.side_effect = lambda ids, **kwargs: [f"new {len(row)}" for row in ids]
+    llm.model = MagicMock()
+    llm.model.generate.side_effect = lambda input_ids, **kwargs: np.ones((input_ids.shape[0], 6), dtype=int)
+
+    results = llm.generate_batch(["task a", "task b", "task c"], batch_size=2)
+
+    assert [result.text for result in results] == ["new 2", "new 2", "new 2"]
+    assert [call.kwargs["input_ids"].shape[0] for call in llm.model.generate.call_args_list] == [2, 1]
+    assert llm.tokenizer.padding_side == "right"
+    assert llm.tokenizer.call_args.kwargs["padding"] is True
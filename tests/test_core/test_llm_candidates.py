@@ -0,0 +1,90 @@
+"""Tests for sampling several commands and keeping the best."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from plainspeak.config import LLMConfig
+from plainspeak.core.llm import RemoteLLMInterface
+from plainspeak.core.llm.base import LLMInterface
+from plainspeak.core.llm.candidates import check_candidate, rank_candidates, resolve_verb
+from plainspeak.core.sandbox import Sandbox
+
+
+class SamplingLLM(LLMInterface):
+    """LLM returning canned candidates."""
+
+    def __init__(self, candidates, config=None):
+        super().__init__(config)
+        self.candidates = candidates
+        self.requests = []
+
+    def generate(self, prompt: str) -> str:
+        return self.candidates[0]
+
+    def generate_candidates(self, prompt: str, n: int):
+        self.requests.append(n)
+        return self.candidates[:n]
+
+
+def candidate_config(**settings):
+    settings.setdefault("cache_responses", False)
+    return SimpleNamespace(llm=LLMConfig(intent_fast_path=False, command_candidates=4, **settings))
+
+
+def test_ranks_valid_resolvable_and_frequent_candidates_first():
+    def known(program):
+        return program in ("ls", "du")
+
+    verdicts = rank_candidates(
+        ["for", "frobnicate -x", "du -sh .", "ls -la", 'echo "hi', "ls -la", "rm -rf /"], Sandbox(), known
+    )
+    assert [v.command for v in verdicts[:3]] == ["ls -la", "du -sh .", "frobnicate -x"]
+    assert (verdicts[0].votes, verdicts[0].index) == (2, 3)
+    assert not verdicts[2].resolved
+    assert {v.command: v.reason for v in verdicts if not v.valid} == {
+        "for": "Incomplete command",
+        'echo "hi': "Unparseable: No closing quotation",
+        "rm -rf /": "Command 'rm -rf /' is blacklisted",
+    }
+
+
+def test_resolves_program_after_variable_assignments():
+    verdict = check_candidate("LC_ALL=C sort data.txt", resolver=lambda program: program == "sort")
+    assert verdict.valid and verdict.resolved
+
+
+def test_resolves_builtins_executables_and_plugin_verbs(monkeypatch):
+    # No program is on the PATH, so only builtins and the verbs of the loaded plugins resolve
+    monkeypatch.setattr("plainspeak.core.llm.candidates.shutil.which", lambda program: None)
+    assert resolve_verb("cd")
+    assert resolve_verb("find-text")
+    assert not resolve_verb("find-txt")
+    assert check_candidate("secure-copy notes.txt host:").resolved
+
+
+def test_generate_command_samples_once_and_keeps_the_best():
+    llm = SamplingLLM(["for", "rm -rf /", "df -h\nextra", "frobnicate"], candidate_config())
+
+    assert llm.generate_command("how full are my disks") == "df -h"
+    assert llm.requests == [4]
+
+
+def test_best_candidate_is_cached():
+    llm = SamplingLLM(["ls -la"], candidate_config(cache_responses=True, cache_persistent=False))
+    received = []
+
+    assert llm.generate_command("what is in this folder", on_token=received.append) == "ls -la"
+    assert llm.generate_command("what is in this folder", on_token=received.append) == "ls -la"
+    assert llm.requests == [4]
+    assert received == ["ls -la", "ls -la"]
+
+
+def test_remote_requests_all_candidates_at_once(api):
+    config = MagicMock()
+    config.llm.api_key = "test_key"
+    config.llm.api_base = api.url
+    llm = RemoteLLMInterface(config)
+
+    assert llm.generate_candidates("uptime", 3) == ["UPTIME"] * 3
+    assert (api.requests, api.payloads[0]["n"]) == (1, 3)
+    llm.close()
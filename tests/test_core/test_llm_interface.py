@@ -73,25 +73,20 @@ class TestRemoteLLMInterface:
         with pytest.raises(ValueError):
             RemoteLLMInterface(config)
 
-    def test_remote_llm_circuit_breaker(self):
+    def test_remote_llm_circuit_breaker(self, api):
         """Test circuit breaker functionality."""
         config = MagicMock()
         config.llm.api_key = "test_key"
+        config.llm.api_base = api.url
+        config.llm.retry_count = 0
         config.llm.circuit_failure_threshold = 2  # Trip after 2 failures
         config.llm.model_name = "test_model"
         config.llm.max_tokens = 100
         config.llm.temperature = 0.7
 
-        # Create a mock OpenAI client that always fails
-        mock_client = MagicMock()
-        mock_client.chat.completions.create.side_effect = Exception("Test failure")
-
+        # The API fails every request
+        api.failures = [500] * 3
         interface = RemoteLLMInterface(config)
-        interface.remote_llm = mock_client
-
-        # Reset circuit breaker state
-        interface.failure_count = 0
-        interface.circuit_tripped = False
 
         # First call should raise LLMResponseError but not trip circuit
         with pytest.raises(LLMResponseError):
@@ -105,9 +100,12 @@ class TestRemoteLLMInterface:
         assert interface.failure_count == 2
         assert interface.circuit_tripped  # Circuit should be tripped now
 
-        # Third call should raise RuntimeError due to tripped circuit
-        with pytest.raises(RuntimeError, match="Circuit breaker tripped"):
+        # Third call should raise RuntimeError due to tripped circuit, without a request
+        with pytest.raises(RuntimeError, match="Circuit breaker"):
             interface.generate("test prompt")
+        assert api.requests == 2
+        assert api.payloads[0]["model"] == "test_model"
+        interface.close()
 
 
 class TestLocalLLMInterface:
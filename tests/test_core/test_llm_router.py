@@ -0,0 +1,118 @@
+"""Tests for routing requests between LLM backends."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from plainspeak.config import LLMConfig
+from plainspeak.core.llm import LLMResponseError, RouterLLMInterface, get_llm_interface
+from plainspeak.core.llm.base import LLMInterface
+from plainspeak.core.llm.router import BackendStats, build_backends, percentile
+
+
+class FailingLLM(LLMInterface):
+    """Synchronous backend that always fails."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        raise RuntimeError("model crashed")
+
+
+def router_config(*servers, **settings):
+    endpoints = [{"name": name, "api_base": server.url} for name, server in zip("ab", servers)]
+    llm_config = LLMConfig(
+        provider="router",
+        router_local=False,
+        router_endpoints=endpoints,
+        retry_count=0,
+        cache_responses=False,
+        **settings,
+    )
+    return SimpleNamespace(llm=llm_config)
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+
+def test_backend_stats_track_latency_and_health():
+    assert percentile([0.3, 0.1, 0.2, 0.4], 50) == 0.2
+    assert percentile([0.3, 0.1, 0.2, 0.4], 95) == 0.4
+
+    now = [0.0]
+    stats = BackendStats(window=4, clock=lambda: now[0])
+    for latency in (0.1, 0.2, 0.3, 0.4, 0.5):
+        stats.record_success(latency)
+    assert (stats.p50, stats.p95) == (0.3, 0.5)
+
+    for _ in range(3):
+        stats.record_failure()
+    assert stats.error_rate == 0.75
+    assert not stats.healthy(0.5, recovery_timeout=30)
+    now[0] = 30.0
+    assert stats.healthy(0.5, recovery_timeout=30)
+
+
+def test_routes_to_fastest_backend(stub_api):
+    slow, fast = stub_api(), stub_api()
+    slow.delay = 0.05
+    llm = get_llm_interface(router_config(slow, fast))
+    assert isinstance(llm, RouterLLMInterface)
+    assert list(llm.backends) == ["a", "b"]
+
+    try:
+        assert [llm.generate(f"cmd{i}") for i in range(6)] == [f"CMD{i}" for i in range(6)]
+    finally:
+        llm.close()
+    # Each backend is measured once, then the fast one takes the requests
+    assert (slow.requests, fast.requests) == (1, 5)
+    assert llm.ranked_backends() == ["b", "a"]
+
+
+def test_falls_back_and_avoids_failing_backend(stub_api):
+    broken, working = stub_api(), stub_api()
+    broken.failures = [500] * 10
+    llm = RouterLLMInterface(router_config(broken, working))
+
+    try:
+        assert [llm.generate("ls"), llm.generate("pwd"), llm.generate("df")] == ["LS", "PWD", "DF"]
+    finally:
+        llm.close()
+    assert broken.requests == 1
+    assert llm.stats["a"].error_rate == 1.0
+
+
+def test_hedges_requests_slower_than_percentile(stub_api):
+    primary, secondary = stub_api(), stub_api()
+    llm = RouterLLMInterface(router_config(primary, secondary, hedge_percentile=95))
+    for _ in range(5):
+        llm.stats["a"].record_success(0.02)
+        llm.stats["b"].record_success(0.05)
+    primary.delay = 1.0
+
+    start = time.perf_counter()
+    try:
+        assert llm.generate("ls") == "LS"
+    finally:
+        llm.close()
+    assert time.perf_counter() - start < 0.5
+    assert (primary.requests, secondary.requests) == (1, 1)
+
+
+def test_reports_every_failed_backend(stub_api):
+    broken = stub_api()
+    broken.failures = [500]
+    local = FailingLLM()
+    config = router_config(broken)
+    llm = RouterLLMInterface(config, backends={"local": local, **build_backends(config)})
+
+    with pytest.raises(LLMResponseError, match="local: model crashed.*a: "):
+        llm.generate("ls")
+    llm.close()
+    assert local.calls == 1
@@ -0,0 +1,100 @@
+"""Tests for streaming generation."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from plainspeak.core.llm import LocalLLMInterface, RemoteLLMInterface
+from plainspeak.core.llm.base import LLMInterface
+from plainspeak.core.llm.streaming import hold_incomplete
+from plainspeak.core.llm.parsers import first_complete_command, is_complete_command
+
+
+class StreamingLLM(LLMInterface):
+    """LLM streaming fixed chunks and recording how many were consumed."""
+
+    def __init__(self, chunks):
+        super().__init__()
+        self.chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def generate(self, prompt: str) -> str:
+        return "".join(self.chunks)
+
+    def generate_stream(self, prompt: str):
+        try:
+            for chunk in self.chunks:
+                self.consumed += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+
+@pytest.mark.parametrize(
+    "command, complete",
+    [
+        ("ls -la", True),
+        ("ls -la |", False),
+        ("echo 'unterminated", False),
+        ("for f in *.txt; do", False),
+        ("for f in *.txt; do echo $f; done", True),
+        ("if true; then echo yes; fi", True),
+        ("", False),
+    ],
+)
+def test_is_complete_command(command, complete):
+    assert is_complete_command(command) is complete
+
+
+def test_first_complete_command_waits_for_line_end_and_json():
+    assert first_complete_command("ls -la") is None
+    assert first_complete_command("\nls -la\npartial") == "ls -la"
+    assert first_complete_command('{"verb": "ls",\n') is None
+
+
+def test_generation_stops_after_first_command():
+    llm = StreamingLLM(["ls", " -la", "\n", "Explanation", " of the command", "\n"])
+    tokens = []
+    assert llm.generate_command("list the directory contents", on_token=tokens.append) == "ls -la"
+    assert llm.consumed == 3 and llm.closed
+    assert tokens == ["ls", " -la", "\n"]
+
+
+def test_multiline_compound_command_is_kept_whole():
+    llm = StreamingLLM(["for f in *; do\n", "  echo $f\n", "done\n", "more text\n"])
+    command = "for f in *; do\n  echo $f\ndone"
+    assert llm.parse_intent("echo every file") == {"verb": command, "args": {}, "command": command}
+    assert llm.consumed == 3
+
+
+def test_hold_incomplete_retries_bare_for():
+    assert list(hold_incomplete(iter(["f", "or"]), lambda: "ls")) == ["ls"]
+    assert list(hold_incomplete(iter(["f", "ind .", "\n"]), lambda: "ls")) == ["find .", "\n"]
+    assert list(hold_incomplete(iter([]))) == []
+
+
+def test_local_ctransformers_stream():
+    llm = LocalLLMInterface.__new__(LocalLLMInterface)
+    LLMInterface.__init__(llm, SimpleNamespace(llm=SimpleNamespace(max_new_tokens=16, temperature=0.1)))
+    llm.using_ctransformers = True
+    llm.model = MagicMock(return_value=iter(["git", " status", "\n", "ignored"]))
+
+    assert llm.generate_until_command("show repository state") == "git status"
+    assert llm.model.call_args.kwargs["stream"] is True
+
+
+def test_remote_stream_reads_server_sent_events(api):
+    config = MagicMock()
+    config.llm.api_key = "test_key"
+    config.llm.api_base = api.url
+    config.llm.retry_count = 1
+    llm = RemoteLLMInterface(config)
+    # Rate limited once before the stream starts
+    api.failures = [429]
+
+    assert llm.generate_until_command("df -h") == "DF -H"
+    assert api.requests == 2
+    assert api.payloads[-1]["stream"] is True
+    llm.close()
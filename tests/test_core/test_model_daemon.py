@@ -0,0 +1,167 @@
+"""Tests for the local model daemon."""
+
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from plainspeak.config import LLMConfig
+from plainspeak.core.llm import DaemonLLMInterface, get_llm_interface
+from plainspeak.core.llm.base import LLMInterface, LLMResponseError
+from plainspeak.core.llm.daemon import DaemonError, ModelDaemon, daemon_supported, model_identity
+from plainspeak.core.llm.daemon_client import DaemonClient
+
+pytestmark = pytest.mark.skipif(not daemon_supported(), reason="requires Unix domain sockets")
+
+
+class SlowEchoLLM(LLMInterface):
+    """LLM echoing prompts, slowly for prompts starting with 'slow' and without end for 'endless'."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.stream_closed = threading.Event()
+
+    def generate(self, prompt: str) -> str:
+        if prompt.startswith("fail"):
+            raise ValueError("generation failed")
+        if prompt.startswith("slow"):
+            time.sleep(0.2)
+        return f"echo {prompt}"
+
+    def generate_stream(self, prompt: str):
+        try:
+            if prompt.startswith("endless"):
+                while True:
+                    yield "y\n"
+                    time.sleep(0.01)
+            words = self.generate(prompt).split(" ")
+            yield words[0]
+            for word in words[1:]:
+                yield " " + word
+        finally:
+            self.stream_closed.set()
+
+
+@pytest.fixture
+def socket_dir():
+    # Socket paths are limited in length, so avoid the long pytest directories
+    directory = tempfile.mkdtemp(prefix="ps")
+    yield Path(directory)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def llm_config(socket_dir):
+    return LLMConfig(provider="local", model_path="model.gguf", daemon_socket=str(socket_dir / "model.sock"))
+
+
+def start_daemon(llm_config, idle_timeout=None):
+    daemon = ModelDaemon(SlowEchoLLM(), Path(llm_config.daemon_socket), idle_timeout, model_identity(llm_config))
+    daemon.bind()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    return daemon, thread
+
+
+def test_generate_through_daemon(llm_config):
+    daemon, thread = start_daemon(llm_config)
+    try:
+        client = DaemonClient(Path(llm_config.daemon_socket))
+        assert client.request("generate", prompt="list files") == "echo list files"
+        with pytest.raises(DaemonError, match="generation failed"):
+            client.request("generate", prompt="fail")
+        assert client.request("ping")["requests"] == 3
+    finally:
+        daemon.stop()
+        thread.join(5)
+    assert not Path(llm_config.daemon_socket).exists()
+
+
+def test_concurrent_clients(llm_config):
+    daemon, thread = start_daemon(llm_config)
+    results = {}
+
+    def ask(name):
+        results[name] = DaemonClient(Path(llm_config.daemon_socket)).request("generate", prompt=name)
+
+    try:
+        threads = [threading.Thread(target=ask, args=(f"slow {i}",)) for i in range(3)]
+        threads.append(threading.Thread(target=ask, args=("fast",)))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        assert results == {name: f"echo {name}" for name in ("slow 0", "slow 1", "slow 2", "fast")}
+    finally:
+        daemon.stop()
+        thread.join(5)
+
+
+def test_idle_daemon_exits(llm_config):
+    _, thread = start_daemon(llm_config, idle_timeout=0.1)
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_get_llm_interface_uses_running_daemon(llm_config):
+    daemon, thread = start_daemon(llm_config)
+    try:
+        with patch("plainspeak.core.llm.local.LocalLLMInterface") as local:
+            llm = get_llm_interface(SimpleNamespace(llm=llm_config))
+            assert isinstance(llm, DaemonLLMInterface)
+            assert llm.generate("list files") == "echo list files"
+            local.assert_not_called()
+
+            # A daemon serving another model is not used
+            other = llm_config.model_copy(update={"model_path": "other.gguf"})
+            assert get_llm_interface(SimpleNamespace(llm=other)) is local.return_value
+    finally:
+        daemon.stop()
+        thread.join(5)
+
+
+def test_falls_back_to_in_process_model(llm_config):
+    with patch("plainspeak.core.llm.local.LocalLLMInterface") as local:
+        assert get_llm_interface(SimpleNamespace(llm=llm_config)) is local.return_value
+
+    # The daemon went away after the client connected
+    llm = DaemonLLMInterface(SimpleNamespace(llm=llm_config), DaemonClient(Path(llm_config.daemon_socket)))
+    fallback = MagicMock()
+    fallback.generate.return_value = "ls"
+    with patch("plainspeak.core.llm.local.LocalLLMInterface", return_value=fallback):
+        assert llm.generate("list files") == "ls"
+        assert llm.generate("list files") == "ls"
+    assert fallback.generate.call_count == 2
+
+
+def test_stream_through_daemon(llm_config):
+    daemon, thread = start_daemon(llm_config)
+    try:
+        llm = DaemonLLMInterface(SimpleNamespace(llm=llm_config), DaemonClient(Path(llm_config.daemon_socket)))
+        assert list(llm.generate_stream("list files")) == ["echo", " list", " files"]
+        with pytest.raises(LLMResponseError, match="generation failed"):
+            list(llm.generate_stream("fail"))
+
+        # Closing the stream stops the daemon's generation, and the client reconnects for the next request
+        daemon.interface.stream_closed.clear()
+        stream = llm.generate_stream("endless")
+        assert next(stream) == "y\n"
+        stream.close()
+        assert daemon.interface.stream_closed.wait(5)
+        assert llm.generate("list files") == "echo list files"
+    finally:
+        daemon.stop()
+        thread.join(5)
+
+
+def test_stream_falls_back_to_in_process_model(llm_config):
+    llm = DaemonLLMInterface(SimpleNamespace(llm=llm_config), DaemonClient(Path(llm_config.daemon_socket)))
+    fallback = MagicMock()
+    fallback.generate_stream.return_value = iter(["l", "s"])
+    with patch("plainspeak.core.llm.local.LocalLLMInterface", return_value=fallback):
+        assert list(llm.generate_stream("list files")) == ["l", "s"]
@@ -0,0 +1,172 @@
+"""Test module for deferred plugin loading and verb argument resolution."""
+
+import sys
+from types import SimpleNamespace
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from plainspeak.plugins.arguments import ArgumentValidationError, compile_validator
+from plainspeak.plugins.base import BasePlugin, YAMLPlugin
+from plainspeak.plugins.lazy import LazyPlugin, find_entry_point_manifest
+from plainspeak.utils import paths
+
+
+class VerbPlugin(BasePlugin):
+    """Plugin handling the given verbs, without argument schemas."""
+
+    def __init__(self, name: str, verbs: List[str]):
+        super().__init__(name=name, description="Test plugin")
+        self._verbs = verbs
+
+    def get_verbs(self) -> List[str]:
+        return self._verbs
+
+    def generate_command(self, verb: str, args: Dict[str, Any]) -> str:
+        return verb
+
+
+LAZY_MODULE = """
+from plainspeak.plugins.base import BasePlugin
+
+
+class LazyTestPlugin(BasePlugin):
+    def __init__(self):
+        super().__init__(name="lazy_plugin", description="Lazy test plugin")
+
+    def get_verbs(self):
+        return ["lazyverb"]
+
+    def get_aliases(self):
+        return {"lv": "lazyverb"}
+
+    def generate_command(self, verb, args):
+        return "lazy"
+"""
+
+
+def write_lazy_plugin(tmp_path, module_name, module_source):
+    """Write a plugin module and a plugin directory whose manifest points to it."""
+    (tmp_path / f"{module_name}.py").write_text(module_source)
+    plugin_dir = tmp_path / "plugins" / "lazy_plugin"
+    plugin_dir.mkdir(parents=True)
+    manifest = {
+        "name": "lazy_plugin",
+        "version": "1.0.0",
+        "description": "Lazy test plugin",
+        "author": "Test Author",
+        "verbs": ["lazyverb"],
+        "verb_aliases": {"lazyverb": ["lv"]},
+        "entrypoint": f"{module_name}.LazyTestPlugin",
+        "commands": {"lazyverb": {"template": "lazy", "description": "Lazy command"}},
+    }
+    (plugin_dir / "manifest.yaml").write_text(yaml.dump(manifest))
+    return str(tmp_path / "plugins")
+
+
+class TestLazyPluginLoading:
+    """Test deferred loading of manifest plugins."""
+
+    def test_module_imported_on_first_use(self, plugin_manager, tmp_path, monkeypatch):
+        """Test that a directory plugin is only imported when its verb resolves."""
+        monkeypatch.syspath_prepend(str(tmp_path))
+        plugin_manager._load_plugins_from_directory(write_lazy_plugin(tmp_path, "lazy_test_module", LAZY_MODULE))
+
+        assert "lazy_test_module" not in sys.modules
+        assert isinstance(plugin_manager.registry.plugins["lazy_plugin"], LazyPlugin)
+        assert plugin_manager.load_stats["lazy_plugin"].loaded is False
+
+        plugin = plugin_manager.get_plugin_for_verb("lv")
+        assert "lazy_test_module" in sys.modules
+        assert not isinstance(plugin, LazyPlugin)
+        assert plugin.generate_command("lazyverb", {}) == "lazy"
+        assert plugin_manager.registry.plugins["lazy_plugin"] is plugin
+        assert plugin_manager.get_plugin("lazy_plugin") is plugin
+
+        report = {stats.name: stats for stats in plugin_manager.get_load_report()}
+        assert report["lazy_plugin"].lazy and report["lazy_plugin"].loaded
+        monkeypatch.delitem(sys.modules, "lazy_test_module")
+
+    def test_failing_plugin_is_dropped(self, plugin_manager, tmp_path, monkeypatch):
+        """Test that a plugin whose module fails to import no longer claims its verbs."""
+        monkeypatch.syspath_prepend(str(tmp_path))
+        directory = write_lazy_plugin(tmp_path, "lazy_broken_module", "raise ImportError('missing dependency')\n")
+        plugin_manager._load_plugins_from_directory(directory)
+        fallback = VerbPlugin("fallback", ["lazyverb"])
+        fallback.priority = 0
+        plugin_manager.registry.register(fallback)
+
+        assert plugin_manager.get_plugin_for_verb("lazyverb") is fallback
+        assert "lazy_plugin" not in plugin_manager.registry.plugins
+        assert plugin_manager.load_stats["lazy_plugin"].error
+
+    def test_entry_point_manifest_lookup(self, tmp_path):
+        """Test that entry point manifests are found without importing the module."""
+        files = ["acme/__init__.py", "acme/plugin.py", "acme/manifest.yaml", "other/manifest.yaml"]
+        dist = SimpleNamespace(files=files, locate_file=lambda file: tmp_path / file)
+        entry_point = SimpleNamespace(name="acme", value="acme.plugin:AcmePlugin", dist=dist)
+        assert find_entry_point_manifest(entry_point) == tmp_path / "acme/manifest.yaml"
+
+        entry_point = SimpleNamespace(name="other", value="third.plugin:Plugin", dist=dist)
+        assert find_entry_point_manifest(entry_point) is None
+
+
+class TestArgumentResolution:
+    """Test validation of verb arguments."""
+
+    @pytest.fixture
+    def yaml_plugin(self, tmp_path):
+        manifest = {
+            "name": "args_plugin",
+            "version": "1.0.0",
+            "description": "Argument test plugin",
+            "author": "Test Author",
+            "verbs": ["show"],
+            "verb_aliases": {"show": ["sh"]},
+            "entrypoint": "args_module.ArgsPlugin",
+            "commands": {
+                "show": {
+                    "template": "show {{ path }}",
+                    "description": "Show a file",
+                    "required_args": ["path"],
+                    "optional_args": {"verbose": False, "limit": "10"},
+                }
+            },
+        }
+        manifest_path = tmp_path / "manifest.yaml"
+        manifest_path.write_text(yaml.dump(manifest))
+        return YAMLPlugin(str(manifest_path))
+
+    def test_defaults_coercion_and_paths(self, plugin_manager, yaml_plugin):
+        """Test that arguments get defaults, typed values and normalized paths."""
+        plugin_manager.registry.register(yaml_plugin)
+        args = plugin_manager.resolve_parameters("sh", {"path": "docs//./notes.txt", "verbose": "yes"})
+        assert args == {"path": paths.normalize_path("docs/notes.txt"), "verbose": True, "limit": "10"}
+
+    def test_missing_and_invalid_arguments(self, plugin_manager, yaml_plugin):
+        """Test that missing and uncoercible arguments are reported together."""
+        plugin_manager.registry.register(yaml_plugin)
+        with pytest.raises(ArgumentValidationError) as excinfo:
+            plugin_manager.resolve_parameters("show", {"verbose": "maybe"})
+        assert excinfo.value.missing == ["path"]
+        assert list(excinfo.value.invalid) == ["verbose"]
+
+    def test_validator_compiled_once_per_verb(self, plugin_manager, yaml_plugin):
+        """Test that verb details are cached per canonical verb until the registry changes."""
+        plugin_manager.registry.register(yaml_plugin)
+        with patch("plainspeak.plugins.manager.compile_validator", wraps=compile_validator) as compile_mock:
+            for verb in ("show", "sh", "show"):
+                plugin_manager.resolve_parameters(verb, {"path": "a"})
+            assert plugin_manager.get_verb_details("sh")["template"] == "show {{ path }}"
+            assert compile_mock.call_count == 1
+
+            plugin_manager.registry.register(VerbPlugin("other", ["other"]))
+            plugin_manager.resolve_parameters("show", {"path": "a"})
+            assert compile_mock.call_count == 2
+
+    def test_plugin_without_schema_passes_arguments_through(self, plugin_manager):
+        """Test that arguments of verbs without a schema are left unchanged."""
+        plugin_manager.registry.register(VerbPlugin("test_plugin", ["test_verb"]))
+        assert plugin_manager.resolve_parameters("test_verb", {"anything": 1}) == {"anything": 1}
@@ -6,7 +6,6 @@ from unittest.mock import MagicMock, patch
 import pytest
 import yaml
 
-from plainspeak.config import PlainSpeakConfig
 from plainspeak.plugins.base import BasePlugin
 from plainspeak.plugins.manager import PluginManager
 from plainspeak.utils import paths
@@ -71,27 +70,6 @@ def mock_base_plugin():
     return MockPlugin(name="test_plugin", verbs=["test_verb"], aliases={"tv": "test_verb"})
 
 
-@pytest.fixture
-def mock_config(tmp_path):
-    """Create a mock config."""
-    config = MagicMock(spec=PlainSpeakConfig)
-    config.plugins_dir = str(tmp_path)  # Use temp directory
-    config.plugins_enabled = ["core_file", "core_system"]
-    config.plugins_disabled = []
-    config.plugin_verb_match_threshold = 0.8
-    return config
-
-
-@pytest.fixture
-def plugin_manager(mock_config):
-    """Create a plugin manager instance."""
-    with patch("plainspeak.plugins.manager.PluginManager._load_plugins"):
-        manager = PluginManager(config=mock_config)
-        # Clear initial plugins for testing
-        manager.registry.clear()
-        return manager
-
-
 class TestPluginManager:
     """Test the plugin manager functionality."""
 
@@ -0,0 +1,118 @@
+"""Tests for concurrent command execution with the execution pool."""
+
+import asyncio
+import os
+import shlex
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from plainspeak.cli.shell_utils import execute_command, shell_sandbox
+from plainspeak.core.commander import Commander
+from plainspeak.core.executor import CommandExecutor
+from plainspeak.core.pool import DEFAULT_MAX_PARALLEL, ExecutionPool, get_execution_pool
+from plainspeak.core.sandbox import Sandbox
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="Uses POSIX shell commands")
+
+
+@pytest.fixture
+def sandbox():
+    return Sandbox()
+
+
+def test_batches_run_concurrently_up_to_the_limit(sandbox):
+    pool = ExecutionPool(sandbox, max_parallel=2)
+    start = time.monotonic()
+    runs = pool.run_batch([f"sleep 0.3; echo {i}" for i in range(4)] + ["cat /etc/shadow"])
+    elapsed = time.monotonic() - start
+
+    assert 0.6 <= elapsed < 1.2
+    assert [run.stdout for run in runs[:4]] == ["0\n", "1\n", "2\n", "3\n"]
+    assert all(run.success and run.duration >= 0.3 for run in runs[:4])
+    assert sorted(run.queued >= 0.25 for run in runs[:4]) == [False, False, True, True]
+    assert not runs[4].success
+    assert runs[4].error == "Unsafe command: Unsafe path: /etc/shadow"
+
+
+def test_output_is_delivered_on_the_event_loop(sandbox):
+    pool = ExecutionPool(sandbox)
+    lines = []
+
+    async def main():
+        loop_thread = threading.get_ident()
+        runs = await pool.map(
+            ["echo a; echo b >&2", "echo c"],
+            on_output=lambda index, name, line: lines.append((index, name, line, threading.get_ident() == loop_thread)),
+        )
+        return runs
+
+    runs = asyncio.run(main())
+    assert sorted(lines) == [(0, "stderr", "b\n", True), (0, "stdout", "a\n", True), (1, "stdout", "c\n", True)]
+    assert (runs[0].stdout, runs[0].stderr, runs[1].stdout) == ("a\n", "b\n", "c\n")
+    assert pool.max_parallel == DEFAULT_MAX_PARALLEL
+
+
+def test_cancelling_kills_only_the_command_process_group(sandbox, tmp_path):
+    pool = ExecutionPool(sandbox, max_parallel=1)
+    marker = tmp_path / "marker"
+
+    async def main():
+        running = asyncio.ensure_future(pool.run(f"(sleep 0.5; touch {marker}) & sleep 5"))
+        queued = asyncio.ensure_future(pool.run(f"touch {marker}"))
+        await asyncio.sleep(0.2)
+        start = time.monotonic()
+        for task in (running, queued):
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) < 0.5
+    time.sleep(0.5)
+    assert not marker.exists()
+    # The pool keeps working after a cancellation
+    assert pool.run_batch(["true"])[0].success
+
+
+def test_commander_executor_and_shell_share_the_pool(sandbox, monkeypatch):
+    monkeypatch.setattr("plainspeak.core.pool._shared_pool", None)
+    config = MagicMock()
+    config.execution.max_parallel_commands = 3
+    commander = Commander(config=config, sandbox=sandbox)
+    assert commander.pool.max_parallel == 3
+    assert CommandExecutor(sandbox).pool is commander.pool is get_execution_pool()
+
+    template = {"action_type": "execute_command", "command_template": "echo {word}"}
+    results = commander.execute_batch(
+        [
+            {**template, "parameters": {"word": "hi"}},
+            {**template, "parameters": {}},
+            {**template, "parameters": {"word": "; exit 2"}},
+        ]
+    )
+    assert results == [
+        (True, "hi\n", ""),
+        (False, "", "Error rendering command: Missing parameter 'word'."),
+        (False, "\n", ""),
+    ]
+    assert asyncio.run(commander.aexecute({**template, "parameters": {"word": "async"}})) == (True, "async\n", "")
+
+    history = []
+    monkeypatch.setattr("plainspeak.core.executor.session_context.add_to_history", lambda *args: history.append(args))
+    executor = CommandExecutor(sandbox)
+    run = asyncio.run(executor.aexecute("echo done", original_text="say done"))
+    assert (run.success, run.stdout, history) == (True, "done\n", [("say done", "echo done", True)])
+    assert [run.returncode for run in executor.execute_batch(["true", "false"])] == [0, 1]
+
+    lines = []
+    assert execute_command("echo shell", on_output=lambda name, line: lines.append(line)) == (True, "shell\n", None)
+    assert lines == ["shell\n"]
+    # Commands typed into the shell aren't validated, have no time limit and keep the terminal
+    assert execute_command("echo /etc/shadow") == (True, "/etc/shadow\n", None)
+    assert shell_sandbox.stream_shell_command("sleep 100").timeout is None
+    session = f"{shlex.quote(sys.executable)} -c 'import os; print(os.getsid(0))'"
+    assert execute_command(session) == (True, f"{os.getsid(0)}\n", None)
@@ -0,0 +1,128 @@
+"""Tests for the remote HTTP client, against a local stub server."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from plainspeak.config import LLMConfig
+from plainspeak.core.llm import RemoteLLM, RemoteLLMInterface
+from plainspeak.core.llm.resilience import CircuitBreaker, CircuitOpenError, TokenBucket, backoff_delay
+
+
+@pytest.fixture
+def client(api):
+    llm = RemoteLLM(api.url, "test-key", retry_count=2, timeout=5, rate_limit_per_minute=0, backoff_base=0.01)
+    yield llm
+    llm.close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(60, burst=2, clock=clock)
+    assert [bucket.reserve(), bucket.reserve()] == [0.0, 0.0]
+    # One token per second, queued callers wait in turn
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+    clock.now = 10.0
+    assert bucket.reserve() == 0.0
+    assert TokenBucket(0).reserve() == 0.0
+
+
+def test_circuit_breaker_half_opens_after_recovery_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    clock.now = 30.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # A single trial request is let through
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 60.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+
+def test_backoff_is_jittered_and_capped():
+    assert backoff_delay(3, base=0.5, cap=30, rng=lambda: 0.5) == 2.0
+    assert backoff_delay(10, base=0.5, cap=30, rng=lambda: 0.999) < 30
+    assert backoff_delay(0, rng=lambda: 0.0) == 0.0
+
+
+def test_request_retries_transient_errors(api, client):
+    api.failures = [503, 429]
+    result = client._make_api_request("chat/completions", {"messages": [{"role": "user", "content": "ls"}]})
+    assert result["choices"][0]["message"]["content"] == "LS"
+    assert api.requests == 3
+    assert client.failure_count == 0
+
+
+def test_request_does_not_retry_client_errors(api, client):
+    api.failures = [400]
+    with pytest.raises(requests.HTTPError):
+        client._make_api_request("chat/completions", {"messages": []})
+    assert api.requests == 1
+    assert not client.circuit_open
+
+
+def test_circuit_opens_after_failed_requests(api, client):
+    client.breaker.failure_threshold = 1
+    api.failures = [500] * 3
+    with pytest.raises(requests.HTTPError):
+        client._make_api_request("chat/completions", {"messages": []})
+    assert client.circuit_open
+
+    with pytest.raises(CircuitOpenError):
+        client._make_api_request("chat/completions", {"messages": []})
+    assert api.requests == 3
+
+
+def test_async_requests_share_bounded_keep_alive_connections(api):
+    api.delay = 0.05
+    client = RemoteLLM(api.url, "test-key", rate_limit_per_minute=0, max_concurrency=3)
+
+    async def run():
+        messages = [[{"role": "user", "content": f"cmd{i}"}] for i in range(9)]
+        return await asyncio.gather(*(client.chat_async(m, "test-model", 16, 0.0) for m in messages))
+
+    try:
+        assert asyncio.run(run()) == [f"CMD{i}" for i in range(9)]
+    finally:
+        client.close()
+    assert api.max_in_flight == 3
+    assert len(api.connections) == 3
+
+
+def test_interface_batch_runs_concurrently(api, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    api.delay = 0.1
+    llm_config = LLMConfig(provider="openai", api_base=api.url, cache_responses=False, max_concurrency=4)
+    llm = RemoteLLMInterface(SimpleNamespace(llm=llm_config))
+
+    start = time.perf_counter()
+    results = llm.generate_batch(["ls", "pwd", "df", "for"], batch_size=4)
+    elapsed = time.perf_counter() - start
+    llm.close()
+
+    assert [result.text for result in results[:3]] == ["LS", "PWD", "DF"]
+    # 'FOR' isn't the incomplete 'for', the retry only happens for exact matches
+    assert results[3].text == "FOR"
+    assert elapsed < 0.35
+    assert api.max_in_flight == 4
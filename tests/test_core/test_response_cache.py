@@ -0,0 +1,122 @@
+"""Tests for the LLM response cache."""
+
+from unittest.mock import patch
+
+import pytest
+
+from plainspeak.config import LLMConfig
+from plainspeak.core.llm import LLMInterface
+from plainspeak.core.llm.cache import ResponseCache, cache_key
+
+
+class CountingLLM(LLMInterface):
+    """LLM returning a fixed command and counting generations."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.calls = 0
+
+        self.response = "ls -la"
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        return self.response
+
+
+@pytest.fixture
+def llm_config(tmp_path):
+    return LLMConfig(
+        provider="local",
+        model_path="model.gguf",
+        cache_responses=True,
+        cache_path=str(tmp_path / "responses.sqlite3"),
+        intent_fast_path=False,
+    )
+
+
+def test_key_normalizes_text_and_covers_model():
+    model = {"model_path": "a.gguf", "temperature": 0.2}
+    assert cache_key("intent", "list   files ", "system", "en_US", model) == cache_key(
+        "intent", "list files", "system", "en_US", model
+    )
+    assert cache_key("intent", "list files", "system", "en_US", model) != cache_key(
+        "intent", "list files", "system", "en_US", {**model, "temperature": 0.7}
+    )
+    assert cache_key("intent", "list files", "system") != cache_key("command", "list files", "system")
+
+
+def test_responses_persist_across_instances(tmp_path):
+    path = tmp_path / "responses.sqlite3"
+    cache = ResponseCache(path)
+    cache.put("key", "ls -la")
+    cache.close()
+
+    reloaded = ResponseCache(path)
+    assert reloaded.get("key") == "ls -la"
+    assert reloaded.get("key") == "ls -la"
+    stats = reloaded.stats()
+    assert (stats.disk_hits, stats.memory_hits, stats.misses) == (1, 1, 0)
+
+
+def test_memory_tier_is_bounded():
+    cache = ResponseCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+    assert cache.stats().memory_entries == 2
+
+
+def test_expired_responses_are_misses(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite3", ttl=60)
+    with patch("plainspeak.core.llm.cache.time.time", return_value=1000.0):
+        cache.put("key", "ls")
+    with patch("plainspeak.core.llm.cache.time.time", return_value=1061.0):
+        assert cache.get("key") is None
+    assert cache.stats().hit_rate == 0.0
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    with patch("plainspeak.core.llm.cache.PRUNE_INTERVAL", 1):
+        cache = ResponseCache(tmp_path / "responses.sqlite3", max_entries=1, max_disk_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, key)
+    assert [cache.get(key) for key in ("a", "b", "c")] == [None, "b", "c"]
+
+
+def test_interface_reuses_cached_generations(llm_config):
+    llm = CountingLLM(config=type("Config", (), {"llm": llm_config})())
+    assert llm.generate_command("list files") == "ls -la"
+    assert llm.generate_command("list  files") == "ls -la"
+    assert llm.calls == 1
+
+    # A different prompt kind, locale or bypass generates again
+    llm.parse_natural_language_with_locale("list files", "fr_FR")
+    assert llm.calls == 2
+    llm.bypass_cache = True
+    llm.generate_command("list files")
+    assert llm.calls == 3
+
+
+def test_cache_disabled_by_config(llm_config):
+    llm_config.cache_responses = False
+    llm = CountingLLM(config=type("Config", (), {"llm": llm_config})())
+    llm.generate_command("list files")
+    llm.generate_command("list files")
+    assert llm.response_cache is None and llm.calls == 2
+
+
+def test_cache_is_off_by_default():
+    assert LLMConfig().cache_responses is False
+    llm = CountingLLM(config=type("Config", (), {"llm": LLMConfig()})())
+    assert llm.response_cache is None
+
+
+def test_unsafe_commands_are_not_cached(llm_config):
+    llm = CountingLLM(config=type("Config", (), {"llm": llm_config})())
+    llm.response = "cat /etc/shadow"
+    llm.generate_command("show passwords")
+    llm.response = "ls -la"
+    assert llm.generate_command("show passwords") == "ls -la"
+    assert llm.generate_command("show passwords") == "ls -la"
+    assert llm.calls == 2
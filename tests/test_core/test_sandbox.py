@@ -0,0 +1,193 @@
+"""Tests for streamed, resource-limited command execution in the sandbox."""
+
+import getpass
+import os
+import sys
+import time
+
+import pytest
+
+from plainspeak.cli.shell_utils import execute_command
+from plainspeak.core.executor import CommandExecutor
+from plainspeak.core.process import LineSplitter, StreamingProcess
+from plainspeak.core.sandbox import Sandbox, SandboxExecutionError, ValidationResult
+from plainspeak.core.spawn import ResourceLimits
+from plainspeak.plugins.platform import platform_manager
+from plainspeak.plugins.sandbox import SafetySandbox
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="Uses POSIX shell commands")
+
+PYTHON = sys.executable
+
+
+@pytest.fixture
+def sandbox():
+    return Sandbox()
+
+
+def test_lines_are_yielded_as_they_arrive(sandbox):
+    process = sandbox.stream_shell_command("echo first; sleep 0.5; echo second >&2")
+    start = time.monotonic()
+    arrivals = [(name, line, time.monotonic() - start) for name, line in process]
+
+    assert [(name, line) for name, line, _ in arrivals] == [("stdout", "first\n"), ("stderr", "second\n")]
+    assert arrivals[0][2] < 0.4 <= arrivals[1][2]
+    result = process.result()
+    assert (result.returncode, result.stdout, result.stderr, result.lines) == (0, "first\n", "second\n", 2)
+
+
+def test_output_cap_stops_the_command(sandbox, monkeypatch):
+    monkeypatch.setitem(Sandbox.RESOURCE_LIMITS, "MAX_OUTPUT", 100)
+    streamed = []
+
+    returncode, stdout, stderr = sandbox.execute_shell_command(
+        f"{PYTHON} -c 'while True: print(1)'", on_output=lambda name, line: streamed.append(line)
+    )
+
+    assert returncode != 0
+    assert stdout == "1\n" * 100
+    assert stderr == "Output truncated after 100 lines, command stopped\n"
+    assert len(streamed) == 101
+
+
+def test_streamed_results_keep_only_the_last_lines(sandbox, monkeypatch):
+    monkeypatch.setattr(Sandbox, "OUTPUT_HISTORY", 3)
+    streamed = []
+
+    returncode, stdout, _ = sandbox.execute_shell_command("seq 10", on_output=lambda name, line: streamed.append(line))
+
+    assert returncode == 0
+    assert stdout == "8\n9\n10\n"
+    assert "".join(streamed) == "".join(f"{i}\n" for i in range(1, 11))
+
+
+def test_timeout_kills_the_command(sandbox, monkeypatch):
+    monkeypatch.setitem(Sandbox.RESOURCE_LIMITS, "MAX_CPU_TIME", 0.3)
+    start = time.monotonic()
+    with pytest.raises(SandboxExecutionError, match="timed out"):
+        sandbox.execute_shell_command("sleep 5")
+    assert time.monotonic() - start < 2
+
+
+def test_timeout_kills_the_whole_process_group(sandbox, monkeypatch, tmp_path):
+    monkeypatch.setitem(Sandbox.RESOURCE_LIMITS, "MAX_CPU_TIME", 0.3)
+    marker = tmp_path / "marker"
+    with pytest.raises(SandboxExecutionError, match="timed out"):
+        sandbox.execute_shell_command(f"(sleep 0.6; touch {marker}) & sleep 5")
+    time.sleep(0.6)
+    assert not marker.exists()
+
+
+def test_cpu_and_file_size_limits_are_enforced(sandbox, monkeypatch, tmp_path):
+    # The sandbox's wall-clock timeout equals MAX_CPU_TIME, so the CPU limit is checked on its own
+    process = StreamingProcess(f"{PYTHON} -c 'while True: pass'", timeout=10, limits=ResourceLimits(cpu_time=1))
+    assert all(name == "stderr" for name, _ in process)
+    assert process.result().limit_exceeded == "CPU time limit exceeded"
+
+    monkeypatch.setitem(Sandbox.RESOURCE_LIMITS, "MAX_FILE_SIZE", 1)
+    returncode, _, stderr = sandbox.execute_shell_command(f"yes | head -c 2000000 > {tmp_path / 'big'}")
+    assert returncode != 0
+    assert stderr.endswith("File size limit exceeded\n")
+    assert (tmp_path / "big").stat().st_size <= 1024 * 1024
+
+
+def test_memory_limit_is_opt_in_and_caps_the_heap():
+    allocate = f"{PYTHON} -c 'b = bytearray(256 * 1024 * 1024)'"
+    assert Sandbox.RESOURCE_LIMITS["MAX_MEMORY"] == 0
+
+    process = StreamingProcess(allocate, timeout=10, limits=ResourceLimits(memory=64))
+    assert any("MemoryError" in line for _, line in process)
+    assert process.result().returncode != 0
+
+    # The command starts once its limits are set, with nothing to read on its input
+    process = StreamingProcess("ulimit -d; cat", timeout=10, limits=ResourceLimits(memory=64))
+    assert [line for _, line in process] == [f"{64 * 1024}\n"]
+
+
+def test_results_include_resource_usage(sandbox):
+    result = sandbox.run_shell_command(f"{PYTHON} -c 'sum(range(10**6)); b = bytearray(64 * 1024 * 1024)'")
+
+    assert result.returncode == 0
+    assert result.limit_exceeded is None
+    assert result.usage.user_time + result.usage.system_time > 0
+    assert result.usage.max_rss > 64 * 1024 * 1024
+
+
+def test_unsafe_commands_are_not_started(sandbox):
+    with pytest.raises(SandboxExecutionError, match="Unsafe command"):
+        sandbox.stream_shell_command("rm -rf /")
+
+
+def test_validation_reports_the_rule_that_rejected_a_command(sandbox):
+    assert sandbox.check_command("ls -la ~/notes") == ValidationResult(True)
+    assert sandbox.check_command("   ") == ValidationResult(False, "empty")
+    assert sandbox.check_command("echo 'open") == ValidationResult(False, "syntax", "No closing quotation")
+    assert sandbox.check_command("rm -rf /") == ValidationResult(False, "blacklisted", "rm -rf /")
+    assert sandbox.check_command("chmod 777 notes") == ValidationResult(
+        False, "pattern", r"\b(chmod|chown)\s+[0-7]*777\b"
+    )
+    assert sandbox.check_command("cat /etc/shadow") == ValidationResult(False, "path", "/etc/shadow")
+    assert sandbox.validate_command("cat /etc/shadow") == (False, "Unsafe path: /etc/shadow")
+    assert SafetySandbox().check_command("dd if=a of=b").reason == "pattern"
+
+
+def test_subclass_patterns_are_compiled():
+    class StrictSandbox(Sandbox):
+        DANGEROUS_PATTERNS = Sandbox.DANGEROUS_PATTERNS + [r"\bsudo\b"]
+
+    assert StrictSandbox().check_command("sudo ls").detail == r"\bsudo\b"
+    assert Sandbox().check_command("sudo ls").safe
+
+
+def test_path_verdicts_are_cached_per_normalized_path(monkeypatch):
+    monkeypatch.setattr(platform_manager, "_safe_path_cache", {})
+    assert platform_manager.is_safe_path("/tmp/a/../b")
+    assert not platform_manager.is_safe_path("/tmp")
+    assert not platform_manager.is_safe_path("~/../..")
+    assert platform_manager._safe_path_cache == {"/tmp/b": True, "/tmp": False, "/": False}
+
+    monkeypatch.setattr(platform_manager, "SAFE_PATH_CACHE_SIZE", 3)
+    platform_manager.is_safe_path("/tmp/c")
+    assert platform_manager._safe_path_cache == {"/tmp/c": True}
+
+
+def test_context_reuses_environment_and_user_snapshots(sandbox, monkeypatch):
+    def no_terminal():
+        raise OSError(6, "No such device or address")
+
+    monkeypatch.setattr(os, "getlogin", no_terminal)
+    first, second = sandbox.create_context("ls"), sandbox.create_context("pwd")
+    assert first.user == getpass.getuser()
+    assert second.env is first.env
+    assert dict(first.env) == dict(os.environ)
+
+    monkeypatch.setenv("PLAINSPEAK_TEST", "fresh")
+    third = sandbox.create_context("ls")
+    assert third.env is not first.env
+    assert third.env["PLAINSPEAK_TEST"] == "fresh"
+    with pytest.raises(TypeError):
+        third.env["PLAINSPEAK_TEST"] = "changed"
+    assert sandbox.execute_shell_command("echo $PLAINSPEAK_TEST")[1] == "fresh\n"
+
+
+def test_executor_and_shell_stream_output(sandbox):
+    streamed = []
+    success, stdout, stderr = CommandExecutor(sandbox).execute(
+        "echo out; echo err >&2; exit 3", track_history=False, on_output=lambda name, line: streamed.append(name)
+    )
+    assert (success, stdout, stderr) == (False, "out\n", "err\n")
+    assert sorted(streamed) == ["stderr", "stdout"]
+
+    streamed.clear()
+    assert execute_command("printf 'a\\nb'", on_output=lambda name, line: streamed.append(line)) == (True, "a\nb", None)
+    assert streamed == ["a\n", "b"]
+
+
+def test_line_splitter_bounds_line_length():
+    splitter = LineSplitter(max_length=4)
+    assert splitter.feed(b"ab\r\ncdefgh") == ["ab\n", "cdef"]
+    # A character split across chunks is decoded once complete
+    assert splitter.feed("é".encode()[:1]) == []
+    assert splitter.feed("é!\nx".encode()[1:]) == ["ghé!\n"]
+    assert splitter.flush() == ["x"]
+    assert StreamingProcess("true").result().returncode == 0
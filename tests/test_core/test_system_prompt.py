@@ -0,0 +1,140 @@
+"""Tests for system prompt loading and compaction."""
+
+from unittest.mock import mock_open, patch
+
+import pytest
+
+from plainspeak.config import LLMConfig
+from plainspeak.core.llm import LLMInterface
+from plainspeak.core.llm import system_prompt as system_prompt_module
+from plainspeak.core.llm.system_prompt import SystemPrompt, load_system_prompt
+from plainspeak.learning.index import SimilarityIndex
+
+PROMPT = """You translate requests into commands.
+
+## File Operations
+- "list files" → `ls -la`
+- "copy a file" → `cp source dest`
+
+## Network
+- "show open ports" → `ss -tuln`
+- "ping a host" → `ping -c 4 host`
+
+## Compression
+- "extract an archive" → `tar -xzf archive.tar.gz`
+
+Prefer safe commands."""
+
+
+class EchoLLM(LLMInterface):
+    """LLM recording the prompts it is given."""
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.prompts = []
+
+    def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return "ls -la"
+
+
+def make_llm(prompt_mode="auto", **settings):
+    config = LLMConfig(cache_responses=False, prompt_mode=prompt_mode, intent_fast_path=False, **settings)
+    return EchoLLM(config=type("Config", (), {"llm": config})())
+
+
+@pytest.fixture(autouse=True)
+def parsed_prompt():
+    with patch("plainspeak.core.llm.base.load_system_prompt", return_value=SystemPrompt.parse(PROMPT)):
+        yield
+
+
+def test_parse_splits_sections():
+    prompt = SystemPrompt.parse(PROMPT)
+    assert prompt.preamble == "You translate requests into commands."
+    assert [section.title for section in prompt.sections] == ["File Operations", "Network", "Compression"]
+    assert prompt.epilogue == "Prefer safe commands."
+    assert "Prefer" not in prompt.sections[-1].text
+
+
+def test_compact_keeps_relevant_sections_in_order():
+    prompt = SystemPrompt.parse(PROMPT)
+    compact = prompt.compact("extract the archive and show open ports", max_sections=2)
+    assert compact.startswith("You translate requests into commands.")
+    assert compact.index("## Network") < compact.index("## Compression")
+    assert "## File Operations" not in compact
+    assert compact.endswith("Prefer safe commands.")
+
+
+def test_index_ranks_sections_by_relevance():
+    prompt = SystemPrompt.parse(PROMPT)
+    scores = prompt.index.scores("ping the host")
+    assert scores.index(max(scores)) == 1
+    assert prompt.index.scores("the") == [0.0, 0.0, 0.0]
+
+
+def test_sections_and_learned_commands_are_matched_alike():
+    prompt = SystemPrompt.parse(PROMPT)
+    index = SimilarityIndex()
+    for i, section in enumerate(prompt.sections):
+        index.upsert({"id": str(i), "natural_text": section.text, "generated_command": "true", "success": True})
+
+    # Both indexes drop stopwords and plural endings before ranking with BM25
+    for query in ("extract the archives", "ping hosts", "copy files"):
+        scores = prompt.index.scores(query)
+        best = prompt.sections[scores.index(max(scores))].text
+        assert index.search(query, limit=1)[0][0] == best
+    assert index.search("the") == []
+
+
+def test_compact_respects_token_budget():
+    prompt = SystemPrompt.parse(PROMPT)
+    query = "show open ports, list and copy files, extract an archive"
+    files, network, compression = (section.text for section in prompt.sections)
+    fixed = len(prompt.preamble) + len(prompt.epilogue)
+
+    compact = prompt.compact(query, budget=fixed + len(files) + len(compression), count_tokens=len)
+    assert "## File Operations" in compact
+    # The next best section doesn't fit, but a smaller one further down the ranking does
+    assert "## Network" not in compact
+    assert "## Compression" in compact
+
+
+def test_file_is_read_once():
+    with patch.dict(system_prompt_module._prompts, clear=True):
+        with patch("builtins.open", mock_open(read_data=PROMPT)) as opened:
+            first = load_system_prompt("linux")
+            assert load_system_prompt("linux") is first
+    assert opened.call_count == 1
+    assert len(first.sections) == 3
+
+
+def test_prompt_modes():
+    full = make_llm("full")
+    full.generate_command("show open ports")
+    assert "## Compression" in full.prompts[0]
+
+    compact = make_llm("compact")
+    compact.generate_command("show open ports")
+    compact.parse_intent("extract an archive")
+    compact.parse_natural_language_with_locale("copy a file", "fr_FR")
+    assert "## Network" in compact.prompts[0] and "## Compression" not in compact.prompts[0]
+    assert "## Compression" in compact.prompts[1] and "## Network" not in compact.prompts[1]
+    assert "## File Operations" in compact.prompts[2] and "## Network" not in compact.prompts[2]
+
+
+def test_auto_mode_sends_full_prompt_only_when_prefix_is_reused_and_fits():
+    # Without prefix reuse every request pays for the whole prompt
+    llm = make_llm()
+    llm.generate_command("show open ports")
+    assert "## Compression" not in llm.prompts[0]
+
+    llm = make_llm()
+    llm.reuses_prompt_prefix = True
+    llm.generate_command("show open ports")
+    assert "## Compression" in llm.prompts[0]
+
+    llm = make_llm(context_length=300, max_new_tokens=256)
+    llm.reuses_prompt_prefix = True
+    llm.generate_command("show open ports")
+    assert "## Compression" not in llm.prompts[0]
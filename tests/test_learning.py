@@ -3,35 +3,42 @@ Tests for the learning module.
 """
 
 import json
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
-from plainspeak.learning import LearningStore
+from plainspeak.learning import CommandHistory, LearningStore
+from plainspeak.learning import store as store_module
 
 
 @pytest.fixture
 def temp_data_dir():
-    """Create a temporary directory for JSON files."""
+    """Create a temporary directory for journal files."""
     with tempfile.TemporaryDirectory() as temp_dir:
         yield Path(temp_dir)
 
 
+def read_journal(path):
+    """Read a journal file, keeping the latest version of each record."""
+    records = {}
+    for line in path.read_text().splitlines():
+        record = json.loads(line)
+        records[record.get("id", len(records))] = record
+    return list(records.values())
+
+
 def test_learning_store_init(temp_data_dir):
     """Test LearningStore initialization and file creation."""
     LearningStore(temp_data_dir)
 
-    # Check that JSON files were created
-    assert (temp_data_dir / "commands.json").exists()
-    assert (temp_data_dir / "feedback.json").exists()
-    assert (temp_data_dir / "patterns.json").exists()
-
-    # Check that files contain valid empty JSON arrays
-    for filename in ["commands.json", "feedback.json", "patterns.json"]:
-        content = (temp_data_dir / filename).read_text()
-        assert json.loads(content) == []
+    # Check that journal files were created empty
+    for filename in ["commands.jsonl", "feedback.jsonl", "patterns.jsonl"]:
+        assert (temp_data_dir / filename).exists()
+        assert (temp_data_dir / filename).read_text() == ""
 
 
 def test_add_command(temp_data_dir):
@@ -47,7 +54,7 @@ def test_add_command(temp_data_dir):
     )
 
     # Check that the command was added
-    commands = json.loads((temp_data_dir / "commands.json").read_text())
+    commands = read_journal(temp_data_dir / "commands.jsonl")
     assert len(commands) == 1
     cmd = commands[0]
 
@@ -74,7 +81,7 @@ def test_update_command_execution(temp_data_dir):
     store.update_command_execution(command_id, True, True)
 
     # Check that the status was updated
-    commands = json.loads((temp_data_dir / "commands.json").read_text())
+    commands = read_journal(temp_data_dir / "commands.jsonl")
     cmd = next(c for c in commands if c["id"] == command_id)
 
     assert cmd["executed"] is True
@@ -92,7 +99,7 @@ def test_update_command_edit(temp_data_dir):
     store.update_command_edit(command_id, "ls -la")
 
     # Check that the edit was saved
-    commands = json.loads((temp_data_dir / "commands.json").read_text())
+    commands = read_journal(temp_data_dir / "commands.jsonl")
     cmd = next(c for c in commands if c["id"] == command_id)
 
     assert cmd["edited"] is True
@@ -110,7 +117,7 @@ def test_add_feedback(temp_data_dir):
     store.add_feedback(command_id, "approve", "Great command!")
 
     # Check that the feedback was added
-    feedbacks = json.loads((temp_data_dir / "feedback.json").read_text())
+    feedbacks = read_journal(temp_data_dir / "feedback.jsonl")
     assert len(feedbacks) == 1
     feedback = feedbacks[0]
 
@@ -223,3 +230,44 @@ def test_export_training_data(temp_data_dir):
         # Cleanup
         if output_path.exists():
             output_path.unlink()
+
+
+def test_get_history_columnar_view(temp_data_dir):
+    """Test the lightweight history view used instead of a DataFrame."""
+    store = LearningStore(temp_data_dir)
+    first = store.add_command("list files", "ls", executed=True, success=True)
+    store.add_command("bad command", "bad", executed=True, success=False)
+    store.update_command_edit(first, "ls -la")
+    store.add_command("not run yet", "echo")
+
+    history = store.get_history(limit=2)
+
+    assert isinstance(history, CommandHistory)
+    assert len(history) == 2
+    assert history["natural_text"] == ["not run yet", "bad command"]
+    assert history.count("executed") == 1
+    assert history.count("success") == 0
+
+    full = store.get_history()
+    assert full.count("edited") == 1
+    assert next(row for row in full.rows() if row["id"] == first)["edited_command"] == "ls -la"
+    assert list(full.to_frame()["natural_text"]) == full["natural_text"]
+
+
+def test_global_learning_store_is_lazy(temp_data_dir, monkeypatch):
+    """Test that the global store is only created when first used."""
+    monkeypatch.setattr(store_module, "_default_store", None)
+    monkeypatch.setattr(store_module.Path, "home", classmethod(lambda cls: temp_data_dir))
+
+    assert not (temp_data_dir / ".plainspeak").exists()
+    store_module.learning_store.add_command("list files", "ls")
+
+    assert (temp_data_dir / ".plainspeak" / "learning" / "commands.jsonl").exists()
+    assert store_module.get_learning_store() is store_module._default_store
+
+
+def test_learning_import_does_not_load_pandas():
+    """Test that pandas stays out of the import path."""
+    code = "import sys, plainspeak.learning; print('pandas' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,134 @@
+"""
+Tests for the append-only journals of the learning store.
+"""
+
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from plainspeak.learning import LearningStore, RecordJournal
+from plainspeak.utils.paths import file_lock
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create a temporary directory for journal files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+def test_updates_append_instead_of_rewriting(temp_data_dir):
+    """Test that updates append a new record version."""
+    store = LearningStore(temp_data_dir)
+    command_id = store.add_command(natural_text="list files", generated_command="ls")
+    store.update_command_execution(command_id, True, False, "boom")
+
+    lines = (temp_data_dir / "commands.jsonl").read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[1])["error_message"] == "boom"
+
+    # A fresh store sees only the latest version
+    history = LearningStore(temp_data_dir).get_command_history()
+    assert len(history) == 1
+    assert history.iloc[0]["success"] == False  # noqa: E712
+
+
+def test_legacy_json_migration(temp_data_dir):
+    """Test that legacy JSON array files are migrated transparently."""
+    legacy = [
+        {"id": "a", "natural_text": "list files", "generated_command": "ls", "executed": True, "success": True},
+        {"id": "b", "natural_text": "bad", "generated_command": "bad", "executed": True, "success": False},
+    ]
+    (temp_data_dir / "commands.json").write_text(json.dumps(legacy, indent=2))
+
+    store = LearningStore(temp_data_dir)
+
+    assert not (temp_data_dir / "commands.json").exists()
+    assert (temp_data_dir / "commands.json.migrated").exists()
+    assert store.get_training_data() == [("list files", "ls")]
+
+
+def test_journal_compaction(temp_data_dir):
+    """Test that stale versions are compacted away."""
+    journal = RecordJournal(temp_data_dir / "records.jsonl", compact_min_stale=4)
+    journal.append({"id": "a", "value": 0})
+    journal.append({"id": "b", "value": 0})
+    for i in range(1, 6):
+        journal.update("a", {"value": i})
+
+    assert journal.stale_count < 4
+    assert len(journal) == 2
+    assert journal.get("a") == {"id": "a", "value": 5}
+    assert [r["id"] for r in journal.records()] == ["a", "b"]
+
+
+def test_journal_recovers_truncated_tail(temp_data_dir):
+    """Test that a partially written last line is discarded."""
+    path = temp_data_dir / "records.jsonl"
+    path.write_text('{"id": "a", "value": 1}\n{"id": "b", "val')
+
+    journal = RecordJournal(path)
+
+    assert len(journal) == 1
+    journal.append({"id": "c", "value": 3})
+    assert [r["id"] for r in RecordJournal(path).records()] == ["a", "c"]
+
+
+def test_journal_sees_appends_from_other_writers(temp_data_dir):
+    """Test that the index picks up records written by another process."""
+    path = temp_data_dir / "records.jsonl"
+    reader = RecordJournal(path)
+    writer = RecordJournal(path)
+
+    writer.append({"id": "a", "value": 1})
+    writer.compact()
+    writer.append({"id": "b", "value": 2})
+
+    assert reader.get("b") == {"id": "b", "value": 2}
+    assert len(reader) == 2
+
+
+def test_journal_compaction_keeps_concurrent_appends(temp_data_dir):
+    """Test that a compaction waiting for the lock keeps records appended meanwhile."""
+    path = temp_data_dir / "records.jsonl"
+    journal = RecordJournal(path, compact_min_stale=1000)
+    for i in range(3):
+        journal.append({"id": "a", "value": i})
+
+    with file_lock(journal.lock_path):
+        compaction = threading.Thread(target=journal.compact)
+        compaction.start()
+        time.sleep(0.1)
+        assert compaction.is_alive()
+        # Another process appends while holding the lock
+        with open(path, "ab") as f:
+            f.write(b'{"id":"b","value":1}\n')
+    compaction.join(timeout=5)
+
+    assert not compaction.is_alive()
+    assert journal.stale_count == 0
+    assert RecordJournal(path).records() == [{"id": "a", "value": 2}, {"id": "b", "value": 1}]
+
+
+def test_journal_update_keeps_concurrent_updates(temp_data_dir):
+    """Test that an update waiting for the lock applies its fields to the latest version."""
+    path = temp_data_dir / "records.jsonl"
+    journal = RecordJournal(path)
+    journal.append({"id": "a", "value": 0})
+
+    with file_lock(journal.lock_path):
+        update = threading.Thread(target=journal.update, args=("a", {"value": 1}))
+        update.start()
+        time.sleep(0.1)
+        assert update.is_alive()
+        # Another process updates a different field while holding the lock
+        with open(path, "ab") as f:
+            f.write(b'{"id":"a","value":0,"note":"kept"}\n')
+    update.join(timeout=5)
+
+    assert not update.is_alive()
+    assert RecordJournal(path).get("a") == {"id": "a", "value": 1, "note": "kept"}
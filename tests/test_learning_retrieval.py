@@ -0,0 +1,108 @@
+"""
+Tests for similarity retrieval and the semantic cache of the learning store.
+"""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from plainspeak.learning import LearningStore
+from plainspeak.learning.index import SimilarityIndex
+from plainspeak.learning.semantic import SemanticCache
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create a temporary directory for journal files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+def test_similar_examples_ranking_and_updates(temp_data_dir):
+    """Test BM25 ranking and incremental index updates."""
+    store = LearningStore(temp_data_dir)
+    store.add_command("list all files", "ls -la", executed=True, success=True)
+    pending_id = store.add_command("list hidden files here", "ls -a", executed=False)
+    store.add_command("check disk usage", "df -h", executed=True, success=True)
+
+    # Unsuccessful commands are not suggested
+    assert [ex[0] for ex in store.get_similar_examples("list hidden files")] == ["list all files"]
+
+    # Marking the command successful makes it retrievable and the best match
+    store.update_command_execution(pending_id, True, True)
+    examples = store.get_similar_examples("list hidden files")
+    assert examples[0][:2] == ("list hidden files here", "ls -a")
+    assert examples[0][2] > examples[1][2]
+
+    # Edits replace the suggested command
+    store.update_command_edit(pending_id, "ls -A")
+    assert store.get_similar_examples("hidden", limit=1)[0][1] == "ls -A"
+
+    # Failures remove it again
+    store.update_command_execution(pending_id, True, False)
+    assert all(ex[0] != "list hidden files here" for ex in store.get_similar_examples("hidden files"))
+
+
+def test_similarity_index_persistence(temp_data_dir):
+    """Test that the index snapshot is reused and caught up by new stores."""
+    store = LearningStore(temp_data_dir)
+    store.add_command("list all files", "ls -la", executed=True, success=True)
+    assert store._index is None  # Loaded on first search
+    store.get_similar_examples("files")
+    store._index.save()
+    snapshot = temp_data_dir / "similarity_index.pickle"
+    assert snapshot.exists()
+
+    # Written after the snapshot, so it has to be replayed from the journal
+    other = LearningStore(temp_data_dir)
+    other.add_command("show running processes", "ps aux", executed=True, success=True)
+    assert other._index is None
+    assert len(SimilarityIndex.load(snapshot)) == 1
+
+    reloaded = LearningStore(temp_data_dir)
+    assert reloaded.get_similar_examples("running processes", limit=1)[0][1] == "ps aux"
+    assert len(reloaded._index) == 2
+
+    # Rewriting the journal invalidates the snapshot position
+    reloaded.compact()
+    assert [ex[1] for ex in LearningStore(temp_data_dir).get_similar_examples("files")] == ["ls -la"]
+
+
+def test_semantic_cache_matches_paraphrases(temp_data_dir):
+    """Test nearest-neighbour lookup of successful requests and its incremental updates."""
+    store = LearningStore(temp_data_dir)
+    pending_id = store.add_command("find duplicate photos in downloads", "fdupes ~/Downloads", executed=False)
+    store.add_command("compress old logs", "gzip *.log", executed=True, success=True)
+
+    # Unsuccessful commands are not reused
+    assert store.find_cached_command("find duplicate photos in downloads") is None
+
+    store.update_command_execution(pending_id, True, True)
+    natural_text, command, score = store.find_cached_command("can you find my duplicate photos in downloads?")
+    assert (natural_text, command) == ("find duplicate photos in downloads", "fdupes ~/Downloads")
+    assert score > 0.99
+
+    # Requests differing in what they ask for are left to the LLM
+    assert store.find_cached_command("find duplicate videos in downloads") is None
+    assert store.find_cached_command("find duplicate videos in downloads", threshold=0.5) is not None
+
+    store.update_command_execution(pending_id, True, False)
+    assert store.find_cached_command("find duplicate photos in downloads") is None
+    assert store.find_cached_command("please compress the old logs")[1] == "gzip *.log"
+
+
+def test_semantic_cache_persistence(temp_data_dir):
+    """Test that the semantic cache snapshot is reused and caught up by new stores."""
+    store = LearningStore(temp_data_dir)
+    for i in range(SemanticCache.INITIAL_CAPACITY + 1):
+        store.add_command(f"show log number {i}", f"cat {i}.log", executed=True, success=True)
+    assert store.find_cached_command("show log number 64")[1] == "cat 64.log"
+    store._semantic_cache.save()
+
+    other = LearningStore(temp_data_dir)
+    other.add_command("show running processes", "ps aux", executed=True, success=True)
+
+    reloaded = LearningStore(temp_data_dir)
+    assert reloaded.find_cached_command("show running processes")[1] == "ps aux"
+    assert len(reloaded._semantic_cache) == SemanticCache.INITIAL_CAPACITY + 2
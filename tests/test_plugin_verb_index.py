@@ -0,0 +1,145 @@
+"""
+Tests for incremental verb registration and the verb index.
+
+Registering plugins one at a time or in bulk must give the same verb map and
+resolutions as rebuilding the registry, and the index's prefix and fuzzy
+matches must agree with a linear scan.
+"""
+
+import difflib
+import random
+import string
+import unittest
+
+from plainspeak.plugins.base import PluginRegistry
+from plainspeak.plugins.manager import PluginManager
+from plainspeak.plugins.verb_index import VerbIndex
+from tests.test_plugin_verb_matching import PluginFixture
+
+
+class TestIncrementalRegistration(unittest.TestCase):
+    """Test that incremental and bulk registration match a full rebuild."""
+
+    def make_plugins(self, rng):
+        vocabulary = [f"v{i}" for i in range(30)]
+        plugins = []
+        for i in range(25):
+            verbs = rng.sample(vocabulary, 4)
+            aliases = {rng.choice(vocabulary): verbs[0], f"a{rng.randrange(10)}": verbs[1]}
+            plugins.append(
+                PluginFixture(name=f"p{i}", description="", verbs=verbs, priority=rng.randrange(4), aliases=aliases)
+            )
+        return plugins
+
+    def rebuilt(self, plugins):
+        registry = PluginRegistry()
+        registry.plugins = {plugin.name: plugin for plugin in plugins}
+        registry._rebuild_verb_maps()
+        return registry
+
+    def assert_same_maps(self, registry, expected):
+        self.assertEqual(list(registry.get_all_verbs().items()), list(expected.get_all_verbs().items()))
+        for verb in expected.verb_to_plugin_map:
+            self.assertEqual(registry.verb_index.prefix_match(verb), expected.verb_index.prefix_match(verb))
+
+    def test_register_matches_rebuild(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            plugins = self.make_plugins(rng)
+            registry = PluginRegistry()
+            for plugin in plugins:
+                registry.register(plugin)
+            self.assert_same_maps(registry, self.rebuilt(plugins))
+
+    def test_register_many_matches_rebuild(self):
+        plugins = self.make_plugins(random.Random(3))
+        registry = PluginRegistry()
+        registry.register(plugins[0])
+        registry.register_many(plugins[1:])
+        self.assert_same_maps(registry, self.rebuilt(plugins))
+
+    def test_register_after_clear_caches_rebuilds(self):
+        plugins = self.make_plugins(random.Random(5))
+        registry = PluginRegistry()
+        registry.register_many(plugins[:-1])
+        registry.clear_caches()
+        registry.register(plugins[-1])
+        self.assert_same_maps(registry, self.rebuilt(plugins))
+
+    def test_replacing_plugin_drops_old_verbs(self):
+        registry = PluginRegistry()
+        registry.register(PluginFixture(name="p", description="", verbs=["old"]))
+        registry.register(PluginFixture(name="p", description="", verbs=["new"]))
+        self.assertEqual(registry.get_all_verbs(), {"new": "p"})
+
+    def test_all_verbs_sorted_once_per_generation(self):
+        registry = PluginRegistry()
+        registry.register(PluginFixture(name="low", description="", verbs=["b", "a"]))
+        verbs = registry.get_all_verbs()
+        verbs["mutated"] = "low"
+        self.assertIs(registry.get_all_verbs().get("mutated"), None)
+        cached = registry._ordered_verbs
+        registry.get_all_verbs()
+        self.assertIs(registry._ordered_verbs, cached)
+
+        registry.register(PluginFixture(name="high", description="", verbs=["c"], priority=5))
+        self.assertEqual(list(registry.get_all_verbs().items()), [("c", "high"), ("b", "low"), ("a", "low")])
+
+
+class TestVerbIndex(unittest.TestCase):
+    """Test the trie and n-gram verb index against a linear scan."""
+
+    @staticmethod
+    def linear_lookup(verbs, query, threshold):
+        """Reference implementation scanning every verb in priority order."""
+        prefix_matches = [v for v in verbs if v.startswith(query)]
+        if prefix_matches:
+            return prefix_matches[0]
+        matches = []
+        for v in verbs:
+            score = difflib.SequenceMatcher(None, query, v).ratio()
+            if score >= threshold:
+                matches.append((v, score))
+        matches.sort(key=lambda x: x[1], reverse=True)
+        return matches[0][0] if matches else None
+
+    def test_prefix_match_respects_rank(self):
+        """Test that prefix lookups return the best-ranked verb."""
+        index = VerbIndex()
+        for rank, verb in enumerate(["list", "lint", "lsof", "ls"]):
+            index.add(verb, rank)
+
+        self.assertEqual(index.prefix_match("li"), "list")
+        self.assertEqual(index.prefix_match("ls"), "lsof")
+        self.assertEqual(index.prefix_match("lx"), None)
+
+        # Improving a rank later moves the verb ahead
+        index.add("lint", -1)
+        self.assertEqual(index.prefix_match("li"), "lint")
+
+    def test_matches_linear_scan(self):
+        """Test that indexed resolution returns the same verbs as a full scan."""
+        rng = random.Random(7)
+        alphabet = string.ascii_lowercase[:8] + "_"
+        verbs = list(dict.fromkeys("".join(rng.choices(alphabet, k=rng.randint(2, 10))) for _ in range(400)))
+
+        registry = PluginRegistry()
+        for i in range(0, len(verbs), 10):
+            registry.register(
+                PluginFixture(name=f"p{i}", description="", verbs=verbs[i : i + 10], priority=rng.randint(0, 5))
+            )
+        ordered = list(registry.get_all_verbs())
+        manager = PluginManager()
+        manager.registry = registry
+
+        for _ in range(300):
+            query = "".join(rng.choices(alphabet, k=rng.randint(1, 11)))
+            for threshold in (0.5, 0.7, 0.9):
+                expected = self.linear_lookup(ordered, query, threshold)
+                plugin = manager._find_plugin_with_fuzzy_matching(query, threshold)
+                expected_plugin = registry.get_plugin_for_verb(expected) if expected else None
+                self.assertIs(plugin, expected_plugin, f"query={query!r} threshold={threshold}")
+
+
+if __name__ == "__main__":
+    unittest.main()
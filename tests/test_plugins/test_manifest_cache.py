@@ -0,0 +1,129 @@
+"""Tests for the persistent plugin manifest cache."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from plainspeak.plugins import manifest_cache
+from plainspeak.plugins.manifest_cache import ManifestCache
+
+
+def manifest_data(verbs):
+    """Build a minimal valid manifest."""
+    return {
+        "name": "cached_plugin",
+        "version": "1.0.0",
+        "description": "Cached plugin",
+        "author": "Test Author",
+        "verbs": verbs,
+        "entrypoint": "cached_module.CachedPlugin",
+        "commands": {verb: {"template": verb, "description": verb} for verb in verbs},
+    }
+
+
+def age(path, seconds=60):
+    """Move a file's modification time into the past, out of the racy window."""
+    old = time.time_ns() - seconds * 1_000_000_000
+    os.utime(path, ns=(old, old))
+    return old
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    path = tmp_path / "plugin" / "manifest.yaml"
+    path.parent.mkdir()
+    path.write_text(yaml.dump(manifest_data(["alpha"])))
+    age(path)
+    return path
+
+
+def test_unchanged_manifest_is_not_parsed_again(tmp_path, manifest_path):
+    cache = ManifestCache(tmp_path / "cache.pickle")
+    assert cache.load(str(manifest_path)).verbs == ["alpha"]
+    cache.save()
+
+    # A new process reuses the snapshot without parsing YAML
+    reloaded = ManifestCache(tmp_path / "cache.pickle")
+    with patch("plainspeak.plugins.manifest_cache.yaml.safe_load", side_effect=AssertionError("parsed")):
+        assert reloaded.load(str(manifest_path)).verbs == ["alpha"]
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+
+
+def test_touched_manifest_is_recognized_by_hash(manifest_path):
+    cache = ManifestCache()
+    cache.load(str(manifest_path))
+    os.utime(manifest_path)
+    with patch("plainspeak.plugins.manifest_cache.yaml.safe_load", side_effect=AssertionError("parsed")):
+        assert cache.load(str(manifest_path)).verbs == ["alpha"]
+
+
+def test_modified_manifest_is_reparsed(manifest_path):
+    cache = ManifestCache()
+    cache.load(str(manifest_path))
+    manifest_path.write_text(yaml.dump(manifest_data(["charlie", "delta"])))
+    assert cache.load(str(manifest_path)).verbs == ["charlie", "delta"]
+
+
+def test_recent_manifest_mtime_is_not_trusted(tmp_path):
+    path = tmp_path / "manifest.yaml"
+    path.write_text(yaml.dump(manifest_data(["alpha"])))
+    cache = ManifestCache()
+    cache.load(str(path))
+
+    # Rewritten within the timestamp resolution, with the same size
+    mtime = os.stat(path).st_mtime_ns
+    path.write_text(yaml.dump(manifest_data(["bravo"])))
+    os.utime(path, ns=(mtime, mtime))
+    assert cache.load(str(path)).verbs == ["bravo"]
+
+
+def test_plugin_dirs_detects_changes(tmp_path, manifest_path):
+    plugins_dir = tmp_path
+    (plugins_dir / "empty").mkdir()
+    age(plugins_dir / "empty")
+    age(manifest_path.parent)
+    age(plugins_dir)
+
+    cache = ManifestCache()
+    assert cache.plugin_dirs(str(plugins_dir)) == [str(manifest_path.parent)]
+    with patch("plainspeak.plugins.manifest_cache.paths.list_directory", side_effect=AssertionError("listed")):
+        assert cache.plugin_dirs(str(plugins_dir)) == [str(manifest_path.parent)]
+
+    # A manifest added to an existing directory only changes that directory
+    (plugins_dir / "empty" / "manifest.yaml").write_text(yaml.dump(manifest_data(["alpha"])))
+    assert sorted(cache.plugin_dirs(str(plugins_dir))) == sorted(
+        [str(manifest_path.parent), str(plugins_dir / "empty")]
+    )
+
+
+def test_unreadable_snapshot_is_ignored(tmp_path, manifest_path):
+    snapshot = tmp_path / "cache.pickle"
+    snapshot.write_bytes(b"not a pickle")
+    cache = ManifestCache(snapshot)
+    assert cache.load(str(manifest_path)).verbs == ["alpha"]
+    cache.save()
+    assert ManifestCache(snapshot).load(str(manifest_path)).verbs == ["alpha"]
+
+
+def test_snapshot_from_other_schema_is_ignored(tmp_path, manifest_path):
+    cache = ManifestCache(tmp_path / "cache.pickle")
+    cache.load(str(manifest_path))
+    cache.save()
+    with patch("plainspeak.plugins.manifest_cache._schema_key", return_value=("other",)):
+        assert ManifestCache(tmp_path / "cache.pickle")._manifests == {}
+
+
+def test_shared_cache_path_comes_from_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setattr(manifest_cache, "_default_cache", None)
+    monkeypatch.setenv("PLAINSPEAK_MANIFEST_CACHE", str(tmp_path / "cache.pickle"))
+    assert manifest_cache.get_manifest_cache().path == tmp_path / "cache.pickle"
+
+    monkeypatch.setattr(manifest_cache, "_default_cache", None)
+    monkeypatch.setenv("PLAINSPEAK_MANIFEST_CACHE", "")
+    assert manifest_cache.get_manifest_cache().path is None
+
+    monkeypatch.delenv("PLAINSPEAK_MANIFEST_CACHE")
+    assert manifest_cache.default_cache_path() == manifest_cache.DEFAULT_CACHE_PATH